@@ -239,6 +239,7 @@ class DesignStormDetailSerializer(serializers.ModelSerializer):
 
 class HydrographSerializer(serializers.ModelSerializer):
     """Serializer completo para hidrogramas"""
+    hydrograph_data = serializers.JSONField(source='records')
     peak_discharge_lps_calculated = serializers.ReadOnlyField()
     time_to_peak_hours = serializers.ReadOnlyField()
 
@@ -279,6 +280,7 @@ class HydrographSerializer(serializers.ModelSerializer):
 
 class HydrographCreateSerializer(serializers.ModelSerializer):
     """Serializer para crear hidrogramas"""
+    hydrograph_data = serializers.JSONField(source='records')
 
     class Meta:
         model = Hydrograph
@@ -326,11 +328,17 @@ class HydrographCalculateRequestSerializer(serializers.Serializer):
 
     # Método de cálculo
     method = serializers.ChoiceField(
-        choices=['rational', 'scs_unit_hydrograph'],
+        choices=['rational', 'scs_unit_hydrograph', 'synth_unit_hydro'],
         default='rational',
         help_text="Método de cálculo de hidrograma"
     )
 
+    unit_hydrograph = serializers.ChoiceField(
+        choices=['clark', 'nash', 'snyder'],
+        default='clark',
+        help_text="Hidrograma unitario sintético (solo method='synth_unit_hydro')"
+    )
+
     # Método de hietograma
     hyetograph_method = serializers.ChoiceField(
         choices=['alternating_block', 'uniform'],
@@ -410,21 +418,313 @@ class HydrographCalculateResponseSerializer(serializers.Serializer):
     message = serializers.CharField(read_only=True)
 
 
+class CriticalDurationRequestSerializer(serializers.Serializer):
+    """Serializer para request de búsqueda de duración crítica"""
+
+    # Requerido
+    return_period_years = serializers.IntegerField(
+        required=True,
+        min_value=2,
+        help_text="Período de retorno (Tr) en años"
+    )
+
+    # Parámetro IDF (por defecto extra_metadata['P3_10'] de la cuenca)
+    P3_10 = serializers.FloatField(
+        required=False,
+        min_value=50,
+        max_value=100,
+        help_text="Precipitación P₃,₁₀ en mm (default: metadata de la cuenca)"
+    )
+
+    method = serializers.ChoiceField(
+        choices=['rational', 'scs_unit_hydrograph', 'synth_unit_hydro'],
+        default='rational',
+        help_text="Método de cálculo de hidrograma"
+    )
+
+    unit_hydrograph = serializers.ChoiceField(
+        choices=['clark', 'nash', 'snyder'],
+        default='clark',
+        help_text="Hidrograma unitario sintético (solo method='synth_unit_hydro')"
+    )
+
+    excess_method = serializers.ChoiceField(
+        choices=['rational', 'scs_curve_number'],
+        default='rational',
+        help_text="Método de cálculo de lluvia efectiva"
+    )
+
+    # Parámetros personalizados (por defecto los de la cuenca)
+    C = serializers.FloatField(
+        required=False,
+        min_value=0.0,
+        max_value=1.0,
+        help_text="Coeficiente de escorrentía (default: c_racional de la cuenca)"
+    )
+
+    CN = serializers.IntegerField(
+        required=False,
+        min_value=30,
+        max_value=100,
+        help_text="Curve Number (default: nc_scs de la cuenca)"
+    )
+
+    time_step_minutes = serializers.FloatField(
+        required=False,
+        min_value=1,
+        max_value=60,
+        help_text="Paso de tiempo en minutos (auto si no se especifica)"
+    )
+
+    min_duration_hours = serializers.FloatField(
+        required=False,
+        min_value=0.0,
+        help_text="Duración mínima a evaluar en horas (default: un paso de tiempo)"
+    )
+
+    max_duration_hours = serializers.FloatField(
+        required=False,
+        min_value=0.1,
+        max_value=72.0,
+        default=24.0,
+        help_text="Duración máxima a evaluar en horas"
+    )
+
+    peak_position_ratio = serializers.FloatField(
+        required=False,
+        min_value=0.0,
+        max_value=1.0,
+        default=0.5,
+        help_text="Posición del pico en hietograma (0.0-1.0) si no se busca"
+    )
+
+    search_peak_position = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Buscar también la posición del pico que maximiza el caudal"
+    )
+
+    def validate(self, data):
+        """Validaciones cruzadas"""
+        min_duration = data.get('min_duration_hours')
+        if min_duration is not None and min_duration > data['max_duration_hours']:
+            raise serializers.ValidationError({
+                'min_duration_hours': 'Debe ser menor o igual a max_duration_hours'
+            })
+        return data
+
+
+class SensitivityRequestSerializer(serializers.Serializer):
+    """Serializer para request de análisis de sensibilidad global"""
+
+    analysis = serializers.ChoiceField(
+        choices=['morris', 'sobol'],
+        default='morris',
+        help_text="Método: cribado de Morris o índices de Sobol"
+    )
+
+    # Tormenta de diseño (precipitación total de la curva IDF)
+    return_period_years = serializers.IntegerField(
+        required=True,
+        min_value=2,
+        help_text="Período de retorno (Tr) nominal en años"
+    )
+
+    duration_hours = serializers.FloatField(
+        required=True,
+        min_value=0.1,
+        max_value=72.0,
+        help_text="Duración de la tormenta en horas"
+    )
+
+    P3_10 = serializers.FloatField(
+        required=False,
+        min_value=50,
+        max_value=100,
+        help_text="Precipitación P₃,₁₀ nominal en mm (default: metadata de la cuenca)"
+    )
+
+    method = serializers.ChoiceField(
+        choices=['rational', 'scs_unit_hydrograph', 'synth_unit_hydro'],
+        default='rational',
+        help_text="Método de cálculo de hidrograma"
+    )
+
+    unit_hydrograph = serializers.ChoiceField(
+        choices=['clark', 'nash', 'snyder'],
+        default='clark',
+        help_text="Hidrograma unitario sintético (solo method='synth_unit_hydro')"
+    )
+
+    excess_method = serializers.ChoiceField(
+        choices=['rational', 'scs_curve_number'],
+        default='rational',
+        help_text="Método de cálculo de lluvia efectiva"
+    )
+
+    C = serializers.FloatField(
+        required=False,
+        min_value=0.0,
+        max_value=1.0,
+        help_text="Coeficiente de escorrentía nominal (default: c_racional de la cuenca)"
+    )
+
+    CN = serializers.IntegerField(
+        required=False,
+        min_value=30,
+        max_value=100,
+        help_text="Curve Number nominal (default: nc_scs de la cuenca)"
+    )
+
+    time_step_minutes = serializers.FloatField(
+        required=False,
+        min_value=1,
+        max_value=60,
+        help_text="Paso de tiempo nominal en minutos (auto si no se especifica)"
+    )
+
+    peak_position_ratio = serializers.FloatField(
+        required=False,
+        min_value=0.0,
+        max_value=1.0,
+        default=0.5,
+        help_text="Posición nominal del pico en hietograma (0.0-1.0)"
+    )
+
+    # Rangos de los parámetros
+    parameters = serializers.ListField(
+        child=serializers.ChoiceField(choices=[
+            'C', 'CN', 'tc_minutes', 'peak_position_ratio', 'time_step_minutes', 'P3_10', 'Tr'
+        ]),
+        required=False,
+        allow_empty=False,
+        help_text="Parámetros a analizar (default: los que usa el escenario)"
+    )
+
+    relative_range = serializers.FloatField(
+        required=False,
+        min_value=0.01,
+        max_value=0.9,
+        default=0.2,
+        help_text="Rango de cada parámetro: nominal × (1 ± relative_range)"
+    )
+
+    bounds = serializers.DictField(
+        child=serializers.ListField(child=serializers.FloatField(), min_length=2, max_length=2),
+        required=False,
+        help_text="Rangos explícitos {parámetro: [low, high]} (reemplazan relative_range)"
+    )
+
+    # Tamaño de muestra
+    num_trajectories = serializers.IntegerField(
+        required=False,
+        min_value=2,
+        max_value=500,
+        default=20,
+        help_text="Trayectorias de Morris"
+    )
+
+    num_samples = serializers.IntegerField(
+        required=False,
+        min_value=8,
+        max_value=8192,
+        default=256,
+        help_text="Tamaño N de las matrices de Sobol (N × (k + 2) evaluaciones)"
+    )
+
+    seed = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        help_text="Semilla (resultados reproducibles)"
+    )
+
+
+class CalibrationRequestSerializer(serializers.Serializer):
+    """Serializer para request de calibración de parámetros de la cuenca"""
+
+    objective = serializers.ChoiceField(
+        choices=['nse', 'kge', 'rmse'],
+        default='nse',
+        help_text="Función objetivo (Nash-Sutcliffe, Kling-Gupta o RMSE)"
+    )
+
+    optimizer = serializers.ChoiceField(
+        choices=['nelder-mead', 'powell', 'differential_evolution'],
+        default='nelder-mead',
+        help_text="Optimizador de scipy.optimize"
+    )
+
+    method = serializers.ChoiceField(
+        choices=['rational', 'scs_unit_hydrograph', 'synth_unit_hydro'],
+        default='scs_unit_hydrograph',
+        help_text="Método de cálculo de hidrograma"
+    )
+
+    unit_hydrograph = serializers.ChoiceField(
+        choices=['clark', 'nash', 'snyder'],
+        default='clark',
+        help_text="Hidrograma unitario sintético (solo method='synth_unit_hydro')"
+    )
+
+    excess_method = serializers.ChoiceField(
+        choices=['rational', 'scs_curve_number'],
+        default='scs_curve_number',
+        help_text="Método de lluvia efectiva (calibra C o CN)"
+    )
+
+    parameters = serializers.ListField(
+        child=serializers.ChoiceField(choices=['C', 'CN', 'tc_minutes']),
+        required=False,
+        allow_empty=False,
+        help_text="Parámetros a calibrar (default: C o CN según excess_method, y tc_minutes)"
+    )
+
+    event_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        help_text="Ids de RainfallData (default: todos los eventos con caudal observado)"
+    )
+
+    max_iterations = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=2000,
+        default=200,
+        help_text="Iteraciones máximas del optimizador"
+    )
+
+    time_step_minutes = serializers.FloatField(
+        required=False,
+        min_value=1,
+        max_value=60,
+        help_text="Paso de tiempo en minutos (auto si no se especifica)"
+    )
+
+    apply = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Guardar los parámetros ajustados en la cuenca al terminar"
+    )
+
+
 # ============================================================================
 # RAINFALL DATA SERIALIZERS
 # ============================================================================
 
 class RainfallDataSerializer(serializers.ModelSerializer):
     """Serializer para datos de lluvia"""
+    rainfall_series = serializers.JSONField(source='records')
 
     class Meta:
         model = RainfallData
         fields = [
             'id', 'watershed', 'event_date', 'return_period_years',
             'duration_hours', 'total_rainfall_mm', 'rainfall_series',
-            'source', 'notes', 'created_at'
+            'gauge', 'gauge_offset', 'gauge_length',
+            'observed_discharge', 'source', 'notes', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'gauge', 'gauge_offset', 'gauge_length', 'created_at']
 
     def validate_total_rainfall_mm(self, value):
         """Validar lluvia positiva"""
@@ -448,17 +748,40 @@ class RainfallDataSerializer(serializers.ModelSerializer):
 
         return value
 
+    def validate_observed_discharge(self, value):
+        """Validar formato de observed_discharge"""
+        if value is None:
+            return value
+        if not isinstance(value, list):
+            raise serializers.ValidationError("observed_discharge debe ser una lista")
+
+        for point in value:
+            if not isinstance(point, dict):
+                raise serializers.ValidationError("Cada punto debe ser un diccionario")
+
+            missing_keys = [key for key in ['time_min', 'discharge_m3s'] if key not in point]
+            if missing_keys:
+                raise serializers.ValidationError(f"Faltan claves: {missing_keys}")
+            if point['discharge_m3s'] < 0:
+                raise serializers.ValidationError("El caudal observado debe ser no negativo")
+
+        return value
+
 
 class RainfallDataCreateSerializer(serializers.ModelSerializer):
     """Serializer para crear datos de lluvia"""
+    rainfall_series = serializers.JSONField(source='records')
 
     class Meta:
         model = RainfallData
         fields = [
             'watershed', 'event_date', 'return_period_years', 'duration_hours',
-            'total_rainfall_mm', 'rainfall_series', 'source', 'notes'
+            'total_rainfall_mm', 'rainfall_series', 'observed_discharge', 'source', 'notes'
         ]
 
+    validate_rainfall_series = RainfallDataSerializer.validate_rainfall_series
+    validate_observed_discharge = RainfallDataSerializer.validate_observed_discharge
+
     def validate_total_rainfall_mm(self, value):
         if value <= 0:
             raise serializers.ValidationError("La lluvia total debe ser mayor a 0")
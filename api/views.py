@@ -9,6 +9,9 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django.shortcuts import get_object_or_404
 
+from celery.result import AsyncResult
+from kombu.exceptions import OperationalError
+
 from core.models import Project, Watershed, DesignStorm, Hydrograph, RainfallData
 from .serializers import (
     ProjectSerializer,
@@ -25,11 +28,23 @@ from .serializers import (
     HydrographSummarySerializer,
     HydrographCalculateRequestSerializer,
     HydrographCalculateResponseSerializer,
+    CriticalDurationRequestSerializer,
+    SensitivityRequestSerializer,
+    CalibrationRequestSerializer,
     RainfallDataSerializer,
     RainfallDataCreateSerializer,
 )
 
-from hydrology.services import calculate_hydrograph, HydrographCalculationError
+from hydrology.services import (
+    cached_hydrograph_series,
+    find_critical_duration,
+    pack_columns,
+    default_sensitivity_bounds,
+    morris_screening,
+    sobol_indices,
+    HydrographCalculationError,
+)
+from hydrology.tasks import calibrate_watershed_task, calibration_task_watershed
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -98,6 +113,10 @@ class WatershedViewSet(viewsets.ModelViewSet):
     - GET /api/watersheds/{id}/ - Detalle de cuenca
     - PUT /api/watersheds/{id}/ - Actualizar cuenca
     - DELETE /api/watersheds/{id}/ - Eliminar cuenca
+    - POST /api/watersheds/{id}/critical_duration/ - Buscar duración crítica
+    - POST /api/watersheds/{id}/sensitivity/ - Análisis de sensibilidad global
+    - POST /api/watersheds/{id}/calibrate/ - Calibrar C/CN y Tc (en segundo plano)
+    - GET /api/watersheds/{id}/calibration/{task_id}/ - Estado de la calibración
     """
     queryset = Watershed.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -118,6 +137,41 @@ class WatershedViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(project_id=project_id)
         return queryset
 
+    def _analysis_inputs(self, watershed, validated_data=None):
+        """
+        Verifica que la cuenca tenga área y Tc y resuelve P₃,₁₀ (del request
+        o de la metadata de la cuenca) para las acciones de análisis.
+
+        Args:
+            watershed: Cuenca
+            validated_data: Datos validados del request (None = no se usa la IDF)
+
+        Returns:
+            (P3_10, None) si los datos alcanzan, o (None, Response 400)
+        """
+        if not watershed.area_hectareas or watershed.area_hectareas <= 0:
+            return None, Response(
+                {'error': 'La cuenca debe tener área definida (area_hectareas > 0)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not watershed.tc_horas or watershed.tc_horas <= 0:
+            return None, Response(
+                {'error': 'La cuenca debe tener tiempo de concentración (tc_horas > 0)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if validated_data is None:
+            return None, None
+
+        P3_10 = validated_data.get('P3_10')
+        if P3_10 is None and watershed.extra_metadata and 'P3_10' in watershed.extra_metadata:
+            P3_10 = float(watershed.extra_metadata['P3_10'])
+        if P3_10 is None:
+            return None, Response(
+                {'error': 'Se requiere P3_10 (en el request o en la metadata de la cuenca)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return P3_10, None
+
     @action(detail=True, methods=['get'])
     def design_storms(self, request, pk=None):
         """
@@ -140,6 +194,243 @@ class WatershedViewSet(viewsets.ModelViewSet):
         serializer = RainfallDataSerializer(rainfall, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['post'])
+    def critical_duration(self, request, pk=None):
+        """
+        POST /api/watersheds/{id}/critical_duration/
+        Busca la duración de tormenta (y opcionalmente la posición del pico)
+        que maximiza el caudal pico. No guarda hidrogramas.
+
+        Request body:
+        {
+            "return_period_years": 10,
+            "excess_method": "scs_curve_number",
+            "max_duration_hours": 24,
+            "search_peak_position": true
+        }
+
+        Returns:
+        {
+            "critical_duration_hours": float,
+            "peak_discharge_m3s": float,
+            "peak_position_ratio": float,
+            "evaluated_durations": [...],
+            "summary": {...}
+        }
+        """
+        watershed = self.get_object()
+
+        request_serializer = CriticalDurationRequestSerializer(data=request.data)
+        if not request_serializer.is_valid():
+            return Response(
+                request_serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        validated_data = request_serializer.validated_data
+
+        P3_10, error = self._analysis_inputs(watershed, validated_data)
+        if error is not None:
+            return error
+
+        try:
+            result = find_critical_duration(
+                area_km2=float(watershed.area_hectareas) / 100,  # Convertir ha a km²
+                tc_minutes=float(watershed.tc_horas) * 60,  # Convertir horas a minutos
+                P3_10=P3_10,
+                Tr=float(validated_data['return_period_years']),
+                method=validated_data['method'],
+                excess_method=validated_data['excess_method'],
+                C=validated_data.get('C', watershed.c_racional),
+                CN=validated_data.get('CN', watershed.nc_scs),
+                time_step_minutes=validated_data.get('time_step_minutes'),
+                min_duration_hours=validated_data.get('min_duration_hours'),
+                max_duration_hours=validated_data['max_duration_hours'],
+                peak_position_ratio=validated_data['peak_position_ratio'],
+                search_peak_position=validated_data['search_peak_position'],
+                unit_hydrograph=validated_data['unit_hydrograph']
+            )
+        except (ValueError, HydrographCalculationError) as e:
+            return Response(
+                {'error': f'Error en búsqueda de duración crítica: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(result.to_dict())
+
+    @action(detail=True, methods=['post'])
+    def sensitivity(self, request, pk=None):
+        """
+        POST /api/watersheds/{id}/sensitivity/
+        Ordena los parámetros (C, CN, Tc, posición del pico, Δt, P₃,₁₀, Tr)
+        según su influencia en caudal pico, volumen y tiempo al pico, con
+        cribado de Morris o índices de Sobol. No guarda hidrogramas.
+
+        Request body:
+        {
+            "analysis": "sobol",
+            "return_period_years": 25,
+            "duration_hours": 3,
+            "excess_method": "scs_curve_number",
+            "relative_range": 0.2,
+            "num_samples": 512,
+            "seed": 1
+        }
+
+        Returns:
+        {
+            "method": "sobol",
+            "parameters": [...],
+            "bounds": {...},
+            "num_evaluations": int,
+            "indices": {métrica: {parámetro: {...}}},
+            "ranking": {métrica: [...]}
+        }
+        """
+        watershed = self.get_object()
+
+        request_serializer = SensitivityRequestSerializer(data=request.data)
+        if not request_serializer.is_valid():
+            return Response(
+                request_serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        validated_data = request_serializer.validated_data
+
+        P3_10, error = self._analysis_inputs(watershed, validated_data)
+        if error is not None:
+            return error
+
+        # Escenario nominal: precipitación total P(D) de la curva IDF
+        scenario = dict(
+            total_rainfall_mm=None,
+            duration_hours=validated_data['duration_hours'],
+            area_km2=float(watershed.area_hectareas) / 100,  # Convertir ha a km²
+            tc_minutes=float(watershed.tc_horas) * 60,  # Convertir horas a minutos
+            method=validated_data['method'],
+            excess_method=validated_data['excess_method'],
+            C=validated_data.get('C', watershed.c_racional),
+            CN=validated_data.get('CN', watershed.nc_scs),
+            P3_10=P3_10,
+            Tr=float(validated_data['return_period_years']),
+            time_step_minutes=validated_data.get('time_step_minutes'),
+            peak_position_ratio=validated_data['peak_position_ratio'],
+            unit_hydrograph=validated_data['unit_hydrograph']
+        )
+
+        try:
+            bounds = validated_data.get('bounds') or default_sensitivity_bounds(
+                scenario,
+                parameters=validated_data.get('parameters'),
+                relative_range=validated_data['relative_range']
+            )
+            if validated_data['analysis'] == 'sobol':
+                result = sobol_indices(
+                    scenario, bounds,
+                    num_samples=validated_data['num_samples'],
+                    seed=validated_data.get('seed')
+                )
+            else:
+                result = morris_screening(
+                    scenario, bounds,
+                    num_trajectories=validated_data['num_trajectories'],
+                    seed=validated_data.get('seed')
+                )
+        except (ValueError, HydrographCalculationError) as e:
+            return Response(
+                {'error': f'Error en análisis de sensibilidad: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(result.to_dict())
+
+    @action(detail=True, methods=['post'])
+    def calibrate(self, request, pk=None):
+        """
+        POST /api/watersheds/{id}/calibrate/
+        Inicia la calibración de C/CN y Tc contra los eventos de lluvia con
+        caudal observado (RainfallData.observed_discharge). La calibración
+        corre como tarea de Celery; el progreso se consulta en
+        /api/watersheds/{id}/calibration/{task_id}/.
+
+        Request body:
+        {
+            "objective": "kge",
+            "optimizer": "nelder-mead",
+            "excess_method": "scs_curve_number",
+            "apply": false
+        }
+
+        Returns (202):
+        {
+            "task_id": str,
+            "status_url": str
+        }
+        """
+        watershed = self.get_object()
+
+        request_serializer = CalibrationRequestSerializer(data=request.data)
+        if not request_serializer.is_valid():
+            return Response(
+                request_serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        options = dict(request_serializer.validated_data)
+
+        _, error = self._analysis_inputs(watershed)
+        if error is not None:
+            return error
+        events = watershed.rainfall_data.filter(observed_discharge__isnull=False)
+        if 'event_ids' in options:
+            events = events.filter(id__in=options['event_ids'])
+        if not events.exists():
+            return Response(
+                {'error': 'La cuenca no tiene eventos con caudal observado (observed_discharge)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            task = calibrate_watershed_task.delay(watershed.id, options)
+        except OperationalError as e:
+            return Response(
+                {'error': f'No se pudo encolar la calibración: {str(e)}'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        return Response(
+            {
+                'task_id': task.id,
+                'status_url': f'/api/watersheds/{watershed.id}/calibration/{task.id}/',
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+
+    @action(detail=True, methods=['get'], url_path=r'calibration/(?P<task_id>[\w-]+)')
+    def calibration(self, request, pk=None, task_id=None):
+        """
+        GET /api/watersheds/{id}/calibration/{task_id}/
+        Estado de una calibración: PENDING, PROGRESS (con iteración, número
+        de evaluaciones y mejor objetivo), SUCCESS (con el resultado) o
+        FAILURE (con el error). Las tareas de otra cuenca devuelven 404.
+        """
+        watershed = self.get_object()
+        task = AsyncResult(task_id, app=calibrate_watershed_task.app)
+
+        if (task.state in ('PROGRESS', 'SUCCESS', 'FAILURE')
+                and calibration_task_watershed(task) != watershed.id):
+            return Response(
+                {'error': 'Calibración no encontrada para esta cuenca'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        response = {'task_id': task_id, 'state': task.state}
+        if task.state == 'PROGRESS':
+            response['progress'] = task.info
+        elif task.state == 'SUCCESS':
+            response['result'] = task.result
+        elif task.state == 'FAILURE':
+            response['error'] = str(task.result)
+        return Response(response)
+
 
 class DesignStormViewSet(viewsets.ModelViewSet):
     """
@@ -354,9 +645,9 @@ class HydrographViewSet(viewsets.ModelViewSet):
         if design_storm.return_period_years:
             Tr = float(design_storm.return_period_years)
 
-        # Calcular hidrograma usando el servicio
+        # Calcular hidrograma usando el servicio (memoizado por contenido)
         try:
-            calculation_result = calculate_hydrograph(
+            calculation_result = cached_hydrograph_series(
                 total_rainfall_mm=total_rainfall_mm,
                 duration_hours=duration_hours,
                 area_km2=area_km2,
@@ -369,7 +660,8 @@ class HydrographViewSet(viewsets.ModelViewSet):
                 time_step_minutes=time_step_minutes,
                 peak_position_ratio=peak_position_ratio,
                 P3_10=P3_10,
-                Tr=Tr
+                Tr=Tr,
+                unit_hydrograph=validated_data['unit_hydrograph']
             )
         except HydrographCalculationError as e:
             return Response(
@@ -382,17 +674,15 @@ class HydrographViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-        # Construir hydrograph_data para guardar en BD
-        hydrograph_result = calculation_result['hydrograph']
-        summary = calculation_result['summary']
+        summary = calculation_result.summary()
 
-        hydrograph_data = []
-        for i in range(len(hydrograph_result['time_steps'])):
-            hydrograph_data.append({
-                'time_min': hydrograph_result['time_steps'][i],
-                'discharge_m3s': hydrograph_result['discharge_m3s'][i],
-                'cumulative_volume_m3': hydrograph_result['cumulative_volume_m3'][i]
-            })
+        # Serie para guardar en BD (columnar desde los arrays: tiempo = k·Δt, sin lista de puntos)
+        series = calculation_result.hydrograph
+        hydrograph_columns = pack_columns(
+            {'discharge_m3s': series.discharge_m3s, 'cumulative_volume_m3': series.cumulative_volume_m3},
+            start=0.0,
+            time_step=series.time_step_minutes
+        )
 
         # Crear y guardar el hidrograma en la BD
         hydrograph = Hydrograph.objects.create(
@@ -405,7 +695,7 @@ class HydrographViewSet(viewsets.ModelViewSet):
             total_runoff_mm=summary['rainfall_excess_mm'],
             total_runoff_m3=summary['total_volume_m3'],
             volume_hm3=summary['total_volume_hm3'],
-            hydrograph_data=hydrograph_data,
+            hydrograph_columns=hydrograph_columns,
             rainfall_excess_mm=summary['rainfall_excess_mm'],
             infiltration_total_mm=summary['infiltration_mm'],
             notes=f"Auto-calculado. Método: {method}, C={C if C else 'N/A'}, CN={CN if CN else 'N/A'}"
@@ -416,7 +706,7 @@ class HydrographViewSet(viewsets.ModelViewSet):
 
         response_data = {
             'hydrograph': hydrograph_serializer.data,
-            'calculation_details': calculation_result,
+            'calculation_details': calculation_result.to_dict(),
             'message': f'Hidrograma calculado exitosamente usando método {method}'
         }
 
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
+
+from calculators.services.idf_table import get_idf_table
 
 
 class CalculatorsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'calculators'
+
+    def ready(self):
+        """Construye la tabla IDF compartida antes de atender solicitudes"""
+        table = get_idf_table()
+        table.exact = getattr(settings, 'IDF_TABLE_EXACT', False)
@@ -14,6 +14,8 @@ Referencias:
 import math
 from typing import Dict, Optional, Union, List
 
+import numpy as np
+
 
 def calculate_CT(Tr: float) -> float:
     """
@@ -215,6 +217,127 @@ def calculate_intensity_idf(
     return result
 
 
+def calculate_intensity_idf_array(
+    P3_10: Union[float, np.ndarray],
+    Tr: Union[float, np.ndarray],
+    d: Union[float, np.ndarray],
+    Ac: Optional[Union[float, np.ndarray]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Versión vectorizada de calculate_intensity_idf().
+
+    Acepta arrays o escalares broadcastables para P3_10, Tr, d y Ac, y evalúa
+    CT, CD y CA con NumPy en una sola pasada. La rama d < 3h / d >= 3h de CD
+    se resuelve con máscaras. Los valores no se redondean.
+
+    Args:
+        P3_10: Precipitación de 3 horas y 10 años en mm (50-100)
+        Tr: Período de retorno en años (>= 2)
+        d: Duración de la tormenta en horas (> 0)
+        Ac: Área de cuenca en km² (None para intensidad puntual)
+
+    Returns:
+        Dictionary de arrays con la forma broadcast de las entradas:
+            - I_mmh: Intensidad en mm/h
+            - P_mm: Precipitación total en mm
+            - CT, CD, CA: Factores de corrección
+
+    Raises:
+        ValueError: Si algún valor está fuera de rango
+
+    Example:
+        >>> result = calculate_intensity_idf_array(74, [2, 5, 10], d=[[0.5], [1], [3]], Ac=30)
+        >>> result['I_mmh'].shape
+        (3, 3)
+    """
+    P3_10, Tr, d, Ac = _validate_idf_arrays(P3_10, Tr, d, Ac)
+
+    # CT(Tr) = 0.5786 - 0.4312 × log[ln(Tr / (Tr - 1))]
+    CT = _CT_array(Tr)
+
+    # CD(d): fórmula de duraciones cortas (< 3h) o largas (>= 3h)
+    CD = _CD_array(d)
+
+    # CA(Ac,d) = 1.0 - (0.3549 × d^(-0.4272)) × (1.0 - e^(-0.005792 × Ac))
+    if Ac is None:
+        CA = np.ones_like(d)
+    else:
+        CA = 1.0 - _CA_duration_term(d) * _CA_area_term(Ac)
+
+    return _idf_arrays(P3_10, CT, CD, CA, d)
+
+
+# ===== FACTORES VECTORIZADOS (compartidos con IDFTable) =====
+
+def _CT_array(Tr: np.ndarray) -> np.ndarray:
+    """CT(Tr) = 0.5786 - 0.4312 × log[ln(Tr / (Tr - 1))]"""
+    return 0.5786 - 0.4312 * np.log10(np.log(Tr / (Tr - 1)))
+
+
+def _CD_short_array(d: np.ndarray) -> np.ndarray:
+    """CD(d) para d < 3 horas"""
+    return (0.6208 * d) / (d + 0.0137) ** 0.5639
+
+
+def _CD_long_array(d: np.ndarray) -> np.ndarray:
+    """CD(d) para d >= 3 horas"""
+    return (1.0287 * d) / (d + 1.0293) ** 0.8083
+
+
+def _CD_array(d: np.ndarray) -> np.ndarray:
+    """CD(d) con la rama d < 3h / d >= 3h resuelta por máscara"""
+    return np.where(d < 3, _CD_short_array(d), _CD_long_array(d))
+
+
+def _CA_duration_term(d: np.ndarray) -> np.ndarray:
+    """Término de duración de CA: 0.3549 × d^(-0.4272)"""
+    return 0.3549 * d ** (-0.4272)
+
+
+def _CA_area_term(Ac: np.ndarray) -> np.ndarray:
+    """Término de área de CA: 1.0 - e^(-0.005792 × Ac)"""
+    return 1.0 - np.exp(-0.005792 * Ac)
+
+
+def _validate_idf_arrays(P3_10, Tr, d, Ac):
+    """Convierte a arrays float64 y valida (mismos mensajes que la versión escalar)"""
+    P3_10 = np.asarray(P3_10, dtype=np.float64)
+    Tr = np.asarray(Tr, dtype=np.float64)
+    d = np.asarray(d, dtype=np.float64)
+
+    if np.any((P3_10 < 50) | (P3_10 > 100)):
+        raise ValueError(
+            f'P₃,₁₀ debe estar entre 50 y 100 mm (valor típico de Uruguay). '
+            f'Valor ingresado: {P3_10} mm'
+        )
+    if np.any(Tr < 2):
+        raise ValueError('El período de retorno debe ser >= 2 años')
+    if np.any(d <= 0):
+        raise ValueError('La duración debe ser mayor a 0')
+    if Ac is not None:
+        Ac = np.asarray(Ac, dtype=np.float64)
+        if np.any(Ac < 0):
+            raise ValueError('El área de cuenca no puede ser negativa')
+
+    return P3_10, Tr, d, Ac
+
+
+def _idf_arrays(P3_10, CT, CD, CA, d) -> Dict[str, np.ndarray]:
+    """Intensidad y precipitación a partir de los factores, con la forma broadcast"""
+    P_mm = P3_10 * CT * CD * CA
+    I_mmh = P_mm / d
+
+    shape = np.broadcast_shapes(I_mmh.shape, CA.shape)
+
+    return {
+        'I_mmh': np.broadcast_to(I_mmh, shape),
+        'P_mm': np.broadcast_to(P_mm, shape),
+        'CT': np.broadcast_to(CT, shape),
+        'CD': np.broadcast_to(CD, shape),
+        'CA': np.broadcast_to(CA, shape)
+    }
+
+
 # ===== FUNCIONES AUXILIARES =====
 
 def get_P3_10_reference_values() -> Dict[str, float]:
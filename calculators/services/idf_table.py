@@ -0,0 +1,279 @@
+"""
+Tablas IDF precalculadas.
+
+Los factores CT(Tr), CD(d) y CA(Ac,d) de Rodríguez Fontal son funciones
+trascendentes que el cálculo de hietogramas evalúa una y otra vez con los
+mismos argumentos: Tr de un conjunto chico de períodos de retorno y d en
+múltiplos enteros de Δt. IDFTable los precalcula sobre grillas:
+
+- Nodos exactos: Tr entero (2..max_return_period), d en minutos enteros
+  (1..max_duration_minutes) y Ac en múltiplos de area_step_km2. En un nodo
+  la consulta devuelve el valor de la fórmula (sin error).
+- Fuera de los nodos: interpolación en grillas densas. CT e CD se
+  interpolan en escala logarítmica (log Tr; log d - log CD, por rama
+  d < 3h / d >= 3h para no cruzar la discontinuidad de CD en 3 h) y el
+  término de área de CA linealmente en Ac. El error relativo queda por
+  debajo de IDF_TABLE_MAX_RELATIVE_ERROR.
+- Fuera del rango de las grillas, o con exact=True, se evalúan las
+  fórmulas (calculate_intensity_idf_array).
+
+CA(Ac,d) = 1 - g(d)·h(Ac) es separable, por lo que se tabulan g y h por
+separado en lugar de una grilla 2-D.
+
+get_idf_table() devuelve la tabla compartida por el proceso;
+CalculatorsConfig.ready() la construye al iniciar la aplicación.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from .idf import (
+    _CA_area_term,
+    _CA_duration_term,
+    _CD_array,
+    _CD_long_array,
+    _CD_short_array,
+    _CT_array,
+    _idf_arrays,
+    _validate_idf_arrays,
+    calculate_intensity_idf_array,
+)
+
+
+# Rangos de las grillas
+IDF_TABLE_MAX_RETURN_PERIOD = 1000  # años
+IDF_TABLE_MAX_DURATION_MINUTES = 2880  # 48 h
+IDF_TABLE_MAX_AREA_KM2 = 1000.0
+IDF_TABLE_AREA_STEP_KM2 = 0.01
+
+# Puntos de las grillas densas (geométricas) de interpolación
+IDF_TABLE_INTERPOLATION_POINTS = 4096
+
+# Cota del error relativo de la interpolación fuera de los nodos
+IDF_TABLE_MAX_RELATIVE_ERROR = 1e-6
+
+# Tolerancia relativa para reconocer un nodo (p. ej. k·Δt/60 h = k·Δt min)
+NODE_TOLERANCE = 1e-9
+
+# Límite entre las ramas de CD [min]
+CD_BRANCH_MINUTES = 180
+
+
+def _snap(values: np.ndarray, step: float):
+    """Índices de nodo de values en una grilla de paso step y máscara de nodos exactos"""
+    scaled = values / step
+    index = np.rint(scaled)
+    on_node = np.abs(scaled - index) <= NODE_TOLERANCE * np.maximum(np.abs(scaled), 1.0)
+    return index.astype(np.int64), on_node
+
+
+def _lookup(nodes: np.ndarray, index: np.ndarray, use_node: np.ndarray, off_node) -> np.ndarray:
+    """Valores de nodo donde use_node, off_node() en el resto"""
+    if use_node.all():
+        return nodes[index]
+    return np.where(use_node, nodes[np.where(use_node, index, 0)], off_node())
+
+
+class IDFTable:
+    """
+    Factores CT, CD y CA precalculados con consulta exacta en los nodos e
+    interpolación fuera de ellos.
+
+    Args:
+        max_return_period: Tr máximo tabulado [años]
+        max_duration_minutes: Duración máxima tabulada [min]
+        max_area_km2: Área máxima tabulada [km²]
+        area_step_km2: Paso de la grilla de áreas [km²]
+        num_points: Puntos de las grillas densas de interpolación
+        exact: Evaluar siempre las fórmulas (sin tablas)
+    """
+
+    def __init__(
+        self,
+        max_return_period: int = IDF_TABLE_MAX_RETURN_PERIOD,
+        max_duration_minutes: int = IDF_TABLE_MAX_DURATION_MINUTES,
+        max_area_km2: float = IDF_TABLE_MAX_AREA_KM2,
+        area_step_km2: float = IDF_TABLE_AREA_STEP_KM2,
+        num_points: int = IDF_TABLE_INTERPOLATION_POINTS,
+        exact: bool = False
+    ):
+        if max_return_period < 3:
+            raise ValueError(f"max_return_period debe ser >= 3. Valor: {max_return_period}")
+        if max_duration_minutes <= CD_BRANCH_MINUTES:
+            raise ValueError(
+                f"max_duration_minutes debe ser > {CD_BRANCH_MINUTES}. Valor: {max_duration_minutes}"
+            )
+        if max_area_km2 <= 0 or area_step_km2 <= 0:
+            raise ValueError(f"Grilla de áreas inválida: 0-{max_area_km2} km² cada {area_step_km2} km²")
+        if num_points < 2:
+            raise ValueError(f"num_points debe ser >= 2. Valor: {num_points}")
+
+        self.max_return_period = int(max_return_period)
+        self.max_duration_minutes = int(max_duration_minutes)
+        self.area_step_km2 = float(area_step_km2)
+        self.exact = exact
+
+        # CT: nodos en Tr enteros; interpolación lineal en log Tr
+        self._ct_nodes = _CT_array(np.arange(self.max_return_period + 1, dtype=np.float64).clip(2))
+        return_periods = np.geomspace(2, self.max_return_period, num_points)
+        self._log_tr = np.log(return_periods)
+        self._ct_dense = _CT_array(return_periods)
+
+        # CD y término de duración de CA: nodos en minutos enteros;
+        # interpolación log-log por rama de CD
+        minutes = np.arange(self.max_duration_minutes + 1, dtype=np.float64).clip(1)
+        self._cd_nodes = _CD_array(minutes / 60)
+        self._duration_term_nodes = _CA_duration_term(minutes / 60)
+        short = np.geomspace(1, CD_BRANCH_MINUTES, num_points) / 60
+        long = np.geomspace(CD_BRANCH_MINUTES, self.max_duration_minutes, num_points) / 60
+        self._log_d_short = np.log(short)
+        self._log_d_long = np.log(long)
+        self._log_cd_short = np.log(_CD_short_array(short))
+        self._log_cd_long = np.log(_CD_long_array(long))
+
+        # Término de área de CA: nodos cada area_step_km2, interpolación lineal
+        num_areas = int(round(max_area_km2 / self.area_step_km2))
+        self.max_area_km2 = num_areas * self.area_step_km2
+        self._areas = np.arange(num_areas + 1) * self.area_step_km2
+        self._area_term_nodes = _CA_area_term(self._areas)
+
+        for array in (self._ct_nodes, self._cd_nodes, self._duration_term_nodes, self._area_term_nodes):
+            array.setflags(write=False)
+
+    def CT(self, Tr, exact: bool = None) -> np.ndarray:
+        """Factor por período de retorno (Tr >= 2, sin validar)"""
+        Tr = np.asarray(Tr, dtype=np.float64)
+        if self._use_exact(exact):
+            return _CT_array(Tr)
+
+        index, on_node = _snap(Tr, 1.0)
+        inside = Tr <= self.max_return_period
+
+        def off_node():
+            interpolated = np.interp(np.log(Tr), self._log_tr, self._ct_dense)
+            return np.where(inside, interpolated, _CT_array(Tr))
+
+        return _lookup(self._ct_nodes, index, on_node & inside, off_node)
+
+    def CD(self, d, exact: bool = None) -> np.ndarray:
+        """Factor por duración d [h] (d > 0, sin validar)"""
+        d = np.asarray(d, dtype=np.float64)
+        if self._use_exact(exact):
+            return _CD_array(d)
+
+        minutes = d * 60
+        index, on_node = _snap(minutes, 1.0)
+        inside = (minutes >= 1) & (minutes <= self.max_duration_minutes)
+
+        def off_node():
+            log_d = np.log(d)
+            interpolated = np.exp(np.where(
+                minutes < CD_BRANCH_MINUTES,
+                np.interp(log_d, self._log_d_short, self._log_cd_short),
+                np.interp(log_d, self._log_d_long, self._log_cd_long)
+            ))
+            return np.where(inside, interpolated, _CD_array(d))
+
+        return _lookup(self._cd_nodes, index, on_node & inside, off_node)
+
+    def CA(self, Ac, d, exact: bool = None) -> np.ndarray:
+        """Factor por área Ac [km²] y duración d [h] (Ac >= 0, d > 0, sin validar)"""
+        Ac = np.asarray(Ac, dtype=np.float64)
+        d = np.asarray(d, dtype=np.float64)
+        if self._use_exact(exact):
+            return 1.0 - _CA_duration_term(d) * _CA_area_term(Ac)
+
+        # Término de duración: potencia pura, nodo o fórmula
+        index, on_node = _snap(d * 60, 1.0)
+        inside = (index >= 1) & (index <= self.max_duration_minutes)
+        duration_term = _lookup(
+            self._duration_term_nodes, index, on_node & inside, lambda: _CA_duration_term(d)
+        )
+
+        return 1.0 - duration_term * self._area_term(Ac)
+
+    def _area_term(self, Ac: np.ndarray) -> np.ndarray:
+        """Término de área de CA: nodo, interpolación lineal o fórmula fuera de rango"""
+        index, on_node = _snap(Ac, self.area_step_km2)
+        inside = Ac <= self.max_area_km2
+
+        def off_node():
+            interpolated = np.interp(Ac, self._areas, self._area_term_nodes)
+            return np.where(inside, interpolated, _CA_area_term(Ac))
+
+        return _lookup(self._area_term_nodes, index, on_node & inside, off_node)
+
+    def _use_exact(self, exact: Optional[bool]) -> bool:
+        return self.exact if exact is None else exact
+
+    def intensity(
+        self,
+        P3_10: Union[float, np.ndarray],
+        Tr: Union[float, np.ndarray],
+        d: Union[float, np.ndarray],
+        Ac: Optional[Union[float, np.ndarray]] = None,
+        exact: bool = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Igual que calculate_intensity_idf_array() pero con los factores de la tabla.
+
+        Args:
+            exact: Evaluar las fórmulas (None = self.exact)
+        """
+        if self._use_exact(exact):
+            return calculate_intensity_idf_array(P3_10, Tr, d, Ac)
+
+        P3_10, Tr, d, Ac = _validate_idf_arrays(P3_10, Tr, d, Ac)
+        CT = self.CT(Tr)
+        CD = self.CD(d)
+        CA = np.ones_like(d) if Ac is None else self.CA(Ac, d)
+        return _idf_arrays(P3_10, CT, CD, CA, d)
+
+    def intensity_steps(
+        self,
+        P3_10: Union[float, np.ndarray],
+        Tr: Union[float, np.ndarray],
+        time_step_minutes: float,
+        num_intervals: int,
+        Ac: Optional[Union[float, np.ndarray]] = None,
+        exact: bool = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        intensity() para las duraciones Δt, 2Δt, ..., nΔt (eje final).
+
+        Con Δt entero en minutos las duraciones son nodos de la tabla y CD
+        y el término de duración de CA se toman como una vista con paso Δt
+        de los nodos, sin ubicar cada duración en la grilla. Otros Δt (o
+        nΔt fuera de la tabla) pasan por intensity().
+
+        Args:
+            time_step_minutes: Paso de tiempo Δt [min]
+            num_intervals: Número de duraciones n
+            exact: Evaluar las fórmulas (None = self.exact)
+        """
+        d = np.arange(1, num_intervals + 1) * (time_step_minutes / 60)
+        step = float(time_step_minutes)
+        if (self._use_exact(exact) or not step.is_integer()
+                or step * num_intervals > self.max_duration_minutes):
+            return self.intensity(P3_10, Tr, d, Ac, exact)
+
+        P3_10, Tr, d, Ac = _validate_idf_arrays(P3_10, Tr, d, Ac)
+        nodes = slice(int(step), int(step) * num_intervals + 1, int(step))
+        CT = self.CT(Tr)
+        CD = self._cd_nodes[nodes]
+        CA = np.ones_like(d) if Ac is None else 1.0 - self._duration_term_nodes[nodes] * self._area_term(Ac)
+        return _idf_arrays(P3_10, CT, CD, CA, d)
+
+    def nbytes(self) -> int:
+        """Memoria ocupada por las grillas [bytes]"""
+        return sum(
+            value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray)
+        )
+
+
+@lru_cache(maxsize=1)
+def get_idf_table() -> IDFTable:
+    """Tabla IDF compartida por el proceso (se construye en el primer uso)"""
+    return IDFTable()
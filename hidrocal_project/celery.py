@@ -0,0 +1,19 @@
+"""
+Celery app de hidrocal_project.
+
+Las tareas se descubren en el módulo tasks.py de cada app y la
+configuración se toma de los settings con prefijo CELERY_.
+
+Worker:
+    celery -A hidrocal_project worker -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hidrocal_project.settings')
+
+app = Celery('hidrocal_project')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -251,6 +251,25 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
+# ===== HYDROLOGY CALCULATION SETTINGS =====
+# Procesos para barridos de escenarios en paralelo (0 = un proceso por CPU)
+HYDROLOGY_MAX_WORKERS = config('HYDROLOGY_MAX_WORKERS', default=0, cast=int)
+
+# Tabla IDF precalculada (calculators.services.idf_table): True = evaluar siempre las fórmulas
+IDF_TABLE_EXACT = config('IDF_TABLE_EXACT', default=False, cast=bool)
+
+# Caché de resultados de calculate_hydrograph() (hydrology.services.result_cache):
+# nivel en proceso acotado por entradas/bytes + alias de CACHES como backend compartido
+HYDROGRAPH_RESULT_CACHE = {
+    'ALIAS': config('HYDROGRAPH_CACHE_ALIAS', default='default'),
+    'MAX_ENTRIES': config('HYDROGRAPH_CACHE_MAX_ENTRIES', default=256, cast=int),
+    'MAX_BYTES': config('HYDROGRAPH_CACHE_MAX_BYTES', default=64 * 1024 * 1024, cast=int),
+    'TIMEOUT': config('HYDROGRAPH_CACHE_TIMEOUT', default=24 * 3600, cast=int),
+}
+
+# Registros de pluviógrafos (hydrology.services.gauge_store): un archivo .npy por pluviógrafo
+RAINFALL_STORE_ROOT = config('RAINFALL_STORE_ROOT', default=str(BASE_DIR / 'rainfall_store'))
+
 # ===== LOGGING =====
 LOGGING = {
     'version': 1,
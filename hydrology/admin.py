@@ -3,7 +3,9 @@ Django Admin Configuration para Hydrology Models
 """
 
 from django.contrib import admin
-from .models import DesignStorm, Hydrograph, RainfallData
+from .models import DesignStorm, Hydrograph, RainfallData, RainfallGauge
+from .models.rainfall_gauge import GAUGE_RECORD_FIELDS
+from .services.rainfall_codec import rainfall_header
 
 
 @admin.register(DesignStorm)
@@ -42,7 +44,9 @@ class HydrographAdmin(admin.ModelAdmin):
     list_display = ['name', 'design_storm', 'method', 'peak_discharge_m3s', 'time_to_peak_minutes', 'created_at']
     list_filter = ['method', 'created_at']
     search_fields = ['name', 'notes', 'design_storm__name']
-    readonly_fields = ['created_at', 'updated_at', 'peak_discharge_lps_calculated', 'time_to_peak_hours']
+    readonly_fields = [
+        'created_at', 'updated_at', 'peak_discharge_lps_calculated', 'time_to_peak_hours', 'series_storage'
+    ]
 
     fieldsets = (
         ('Información Básica', {
@@ -55,8 +59,8 @@ class HydrographAdmin(admin.ModelAdmin):
             'fields': ('total_runoff_mm', 'total_runoff_m3', 'volume_hm3')
         }),
         ('Serie Temporal', {
-            'fields': ('hydrograph_data',),
-            'description': 'Serie temporal del hidrograma en formato JSON'
+            'fields': ('series_storage', 'hydrograph_data'),
+            'description': 'Serie temporal del hidrograma (columnar; JSON asignado se convierte al guardar)'
         }),
         ('Metadata de Cálculo', {
             'fields': ('rainfall_excess_mm', 'infiltration_total_mm', 'notes'),
@@ -68,6 +72,17 @@ class HydrographAdmin(admin.ModelAdmin):
         }),
     )
 
+    @admin.display(description='Almacenamiento de la serie')
+    def series_storage(self, obj):
+        """Puntos, Δt y tamaño de la serie almacenada"""
+        series = obj.series
+        if series is None:
+            return '-'
+        if not obj.hydrograph_columns:
+            return f"{len(series)} puntos (JSON, sin convertir)"
+        time_step = f"Δt = {series.time_step:g} min" if series.time_step > 0 else "tiempo irregular"
+        return f"{len(series)} puntos, {time_step}, {len(obj.hydrograph_columns) / 1024:.1f} KB (columnar)"
+
 
 @admin.register(RainfallData)
 class RainfallDataAdmin(admin.ModelAdmin):
@@ -75,7 +90,7 @@ class RainfallDataAdmin(admin.ModelAdmin):
     list_display = ['event_date', 'watershed', 'total_rainfall_mm', 'return_period_years', 'duration_hours', 'source']
     list_filter = ['event_date', 'source', 'watershed']
     search_fields = ['notes', 'watershed__name', 'source']
-    readonly_fields = ['created_at']
+    readonly_fields = ['created_at', 'series_storage', 'gauge', 'gauge_offset', 'gauge_length']
 
     fieldsets = (
         ('Información del Evento', {
@@ -85,11 +100,76 @@ class RainfallDataAdmin(admin.ModelAdmin):
             'fields': ('total_rainfall_mm', 'duration_hours', 'return_period_years')
         }),
         ('Serie Temporal', {
-            'fields': ('rainfall_series',),
-            'description': 'Serie temporal de lluvia en formato JSON'
+            'fields': (
+                'series_storage', 'rainfall_series', 'gauge', 'gauge_offset', 'gauge_length', 'observed_discharge'
+            ),
+            'description': 'Serie temporal de lluvia (codificada; JSON asignado se convierte al guardar) '
+                           'y caudal observado en formato JSON'
         }),
         ('Notas', {
             'fields': ('notes', 'created_at'),
             'classes': ('collapse',)
         }),
     )
+
+    @admin.display(description='Almacenamiento de la serie')
+    def series_storage(self, obj):
+        """Intervalos, Δt y tamaño de la serie almacenada"""
+        if obj.gauge_offset is not None:
+            return (
+                f"{obj.gauge_length} intervalos, Δt = {obj.gauge.time_step_minutes:g} min "
+                f"(registro de {obj.gauge.code} desde el intervalo {obj.gauge_offset})"
+            )
+        if obj.rainfall_encoded:
+            header = rainfall_header(obj.rainfall_encoded)
+            return (
+                f"{header.length} intervalos, Δt = {header.time_step_minutes:g} min, "
+                f"{len(obj.rainfall_encoded) / 1024:.1f} KB (codificada)"
+            )
+        if obj.rainfall_series:
+            return f"{len(obj.rainfall_series)} puntos (JSON, paso irregular o sin convertir)"
+        return '-'
+
+
+@admin.register(RainfallGauge)
+class RainfallGaugeAdmin(admin.ModelAdmin):
+    """Admin para pluviógrafos"""
+    list_display = ['code', 'name', 'watershed', 'start_time', 'time_step_minutes', 'source']
+    list_filter = ['source', 'watershed']
+    search_fields = ['code', 'name', 'watershed__name']
+    readonly_fields = ['created_at', 'record_storage']
+
+    fieldsets = (
+        ('Información del Pluviógrafo', {
+            'fields': ('watershed', 'code', 'name', 'source')
+        }),
+        ('Registro', {
+            'fields': ('start_time', 'time_step_minutes', 'record_storage'),
+            'description': 'La serie se guarda en disco (RAINFALL_STORE_ROOT/<código>.npy), solo con agregados'
+        }),
+        ('Notas', {
+            'fields': ('created_at',),
+            'classes': ('collapse',)
+        }),
+    )
+
+    def get_readonly_fields(self, request, obj=None):
+        """Con datos en disco, código, inicio y Δt no se editan (reinterpretarían el registro)"""
+        readonly = super().get_readonly_fields(request, obj)
+        if obj is not None and obj.length > 0:
+            return [*readonly, *GAUGE_RECORD_FIELDS]
+        return readonly
+
+    def delete_queryset(self, request, queryset):
+        """Borrado uno a uno: cada pluviógrafo borra su archivo"""
+        for gauge in queryset:
+            gauge.delete()
+
+    @admin.display(description='Registro en disco')
+    def record_storage(self, obj):
+        """Intervalos guardados, período cubierto y tamaño del archivo"""
+        if not obj.pk or not obj.store.exists(obj.code):
+            return '-'
+        length = obj.length
+        size = obj.store.path(obj.code).stat().st_size
+        return f"{length} intervalos hasta {obj.end_time:%Y-%m-%d %H:%M}, {size / 1024 ** 2:.1f} MB"
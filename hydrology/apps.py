@@ -1,6 +1,21 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.cache import caches
+
+from hydrology.services.result_cache import configure_result_cache
 
 
 class HydrologyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hydrology'
+
+    def ready(self):
+        """Conecta la caché de resultados de hidrogramas al backend de CACHES"""
+        options = getattr(settings, 'HYDROGRAPH_RESULT_CACHE', {})
+        alias = options.get('ALIAS')
+        configure_result_cache(
+            backend=caches[alias] if alias else None,
+            max_entries=options.get('MAX_ENTRIES', 256),
+            max_bytes=options.get('MAX_BYTES', 64 * 1024 * 1024),
+            timeout=options.get('TIMEOUT')
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hydrology', '0002_designstorm_peak_position_ratio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rainfalldata',
+            name='observed_discharge',
+            field=models.JSONField(blank=True, help_text='Caudal observado: [{time_min, discharge_m3s}, ...] (para calibración)', null=True),
+        ),
+    ]
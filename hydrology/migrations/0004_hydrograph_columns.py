@@ -0,0 +1,124 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:59
+
+import struct
+import zlib
+
+import numpy as np
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+
+# Copia congelada del formato columnar v1 (hydrology.services.columnar): la
+# migración no depende del módulo vivo. Las filas existentes se guardan en
+# float64 para no perder precisión (p. ej. en cumulative_volume_m3).
+_HEADER = struct.Struct('<4sBBBBIdd')
+_NAMES_LENGTH = struct.Struct('<H')
+_MAGIC = b'HCOL'
+_ZLIB = 1
+_TIME_KEY = 'time_min'
+
+
+def _pack_records(records):
+    """Empaqueta [{time_min, columna: valor, ...}] en float64; None si no se puede"""
+    keys = list(records[0])
+    if _TIME_KEY not in keys or any(set(point) != set(keys) for point in records):
+        return None
+    names = [_TIME_KEY, *(key for key in keys if key != _TIME_KEY)]
+    try:
+        values = np.array([[point[key] for key in names] for point in records], dtype='<f8').T
+    except (TypeError, ValueError):
+        return None
+
+    time = values[0]
+    time_step = time[1] - time[0] if len(time) > 1 else 0.0
+    regular = time_step > 0 and np.allclose(
+        time, time[0] + np.arange(len(time)) * time_step, rtol=0, atol=1e-6 * time_step
+    )
+    start, data = (float(time[0]), values[1:]) if regular else (0.0, values)
+    encoded_names = ','.join(names).encode()
+    return b''.join((
+        _HEADER.pack(_MAGIC, 1, _ZLIB, 8, len(data), len(time), start, float(time_step) if regular else 0.0),
+        _NAMES_LENGTH.pack(len(encoded_names)),
+        encoded_names,
+        zlib.compress(np.ascontiguousarray(data).tobytes(), 6),
+    ))
+
+
+def _unpack_records(data):
+    """Lista de puntos desde el formato columnar v1 (float32 o float64)"""
+    buffer = bytes(data)
+    magic, _, compression, itemsize, num_columns, length, start, time_step = _HEADER.unpack_from(buffer)
+    if magic != _MAGIC:
+        raise ValueError("Los datos no tienen formato columnar (magic inválido)")
+    offset = _HEADER.size
+    (names_length,) = _NAMES_LENGTH.unpack_from(buffer, offset)
+    offset += _NAMES_LENGTH.size
+    names = buffer[offset:offset + names_length].decode().split(',')
+    payload = buffer[offset + names_length:]
+    if compression == _ZLIB:
+        payload = zlib.decompress(payload)
+
+    dtype = '<f4' if itemsize == 4 else '<f8'
+    values = np.frombuffer(payload, dtype=dtype).reshape(num_columns, length)
+    if time_step > 0:
+        values = np.vstack([start + np.arange(length) * time_step, values])
+    # float32 con su representación más corta (0.1, no 0.10000000149)
+    columns = [
+        column.astype(str).astype(np.float64).tolist() if column.dtype == np.float32 else column.tolist()
+        for column in values
+    ]
+    return [dict(zip(names, point)) for point in zip(*columns)]
+
+
+def pack_hydrograph_data(apps, schema_editor):
+    """Convierte hydrograph_data (JSON) a hydrograph_columns (las filas no convertibles quedan en JSON)"""
+    Hydrograph = apps.get_model('hydrology', 'Hydrograph')
+    batch = []
+    for hydrograph in Hydrograph.objects.filter(hydrograph_data__isnull=False).iterator(chunk_size=BATCH_SIZE):
+        if hydrograph.hydrograph_data:
+            columns = _pack_records(hydrograph.hydrograph_data)
+            if columns is None:
+                continue
+            hydrograph.hydrograph_columns = columns
+        hydrograph.hydrograph_data = None
+        batch.append(hydrograph)
+        if len(batch) == BATCH_SIZE:
+            Hydrograph.objects.bulk_update(batch, ['hydrograph_columns', 'hydrograph_data'])
+            batch = []
+    Hydrograph.objects.bulk_update(batch, ['hydrograph_columns', 'hydrograph_data'])
+
+
+def unpack_hydrograph_columns(apps, schema_editor):
+    """Vuelve a escribir hydrograph_data (JSON) desde hydrograph_columns"""
+    Hydrograph = apps.get_model('hydrology', 'Hydrograph')
+    batch = []
+    for hydrograph in Hydrograph.objects.filter(hydrograph_data__isnull=True).iterator(chunk_size=BATCH_SIZE):
+        columns = hydrograph.hydrograph_columns
+        hydrograph.hydrograph_data = _unpack_records(columns) if columns else []
+        batch.append(hydrograph)
+        if len(batch) == BATCH_SIZE:
+            Hydrograph.objects.bulk_update(batch, ['hydrograph_data'])
+            batch = []
+    Hydrograph.objects.bulk_update(batch, ['hydrograph_data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hydrology', '0003_rainfalldata_observed_discharge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hydrograph',
+            name='hydrograph_columns',
+            field=models.BinaryField(blank=True, help_text='Serie temporal del hidrograma en columnas binarias comprimidas', null=True),
+        ),
+        migrations.AlterField(
+            model_name='hydrograph',
+            name='hydrograph_data',
+            field=models.JSONField(blank=True, help_text='Serie temporal del hidrograma: [{time_min, discharge_m3s, cumulative_volume_m3}, ...]', null=True),
+        ),
+        migrations.RunPython(pack_hydrograph_data, unpack_hydrograph_columns),
+    ]
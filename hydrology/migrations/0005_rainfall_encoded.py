@@ -0,0 +1,170 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:03
+
+import struct
+import zlib
+
+import numpy as np
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+
+# Copia congelada de la codificación de lluvia v2 (hydrology.services.rainfall_codec):
+# la migración no depende del módulo vivo.
+_HEADER = struct.Struct('<4sBdddqII')
+_BLOCK_INDEX = struct.Struct('<Iq')
+_BLOCK_WIDTH = struct.Struct('<B')
+_MAGIC = b'HRNF'
+_VERSION = 2
+_QUANTUM_MM_H = 0.001
+_QUANTUM_SCALE = 1_000_000
+_BLOCK_SIZE = 4096
+_CONSISTENCY_TOLERANCE_MM = 0.001
+_UNSIGNED_BY_WIDTH = {1: '<u1', 2: '<u2', 4: '<u4', 8: '<u8'}
+
+
+def _decimal_resolution(values):
+    """Resolución decimal de los valores (10⁻ᵈ, d <= 6), 0 si tienen más decimales"""
+    for decimals in range(7):
+        scaled = values * 10 ** decimals
+        if np.allclose(scaled, np.rint(scaled), rtol=0, atol=1e-6):
+            return 10.0 ** -decimals
+    return 0.0
+
+
+def _encode_records(records):
+    """Codifica [{time_min, intensity_mm_h, cumulative_mm}]; None si debe quedar en JSON"""
+    if len(records) < 2 or any('time_min' not in point for point in records):
+        return None
+    times = np.array([point['time_min'] for point in records], dtype=np.float64)
+    time_step = times[1] - times[0]
+    regular = time_step > 0 and np.allclose(
+        times, times[0] + np.arange(len(times)) * time_step, rtol=0, atol=1e-6 * time_step
+    )
+    if not regular:
+        return None
+
+    intensity = (
+        np.array([point['intensity_mm_h'] for point in records], dtype=np.float64)
+        if all('intensity_mm_h' in point for point in records) else None
+    )
+    cumulative = (
+        np.array([point['cumulative_mm'] for point in records], dtype=np.float64)
+        if all('cumulative_mm' in point for point in records) else None
+    )
+    if intensity is None and cumulative is None:
+        return None
+    if intensity is None:
+        intensity = np.diff(cumulative, prepend=0.0) * 60 / time_step
+    if np.any(intensity < 0) or not np.all(np.isfinite(intensity)):
+        return None
+
+    quantized = np.rint(intensity / _QUANTUM_MM_H).astype(np.int64)
+    initial = 0.0
+    if cumulative is not None:
+        # Intensidades sin cuantizar contra la acumulada, salvo el redondeo de cumulative_mm
+        depths = intensity * time_step / 60
+        initial = cumulative[0] - depths[0]
+        tolerance = max(_CONSISTENCY_TOLERANCE_MM, _decimal_resolution(cumulative))
+        if not np.allclose(cumulative, initial + np.cumsum(depths), rtol=1e-9, atol=tolerance):
+            return None
+
+    preceding = np.concatenate([[0], np.cumsum(quantized)])
+    index, blocks, offset = [], [], 0
+    for first in range(0, len(quantized), _BLOCK_SIZE):
+        deltas = np.diff(quantized[first:first + _BLOCK_SIZE], prepend=0)
+        zigzag = ((deltas << 1) ^ (deltas >> 63)).astype(np.uint64)
+        width = next(width for width in (1, 2, 4, 8) if zigzag.max() < 1 << (8 * width))
+        data = _BLOCK_WIDTH.pack(width) + zlib.compress(zigzag.astype(_UNSIGNED_BY_WIDTH[width]).tobytes(), 6)
+        index.append(_BLOCK_INDEX.pack(offset, preceding[first]))
+        blocks.append(data)
+        offset += len(data)
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, float(times[0] - time_step), float(time_step), float(initial),
+        round(_QUANTUM_MM_H * _QUANTUM_SCALE), len(quantized), _BLOCK_SIZE
+    )
+    return b''.join([header, *index, *blocks])
+
+
+def _decode_records(data):
+    """Lista de puntos {time_min, intensity_mm_h, cumulative_mm} desde la codificación v2"""
+    buffer = bytes(data)
+    magic, version, start, time_step, initial, quantum_scaled, length, block_size = _HEADER.unpack_from(buffer)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Registro de lluvia codificado no soportado: {magic!r} v{version}")
+    num_blocks = -(-length // block_size)
+    blocks_offset = _HEADER.size + num_blocks * _BLOCK_INDEX.size
+    offsets = [_BLOCK_INDEX.unpack_from(buffer, _HEADER.size + k * _BLOCK_INDEX.size)[0] for k in range(num_blocks)]
+    offsets.append(len(buffer) - blocks_offset)
+
+    quantized = []
+    for begin, end in zip(offsets[:-1], offsets[1:]):
+        chunk = buffer[blocks_offset + begin:blocks_offset + end]
+        (width,) = _BLOCK_WIDTH.unpack_from(chunk)
+        zigzag = np.frombuffer(zlib.decompress(chunk[_BLOCK_WIDTH.size:]), dtype=_UNSIGNED_BY_WIDTH[width])
+        zigzag = zigzag.astype(np.int64)
+        quantized.append(np.cumsum((zigzag >> 1) ^ -(zigzag & 1)))
+
+    depths = np.concatenate(quantized) * (quantum_scaled / _QUANTUM_SCALE) * time_step / 60
+    time = start + np.arange(1, length + 1) * time_step
+    intensity = np.round(depths * 60 / time_step, 6)
+    cumulative = np.round(initial + np.cumsum(depths), 6)
+    return [
+        {'time_min': t, 'intensity_mm_h': i, 'cumulative_mm': c}
+        for t, i, c in zip(time.tolist(), intensity.tolist(), cumulative.tolist())
+    ]
+
+
+def encode_rainfall_series(apps, schema_editor):
+    """Convierte rainfall_series (JSON) a rainfall_encoded; las series irregulares quedan en JSON"""
+    RainfallData = apps.get_model('hydrology', 'RainfallData')
+    batch = []
+    for rain in RainfallData.objects.filter(rainfall_series__isnull=False).iterator(chunk_size=BATCH_SIZE):
+        try:
+            data = _encode_records(rain.rainfall_series) if rain.rainfall_series else None
+        except (TypeError, ValueError):
+            data = None  # Serie con formato no reconocido: se conserva en JSON
+        if data is None:
+            continue
+        rain.rainfall_encoded = data
+        rain.rainfall_series = None
+        batch.append(rain)
+        if len(batch) == BATCH_SIZE:
+            RainfallData.objects.bulk_update(batch, ['rainfall_encoded', 'rainfall_series'])
+            batch = []
+    RainfallData.objects.bulk_update(batch, ['rainfall_encoded', 'rainfall_series'])
+
+
+def decode_rainfall_encoded(apps, schema_editor):
+    """Vuelve a escribir rainfall_series (JSON) desde rainfall_encoded"""
+    RainfallData = apps.get_model('hydrology', 'RainfallData')
+    batch = []
+    for rain in RainfallData.objects.filter(rainfall_series__isnull=True).iterator(chunk_size=BATCH_SIZE):
+        data = rain.rainfall_encoded
+        rain.rainfall_series = _decode_records(data) if data else []
+        batch.append(rain)
+        if len(batch) == BATCH_SIZE:
+            RainfallData.objects.bulk_update(batch, ['rainfall_series'])
+            batch = []
+    RainfallData.objects.bulk_update(batch, ['rainfall_series'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hydrology', '0004_hydrograph_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rainfalldata',
+            name='rainfall_encoded',
+            field=models.BinaryField(blank=True, help_text='Serie temporal de lluvia codificada (delta cuantizado por bloques)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='rainfalldata',
+            name='rainfall_series',
+            field=models.JSONField(blank=True, help_text='Serie temporal de lluvia: [{time_min, intensity_mm_h, cumulative_mm}, ...]', null=True),
+        ),
+        migrations.RunPython(encode_rainfall_series, decode_rainfall_encoded),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:06
+
+import django.core.validators
+import django.db.models.deletion
+import re
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hydrology', '0005_rainfall_encoded'),
+        ('watersheds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rainfalldata',
+            name='gauge_length',
+            field=models.BigIntegerField(blank=True, help_text='Cantidad de intervalos del evento en el registro del pluviógrafo', null=True),
+        ),
+        migrations.AddField(
+            model_name='rainfalldata',
+            name='gauge_offset',
+            field=models.BigIntegerField(blank=True, help_text='Primer intervalo del evento en el registro del pluviógrafo', null=True),
+        ),
+        migrations.CreateModel(
+            name='RainfallGauge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(help_text='Código del pluviógrafo (nombre del archivo del registro)', max_length=64, unique=True, validators=[django.core.validators.RegexValidator(re.compile('^[A-Za-z0-9][A-Za-z0-9_.-]*$'))])),
+                ('name', models.CharField(blank=True, help_text='Nombre o ubicación del pluviógrafo', max_length=255, null=True)),
+                ('start_time', models.DateTimeField(help_text='Inicio del primer intervalo del registro')),
+                ('time_step_minutes', models.FloatField(help_text='Paso de tiempo del registro en minutos', validators=[django.core.validators.MinValueValidator(0.01)])),
+                ('source', models.CharField(blank=True, help_text='Fuente de datos (DNM, IMFIA, sensor local, etc.)', max_length=100, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Fecha de registro')),
+                ('watershed', models.ForeignKey(help_text='Cuenca donde está el pluviógrafo', on_delete=django.db.models.deletion.CASCADE, related_name='rain_gauges', to='watersheds.watershed')),
+            ],
+            options={
+                'verbose_name': 'Pluviógrafo',
+                'verbose_name_plural': 'Pluviógrafos',
+                'ordering': ['code'],
+            },
+        ),
+        migrations.AddField(
+            model_name='rainfalldata',
+            name='gauge',
+            field=models.ForeignKey(blank=True, help_text='Pluviógrafo cuyo registro contiene la serie', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='hydrology.rainfallgauge'),
+        ),
+    ]
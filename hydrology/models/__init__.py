@@ -7,9 +7,11 @@ Modelos hidrológicos para análisis de tormentas y caudales.
 from .design_storm import DesignStorm
 from .hydrograph import Hydrograph
 from .rainfall_data import RainfallData
+from .rainfall_gauge import RainfallGauge
 
 __all__ = [
     'DesignStorm',
     'Hydrograph',
     'RainfallData',
+    'RainfallGauge',
 ]
@@ -2,8 +2,11 @@
 Hydrograph Model - Hidrograma
 """
 
+from typing import Dict, List, Optional
+
 from django.db import models
 from .design_storm import DesignStorm
+from hydrology.services.columnar import ColumnarSeries, pack_records, unpack_columns
 
 
 class Hydrograph(models.Model):
@@ -72,9 +75,20 @@ class Hydrograph(models.Model):
         help_text="Volumen total en hm³"
     )
 
-    # Serie temporal del hidrograma (JSON)
+    # Serie temporal del hidrograma (formato columnar, ver hydrology.services.columnar)
+    # discharge_m3s y cumulative_volume_m3 en float32 comprimidos; tiempo = inicio + k·Δt
+    hydrograph_columns = models.BinaryField(
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Serie temporal del hidrograma en columnas binarias comprimidas"
+    )
+
+    # Serie temporal en el formato anterior (JSON); al guardar se convierte a hydrograph_columns
     # Array de: {time_min, discharge_m3s, cumulative_volume_m3}
     hydrograph_data = models.JSONField(
+        blank=True,
+        null=True,
         help_text="Serie temporal del hidrograma: [{time_min, discharge_m3s, cumulative_volume_m3}, ...]"
     )
 
@@ -112,6 +126,15 @@ class Hydrograph(models.Model):
             models.Index(fields=['design_storm', 'method']),
         ]
 
+    def save(self, *args, **kwargs):
+        """Guarda la serie en formato columnar (convierte hydrograph_data si se asignó)"""
+        if self.hydrograph_data:
+            self.records = self.hydrograph_data
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'hydrograph_data' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'hydrograph_columns'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name or 'Hidrograma'} - {self.method} (Q={self.peak_discharge_m3s:.2f} m³/s)"
 
@@ -128,3 +151,23 @@ class Hydrograph(models.Model):
         if self.time_to_peak_minutes:
             return self.time_to_peak_minutes / 60
         return None
+
+    @property
+    def series(self) -> Optional[ColumnarSeries]:
+        """Serie como columnas de NumPy (vistas sobre el buffer, sin recorrer los puntos)"""
+        if self.hydrograph_columns:
+            return unpack_columns(self.hydrograph_columns)
+        if self.hydrograph_data:
+            return unpack_columns(pack_records(self.hydrograph_data, dtype='float64', compression='none'))
+        return None
+
+    @property
+    def records(self) -> List[Dict]:
+        """Serie como lista de puntos {time_min, discharge_m3s, cumulative_volume_m3}"""
+        series = self.series
+        return series.to_records() if series is not None else []
+
+    @records.setter
+    def records(self, value: List[Dict]) -> None:
+        self.hydrograph_columns = pack_records(value) if value else None
+        self.hydrograph_data = None
@@ -2,8 +2,19 @@
 RainfallData Model - Datos de Lluvia Observados
 """
 
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
 from django.db import models
 from watersheds.models import Watershed
+from hydrology.services.rainfall_codec import (
+    RainfallRecord,
+    decode_rainfall,
+    decode_rainfall_window,
+    encode_rainfall_records,
+    quantize_intensity,
+)
 
 
 class RainfallData(models.Model):
@@ -35,12 +46,53 @@ class RainfallData(models.Model):
         help_text="Lluvia total en mm"
     )
 
-    # Serie de intensidades (JSON)
+    # Serie de lluvia codificada (ver hydrology.services.rainfall_codec)
+    # Inicio, Δt, acumulada inicial e intensidades cuantizadas (delta entre intervalos), en bloques comprimidos
+    rainfall_encoded = models.BinaryField(
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Serie temporal de lluvia codificada (delta cuantizado por bloques)"
+    )
+
+    # Serie de intensidades en el formato anterior (JSON); al guardar se convierte a
+    # rainfall_encoded si el paso de tiempo es constante (las series irregulares quedan en JSON)
     # Array de: {time_min, intensity_mm_h, cumulative_mm}
     rainfall_series = models.JSONField(
+        blank=True,
+        null=True,
         help_text="Serie temporal de lluvia: [{time_min, intensity_mm_h, cumulative_mm}, ...]"
     )
 
+    # Serie en el registro de un pluviógrafo (archivo en disco, ver RainfallGauge):
+    # la fila guarda solo el desplazamiento y la cantidad de intervalos
+    gauge = models.ForeignKey(
+        'RainfallGauge',
+        on_delete=models.CASCADE,
+        related_name='events',
+        blank=True,
+        null=True,
+        help_text="Pluviógrafo cuyo registro contiene la serie"
+    )
+    gauge_offset = models.BigIntegerField(
+        blank=True,
+        null=True,
+        help_text="Primer intervalo del evento en el registro del pluviógrafo"
+    )
+    gauge_length = models.BigIntegerField(
+        blank=True,
+        null=True,
+        help_text="Cantidad de intervalos del evento en el registro del pluviógrafo"
+    )
+
+    # Hidrograma observado en el cierre de la cuenca (JSON, opcional)
+    # Array de: {time_min, discharge_m3s}, con el mismo origen de tiempo que rainfall_series
+    observed_discharge = models.JSONField(
+        blank=True,
+        null=True,
+        help_text="Caudal observado: [{time_min, discharge_m3s}, ...] (para calibración)"
+    )
+
     source = models.CharField(
         max_length=100,
         blank=True,
@@ -66,5 +118,85 @@ class RainfallData(models.Model):
             models.Index(fields=['watershed', 'event_date']),
         ]
 
+    def save(self, *args, **kwargs):
+        """Guarda la serie codificada (convierte rainfall_series si se asignó y es regular)"""
+        if self.rainfall_series and self.gauge_offset is None:
+            self.records = self.rainfall_series
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'rainfall_series' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'rainfall_encoded'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Lluvia {self.event_date} - {self.total_rainfall_mm}mm"
+
+    def _gauge_record(self, start: int = 0, stop: int = None) -> RainfallRecord:
+        """
+        Intervalos [start, stop) del evento leídos del registro del pluviógrafo.
+
+        Se leen solo esos intervalos del memmap; las intensidades (float32 en
+        disco) se redondean a la resolución de la codificación de lluvia.
+        """
+        stop = self.gauge_length if stop is None else min(stop, self.gauge_length)
+        start = min(max(start, 0), stop)
+        offset = self.gauge_offset
+        time_step = self.gauge.time_step_minutes
+
+        def depths(first, last):
+            intensity = self.gauge.depths(first, last).astype(np.float64) * (60 / time_step)
+            return quantize_intensity(intensity) * (time_step / 60)
+
+        return RainfallRecord(
+            depths_mm=depths(offset + start, offset + stop),
+            start_min=start * time_step,
+            time_step_minutes=time_step,
+            initial_cumulative_mm=float(depths(offset, offset + start).sum())
+        )
+
+    @property
+    def rainfall(self) -> Optional[RainfallRecord]:
+        """Serie como láminas por intervalo en NumPy (None si no hay serie o es irregular)"""
+        if self.gauge_offset is not None:
+            return self._gauge_record()
+        if self.rainfall_encoded:
+            return decode_rainfall(self.rainfall_encoded)
+        if self.rainfall_series:
+            data = encode_rainfall_records(self.rainfall_series)
+            return decode_rainfall(data) if data is not None else None
+        return None
+
+    def rainfall_window(self, start_min: float = None, end_min: float = None) -> Optional[RainfallRecord]:
+        """
+        Intervalos que se solapan con [start_min, end_min) [min].
+
+        Sobre la serie codificada solo se descomprimen los bloques de la ventana;
+        sobre el registro de un pluviógrafo es una rebanada del memmap.
+        """
+        if self.gauge_offset is not None:
+            time_step = self.gauge.time_step_minutes
+            start = 0 if start_min is None else math.floor(start_min / time_step + 1e-9)
+            stop = None if end_min is None else math.ceil(end_min / time_step - 1e-9)
+            return self._gauge_record(start, stop)
+        if self.rainfall_encoded:
+            return decode_rainfall_window(self.rainfall_encoded, start_min, end_min)
+        if self.rainfall_series:
+            data = encode_rainfall_records(self.rainfall_series)
+            return decode_rainfall_window(data, start_min, end_min) if data is not None else None
+        return None
+
+    @property
+    def records(self) -> List[Dict]:
+        """Serie como lista de puntos {time_min, intensity_mm_h, cumulative_mm}"""
+        if self.gauge_offset is not None:
+            return self._gauge_record().to_records()
+        if self.rainfall_encoded:
+            return decode_rainfall(self.rainfall_encoded).to_records()
+        return self.rainfall_series or []
+
+    @records.setter
+    def records(self, value: List[Dict]) -> None:
+        """Asignar una serie reemplaza la referencia al registro del pluviógrafo"""
+        self.gauge, self.gauge_offset, self.gauge_length = None, None, None
+        data = encode_rainfall_records(value) if value else None
+        self.rainfall_encoded = data
+        self.rainfall_series = value if value and data is None else None
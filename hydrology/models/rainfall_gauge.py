@@ -0,0 +1,201 @@
+"""
+RainfallGauge Model - Pluviógrafo con registro en disco
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, RegexValidator
+from django.db import models
+from watersheds.models import Watershed
+from hydrology.services.continuous import INTER_EVENT_DRY_HOURS
+from hydrology.services.gauge_store import GAUGE_CODE_PATTERN, GaugeStore, find_rainfall_events
+from hydrology.services.rainfall_codec import RainfallRecord
+from .rainfall_data import RainfallData
+
+
+# Campos que interpretan el archivo en disco: no cambian una vez que hay datos
+GAUGE_RECORD_FIELDS = ('code', 'start_time', 'time_step_minutes')
+
+
+class RainfallGauge(models.Model):
+    """
+    Pluviógrafo con registro continuo a paso constante.
+
+    La serie vive en un archivo de solo agregado por pluviógrafo
+    (hydrology.services.gauge_store, en settings.RAINFALL_STORE_ROOT); la
+    base guarda solo los metadatos. El intervalo k cubre
+    [start_time + kΔt, start_time + (k+1)Δt).
+
+    El archivo se identifica por el código: con datos guardados, código,
+    inicio y Δt quedan fijos (GAUGE_RECORD_FIELDS), y borrar el pluviógrafo
+    borra su archivo.
+    """
+
+    watershed = models.ForeignKey(
+        Watershed,
+        on_delete=models.CASCADE,
+        related_name='rain_gauges',
+        db_index=True,
+        help_text="Cuenca donde está el pluviógrafo"
+    )
+
+    code = models.CharField(
+        max_length=64,
+        unique=True,
+        validators=[RegexValidator(GAUGE_CODE_PATTERN)],
+        help_text="Código del pluviógrafo (nombre del archivo del registro)"
+    )
+    name = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Nombre o ubicación del pluviógrafo"
+    )
+    start_time = models.DateTimeField(
+        help_text="Inicio del primer intervalo del registro"
+    )
+    time_step_minutes = models.FloatField(
+        validators=[MinValueValidator(0.01)],
+        help_text="Paso de tiempo del registro en minutos"
+    )
+    source = models.CharField(
+        max_length=100,
+        blank=True,
+        null=True,
+        help_text="Fuente de datos (DNM, IMFIA, sensor local, etc.)"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Fecha de registro"
+    )
+
+    class Meta:
+        ordering = ['code']
+        verbose_name = "Pluviógrafo"
+        verbose_name_plural = "Pluviógrafos"
+
+    def __str__(self):
+        return f"{self.name or self.code} (Δt = {self.time_step_minutes:g} min)"
+
+    def _record_conflicts(self) -> Dict[str, str]:
+        """Cambios que dejarían huérfano o reinterpretarían un registro en disco (por campo)"""
+        if self._state.adding:
+            if GAUGE_CODE_PATTERN.match(self.code or '') and self.store.length(self.code) > 0:
+                return {'code': f"Ya existe un registro en disco para '{self.code}'"}
+            return {}
+        stored = type(self).objects.filter(pk=self.pk).values(*GAUGE_RECORD_FIELDS).first()
+        if stored is None or self.store.length(stored['code']) == 0:
+            return {}
+        return {
+            name: "No se puede modificar: el pluviógrafo ya tiene datos registrados"
+            for name in GAUGE_RECORD_FIELDS if getattr(self, name) != stored[name]
+        }
+
+    def clean(self):
+        conflicts = self._record_conflicts()
+        if conflicts:
+            raise ValidationError(conflicts)
+
+    def save(self, *args, **kwargs):
+        conflicts = self._record_conflicts()
+        if conflicts:
+            raise ValueError(f"Pluviógrafo {self.code}: {conflicts}")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Borra el pluviógrafo, sus eventos y su archivo de registro"""
+        code = self.code
+        result = super().delete(*args, **kwargs)
+        self.store.remove(code)
+        return result
+
+    @property
+    def store(self) -> GaugeStore:
+        return GaugeStore(settings.RAINFALL_STORE_ROOT)
+
+    @property
+    def length(self) -> int:
+        """Intervalos guardados (leído de la cabecera del archivo)"""
+        return self.store.length(self.code)
+
+    @property
+    def end_time(self) -> datetime:
+        """Fin del último intervalo guardado"""
+        return self.time_at(self.length)
+
+    def time_at(self, index: int) -> datetime:
+        """Inicio del intervalo `index`"""
+        return self.start_time + timedelta(minutes=index * self.time_step_minutes)
+
+    def index_at(self, when: datetime) -> int:
+        """Intervalo que contiene el instante `when` (puede quedar fuera del registro)"""
+        return math.floor((when - self.start_time).total_seconds() / 60 / self.time_step_minutes + 1e-9)
+
+    def append(self, depths_mm) -> int:
+        """Agrega láminas [mm] al final del registro; devuelve el índice del primer intervalo agregado"""
+        return self.store.append(self.code, depths_mm)
+
+    def depths(self, start: int = None, stop: int = None) -> np.ndarray:
+        """Láminas [mm] de los intervalos [start, stop) (vista numpy.memmap, sin copiar)"""
+        return self.store.read(self.code, start, stop)
+
+    def window(self, start_time: datetime = None, end_time: datetime = None) -> RainfallRecord:
+        """
+        Intervalos que se solapan con [start_time, end_time).
+
+        start_min del resultado es relativo al inicio del registro.
+        """
+        start = 0 if start_time is None else max(0, self.index_at(start_time))
+        stop = None if end_time is None else max(start, math.ceil(
+            (end_time - self.start_time).total_seconds() / 60 / self.time_step_minutes - 1e-9
+        ))
+        return RainfallRecord(
+            depths_mm=self.depths(start, stop),
+            start_min=start * self.time_step_minutes,
+            time_step_minutes=self.time_step_minutes
+        )
+
+    def extract_event(self, start: int, stop: int, **fields) -> RainfallData:
+        """
+        Evento de lluvia (sin guardar) que referencia los intervalos [start, stop).
+
+        La fila guarda solo el desplazamiento y la cantidad de intervalos.
+        """
+        depths = self.depths(start, stop)
+        if len(depths) == 0:
+            raise ValueError(f"El intervalo [{start}, {stop}) está fuera del registro ({self.length} intervalos)")
+        defaults = dict(
+            watershed_id=self.watershed_id,
+            event_date=self.time_at(start).date(),
+            duration_hours=len(depths) * self.time_step_minutes / 60,
+            total_rainfall_mm=round(float(depths.sum(dtype=np.float64)), 3),
+            source=self.source,
+        )
+        return RainfallData(gauge=self, gauge_offset=start, gauge_length=len(depths), **{**defaults, **fields})
+
+    def extract_events(
+        self,
+        start: int = None,
+        stop: int = None,
+        inter_event_hours: float = INTER_EVENT_DRY_HOURS,
+        min_depth_mm: float = 0.0
+    ) -> List[RainfallData]:
+        """
+        Eventos de lluvia (sin guardar) de los intervalos [start, stop).
+
+        Example:
+            >>> RainfallData.objects.bulk_create(gauge.extract_events(min_depth_mm=10))
+        """
+        first = start or 0
+        return [
+            self.extract_event(first + event_start, first + event_stop)
+            for event_start, event_stop in find_rainfall_events(
+                self.depths(start, stop), self.time_step_minutes, inter_event_hours, min_depth_mm
+            )
+        ]
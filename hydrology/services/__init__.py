@@ -5,12 +5,60 @@ This package contains services for:
 - Hyetograph generation (temporal rainfall distribution)
 - Rainfall excess calculation (runoff)
 - Hydrograph calculation (flow hydrographs)
+- Staged hydrograph pipeline with per-stage fingerprint caches
+- Content-addressed result cache (in-process LRU + Django cache backend)
+- Columnar binary storage of time series (packed, compressed float columns)
+- Compact rainfall record encoding (quantized, delta-encoded, block-sliceable)
+- Append-only, memory-mapped per-gauge rainfall archives on disk
+- Array-based result types (series) shared by all stages
+- Batch evaluation of many scenarios as 2-D arrays
+- Parallel execution of large scenario sweeps across processes
+- Critical storm duration search
+- Channel and reservoir routing (Muskingum, Muskingum-Cunge, Modified Puls)
+- Drainage network model (subbasins, reaches and junctions)
+- Continuous simulation of long rainfall records in fixed-size chunks
+- Monte Carlo uncertainty analysis with Latin hypercube sampling
+- Global sensitivity analysis (Morris screening, Sobol indices)
+- Calibration of C/CN and Tc against observed hydrographs
+- Cached dimensionless and synthetic (Clark, Nash, Snyder) unit hydrographs
 """
 
+from .series import (
+    HyetographSeries,
+    RainfallExcessSeries,
+    HydrographSeries,
+    HydrographResult,
+    RoutedHydrographSeries
+)
+
+from .columnar import (
+    pack_columns,
+    pack_records,
+    unpack_columns,
+    ColumnarSeries
+)
+
+from .rainfall_codec import (
+    encode_rainfall,
+    encode_rainfall_records,
+    decode_rainfall,
+    decode_rainfall_window,
+    rainfall_header,
+    quantize_intensity,
+    RainfallRecord,
+    RainfallHeader
+)
+
+from .gauge_store import (
+    GaugeStore,
+    find_rainfall_events
+)
+
 from .hyetograph import (
     generate_hyetograph,
     generate_hyetograph_uniform,
     generate_hyetograph_alternating_block,
+    generate_hyetograph_series,
     HyetographGenerationError
 )
 
@@ -18,28 +66,220 @@ from .rainfall_excess import (
     calculate_rainfall_excess,
     calculate_rainfall_excess_rational,
     calculate_rainfall_excess_scs,
+    calculate_rainfall_excess_series,
     RainfallExcessError
 )
 
+from .unit_hydrograph import (
+    triangular_unit_hydrograph,
+    scs_dimensionless_unit_hydrograph,
+    clark_unit_hydrograph,
+    nash_unit_hydrograph,
+    snyder_unit_hydrograph,
+    synthetic_unit_hydrograph,
+    stack_unit_hydrographs,
+    unit_hydrograph_cache_info,
+    clear_unit_hydrograph_cache
+)
+
+from .pipeline import (
+    stage_fingerprint,
+    pipeline_cache_info,
+    clear_pipeline_caches,
+    PipelineStage
+)
+
+from .result_cache import (
+    hydrograph_cache_key,
+    configure_result_cache,
+    result_cache_info,
+    clear_result_cache,
+    ResultCache
+)
+
 from .hydrograph_calculator import (
     calculate_hydrograph,
     calculate_hydrograph_rational,
+    calculate_hydrograph_scs,
+    calculate_hydrograph_synthetic,
+    calculate_synthetic_hydrographs_series,
+    calculate_hydrograph_series,
+    cached_hydrograph_series,
+    calculate_default_time_step,
     HydrographCalculationError
 )
 
+from .batch import calculate_hydrographs_batch
+
+from .parallel import calculate_hydrographs_parallel
+
+from .routing import (
+    muskingum_coefficients,
+    route_muskingum,
+    route_muskingum_cunge,
+    route_modified_puls,
+    route_hydrograph,
+    storage_indication_table,
+    StorageIndicationTable
+)
+
+from .network import (
+    DrainageNetwork,
+    NetworkElement,
+    NetworkResult
+)
+
+from .continuous import (
+    ContinuousSimulation,
+    ContinuousChunk,
+    ContinuousSummary,
+    simulate_continuous,
+    continuous_unit_hydrograph,
+    iter_rainfall_chunks,
+    rainfall_event_chunks,
+    rainfall_records_to_depths
+)
+
+from .uncertainty import (
+    run_monte_carlo,
+    evaluate_scenario_samples,
+    latin_hypercube_samples,
+    parameter_distribution,
+    MonteCarloResult
+)
+
+from .sensitivity import (
+    morris_screening,
+    sobol_indices,
+    default_sensitivity_bounds,
+    evaluate_parameter_samples,
+    SensitivityResult
+)
+
+from .calibration import (
+    calibrate_parameters,
+    calibration_event,
+    goodness_of_fit,
+    CalibrationEvent,
+    CalibrationResult
+)
+
+from .critical_duration import (
+    find_critical_duration,
+    CriticalDurationResult
+)
+
 __all__ = [
+    # Series
+    'HyetographSeries',
+    'RainfallExcessSeries',
+    'HydrographSeries',
+    'HydrographResult',
+    'RoutedHydrographSeries',
+    # Columnar storage
+    'pack_columns',
+    'pack_records',
+    'unpack_columns',
+    'ColumnarSeries',
+    # Rainfall codec
+    'encode_rainfall',
+    'encode_rainfall_records',
+    'decode_rainfall',
+    'decode_rainfall_window',
+    'rainfall_header',
+    'quantize_intensity',
+    'RainfallRecord',
+    'RainfallHeader',
+    # Gauge store
+    'GaugeStore',
+    'find_rainfall_events',
     # Hyetograph
     'generate_hyetograph',
     'generate_hyetograph_uniform',
     'generate_hyetograph_alternating_block',
+    'generate_hyetograph_series',
     'HyetographGenerationError',
     # Rainfall Excess
     'calculate_rainfall_excess',
     'calculate_rainfall_excess_rational',
     'calculate_rainfall_excess_scs',
+    'calculate_rainfall_excess_series',
     'RainfallExcessError',
+    # Unit Hydrograph
+    'triangular_unit_hydrograph',
+    'scs_dimensionless_unit_hydrograph',
+    'clark_unit_hydrograph',
+    'nash_unit_hydrograph',
+    'snyder_unit_hydrograph',
+    'synthetic_unit_hydrograph',
+    'stack_unit_hydrographs',
+    'unit_hydrograph_cache_info',
+    'clear_unit_hydrograph_cache',
+    # Pipeline
+    'stage_fingerprint',
+    'pipeline_cache_info',
+    'clear_pipeline_caches',
+    'PipelineStage',
+    # Result cache
+    'hydrograph_cache_key',
+    'configure_result_cache',
+    'result_cache_info',
+    'clear_result_cache',
+    'ResultCache',
     # Hydrograph
     'calculate_hydrograph',
     'calculate_hydrograph_rational',
+    'calculate_hydrograph_scs',
+    'calculate_hydrograph_synthetic',
+    'calculate_synthetic_hydrographs_series',
+    'calculate_hydrograph_series',
+    'cached_hydrograph_series',
+    'calculate_default_time_step',
     'HydrographCalculationError',
+    # Batch
+    'calculate_hydrographs_batch',
+    # Parallel
+    'calculate_hydrographs_parallel',
+    # Routing
+    'muskingum_coefficients',
+    'route_muskingum',
+    'route_muskingum_cunge',
+    'route_modified_puls',
+    'route_hydrograph',
+    'storage_indication_table',
+    'StorageIndicationTable',
+    # Network
+    'DrainageNetwork',
+    'NetworkElement',
+    'NetworkResult',
+    # Continuous simulation
+    'ContinuousSimulation',
+    'ContinuousChunk',
+    'ContinuousSummary',
+    'simulate_continuous',
+    'continuous_unit_hydrograph',
+    'iter_rainfall_chunks',
+    'rainfall_event_chunks',
+    'rainfall_records_to_depths',
+    # Uncertainty
+    'run_monte_carlo',
+    'evaluate_scenario_samples',
+    'latin_hypercube_samples',
+    'parameter_distribution',
+    'MonteCarloResult',
+    # Sensitivity
+    'morris_screening',
+    'sobol_indices',
+    'default_sensitivity_bounds',
+    'evaluate_parameter_samples',
+    'SensitivityResult',
+    # Calibration
+    'calibrate_parameters',
+    'calibration_event',
+    'goodness_of_fit',
+    'CalibrationEvent',
+    'CalibrationResult',
+    # Critical duration
+    'find_critical_duration',
+    'CriticalDurationResult',
 ]
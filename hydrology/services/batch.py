@@ -0,0 +1,264 @@
+"""
+Batch Hydrograph Engine
+
+Calcula muchos escenarios tormenta/cuenca en una sola llamada. Cada
+escenario es un dict con los mismos parámetros que calculate_hydrograph().
+
+Los escenarios se agrupan y cada grupo se evalúa como matrices
+(escenarios × tiempo) con las variantes vectorizadas de cada etapa:
+
+    1. (Δt, duración, método de hietograma) → hietogramas
+       (una sola evaluación IDF para todo el grupo)
+    2. (método de lluvia efectiva, AMC) → lluvia efectiva con C/CN por fila
+    3. (método de hidrograma, Tc, hidrograma unitario sintético) →
+       convolución de todas las filas con un mismo hidrograma unitario
+
+Los resultados coinciden con calculate_hydrograph() escenario a escenario
+(dentro de CONVOLUTION_RTOL) y se devuelven en el orden de entrada.
+
+Example:
+    >>> scenarios = [
+    ...     dict(total_rainfall_mm=P, duration_hours=6, area_km2=5.2,
+    ...          tc_minutes=45, C=0.6, P3_10=70, Tr=Tr)
+    ...     for Tr, P in [(10, 80.0), (25, 95.0), (50, 107.0)]
+    ... ]
+    >>> results = calculate_hydrographs_batch(scenarios)
+    >>> [r['summary']['peak_discharge_m3s'] for r in results]
+"""
+
+from dataclasses import fields, replace
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .hydrograph_calculator import (
+    HYDROGRAPH_METHODS,
+    HydrographCalculationError,
+    calculate_default_time_step,
+    transform_rainfall_excess_series,
+)
+from .hyetograph import generate_hyetograph_series
+from .rainfall_excess import calculate_rainfall_excess_series
+from .series import HydrographResult, _scalar
+
+
+# Parámetros de un escenario y sus valores por defecto (los de calculate_hydrograph)
+SCENARIO_DEFAULTS = {
+    'method': 'rational',
+    'hyetograph_method': 'alternating_block',
+    'excess_method': 'rational',
+    'C': None,
+    'CN': None,
+    'time_step_minutes': None,
+    'peak_position_ratio': 0.5,
+    'P3_10': None,
+    'Tr': None,
+    'antecedent_condition': 'AMC-II',
+    'unit_hydrograph': 'clark',
+    'unit_hydrograph_params': None,
+}
+
+SCENARIO_REQUIRED = ('total_rainfall_mm', 'duration_hours', 'area_km2', 'tc_minutes')
+
+# Claves de agrupación de cada etapa
+HYETOGRAPH_GROUP_KEYS = ('time_step_minutes', 'duration_hours', 'hyetograph_method')
+EXCESS_GROUP_KEYS = ('excess_method', 'antecedent_condition')
+TRANSFORM_GROUP_KEYS = ('method', 'tc_minutes', 'unit_hydrograph', 'unit_hydrograph_params')
+
+
+def calculate_hydrographs_batch(
+    scenarios: Iterable[Dict],
+    include_series: bool = False
+) -> List[Dict]:
+    """
+    Calcula hidrogramas para una lista de escenarios.
+
+    Args:
+        scenarios: Dicts con parámetros de calculate_hydrograph()
+            (total_rainfall_mm, duration_hours, area_km2, tc_minutes, C/CN,
+            P3_10, Tr, peak_position_ratio, ...)
+        include_series: Si True, cada resultado incluye además 'series'
+            (HydrographResult del escenario, con arrays de NumPy)
+
+    Returns:
+        Lista (en el orden de entrada) de dicts:
+        {
+            'summary': {...},  # Igual que calculate_hydrograph()['summary']
+            'series': HydrographResult  # Solo si include_series=True
+        }
+
+    Raises:
+        ValueError: Escenario con parámetros faltantes o inválidos
+        HydrographCalculationError: Error en el cálculo de un grupo
+    """
+    normalized = [normalize_scenario(index, scenario) for index, scenario in enumerate(scenarios)]
+    results: List[Dict] = [None] * len(normalized)
+
+    for indices in _group_indices(normalized, range(len(normalized)), HYETOGRAPH_GROUP_KEYS).values():
+        for positions, result in _evaluate_group([normalized[i] for i in indices]):
+            summaries = _split_summary(result.summary(), len(positions))
+            for row, (position, summary) in enumerate(zip(positions, summaries)):
+                item = {'summary': summary}
+                if include_series:
+                    item['series'] = _take_result(result, row)
+                results[indices[position]] = item
+
+    return results
+
+
+def normalize_scenario(index: int, scenario: Dict) -> Dict:
+    """Completa valores por defecto y valida un escenario (Δt automático si falta)"""
+    unknown = set(scenario) - set(SCENARIO_DEFAULTS) - set(SCENARIO_REQUIRED)
+    if unknown:
+        raise ValueError(f"Escenario {index}: parámetros desconocidos {sorted(unknown)}")
+    missing = [name for name in SCENARIO_REQUIRED if scenario.get(name) is None]
+    if missing:
+        raise ValueError(f"Escenario {index}: faltan parámetros {missing}")
+
+    params = {**SCENARIO_DEFAULTS, **scenario}
+    for name in SCENARIO_REQUIRED:
+        if params[name] <= 0:
+            raise ValueError(f"Escenario {index}: {name} debe ser > 0. Valor: {params[name]}")
+
+    if params['method'] not in HYDROGRAPH_METHODS:
+        raise ValueError(f"Escenario {index}: método de hidrograma '{params['method']}' no implementado aún")
+    if params['excess_method'] == 'rational' and params['C'] is None:
+        raise ValueError(f"Escenario {index}: excess_method='rational' requiere parámetro C")
+    if params['excess_method'] == 'scs_curve_number' and params['CN'] is None:
+        raise ValueError(f"Escenario {index}: excess_method='scs_curve_number' requiere parámetro CN")
+    if params['hyetograph_method'] == 'alternating_block' and (params['P3_10'] is None or params['Tr'] is None):
+        raise ValueError(f"Escenario {index}: method='alternating_block' requiere P3_10 y Tr")
+
+    if params['time_step_minutes'] is None:
+        params['time_step_minutes'] = calculate_default_time_step(params['tc_minutes'])
+    # Parámetros de forma como tupla ordenada: forman parte de la clave de agrupación.
+    # dict() acepta también la tupla de un escenario ya normalizado (idempotente)
+    params['unit_hydrograph_params'] = tuple(sorted(dict(params['unit_hydrograph_params'] or {}).items()))
+    return params
+
+
+def _group_indices(
+    scenarios: Sequence[Dict],
+    positions: Iterable[int],
+    keys: Tuple[str, ...]
+) -> Dict[Tuple, List[int]]:
+    """Agrupa posiciones de escenarios por los valores de las claves dadas"""
+    groups: Dict[Tuple, List[int]] = {}
+    for position in positions:
+        groups.setdefault(tuple(scenarios[position][key] for key in keys), []).append(position)
+    return groups
+
+
+def _column(scenarios: Sequence[Dict], name: str) -> np.ndarray:
+    """Valores de un parámetro para un conjunto de escenarios"""
+    return np.array([scenario[name] for scenario in scenarios], dtype=np.float64)
+
+
+def _evaluate_group(scenarios: List[Dict]) -> List[Tuple[List[int], HydrographResult]]:
+    """
+    Evalúa un grupo de escenarios con Δt, duración y método de hietograma
+    comunes. Retorna (posiciones dentro del grupo, HydrographResult por lotes)
+    para cada subgrupo de lluvia efectiva × transformación.
+    """
+    first = scenarios[0]
+    uses_idf = first['hyetograph_method'] == 'alternating_block'
+    try:
+        hyetograph = generate_hyetograph_series(
+            total_rainfall_mm=_column(scenarios, 'total_rainfall_mm'),
+            duration_hours=first['duration_hours'],
+            method=first['hyetograph_method'],
+            time_step_minutes=first['time_step_minutes'],
+            P3_10=_column(scenarios, 'P3_10') if uses_idf else None,
+            Tr=_column(scenarios, 'Tr') if uses_idf else None,
+            area_km2=_column(scenarios, 'area_km2'),
+            peak_position_ratio=_column(scenarios, 'peak_position_ratio')
+        )
+    except Exception as e:
+        raise HydrographCalculationError(f"Error generando hietogramas: {str(e)}")
+
+    evaluated = []
+    for excess_rows in _group_indices(scenarios, range(len(scenarios)), EXCESS_GROUP_KEYS).values():
+        rainfall_excess = _batch_rainfall_excess(hyetograph.rainfall_mm[excess_rows], scenarios, excess_rows)
+        excess_row = {position: row for row, position in enumerate(excess_rows)}
+        for transform_rows in _group_indices(scenarios, excess_rows, TRANSFORM_GROUP_KEYS).values():
+            rows = [excess_row[position] for position in transform_rows]
+            excess = _take(rainfall_excess, rows)
+            evaluated.append((transform_rows, HydrographResult(
+                hyetograph=_take(hyetograph, transform_rows),
+                rainfall_excess=excess,
+                hydrograph=_batch_transform(excess.excess_mm, [scenarios[i] for i in transform_rows]),
+                total_rainfall_mm=_column([scenarios[i] for i in transform_rows], 'total_rainfall_mm'),
+                hyetograph_method=first['hyetograph_method'],
+                excess_method=scenarios[transform_rows[0]]['excess_method']
+            )))
+    return evaluated
+
+
+def _batch_rainfall_excess(rainfall: np.ndarray, scenarios: Sequence[Dict], rows: List[int]):
+    """Lluvia efectiva de una matriz de hietogramas con método y AMC comunes"""
+    members = [scenarios[i] for i in rows]
+    method = members[0]['excess_method']
+    try:
+        return calculate_rainfall_excess_series(
+            rainfall_series=rainfall,
+            method=method,
+            time_step_minutes=members[0]['time_step_minutes'],
+            C=_column(members, 'C') if method == 'rational' else None,
+            CN=_column(members, 'CN') if method == 'scs_curve_number' else None,
+            antecedent_condition=members[0]['antecedent_condition']
+        )
+    except Exception as e:
+        raise HydrographCalculationError(f"Error calculando lluvia efectiva: {str(e)}")
+
+
+def _batch_transform(excess_mm: np.ndarray, scenarios: Sequence[Dict]):
+    """Hidrogramas de una matriz de lluvias efectivas con método, Tc e HU comunes"""
+    try:
+        return transform_rainfall_excess_series(
+            rainfall_excess_series=excess_mm,
+            area_km2=_column(scenarios, 'area_km2'),
+            tc_minutes=scenarios[0]['tc_minutes'],
+            time_step_minutes=scenarios[0]['time_step_minutes'],
+            method=scenarios[0]['method'],
+            unit_hydrograph=scenarios[0]['unit_hydrograph'],
+            unit_hydrograph_params=dict(scenarios[0]['unit_hydrograph_params'])
+        )
+    except Exception as e:
+        raise HydrographCalculationError(f"Error calculando hidrograma: {str(e)}")
+
+
+def _select(value, rows, count: int):
+    """Filas de un valor por escenario (arrays cuyo primer eje tiene count elementos)"""
+    if isinstance(value, dict):
+        return {key: _select(item, rows, count) for key, item in value.items()}
+    if isinstance(value, np.ndarray) and value.ndim > 0 and value.shape[0] == count:
+        return _scalar(value[rows])
+    return value
+
+
+def _take(series, rows):
+    """Copia de una serie por lotes restringida a las filas dadas"""
+    count = len(getattr(series, fields(series)[0].name))
+    return replace(series, **{
+        f.name: _select(getattr(series, f.name), rows, count) for f in fields(series)
+    })
+
+
+def _take_result(result: HydrographResult, row: int) -> HydrographResult:
+    """HydrographResult de un único escenario de un resultado por lotes"""
+    return replace(
+        result,
+        hyetograph=_take(result.hyetograph, row),
+        rainfall_excess=_take(result.rainfall_excess, row),
+        hydrograph=_take(result.hydrograph, row),
+        total_rainfall_mm=_scalar(result.total_rainfall_mm[row])
+    )
+
+
+def _split_summary(summary: Dict, count: int) -> List[Dict]:
+    """Separa un resumen por lotes (valores por escenario) en un dict por escenario"""
+    columns = {
+        key: np.asarray(value).tolist() if isinstance(value, (np.ndarray, list)) else [value] * count
+        for key, value in summary.items()
+    }
+    return [{key: values[row] for key, values in columns.items()} for row in range(count)]
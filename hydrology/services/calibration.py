@@ -0,0 +1,415 @@
+"""
+Parameter Calibration
+
+Ajusta C (o CN) y Tc de una cuenca a hidrogramas observados minimizando
+NSE, KGE o RMSE con los optimizadores de scipy.optimize.
+
+Cada evento es un par (rainfall_series, observed_discharge) de
+RainfallData: la lluvia observada se remuestrea a Δt una sola vez y todos
+los eventos se apilan como filas de una matriz. En cada evaluación:
+
+1. Hietogramas: fijos (lluvia observada), calculados al inicio.
+2. Lluvia efectiva: depende solo de C/CN; se memoiza por valor
+   (lru_cache), de modo que los pasos que solo mueven Tc la reutilizan.
+3. Transformación: depende de Tc; los hidrogramas unitarios salen de las
+   cachés de hydrology.services.unit_hydrograph.
+
+Las métricas se calculan por evento sobre el largo del hidrograma
+observado y el objetivo es su promedio. Los parámetros se optimizan
+normalizados a [0, 1] dentro de sus rangos.
+
+Example:
+    >>> result = calibrate_parameters(
+    ...     events=[(rain.records, rain.observed_discharge) for rain in watershed.rainfall_data.all()],
+    ...     area_km2=5.2, initial=dict(CN=75, tc_minutes=45),
+    ...     excess_method='scs_curve_number', method='scs_unit_hydrograph',
+    ...     objective='kge')
+    >>> result.parameters, result.metrics['kge']
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import optimize
+
+from .continuous import rainfall_records_to_depths
+from .hydrograph_calculator import calculate_default_time_step, transform_rainfall_excess_series
+from .rainfall_excess import calculate_rainfall_excess_series
+
+
+# Parámetros calibrables
+CALIBRATION_PARAMETERS = ('C', 'CN', 'tc_minutes')
+
+# Rangos por defecto (Tc: fracción/múltiplo del valor inicial)
+CALIBRATION_BOUNDS = {
+    'C': (0.05, 1.0),
+    'CN': (30.0, 100.0),
+}
+TC_BOUNDS_RATIO = 4.0
+
+# Objetivos: métricas por evento → pérdida a minimizar
+CALIBRATION_OBJECTIVES = {
+    'nse': lambda metrics: 1.0 - metrics['nse'],
+    'kge': lambda metrics: 1.0 - metrics['kge'],
+    'rmse': lambda metrics: metrics['rmse'],
+}
+
+# Optimizadores: nombre → opciones de convergencia (parámetros normalizados)
+CALIBRATION_OPTIMIZERS = {
+    'nelder-mead': {'xatol': 1e-4, 'fatol': 1e-6},
+    'powell': {'xtol': 1e-4, 'ftol': 1e-6},
+    'differential_evolution': {'tol': 1e-6, 'polish': False},
+}
+
+DEFAULT_MAX_ITERATIONS = 200
+
+# Lluvias efectivas memoizadas por combinación de C/CN
+EXCESS_CACHE_SIZE = 256
+
+
+@dataclass(slots=True)
+class CalibrationEvent:
+    """Evento observado en la grilla de Δt"""
+
+    rainfall_mm: np.ndarray  # lluvia por intervalo
+    observed_m3s: np.ndarray  # caudal observado en t = kΔt
+
+
+def calibration_event(
+    rainfall_series: Sequence[Dict],
+    observed_discharge: Sequence[Dict],
+    time_step_minutes: float
+) -> CalibrationEvent:
+    """
+    Remuestrea un evento de RainfallData a Δt.
+
+    Args:
+        rainfall_series: [{time_min, intensity_mm_h, cumulative_mm}, ...]
+        observed_discharge: [{time_min, discharge_m3s}, ...]
+        time_step_minutes: Δt
+
+    Raises:
+        ValueError: Series vacías, tiempos no crecientes o caudales negativos
+    """
+    if not observed_discharge:
+        raise ValueError("observed_discharge no puede estar vacía")
+    times = np.array([record['time_min'] for record in observed_discharge], dtype=np.float64)
+    discharge = np.array([record['discharge_m3s'] for record in observed_discharge], dtype=np.float64)
+    if np.any(np.diff(times) <= 0) or times[0] < 0:
+        raise ValueError("time_min debe ser no negativo y estrictamente creciente")
+    if np.any(discharge < 0):
+        raise ValueError("discharge_m3s debe ser no negativo")
+
+    num_points = int(times[-1] / time_step_minutes + 1e-9) + 1
+    return CalibrationEvent(
+        rainfall_mm=rainfall_records_to_depths(rainfall_series, time_step_minutes),
+        observed_m3s=np.interp(np.arange(num_points) * time_step_minutes, times, discharge)
+    )
+
+
+def goodness_of_fit(
+    simulated: np.ndarray,
+    observed: np.ndarray,
+    mask: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    NSE, KGE y RMSE por fila.
+
+    Args:
+        simulated, observed: (..., n)
+        mask: Puntos válidos (..., n) (None = todos)
+
+    Returns:
+        {'nse', 'kge', 'rmse'}: arrays (...,)
+    """
+    simulated = np.asarray(simulated, dtype=np.float64)
+    observed = np.asarray(observed, dtype=np.float64)
+    mask = np.ones(observed.shape, dtype=bool) if mask is None else mask
+    count = mask.sum(axis=-1)
+
+    def mean(values):
+        return np.where(mask, values, 0.0).sum(axis=-1) / count
+
+    obs_mean, sim_mean = mean(observed), mean(simulated)
+    obs_dev = observed - obs_mean[..., np.newaxis]
+    sim_dev = simulated - sim_mean[..., np.newaxis]
+    obs_var, sim_var = mean(obs_dev ** 2), mean(sim_dev ** 2)
+    squared_error = mean((simulated - observed) ** 2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        nse = 1.0 - squared_error / obs_var
+        correlation = mean(obs_dev * sim_dev) / np.sqrt(obs_var * sim_var)
+        kge = 1.0 - np.sqrt(
+            (np.nan_to_num(correlation) - 1) ** 2
+            + (np.sqrt(sim_var / obs_var) - 1) ** 2
+            + (sim_mean / obs_mean - 1) ** 2
+        )
+    return {'nse': nse, 'kge': kge, 'rmse': np.sqrt(squared_error)}
+
+
+@dataclass(slots=True)
+class CalibrationResult:
+    """Parámetros ajustados y métricas de ajuste"""
+
+    parameters: Dict[str, float]
+    initial: Dict[str, float]
+    bounds: Dict[str, Tuple[float, float]]
+    objective: str
+    optimizer: str
+    metrics: Dict[str, float]  # promedio de los eventos
+    event_metrics: List[Dict[str, float]]
+    num_iterations: int
+    num_evaluations: int
+    success: bool
+    message: str
+    time_step_minutes: float
+    cache: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def objective_value(self) -> float:
+        return self.metrics[self.objective]
+
+    def to_dict(self) -> Dict:
+        return {
+            'parameters': self.parameters,
+            'initial': self.initial,
+            'bounds': {name: list(bound) for name, bound in self.bounds.items()},
+            'objective': self.objective,
+            'objective_value': self.objective_value,
+            'optimizer': self.optimizer,
+            'metrics': self.metrics,
+            'events': self.event_metrics,
+            'num_iterations': self.num_iterations,
+            'num_evaluations': self.num_evaluations,
+            'success': self.success,
+            'message': self.message,
+            'time_step_minutes': self.time_step_minutes,
+            'cache': self.cache,
+        }
+
+
+class _CalibrationModel:
+    """Simulación de todos los eventos con memoización por etapa"""
+
+    def __init__(self, events: List[CalibrationEvent], area_km2: float, time_step_minutes: float, params: Dict):
+        self.area_km2 = area_km2
+        self.time_step_minutes = time_step_minutes
+        self.params = params
+
+        # Etapa 1 (fija): lluvias y caudales observados apilados con ceros
+        num_events = len(events)
+        self.rainfall_mm = np.zeros((num_events, max(event.rainfall_mm.size for event in events)))
+        self.observed_m3s = np.zeros((num_events, max(event.observed_m3s.size for event in events)))
+        self.mask = np.zeros(self.observed_m3s.shape, dtype=bool)
+        for row, event in enumerate(events):
+            self.rainfall_mm[row, :event.rainfall_mm.size] = event.rainfall_mm
+            self.observed_m3s[row, :event.observed_m3s.size] = event.observed_m3s
+            self.mask[row, :event.observed_m3s.size] = True
+
+        self.excess = lru_cache(maxsize=EXCESS_CACHE_SIZE)(self._excess)
+        self.num_evaluations = 0
+
+    def _excess(self, C: Optional[float], CN: Optional[float]) -> np.ndarray:
+        """Etapa 2: lluvia efectiva de todos los eventos"""
+        return calculate_rainfall_excess_series(
+            rainfall_series=self.rainfall_mm,
+            method=self.params['excess_method'],
+            time_step_minutes=self.time_step_minutes,
+            C=C,
+            CN=CN,
+            antecedent_condition=self.params['antecedent_condition']
+        ).excess_mm
+
+    def simulate(self, values: Dict[str, float]) -> np.ndarray:
+        """Caudales simulados (eventos × largo observado)"""
+        self.num_evaluations += 1
+        excess = self.excess(values.get('C'), values.get('CN'))
+        discharge = transform_rainfall_excess_series(
+            rainfall_excess_series=excess,
+            area_km2=self.area_km2,
+            tc_minutes=values['tc_minutes'],
+            time_step_minutes=self.time_step_minutes,
+            method=self.params['method'],
+            unit_hydrograph=self.params['unit_hydrograph'],
+            unit_hydrograph_params=self.params['unit_hydrograph_params']
+        ).discharge_m3s
+        simulated = np.zeros(self.observed_m3s.shape)
+        length = min(discharge.shape[-1], simulated.shape[-1])
+        simulated[:, :length] = discharge[:, :length]
+        return simulated
+
+    def metrics(self, values: Dict[str, float]) -> Dict[str, np.ndarray]:
+        return goodness_of_fit(self.simulate(values), self.observed_m3s, self.mask)
+
+
+def calibrate_parameters(
+    events: Sequence[Tuple[Sequence[Dict], Sequence[Dict]]],
+    area_km2: float,
+    initial: Dict[str, float],
+    objective: str = 'nse',
+    method: str = 'scs_unit_hydrograph',
+    excess_method: str = 'scs_curve_number',
+    parameters: Optional[Sequence[str]] = None,
+    bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+    optimizer: str = 'nelder-mead',
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    time_step_minutes: Optional[float] = None,
+    antecedent_condition: str = 'AMC-II',
+    unit_hydrograph: str = 'clark',
+    unit_hydrograph_params: Optional[Dict] = None,
+    seed: Optional[int] = None,
+    progress_callback: Optional[Callable[[Dict], None]] = None
+) -> CalibrationResult:
+    """
+    Calibra C/CN y Tc contra hidrogramas observados.
+
+    Args:
+        events: Pares (rainfall_series, observed_discharge) de RainfallData
+        area_km2: Área de la cuenca
+        initial: Valores iniciales (tc_minutes requerido; C o CN según
+            excess_method, por defecto el centro de su rango)
+        objective: 'nse', 'kge' o 'rmse'
+        method: Método de hidrograma (ver calculate_hydrograph())
+        excess_method: 'rational' (calibra C) o 'scs_curve_number' (calibra CN)
+        parameters: Parámetros a calibrar (None = C o CN, y tc_minutes)
+        bounds: {parámetro: (low, high)} (por defecto CALIBRATION_BOUNDS y
+            Tc inicial / TC_BOUNDS_RATIO a Tc inicial × TC_BOUNDS_RATIO)
+        optimizer: 'nelder-mead', 'powell' o 'differential_evolution'
+        max_iterations: Iteraciones (generaciones en differential_evolution)
+        time_step_minutes: Δt (None = automático con el Tc inicial)
+        antecedent_condition, unit_hydrograph, unit_hydrograph_params:
+            Igual que en calculate_hydrograph()
+        seed: Semilla de differential_evolution
+        progress_callback: Recibe {iteration, max_iterations, num_evaluations,
+            objective_value, parameters} al final de cada iteración
+
+    Returns:
+        CalibrationResult
+
+    Raises:
+        ValueError: Parámetros, eventos u opciones inválidos
+    """
+    if objective not in CALIBRATION_OBJECTIVES:
+        raise ValueError(f"Objetivo '{objective}' no soportado. Opciones: {list(CALIBRATION_OBJECTIVES)}")
+    if optimizer not in CALIBRATION_OPTIMIZERS:
+        raise ValueError(f"Optimizador '{optimizer}' no soportado. Opciones: {list(CALIBRATION_OPTIMIZERS)}")
+    if max_iterations < 1:
+        raise ValueError(f"max_iterations debe ser >= 1. Valor: {max_iterations}")
+    if not events:
+        raise ValueError("Se requiere al menos un evento observado")
+    if area_km2 <= 0:
+        raise ValueError(f"area_km2 debe ser > 0. Valor: {area_km2}")
+    if initial.get('tc_minutes') is None or initial['tc_minutes'] <= 0:
+        raise ValueError("initial requiere tc_minutes > 0")
+
+    if parameters is None:
+        parameters = ['C' if excess_method == 'rational' else 'CN', 'tc_minutes']
+    unknown = set(parameters) - set(CALIBRATION_PARAMETERS)
+    if unknown or not parameters:
+        raise ValueError(f"Parámetros {sorted(unknown)} no soportados. Opciones: {list(CALIBRATION_PARAMETERS)}")
+
+    tc_initial = float(initial['tc_minutes'])
+    default_bounds = dict(
+        CALIBRATION_BOUNDS, tc_minutes=(tc_initial / TC_BOUNDS_RATIO, tc_initial * TC_BOUNDS_RATIO)
+    )
+    bounds = {
+        name: tuple(float(value) for value in (bounds or {}).get(name, default_bounds[name]))
+        for name in parameters
+    }
+    for name, (low, high) in bounds.items():
+        if not low < high:
+            raise ValueError(f"Parámetro '{name}': rango inválido ({low}, {high})")
+
+    start = {name: initial.get(name) for name in CALIBRATION_PARAMETERS if initial.get(name) is not None}
+    for name in parameters:
+        low, high = bounds[name]
+        start[name] = float(np.clip(start.get(name, (low + high) / 2), low, high))
+
+    if time_step_minutes is None:
+        time_step_minutes = calculate_default_time_step(tc_initial)
+    model = _CalibrationModel(
+        [calibration_event(rainfall, observed, time_step_minutes) for rainfall, observed in events],
+        area_km2,
+        time_step_minutes,
+        dict(
+            method=method,
+            excess_method=excess_method,
+            antecedent_condition=antecedent_condition,
+            unit_hydrograph=unit_hydrograph,
+            unit_hydrograph_params=unit_hydrograph_params
+        )
+    )
+
+    # Optimización en el hipercubo unitario
+    low = np.array([bounds[name][0] for name in parameters])
+    span = np.array([bounds[name][1] for name in parameters]) - low
+    loss = CALIBRATION_OBJECTIVES[objective]
+
+    def values_of(unit: np.ndarray) -> Dict[str, float]:
+        physical = low + np.clip(unit, 0.0, 1.0) * span
+        return {**start, **{name: float(value) for name, value in zip(parameters, physical)}}
+
+    # Mejor evaluación hasta el momento (el punto que reportan los optimizadores)
+    best = {'key': None, 'value': np.inf}
+
+    def evaluate(unit: np.ndarray) -> float:
+        value = float(np.mean(loss(model.metrics(values_of(unit)))))
+        value = value if np.isfinite(value) else np.inf
+        if value <= best['value']:
+            best.update(key=np.asarray(unit, dtype=np.float64).tobytes(), value=value)
+        return value
+
+    iteration = 0
+
+    def callback(xk, convergence=None):
+        # Firma (xk[, convergence]): la única que differential_evolution y
+        # minimize comparten en todas las versiones de SciPy soportadas
+        nonlocal iteration
+        iteration += 1
+        if progress_callback is not None:
+            xk = np.asarray(xk, dtype=np.float64)
+            value = best['value'] if xk.tobytes() == best['key'] else evaluate(xk)
+            progress_callback({
+                'iteration': iteration,
+                'max_iterations': max_iterations,
+                'num_evaluations': model.num_evaluations,
+                'objective_value': value,
+                'parameters': {name: values_of(xk)[name] for name in parameters},
+            })
+
+    x0 = np.array([(start[name] - bounds[name][0]) / (bounds[name][1] - bounds[name][0]) for name in parameters])
+    unit_bounds = [(0.0, 1.0)] * len(parameters)
+    if optimizer == 'differential_evolution':
+        solution = optimize.differential_evolution(
+            evaluate, unit_bounds, x0=x0, maxiter=max_iterations, seed=np.random.default_rng(seed),
+            callback=callback, **CALIBRATION_OPTIMIZERS[optimizer]
+        )
+    else:
+        solution = optimize.minimize(
+            evaluate, x0, method=optimizer, bounds=unit_bounds, callback=callback,
+            options={'maxiter': max_iterations, **CALIBRATION_OPTIMIZERS[optimizer]}
+        )
+
+    fitted = values_of(solution.x)
+    metrics = model.metrics(fitted)
+    cache_info = model.excess.cache_info()
+    return CalibrationResult(
+        parameters={name: fitted[name] for name in parameters},
+        initial={name: start[name] for name in parameters},
+        bounds=bounds,
+        objective=objective,
+        optimizer=optimizer,
+        metrics={name: float(np.mean(values)) for name, values in metrics.items()},
+        event_metrics=[
+            {name: float(values[row]) for name, values in metrics.items()}
+            for row in range(model.observed_m3s.shape[0])
+        ],
+        num_iterations=iteration,
+        num_evaluations=model.num_evaluations,
+        success=bool(solution.success),
+        message=str(solution.message),
+        time_step_minutes=time_step_minutes,
+        cache={'excess_hits': cache_info.hits, 'excess_misses': cache_info.misses}
+    )
@@ -0,0 +1,239 @@
+"""
+Columnar - Almacenamiento binario de series temporales
+
+Formato compacto para persistir series (p. ej. Hydrograph.hydrograph_data)
+como columnas float32/float64 empaquetadas en lugar de listas JSON de
+dicts (~80 bytes por muestra y un dict de Python por punto al leer).
+
+Estructura (little-endian):
+
+    cabecera  '<4sBBBBIdd': magic, versión, compresión, bytes por valor,
+              número de columnas con datos, longitud, inicio, Δt
+    nombres   '<H' + nombres separados por ',' (UTF-8); el primero es el
+              eje de tiempo
+    datos     columnas contiguas de `longitud` valores (zlib o sin comprimir)
+
+Con Δt > 0 el eje de tiempo es inicio + k·Δt y no se guarda; con Δt = 0
+(series irregulares) el tiempo es la primera columna con datos.
+
+La lectura no recorre las muestras: se descomprime una vez y cada columna
+es una vista numpy.frombuffer (de solo lectura) sobre ese buffer; sin
+compresión las vistas apuntan directamente a los bytes almacenados.
+"""
+
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .series import _to_python
+
+
+COLUMNAR_MAGIC = b'HCOL'
+COLUMNAR_VERSION = 1
+
+_HEADER = struct.Struct('<4sBBBBIdd')
+_NAMES_LENGTH = struct.Struct('<H')
+
+# dtype → tipo little-endian almacenado
+COLUMNAR_DTYPES = {
+    'float32': '<f4',
+    'float64': '<f8',
+}
+_DTYPES_BY_SIZE = {4: '<f4', 8: '<f8'}
+
+# Compresión → código en la cabecera
+COLUMNAR_COMPRESSION = {
+    'none': 0,
+    'zlib': 1,
+}
+COLUMNAR_COMPRESSION_LEVEL = 6
+
+# Tolerancia relativa a Δt para considerar regular un eje de tiempo
+REGULAR_TIME_TOLERANCE = 1e-6
+
+
+@dataclass(slots=True)
+class ColumnarSeries:
+    """Serie temporal por columnas: tiempo implícito (inicio + k·Δt) o explícito"""
+
+    columns: Dict[str, np.ndarray]
+    start: float
+    time_step: float
+    time_key: str = 'time_min'
+    time_values: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        if self.time_values is not None:
+            return len(self.time_values)
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @property
+    def time(self) -> np.ndarray:
+        """Eje de tiempo"""
+        if self.time_values is not None:
+            return self.time_values
+        return self.start + np.arange(len(self)) * self.time_step
+
+    def to_records(self) -> List[Dict]:
+        """Lista de puntos {time_key, columna: valor, ...} (formato JSON anterior)"""
+        names = [self.time_key, *self.columns]
+        values = [_shortest_floats(self.time), *(_shortest_floats(column) for column in self.columns.values())]
+        return [dict(zip(names, point)) for point in zip(*values)]
+
+
+def _shortest_floats(values: np.ndarray) -> List[float]:
+    """Floats de Python; los float32 con su representación más corta (0.1, no 0.10000000149)"""
+    if values.dtype == np.float32:
+        return values.astype(str).astype(np.float64).tolist()
+    return _to_python(values)
+
+
+def pack_columns(
+    columns: Dict[str, Sequence[float]],
+    start: float = 0.0,
+    time_step: float = 0.0,
+    time_key: str = 'time_min',
+    time_values: Optional[Sequence[float]] = None,
+    dtype: str = 'float32',
+    compression: str = 'zlib'
+) -> bytes:
+    """
+    Empaqueta columnas de igual longitud.
+
+    Args:
+        columns: {nombre: valores}
+        start: Tiempo inicial (eje regular)
+        time_step: Δt del eje regular (> 0), o 0 con time_values
+        time_key: Nombre del eje de tiempo
+        time_values: Eje de tiempo explícito (series irregulares)
+        dtype: 'float32' o 'float64'
+        compression: 'zlib' o 'none'
+
+    Returns:
+        Bytes en formato columnar
+    """
+    if dtype not in COLUMNAR_DTYPES:
+        raise ValueError(f"dtype '{dtype}' no soportado. Opciones: {list(COLUMNAR_DTYPES)}")
+    if compression not in COLUMNAR_COMPRESSION:
+        raise ValueError(f"Compresión '{compression}' no soportada. Opciones: {list(COLUMNAR_COMPRESSION)}")
+    if (time_values is None) == (time_step <= 0):
+        raise ValueError("Se requiere time_step > 0 (eje regular) o time_values (eje explícito), no ambos")
+
+    names = [time_key, *columns]
+    if any(',' in name for name in names):
+        raise ValueError(f"Los nombres de columna no pueden contener ',': {names}")
+
+    data = [np.asarray(values, dtype=COLUMNAR_DTYPES[dtype]) for values in columns.values()]
+    if time_values is not None:
+        data.insert(0, np.asarray(time_values, dtype=COLUMNAR_DTYPES[dtype]))
+    lengths = {len(values) for values in data}
+    if len(lengths) > 1 or any(values.ndim != 1 for values in data):
+        raise ValueError("Todas las columnas deben ser 1-D y de igual longitud")
+    length = lengths.pop() if lengths else 0
+
+    payload = b''.join(values.tobytes() for values in data)
+    if compression == 'zlib':
+        payload = zlib.compress(payload, COLUMNAR_COMPRESSION_LEVEL)
+
+    encoded_names = ','.join(names).encode()
+    return b''.join((
+        _HEADER.pack(
+            COLUMNAR_MAGIC, COLUMNAR_VERSION, COLUMNAR_COMPRESSION[compression],
+            np.dtype(COLUMNAR_DTYPES[dtype]).itemsize, len(data), length, float(start), float(time_step)
+        ),
+        _NAMES_LENGTH.pack(len(encoded_names)),
+        encoded_names,
+        payload,
+    ))
+
+
+def unpack_columns(data) -> ColumnarSeries:
+    """
+    Lee bytes en formato columnar (bytes, memoryview o bytearray).
+
+    Las columnas son vistas de solo lectura sobre el buffer (sin copiar ni
+    recorrer las muestras).
+
+    Raises:
+        ValueError: Si los bytes no tienen formato columnar válido
+    """
+    buffer = memoryview(data)
+    if len(buffer) < _HEADER.size + _NAMES_LENGTH.size:
+        raise ValueError("Datos columnares truncados")
+    magic, version, compression, itemsize, num_columns, length, start, time_step = _HEADER.unpack_from(buffer)
+    if magic != COLUMNAR_MAGIC:
+        raise ValueError("Los datos no tienen formato columnar (magic inválido)")
+    if version != COLUMNAR_VERSION:
+        raise ValueError(f"Versión de formato columnar no soportada: {version}")
+    if itemsize not in _DTYPES_BY_SIZE or compression not in COLUMNAR_COMPRESSION.values():
+        raise ValueError(f"Cabecera columnar inválida: itemsize={itemsize}, compresión={compression}")
+
+    offset = _HEADER.size
+    (names_length,) = _NAMES_LENGTH.unpack_from(buffer, offset)
+    offset += _NAMES_LENGTH.size
+    names = bytes(buffer[offset:offset + names_length]).decode().split(',')
+    offset += names_length
+
+    payload = buffer[offset:]
+    if compression == COLUMNAR_COMPRESSION['zlib']:
+        payload = zlib.decompress(payload)
+    if len(payload) != num_columns * length * itemsize:
+        raise ValueError("Datos columnares truncados")
+
+    values = [
+        np.frombuffer(payload, dtype=_DTYPES_BY_SIZE[itemsize], count=length, offset=k * length * itemsize)
+        for k in range(num_columns)
+    ]
+    time_values = values.pop(0) if time_step <= 0 else None
+    data_names = names[1:]
+    if len(data_names) != len(values):
+        raise ValueError("Cabecera columnar inválida: nombres y columnas no coinciden")
+
+    return ColumnarSeries(
+        columns=dict(zip(data_names, values)),
+        start=start,
+        time_step=time_step,
+        time_key=names[0],
+        time_values=time_values
+    )
+
+
+def pack_records(
+    records: List[Dict],
+    time_key: str = 'time_min',
+    dtype: str = 'float32',
+    compression: str = 'zlib'
+) -> bytes:
+    """
+    Empaqueta una lista de puntos {time_key, columna: valor, ...}.
+
+    Si el tiempo es regular (t_k = t_0 + k·Δt) se guardan solo t_0 y Δt;
+    si no, el eje de tiempo se guarda como columna.
+
+    Raises:
+        ValueError: Lista vacía o puntos con claves distintas
+    """
+    if not records:
+        raise ValueError("La serie está vacía")
+    keys = list(records[0])
+    if time_key not in keys:
+        raise ValueError(f"Los puntos deben incluir '{time_key}'")
+    if any(set(point) != set(keys) for point in records):
+        raise ValueError("Todos los puntos deben tener las mismas claves")
+
+    time = np.array([point[time_key] for point in records], dtype=np.float64)
+    columns = {
+        key: np.array([point[key] for point in records], dtype=np.float64)
+        for key in keys if key != time_key
+    }
+
+    time_step = time[1] - time[0] if len(time) > 1 else 0.0
+    regular = time_step > 0 and np.allclose(
+        time, time[0] + np.arange(len(time)) * time_step, rtol=0, atol=REGULAR_TIME_TOLERANCE * time_step
+    )
+    if regular:
+        return pack_columns(columns, time[0], time_step, time_key, dtype=dtype, compression=compression)
+    return pack_columns(columns, time_key=time_key, time_values=time, dtype=dtype, compression=compression)
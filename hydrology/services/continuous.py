@@ -0,0 +1,755 @@
+"""
+Continuous Simulation Service
+
+Simulación continua sobre registros de lluvia largos (años de datos de
+pluviógrafo): la serie se procesa en bloques de tamaño fijo a través de
+
+    pérdidas → transformación (hidrograma unitario) → tránsito (opcional)
+
+y cada etapa conserva su estado entre bloques, de modo que el resultado es
+idéntico al de procesar el registro completo de una vez y la memoria queda
+acotada por el tamaño del bloque (un registro de 30 años a 5 min son ~3,2
+millones de intervalos; se procesan de a CONTINUOUS_CHUNK_SIZE).
+
+Estado transportado entre bloques:
+- Pérdidas (humedad del suelo):
+  - 'rational': Pe = C × P (sin estado)
+  - 'scs_curve_number': número de curva por evento; un evento termina tras
+    inter_event_hours sin lluvia (estado: lluvia acumulada del evento e
+    intervalos secos consecutivos)
+  - 'deficit_constant': déficit y tasa constante (HEC-HMS); el déficit de
+    humedad se satisface con la lluvia y se recupera en los periodos secos
+    (estado: déficit actual)
+- Transformación: cola de la convolución (StreamingConvolver, overlap-add),
+  las m - 1 últimas ordenadas del bloque anterior que aún no se emitieron
+- Tránsito: último caudal de entrada y condiciones del filtro IIR de cada
+  sub-tramo (Muskingum, Muskingum-Cunge), o volumen almacenado (Puls
+  modificado)
+
+En modo continuo el hidrograma unitario es lineal e invariante: 'rational'
+usa el hidrograma triangular normalizado a 1 mm de lluvia efectiva sobre la
+cuenca (el caudal unitario del método racional depende de la intensidad
+media de la tormenta, que no existe en un registro continuo).
+
+Example:
+    >>> simulation = ContinuousSimulation(
+    ...     area_km2=12.0, tc_minutes=90, time_step_minutes=5,
+    ...     loss_method='deficit_constant',
+    ...     loss_params=dict(initial_deficit_mm=20, max_deficit_mm=40,
+    ...                      constant_rate_mm_h=2.5),
+    ...     method='scs_unit_hydrograph',
+    ...     routing=dict(method='muskingum', K_minutes=60, X=0.2))
+    >>> for chunk in simulation.run(iter_rainfall_chunks(record_mm)):
+    ...     store(chunk.outflow_m3s)
+    >>> store(simulation.finish().outflow_m3s)
+    >>> simulation.summary.peak_discharge_m3s
+
+Referencias:
+- USACE (2000). HEC-HMS Technical Reference Manual, Cap. 5 (pérdidas).
+- USDA-NRCS (2004). National Engineering Handbook, Part 630, Cap. 10.
+"""
+
+import bisect
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.signal import lfilter, lfilter_zi
+
+from .convolution import ArrayLike, StreamingConvolver
+from .rainfall_excess import adjust_curve_number
+from .routing import _muskingum_cunge_reach, _muskingum_reach, storage_indication_table
+from .unit_hydrograph import (
+    SCS_PEAK_RATE_FACTOR,
+    scs_dimensionless_unit_hydrograph,
+    scs_time_to_peak_minutes,
+    synthetic_unit_hydrograph,
+    triangular_unit_hydrograph,
+)
+
+
+# Intervalos por bloque (≈ 57 días a 5 min)
+CONTINUOUS_CHUNK_SIZE = 16384
+
+# Curva número: horas sin lluvia que separan dos eventos
+INTER_EVENT_DRY_HOURS = 6.0
+
+
+def _validate_chunk(rainfall_mm: ArrayLike) -> np.ndarray:
+    """Valida y convierte un bloque de lluvia (1-D, no negativo)"""
+    rainfall = np.asarray(rainfall_mm, dtype=np.float64)
+    if rainfall.ndim != 1:
+        raise ValueError(f"Los bloques de lluvia deben ser 1-D. Forma: {rainfall.shape}")
+    if not np.all(np.isfinite(rainfall)) or np.any(rainfall < 0):
+        raise ValueError("Los bloques de lluvia deben ser finitos y no negativos")
+    return rainfall
+
+
+# ---------------------------------------------------------------------------
+# Fuentes de lluvia
+# ---------------------------------------------------------------------------
+
+def iter_rainfall_chunks(
+    rainfall_mm: ArrayLike,
+    chunk_size: int = CONTINUOUS_CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Bloques consecutivos de una serie de lluvia por intervalo [mm].
+
+    La serie puede ser un numpy.memmap (np.load(..., mmap_mode='r')): solo
+    se leen los bloques a medida que se consumen.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size debe ser >= 1. Valor: {chunk_size}")
+    for start in range(0, len(rainfall_mm), chunk_size):
+        yield np.asarray(rainfall_mm[start:start + chunk_size], dtype=np.float64)
+
+
+def rainfall_records_to_depths(
+    rainfall_series: Sequence[Dict],
+    time_step_minutes: float
+) -> np.ndarray:
+    """
+    Lluvia por intervalo [mm] de un registro de RainfallData.rainfall_series.
+
+    Los registros {time_min, intensity_mm_h, cumulative_mm} se remuestrean
+    a Δt interpolando la lluvia acumulada (si falta cumulative_mm se
+    acumula intensity_mm_h). El valor k es la lluvia de (kΔt, (k+1)Δt].
+
+    Raises:
+        ValueError: Registro vacío o tiempos no crecientes
+    """
+    if not rainfall_series:
+        raise ValueError("rainfall_series no puede estar vacía")
+    if time_step_minutes <= 0:
+        raise ValueError(f"time_step_minutes debe ser > 0. Valor: {time_step_minutes}")
+
+    times = np.array([record['time_min'] for record in rainfall_series], dtype=np.float64)
+    if np.any(np.diff(times) <= 0) or times[0] < 0:
+        raise ValueError("time_min debe ser no negativo y estrictamente creciente")
+    if all('cumulative_mm' in record for record in rainfall_series):
+        cumulative = np.array([record['cumulative_mm'] for record in rainfall_series], dtype=np.float64)
+    else:
+        intensity = np.array([record['intensity_mm_h'] for record in rainfall_series], dtype=np.float64)
+        cumulative = np.cumsum(intensity * np.diff(times, prepend=0.0) / 60)
+    if times[0] > 0:
+        times, cumulative = np.concatenate([[0.0], times]), np.concatenate([[0.0], cumulative])
+
+    num_intervals = max(1, math.ceil(times[-1] / time_step_minutes - 1e-9))
+    grid = np.interp(np.arange(num_intervals + 1) * time_step_minutes, times, cumulative)
+    return np.maximum(np.diff(grid), 0.0)
+
+
+def rainfall_event_chunks(
+    events: Iterable[Tuple[float, Sequence[Dict]]],
+    time_step_minutes: float,
+    chunk_size: int = CONTINUOUS_CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Serie continua por bloques a partir de eventos observados.
+
+    Cada evento es (inicio [min desde el comienzo del registro],
+    rainfall_series) en orden cronológico, p.ej. filas de RainfallData
+    recorridas con .iterator(). Los huecos entre eventos se completan con
+    ceros sin materializarlos; un evento que empieza antes del final del
+    anterior se desplaza a continuación de éste.
+
+    Yields:
+        Bloques de chunk_size intervalos (el último puede ser más corto)
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size debe ser >= 1. Valor: {chunk_size}")
+    buffer = np.zeros(chunk_size)
+    filled = 0
+    position = 0
+
+    def _write(values: Optional[np.ndarray], count: int):
+        """Escribe count intervalos (values o ceros) y emite los bloques llenos"""
+        nonlocal filled
+        written = 0
+        while written < count:
+            take = min(chunk_size - filled, count - written)
+            buffer[filled:filled + take] = 0.0 if values is None else values[written:written + take]
+            filled += take
+            written += take
+            if filled == chunk_size:
+                yield buffer.copy()
+                filled = 0
+
+    for start_minutes, rainfall_series in events:
+        depths = rainfall_records_to_depths(rainfall_series, time_step_minutes)
+        start = max(int(round(start_minutes / time_step_minutes)), position)
+        yield from _write(None, start - position)
+        yield from _write(depths, depths.size)
+        position = start + depths.size
+
+    if filled:
+        yield buffer[:filled].copy()
+
+
+# ---------------------------------------------------------------------------
+# Pérdidas con estado
+# ---------------------------------------------------------------------------
+
+class _RationalLoss:
+    """Pe = C × P (sin estado)"""
+
+    def __init__(self, time_step_minutes: float, C: float):
+        if not 0 <= C <= 1:
+            raise ValueError(f"C debe estar entre 0 y 1. Valor: {C}")
+        self.C = C
+
+    def __call__(self, rainfall: np.ndarray) -> np.ndarray:
+        return self.C * rainfall
+
+    @property
+    def state(self) -> Dict:
+        return {}
+
+
+class _CurveNumberLoss:
+    """
+    Número de curva por evento. Dentro de un evento:
+
+        Pe = (P - Ia)² / (P - Ia + S), P = lluvia acumulada del evento
+
+    La lluvia acumulada vuelve a cero tras inter_event_hours sin lluvia. Los
+    límites de evento se obtienen por bloque con acumulados (sin bucles).
+    """
+
+    def __init__(
+        self,
+        time_step_minutes: float,
+        CN: float,
+        antecedent_condition: str = 'AMC-II',
+        inter_event_hours: float = INTER_EVENT_DRY_HOURS
+    ):
+        if not 30 <= CN <= 100:
+            raise ValueError(f"CN debe estar entre 30-100. Valor: {CN}")
+        if inter_event_hours <= 0:
+            raise ValueError(f"inter_event_hours debe ser > 0. Valor: {inter_event_hours}")
+        self.S_mm = 25400 / adjust_curve_number(CN, antecedent_condition) - 254
+        self.Ia_mm = 0.2 * self.S_mm
+        self.dry_steps_between_events = max(1, math.ceil(inter_event_hours * 60 / time_step_minutes - 1e-9))
+        self.event_rainfall_mm = 0.0
+        self.dry_steps = self.dry_steps_between_events
+
+    def _accumulated_excess(self, P: np.ndarray) -> np.ndarray:
+        effective = P - self.Ia_mm
+        return np.divide(
+            effective ** 2, effective + self.S_mm,
+            out=np.zeros_like(P),
+            where=(effective > 0) & (effective + self.S_mm > 0)
+        )
+
+    def __call__(self, rainfall: np.ndarray) -> np.ndarray:
+        n = rainfall.size
+        index = np.arange(n)
+        wet = rainfall > 0
+
+        # Último intervalo con lluvia hasta cada i (el estado lo ubica antes del bloque)
+        carried_last = -1 - self.dry_steps
+        last_wet = np.maximum.accumulate(np.where(wet, index, carried_last))
+        previous_wet = np.concatenate([[carried_last], last_wet[:-1]])
+        new_event = wet & (index - previous_wet - 1 >= self.dry_steps_between_events)
+
+        # P del evento = acumulado del bloque - acumulado al inicio del evento
+        accumulated = np.cumsum(rainfall)
+        event_base = np.maximum.accumulate(
+            np.where(new_event, accumulated - rainfall, -np.inf)
+        )
+        P = accumulated - np.maximum(event_base, -self.event_rainfall_mm)
+
+        excess = self._accumulated_excess(P) - self._accumulated_excess(P - rainfall)
+        self.event_rainfall_mm = float(P[-1])
+        self.dry_steps = int(n - 1 - last_wet[-1])
+        return np.maximum(excess, 0.0)
+
+    @property
+    def state(self) -> Dict:
+        return {'event_rainfall_mm': self.event_rainfall_mm, 'dry_steps': self.dry_steps}
+
+
+class _DeficitConstantLoss:
+    """
+    Déficit y tasa constante (HEC-HMS): la lluvia satisface primero el
+    déficit de humedad; con el suelo saturado se pierde a tasa constante.
+    En los intervalos secos el déficit se recupera a recovery_rate_mm_h
+    hasta max_deficit_mm.
+
+    El bucle recorre solo los intervalos con lluvia; los periodos secos se
+    recuperan en forma cerrada.
+    """
+
+    def __init__(
+        self,
+        time_step_minutes: float,
+        initial_deficit_mm: float,
+        max_deficit_mm: float,
+        constant_rate_mm_h: float,
+        recovery_rate_mm_h: Optional[float] = None
+    ):
+        if recovery_rate_mm_h is None:
+            recovery_rate_mm_h = constant_rate_mm_h
+        for name, value in (
+            ('initial_deficit_mm', initial_deficit_mm),
+            ('max_deficit_mm', max_deficit_mm),
+            ('constant_rate_mm_h', constant_rate_mm_h),
+            ('recovery_rate_mm_h', recovery_rate_mm_h),
+        ):
+            if value < 0:
+                raise ValueError(f"{name} debe ser >= 0. Valor: {value}")
+        if initial_deficit_mm > max_deficit_mm:
+            raise ValueError(
+                f"initial_deficit_mm ({initial_deficit_mm}) no puede superar max_deficit_mm ({max_deficit_mm})"
+            )
+        self.max_deficit_mm = max_deficit_mm
+        self.constant_loss_mm = constant_rate_mm_h * time_step_minutes / 60
+        self.recovery_mm = recovery_rate_mm_h * time_step_minutes / 60
+        self.deficit_mm = float(initial_deficit_mm)
+
+    def __call__(self, rainfall: np.ndarray) -> np.ndarray:
+        excess = np.zeros_like(rainfall)
+        wet = np.flatnonzero(rainfall > 0)
+        deficit, previous = self.deficit_mm, -1
+        maximum, recovery, constant = self.max_deficit_mm, self.recovery_mm, self.constant_loss_mm
+        for i, depth in zip(wet.tolist(), rainfall[wet].tolist()):
+            if i - previous > 1:
+                deficit = min(maximum, deficit + recovery * (i - previous - 1))
+            fill = min(depth, deficit)
+            deficit -= fill
+            if depth - fill > constant:
+                excess[i] = depth - fill - constant
+            previous = i
+        if rainfall.size - previous > 1:
+            deficit = min(maximum, deficit + recovery * (rainfall.size - previous - 1))
+        self.deficit_mm = deficit
+        return excess
+
+    @property
+    def state(self) -> Dict:
+        return {'deficit_mm': self.deficit_mm}
+
+
+# Métodos de pérdidas del modo continuo (parámetros como argumentos con nombre)
+CONTINUOUS_LOSS_METHODS: Dict[str, Callable] = {
+    'rational': _RationalLoss,
+    'scs_curve_number': _CurveNumberLoss,
+    'deficit_constant': _DeficitConstantLoss,
+}
+
+
+# ---------------------------------------------------------------------------
+# Transformación
+# ---------------------------------------------------------------------------
+
+def continuous_unit_hydrograph(
+    method: str,
+    area_km2: float,
+    tc_minutes: float,
+    time_step_minutes: float,
+    unit_hydrograph: str = 'clark',
+    unit_hydrograph_params: Optional[Dict] = None
+) -> np.ndarray:
+    """
+    Hidrograma unitario lineal [m³/s por mm de lluvia efectiva].
+
+    'scs_unit_hydrograph' y 'synth_unit_hydro' coinciden con los de
+    calculate_hydrograph(); 'rational' es el triangular normalizado a un
+    volumen de 1 mm sobre la cuenca.
+
+    Raises:
+        ValueError: Método desconocido o parámetros inválidos
+    """
+    if area_km2 <= 0:
+        raise ValueError(f"Área debe ser > 0. Valor: {area_km2}")
+    if tc_minutes <= 0:
+        raise ValueError(f"Tc debe ser > 0. Valor: {tc_minutes}")
+    volume_rate = area_km2 * 1000 / (time_step_minutes * 60)
+
+    if method == 'rational':
+        shape = triangular_unit_hydrograph(tc_minutes, time_step_minutes)
+        return shape / shape.sum() * volume_rate
+    if method == 'scs_unit_hydrograph':
+        time_to_peak_minutes = scs_time_to_peak_minutes(tc_minutes, time_step_minutes)
+        unit_peak_m3s = SCS_PEAK_RATE_FACTOR * area_km2 / (time_to_peak_minutes / 60)
+        return scs_dimensionless_unit_hydrograph(tc_minutes, time_step_minutes) * unit_peak_m3s
+    if method == 'synth_unit_hydro':
+        return synthetic_unit_hydrograph(
+            unit_hydrograph, tc_minutes, time_step_minutes, **(unit_hydrograph_params or {})
+        ) * volume_rate
+    raise ValueError(
+        f"Método de hidrograma '{method}' no soportado en modo continuo. "
+        f"Opciones: ['rational', 'scs_unit_hydrograph', 'synth_unit_hydro']"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tránsito con estado
+# ---------------------------------------------------------------------------
+
+class _MuskingumReachStream:
+    """
+    Tránsito de Muskingum por bloques: conserva el último caudal de entrada
+    (para interpolar los sub-pasos) y las condiciones finales del filtro
+    IIR de cada sub-tramo. Inicia en régimen permanente con el primer caudal.
+    """
+
+    def __init__(self, coefficients: Tuple[float, float, float], num_substeps: int, num_subreaches: int):
+        c0, c1, c2 = coefficients
+        self.b, self.a = [c0, c1], [1.0, -c2]
+        self.num_substeps = num_substeps
+        self.num_subreaches = num_subreaches
+        self.previous_inflow: Optional[float] = None
+        self.conditions: List[np.ndarray] = []
+
+    def __call__(self, inflow: np.ndarray) -> np.ndarray:
+        if self.previous_inflow is None:
+            self.previous_inflow = float(inflow[0])
+            zi = lfilter_zi(self.b, self.a) * self.previous_inflow
+            self.conditions = [zi.copy() for _ in range(self.num_subreaches)]
+
+        # Sub-pasos interpolados entre el último caudal del bloque anterior y éste
+        signal = inflow
+        n = self.num_substeps
+        if n > 1:
+            extended = np.concatenate([[self.previous_inflow], inflow])
+            lower, offset = np.divmod(np.arange(1, inflow.size * n + 1), n)
+            upper = np.minimum(lower + 1, extended.size - 1)
+            weight = offset / n
+            signal = extended[lower] * (1 - weight) + extended[upper] * weight
+
+        for reach in range(self.num_subreaches):
+            signal, self.conditions[reach] = lfilter(self.b, self.a, signal, zi=self.conditions[reach])
+        self.previous_inflow = float(inflow[-1])
+        return signal[n - 1::n]
+
+    @property
+    def state(self) -> Dict:
+        return {'previous_inflow_m3s': self.previous_inflow}
+
+
+class _ModifiedPulsStream:
+    """
+    Puls modificado por bloques sobre una laguna: conserva el último caudal
+    de entrada y 2S/Δt + O. Bucle escalar con búsqueda binaria (bisect) en
+    la curva de indicación, con la misma interpolación que
+    StorageIndicationTable.
+    """
+
+    def __init__(
+        self,
+        time_step_minutes: float,
+        storage_m3: ArrayLike,
+        discharge_m3s: ArrayLike,
+        initial_storage_m3: Optional[float] = None
+    ):
+        table = storage_indication_table(storage_m3, discharge_m3s, time_step_minutes)
+        if table.num_ponds != 1:
+            raise ValueError("El tránsito continuo admite una sola laguna")
+        self.table = table
+        self.keys = table.indication_m3s[0].tolist()
+        self.values = table.discharge_m3s[0].tolist()
+        self.slopes = [
+            (self.values[j + 1] - self.values[j]) / (self.keys[j + 1] - self.keys[j])
+            for j in range(len(self.keys) - 1)
+        ]
+        self.dt_seconds = time_step_minutes * 60
+        self.initial_storage_m3 = initial_storage_m3
+        self.previous_inflow: Optional[float] = None
+        self.indication = 0.0
+        self.outflow = 0.0
+
+    def __call__(self, inflow: np.ndarray) -> np.ndarray:
+        outflow = np.empty_like(inflow)
+        values = inflow.tolist()
+        start = 0
+        if self.previous_inflow is None:
+            rows = np.zeros(1, dtype=np.intp)
+            if self.initial_storage_m3 is None:
+                storage = self.table.steady_storage(inflow[:1], rows)
+            else:
+                storage = np.array([float(self.initial_storage_m3)])
+            self.outflow = float(self.table.discharge(storage, rows)[0])
+            self.indication = 2 * float(storage[0]) / self.dt_seconds + self.outflow
+            self.previous_inflow = values[0]
+            outflow[0] = self.outflow
+            start = 1
+
+        keys, table_values, slopes = self.keys, self.values, self.slopes
+        last_segment = len(keys) - 2
+        previous, indication, current_outflow = self.previous_inflow, self.indication, self.outflow
+        for i in range(start, len(values)):
+            current = values[i]
+            indication = previous + current + indication - 2 * current_outflow
+            if indication <= keys[0]:
+                current_outflow = table_values[0]
+            else:
+                j = min(bisect.bisect_right(keys, indication) - 1, last_segment)
+                current_outflow = table_values[j] + slopes[j] * (indication - keys[j])
+            outflow[i] = current_outflow
+            previous = current
+        self.previous_inflow, self.indication, self.outflow = previous, indication, current_outflow
+        return outflow
+
+    @property
+    def storage_m3(self) -> float:
+        return max((self.indication - self.outflow) * self.dt_seconds / 2, 0.0)
+
+    @property
+    def state(self) -> Dict:
+        return {'previous_inflow_m3s': self.previous_inflow, 'storage_m3': self.storage_m3}
+
+
+def _routing_stream(time_step_minutes: float, routing: Dict):
+    """Tránsito con estado para una especificación {'method': ..., **parámetros}"""
+    params = dict(routing)
+    method = params.pop('method', 'muskingum')
+    try:
+        if method == 'muskingum':
+            params.setdefault('X', 0.2)
+            return _MuskingumReachStream(*_muskingum_reach(time_step_minutes=time_step_minutes, **params))
+        if method == 'muskingum_cunge':
+            if params.get('reference_discharge_m3s') is None:
+                raise ValueError("Muskingum-Cunge continuo requiere reference_discharge_m3s")
+            coefficients, num_substeps, num_subreaches, _ = _muskingum_cunge_reach(
+                time_step_minutes=time_step_minutes, **params
+            )
+            return _MuskingumReachStream(coefficients, num_substeps, num_subreaches)
+        if method == 'modified_puls':
+            return _ModifiedPulsStream(time_step_minutes, **params)
+    except TypeError as e:
+        raise ValueError(f"Parámetros de tramo inválidos para '{method}': {str(e)}")
+    raise ValueError(
+        f"Método de tránsito '{method}' no soportado en modo continuo. "
+        f"Opciones: ['muskingum', 'muskingum_cunge', 'modified_puls']"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Simulación
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class ContinuousChunk:
+    """Resultados de un bloque de la simulación continua"""
+
+    start_index: int
+    time_step_minutes: float
+    rainfall_mm: np.ndarray
+    excess_mm: np.ndarray
+    discharge_m3s: np.ndarray
+    outflow_m3s: Optional[np.ndarray] = None
+    extra: Dict = field(default_factory=dict)
+
+    @property
+    def time_steps(self) -> np.ndarray:
+        """Tiempos [min] desde el inicio del registro"""
+        return (self.start_index + np.arange(self.discharge_m3s.size)) * self.time_step_minutes
+
+    @property
+    def output_m3s(self) -> np.ndarray:
+        """Caudal a la salida (transitado si hay tránsito)"""
+        return self.discharge_m3s if self.outflow_m3s is None else self.outflow_m3s
+
+
+@dataclass(slots=True)
+class ContinuousSummary:
+    """Resumen acumulado de la simulación continua (memoria constante)"""
+
+    time_step_minutes: float
+    num_intervals: int = 0
+    total_rainfall_mm: float = 0.0
+    total_excess_mm: float = 0.0
+    total_volume_m3: float = 0.0
+    peak_discharge_m3s: float = 0.0
+    time_to_peak_minutes: float = 0.0
+
+    @property
+    def runoff_coefficient(self) -> float:
+        return self.total_excess_mm / self.total_rainfall_mm if self.total_rainfall_mm > 0 else 0.0
+
+    def update(self, chunk: ContinuousChunk) -> None:
+        """Acumula un bloque"""
+        output = chunk.output_m3s
+        self.num_intervals += chunk.rainfall_mm.size
+        self.total_rainfall_mm += float(chunk.rainfall_mm.sum())
+        self.total_excess_mm += float(chunk.excess_mm.sum())
+        self.total_volume_m3 += float(output.sum()) * self.time_step_minutes * 60
+        if output.size == 0:
+            return
+        peak_index = int(np.argmax(output))
+        if output[peak_index] > self.peak_discharge_m3s:
+            self.peak_discharge_m3s = float(output[peak_index])
+            self.time_to_peak_minutes = (chunk.start_index + peak_index) * self.time_step_minutes
+
+    def to_dict(self) -> Dict:
+        return {
+            'time_step_minutes': self.time_step_minutes,
+            'num_intervals': self.num_intervals,
+            'duration_hours': self.num_intervals * self.time_step_minutes / 60,
+            'total_rainfall_mm': self.total_rainfall_mm,
+            'total_excess_mm': self.total_excess_mm,
+            'runoff_coefficient': self.runoff_coefficient,
+            'total_volume_m3': self.total_volume_m3,
+            'peak_discharge_m3s': self.peak_discharge_m3s,
+            'time_to_peak_minutes': self.time_to_peak_minutes,
+        }
+
+
+class ContinuousSimulation:
+    """
+    Simulación continua por bloques con estado entre bloques.
+
+    Tras el último bloque, finish() entrega la recesión pendiente de la
+    convolución (sin ella el volumen y el pico del resumen quedan
+    truncados); quien consuma run()/process() directamente debe llamarlo.
+
+    Args:
+        area_km2: Área de la cuenca [km²]
+        tc_minutes: Tiempo de concentración [min]
+        time_step_minutes: Paso de tiempo del registro [min]
+        loss_method: 'rational' | 'scs_curve_number' | 'deficit_constant'
+        loss_params: Parámetros del método de pérdidas
+            - rational: C
+            - scs_curve_number: CN, antecedent_condition, inter_event_hours
+            - deficit_constant: initial_deficit_mm, max_deficit_mm,
+              constant_rate_mm_h, recovery_rate_mm_h
+        method: Hidrograma unitario ('rational', 'scs_unit_hydrograph',
+            'synth_unit_hydro'), ver continuous_unit_hydrograph()
+        unit_hydrograph: Generador sintético (method='synth_unit_hydro')
+        unit_hydrograph_params: Parámetros de forma del generador
+        routing: Tránsito a la salida (opcional): {'method': 'muskingum' |
+            'muskingum_cunge' | 'modified_puls', **parámetros del tramo};
+            Muskingum-Cunge requiere reference_discharge_m3s
+
+    Raises:
+        ValueError: Parámetros inválidos
+    """
+
+    def __init__(
+        self,
+        area_km2: float,
+        tc_minutes: float,
+        time_step_minutes: float,
+        loss_method: str = 'scs_curve_number',
+        loss_params: Optional[Dict] = None,
+        method: str = 'scs_unit_hydrograph',
+        unit_hydrograph: str = 'clark',
+        unit_hydrograph_params: Optional[Dict] = None,
+        routing: Optional[Dict] = None
+    ):
+        if time_step_minutes <= 0:
+            raise ValueError(f"time_step_minutes debe ser > 0. Valor: {time_step_minutes}")
+        if loss_method not in CONTINUOUS_LOSS_METHODS:
+            raise ValueError(
+                f"Método de pérdidas '{loss_method}' no soportado. "
+                f"Opciones: {list(CONTINUOUS_LOSS_METHODS)}"
+            )
+        try:
+            self.loss = CONTINUOUS_LOSS_METHODS[loss_method](time_step_minutes, **(loss_params or {}))
+        except TypeError as e:
+            raise ValueError(f"Parámetros inválidos para '{loss_method}': {str(e)}")
+
+        self.time_step_minutes = time_step_minutes
+        self.loss_method = loss_method
+        self.method = method
+        self.convolver = StreamingConvolver(continuous_unit_hydrograph(
+            method, area_km2, tc_minutes, time_step_minutes, unit_hydrograph, unit_hydrograph_params
+        ))
+        self.router = None if routing is None else _routing_stream(time_step_minutes, routing)
+        self.summary = ContinuousSummary(time_step_minutes=time_step_minutes)
+        self.position = 0
+        self.finished = False
+
+    def process(self, rainfall_mm: ArrayLike) -> ContinuousChunk:
+        """Simula un bloque de lluvia [mm por intervalo] a continuación del anterior"""
+        if self.finished:
+            raise ValueError("La simulación ya terminó (finish())")
+        rainfall = _validate_chunk(rainfall_mm)
+        if rainfall.size == 0:
+            raise ValueError("Los bloques de lluvia no pueden estar vacíos")
+        excess = self.loss(rainfall)
+        discharge = self.convolver.push(excess)
+        chunk = ContinuousChunk(
+            start_index=self.position,
+            time_step_minutes=self.time_step_minutes,
+            rainfall_mm=rainfall,
+            excess_mm=excess,
+            discharge_m3s=discharge,
+            outflow_m3s=None if self.router is None else self.router(discharge)
+        )
+        if isinstance(self.router, _ModifiedPulsStream):
+            chunk.extra['storage_m3'] = self.router.storage_m3
+        self.position += rainfall.size
+        self.summary.update(chunk)
+        return chunk
+
+    def run(self, rainfall_chunks: Iterable[ArrayLike]) -> Iterator[ContinuousChunk]:
+        """Simula los bloques a medida que se consumen (generador)"""
+        for rainfall in rainfall_chunks:
+            yield self.process(rainfall)
+
+    def finish(self) -> ContinuousChunk:
+        """
+        Cierra la simulación: recesión pendiente de la convolución (m - 1 intervalos sin lluvia).
+
+        La cola pasa por el tránsito y se acumula en el resumen (no cuenta
+        como intervalos del registro). Después no se aceptan más bloques.
+        """
+        if self.finished:
+            raise ValueError("La simulación ya terminó (finish())")
+        self.finished = True
+        discharge = self.convolver.flush()
+        chunk = ContinuousChunk(
+            start_index=self.position,
+            time_step_minutes=self.time_step_minutes,
+            rainfall_mm=np.zeros(0),
+            excess_mm=np.zeros(0),
+            discharge_m3s=discharge,
+            outflow_m3s=None if self.router is None else (
+                self.router(discharge) if discharge.size else np.zeros(0)
+            )
+        )
+        if isinstance(self.router, _ModifiedPulsStream):
+            chunk.extra['storage_m3'] = self.router.storage_m3
+        self.summary.update(chunk)
+        return chunk
+
+    @property
+    def state(self) -> Dict:
+        """Estado transportado al próximo bloque"""
+        return {
+            'position': self.position,
+            'loss': self.loss.state,
+            'convolution': {'tail_length': self.convolver.kernel_length - 1},
+            'routing': None if self.router is None else self.router.state,
+        }
+
+
+def simulate_continuous(
+    rainfall_chunks: Iterable[ArrayLike],
+    area_km2: float,
+    tc_minutes: float,
+    time_step_minutes: float,
+    **simulation_params
+) -> ContinuousSummary:
+    """
+    Recorre un registro completo por bloques y retorna solo el resumen
+    (incluye la recesión tras el último bloque, ver ContinuousSimulation.finish()).
+
+    Args:
+        rainfall_chunks: Bloques de lluvia [mm por intervalo] (ver
+            iter_rainfall_chunks(), rainfall_event_chunks())
+        area_km2, tc_minutes, time_step_minutes, **simulation_params:
+            Ver ContinuousSimulation
+
+    Returns:
+        ContinuousSummary
+    """
+    simulation = ContinuousSimulation(area_km2, tc_minutes, time_step_minutes, **simulation_params)
+    for _ in simulation.run(rainfall_chunks):
+        pass
+    simulation.finish()
+    return simulation.summary
@@ -0,0 +1,351 @@
+"""
+Critical Duration Search
+
+Busca la duración de tormenta (y opcionalmente la posición del pico) que
+maximiza el caudal pico de una cuenca para un período de retorno dado.
+
+La precipitación total de cada duración candidata sale de la curva IDF,
+P(D) = P₃,₁₀ × CT(Tr) × CD(D) × CA(Ac, D), y las duraciones candidatas son
+múltiplos enteros del paso de tiempo (D = n × Δt):
+
+1. Las precipitaciones acumuladas P(Δt), ..., P(N_max × Δt) se evalúan una
+   sola vez; la tormenta de n intervalos usa el prefijo P[:n] y su total es
+   P(n × Δt), igual que generate_hyetograph() con ese total.
+2. Una grilla gruesa de duraciones (espaciado geométrico en n) se evalúa
+   en una sola pasada: los hietogramas de todas las duraciones y posiciones
+   de pico candidatas forman una matriz rellenada con ceros.
+3. Alrededor del mejor punto de la grilla, búsqueda por sección áurea sobre
+   el número de intervalos, reutilizando las evaluaciones previas, y un
+   pulido local de ±LOCAL_SCAN_RADIUS intervalos.
+
+Los hidrogramas intermedios no se persisten.
+
+Example:
+    >>> result = find_critical_duration(
+    ...     area_km2=5.2, tc_minutes=45, P3_10=70, Tr=10, C=0.6,
+    ...     search_peak_position=True
+    ... )
+    >>> result.critical_duration_hours, result.peak_discharge_m3s
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from calculators.services.idf_table import get_idf_table
+from .hydrograph_calculator import (
+    HydrographCalculationError,
+    calculate_default_time_step,
+    transform_rainfall_excess_series,
+)
+from .hyetograph import calculate_peak_index, generate_hyetograph_from_depths_series
+from .rainfall_excess import calculate_rainfall_excess_series
+from .series import HydrographResult, HydrographSeries, HyetographSeries, RainfallExcessSeries
+
+
+GOLDEN_SECTION = (math.sqrt(5) - 1) / 2
+
+# Duraciones evaluadas en la grilla gruesa
+DEFAULT_GRID_SIZE = 12
+
+# Entorno del pulido final (intervalos a cada lado del mejor punto)
+LOCAL_SCAN_RADIUS = 2
+
+# Posiciones de pico evaluadas cuando search_peak_position=True
+PEAK_POSITION_GRID = np.linspace(0.0, 1.0, 11)
+
+
+@dataclass(slots=True)
+class CriticalDurationResult:
+    """Duración crítica y el hidrograma correspondiente"""
+
+    critical_duration_hours: float
+    num_intervals: int
+    peak_position_ratio: float
+    peak_discharge_m3s: float
+    time_step_minutes: float
+    calculation: HydrographResult
+    # Evaluaciones de la búsqueda: n intervalos → (caudal pico, posición del pico)
+    evaluations: Dict[int, Tuple[float, float]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        """Serializa resultado y evaluaciones (sin las series intermedias)"""
+        return {
+            'critical_duration_hours': self.critical_duration_hours,
+            'num_intervals': self.num_intervals,
+            'peak_position_ratio': self.peak_position_ratio,
+            'peak_discharge_m3s': self.peak_discharge_m3s,
+            'total_rainfall_mm': self.calculation.total_rainfall_mm,
+            'time_step_minutes': self.time_step_minutes,
+            'num_evaluations': len(self.evaluations),
+            'evaluated_durations': [
+                {
+                    'duration_hours': n * self.time_step_minutes / 60,
+                    'peak_discharge_m3s': peak,
+                    'peak_position_ratio': ratio
+                }
+                for n, (peak, ratio) in sorted(self.evaluations.items())
+            ],
+            'summary': self.calculation.summary()
+        }
+
+
+class _DurationSearch:
+    """Evaluador memoizado del caudal pico por número de intervalos"""
+
+    def __init__(self, cumulative_depths_mm: np.ndarray, ratios: np.ndarray, params: Dict):
+        self.cumulative_depths_mm = cumulative_depths_mm
+        self.ratios = ratios
+        self.params = params
+        self.evaluations: Dict[int, Tuple[float, float]] = {}
+
+    def hyetograph(self, num_intervals: int, peak_position_ratio) -> HyetographSeries:
+        """Hietograma de num_intervals intervalos (una fila por posición de pico)"""
+        depths = self.cumulative_depths_mm[:num_intervals]
+        return generate_hyetograph_from_depths_series(
+            cumulative_depths_mm=depths,
+            total_rainfall_mm=depths[-1],
+            time_step_minutes=self.params['time_step_minutes'],
+            peak_position_ratio=peak_position_ratio,
+            idf_params=self.params['idf_params']
+        )
+
+    def excess(self, rainfall_mm: np.ndarray) -> RainfallExcessSeries:
+        params = self.params
+        return calculate_rainfall_excess_series(
+            rainfall_series=rainfall_mm,
+            method=params['excess_method'],
+            time_step_minutes=params['time_step_minutes'],
+            C=params['C'],
+            CN=params['CN'],
+            antecedent_condition=params['antecedent_condition']
+        )
+
+    def transform(self, excess_mm: np.ndarray) -> HydrographSeries:
+        params = self.params
+        return transform_rainfall_excess_series(
+            rainfall_excess_series=excess_mm,
+            area_km2=params['area_km2'],
+            tc_minutes=params['tc_minutes'],
+            time_step_minutes=params['time_step_minutes'],
+            method=params['method'],
+            unit_hydrograph=params['unit_hydrograph'],
+            unit_hydrograph_params=params['unit_hydrograph_params']
+        )
+
+    def simulate(self, num_intervals: int, peak_position_ratio) -> HydrographResult:
+        """Tormenta de num_intervals intervalos (una fila por posición de pico)"""
+        hyetograph = self.hyetograph(num_intervals, peak_position_ratio)
+        rainfall_excess = self.excess(hyetograph.rainfall_mm)
+        return HydrographResult(
+            hyetograph=hyetograph,
+            rainfall_excess=rainfall_excess,
+            hydrograph=self.transform(rainfall_excess.excess_mm),
+            total_rainfall_mm=float(self.cumulative_depths_mm[num_intervals - 1]),
+            hyetograph_method='alternating_block',
+            excess_method=self.params['excess_method']
+        )
+
+    def candidate_ratios(self, num_intervals: int) -> np.ndarray:
+        """Posiciones de pico candidatas (ratios con el mismo índice de pico dan el mismo hietograma)"""
+        _, first = np.unique(calculate_peak_index(num_intervals, self.ratios), return_index=True)
+        return self.ratios[np.sort(first)]
+
+    def peaks(self, intervals: Sequence[int]) -> np.ndarray:
+        """
+        Máximo caudal pico de varias duraciones en una sola pasada.
+
+        Los hietogramas de las duraciones pendientes (una fila por posición de
+        pico) se rellenan con ceros al final hasta la más larga y la matriz
+        (filas × intervalos) pasa una vez por pérdidas y transformación. Los
+        ceros finales no aportan lluvia efectiva (el número de curva acumula
+        solo lluvia) ni cambian el pico de la convolución; el caudal unitario
+        racional es inversamente proporcional a la duración de la fila y se
+        corrige por la longitud real.
+        """
+        pending = [n for n in dict.fromkeys(intervals) if n not in self.evaluations]
+        if pending:
+            width = max(pending) + 1
+            rows, owners, row_ratios = [], [], []
+            for num_intervals in pending:
+                ratios = self.candidate_ratios(num_intervals)
+                rainfall = self.hyetograph(num_intervals, ratios).rainfall_mm
+                rows.append(np.pad(rainfall, ((0, 0), (0, width - rainfall.shape[-1]))))
+                owners.append(np.full(len(ratios), num_intervals))
+                row_ratios.append(ratios)
+            owners, row_ratios = np.concatenate(owners), np.concatenate(row_ratios)
+
+            peaks = self.transform(self.excess(np.vstack(rows)).excess_mm).peak_discharge_m3s
+            if self.params['method'] == 'rational':
+                peaks = peaks * width / (owners + 1)
+
+            for num_intervals in pending:
+                rows_of_n = np.flatnonzero(owners == num_intervals)
+                best = rows_of_n[int(np.argmax(peaks[rows_of_n]))]
+                self.evaluations[num_intervals] = (float(peaks[best]), float(row_ratios[best]))
+        return np.array([self.evaluations[n][0] for n in intervals])
+
+    def peak(self, num_intervals: int) -> float:
+        """Máximo caudal pico sobre las posiciones de pico candidatas"""
+        return float(self.peaks([num_intervals])[0])
+
+
+def _golden_section_search(search: _DurationSearch, low: int, high: int) -> None:
+    """Evalúa search.peak por sección áurea sobre los enteros de [low, high]"""
+    while high - low > 3:
+        step = round(GOLDEN_SECTION * (high - low))
+        left, right = high - step, low + step
+        if left >= right:
+            right = left + 1
+        if search.peak(left) >= search.peak(right):
+            high = right
+        else:
+            low = left
+
+    for num_intervals in range(low, high + 1):
+        search.peak(num_intervals)
+
+
+def _best_evaluation(search: _DurationSearch) -> int:
+    """Mejor evaluación; ante empate, la duración más corta"""
+    return max(search.evaluations, key=lambda n: (search.evaluations[n][0], -n))
+
+
+def _polish(search: _DurationSearch, min_intervals: int, max_intervals: int) -> int:
+    """
+    Explora ±LOCAL_SCAN_RADIUS intervalos alrededor del mejor punto hasta que
+    deja de cambiar. El arreglo de bloques alternados introduce un rizado
+    par/impar en el caudal pico que la sección áurea no distingue.
+    """
+    while True:
+        best = _best_evaluation(search)
+        pending = [
+            n for n in range(best - LOCAL_SCAN_RADIUS, best + LOCAL_SCAN_RADIUS + 1)
+            if min_intervals <= n <= max_intervals and n not in search.evaluations
+        ]
+        if not pending:
+            return best
+        for num_intervals in pending:
+            search.peak(num_intervals)
+
+
+def find_critical_duration(
+    area_km2: float,
+    tc_minutes: float,
+    P3_10: float,
+    Tr: float,
+    method: str = 'rational',
+    excess_method: str = 'rational',
+    C: float = None,
+    CN: int = None,
+    antecedent_condition: str = 'AMC-II',
+    time_step_minutes: float = None,
+    min_duration_hours: Optional[float] = None,
+    max_duration_hours: float = 24.0,
+    peak_position_ratio: float = 0.5,
+    search_peak_position: bool = False,
+    grid_size: int = DEFAULT_GRID_SIZE,
+    unit_hydrograph: str = None,
+    unit_hydrograph_params: Dict = None
+) -> CriticalDurationResult:
+    """
+    Busca la duración de tormenta que maximiza el caudal pico.
+
+    Args:
+        area_km2: Área de cuenca [km²]
+        tc_minutes: Tiempo de concentración [min]
+        P3_10: Precipitación de referencia IDF [mm]
+        Tr: Período de retorno [años]
+        method: Método de hidrograma
+        excess_method: 'rational' | 'scs_curve_number'
+        C: Coeficiente de escorrentía (para excess_method='rational')
+        CN: Curve Number (para excess_method='scs_curve_number')
+        antecedent_condition: Condición de humedad antecedente (SCS)
+        time_step_minutes: Paso de tiempo [min] (auto si None)
+        min_duration_hours: Duración mínima [h] (None = un paso de tiempo)
+        max_duration_hours: Duración máxima [h]
+        peak_position_ratio: Posición del pico si no se busca
+        search_peak_position: Si True, busca también la posición del pico
+            sobre PEAK_POSITION_GRID
+        grid_size: Duraciones de la grilla gruesa (>= 3)
+        unit_hydrograph: Generador para method='synth_unit_hydro'
+        unit_hydrograph_params: Parámetros de forma del generador
+
+    Returns:
+        CriticalDurationResult
+
+    Raises:
+        ValueError: Parámetros inválidos
+        HydrographCalculationError: Error en el cálculo
+    """
+    if area_km2 <= 0:
+        raise ValueError(f"area_km2 debe ser > 0. Valor: {area_km2}")
+    if tc_minutes <= 0:
+        raise ValueError(f"tc_minutes debe ser > 0. Valor: {tc_minutes}")
+    if excess_method == 'rational' and C is None:
+        raise ValueError("excess_method='rational' requiere parámetro C")
+    if excess_method == 'scs_curve_number' and CN is None:
+        raise ValueError("excess_method='scs_curve_number' requiere parámetro CN")
+    if grid_size < 3:
+        raise ValueError(f"grid_size debe ser >= 3. Valor: {grid_size}")
+
+    if time_step_minutes is None:
+        time_step_minutes = calculate_default_time_step(tc_minutes)
+
+    # Duraciones candidatas como número de intervalos (tolerancia de redondeo)
+    min_intervals = 1 if min_duration_hours is None else max(
+        1, math.ceil(min_duration_hours * 60 / time_step_minutes - 1e-9)
+    )
+    max_intervals = int(max_duration_hours * 60 / time_step_minutes + 1e-9)
+    if max_intervals < min_intervals:
+        raise ValueError(
+            f"Rango de duraciones inválido: {min_duration_hours}-{max_duration_hours} h "
+            f"con Δt = {time_step_minutes} min"
+        )
+
+    try:
+        # Paso 1: precipitaciones acumuladas para la duración máxima (una sola vez)
+        cumulative_depths = get_idf_table().intensity_steps(
+            P3_10=P3_10, Tr=Tr, time_step_minutes=time_step_minutes, num_intervals=max_intervals, Ac=area_km2
+        )['P_mm']
+
+        ratios = PEAK_POSITION_GRID if search_peak_position else np.array([float(peak_position_ratio)])
+        search = _DurationSearch(cumulative_depths, ratios, {
+            'area_km2': area_km2,
+            'tc_minutes': tc_minutes,
+            'time_step_minutes': time_step_minutes,
+            'method': method,
+            'excess_method': excess_method,
+            'C': C,
+            'CN': CN,
+            'antecedent_condition': antecedent_condition,
+            'unit_hydrograph': unit_hydrograph,
+            'unit_hydrograph_params': unit_hydrograph_params,
+            'idf_params': {'P3_10': P3_10, 'Tr': Tr, 'area_km2': area_km2},
+        })
+
+        # Paso 2: grilla gruesa (todas las duraciones en una sola matriz)
+        grid = np.unique(np.geomspace(min_intervals, max_intervals, grid_size).round().astype(int))
+        best = int(np.argmax(search.peaks(grid.tolist())))
+
+        # Paso 3: sección áurea entre los vecinos del mejor punto de la grilla
+        _golden_section_search(
+            search, int(grid[max(best - 1, 0)]), int(grid[min(best + 1, len(grid) - 1)])
+        )
+        num_intervals = _polish(search, min_intervals, max_intervals)
+        peak_discharge, ratio = search.evaluations[num_intervals]
+        calculation = search.simulate(num_intervals, ratio)
+    except ValueError as e:
+        raise HydrographCalculationError(f"Error en búsqueda de duración crítica: {str(e)}")
+
+    return CriticalDurationResult(
+        critical_duration_hours=num_intervals * time_step_minutes / 60,
+        num_intervals=num_intervals,
+        peak_position_ratio=ratio,
+        peak_discharge_m3s=peak_discharge,
+        time_step_minutes=time_step_minutes,
+        calculation=calculation,
+        evaluations=search.evaluations
+    )
@@ -0,0 +1,189 @@
+"""
+Gauge Store - Archivo de lluvia por pluviógrafo en disco (memory-mapped)
+
+Registros largos (décadas a 5 min son millones de intervalos) se guardan
+fuera de la base de datos: un archivo .npy por pluviógrafo con la lámina
+[mm] de cada intervalo en float32, solo con agregados al final. La base
+guarda los metadatos (inicio, Δt) y, por evento, el desplazamiento y la
+cantidad de intervalos dentro del archivo.
+
+El archivo es un .npy estándar (np.load lo abre) con una cabecera de
+tamaño fijo GAUGE_HEADER_SIZE: al agregar se escriben los datos nuevos al
+final y luego se reescribe la cabecera en su lugar con la nueva longitud,
+sin tocar los datos existentes. Un lector concurrente ve la longitud
+anterior o la nueva, nunca datos a medio escribir. Se asume un único
+escritor por pluviógrafo (la ingesta).
+
+Las lecturas son rebanadas de numpy.memmap: sin parseo ni copia; el
+sistema operativo lee solo las páginas de la ventana pedida.
+
+Example:
+    >>> store = GaugeStore('/srv/hidrocal/rainfall')
+    >>> offset = store.append('PLUVIO-01', depths_mm)
+    >>> window = store.read('PLUVIO-01', offset, offset + len(depths_mm))
+    >>> for chunk in iter_rainfall_chunks(store.read('PLUVIO-01')):
+    ...     ...
+"""
+
+import ast
+import math
+import os
+import re
+from pathlib import Path
+from typing import Iterator, List, Tuple, Union
+
+import numpy as np
+
+from .continuous import INTER_EVENT_DRY_HOURS, iter_rainfall_chunks
+
+
+GAUGE_STORE_DTYPE = '<f4'
+
+# Cabecera .npy (v1.0) de tamaño fijo: magic + versión + longitud + dict con relleno
+GAUGE_HEADER_SIZE = 128
+_NPY_PREAMBLE_SIZE = 10
+
+GAUGE_CODE_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+
+
+def _npy_header(length: int) -> bytes:
+    """Cabecera .npy de GAUGE_HEADER_SIZE bytes para un array 1-D de `length` valores"""
+    header = f"{{'descr': '{GAUGE_STORE_DTYPE}', 'fortran_order': False, 'shape': ({length},), }}"
+    padding = GAUGE_HEADER_SIZE - _NPY_PREAMBLE_SIZE - len(header) - 1
+    return (
+        np.lib.format.magic(1, 0)
+        + (GAUGE_HEADER_SIZE - _NPY_PREAMBLE_SIZE).to_bytes(2, 'little')
+        + header.encode('latin1') + b' ' * padding + b'\n'
+    )
+
+
+def _read_length(path: Path) -> int:
+    """Longitud guardada en la cabecera (valida formato y tamaño de cabecera)"""
+    with open(path, 'rb') as file:
+        preamble = file.read(GAUGE_HEADER_SIZE)
+    if len(preamble) < GAUGE_HEADER_SIZE or preamble[:6] != b'\x93NUMPY':
+        raise ValueError(f"{path.name} no es un archivo de pluviógrafo válido")
+    header = ast.literal_eval(preamble[_NPY_PREAMBLE_SIZE:].decode('latin1'))
+    if header.get('descr') != GAUGE_STORE_DTYPE or len(header.get('shape', ())) != 1:
+        raise ValueError(f"{path.name} no es un archivo de pluviógrafo válido: {header}")
+    return header['shape'][0]
+
+
+class GaugeStore:
+    """Directorio de archivos de lluvia por pluviógrafo (<raíz>/<código>.npy)"""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def path(self, code: str) -> Path:
+        """Ruta del archivo de un pluviógrafo"""
+        if not GAUGE_CODE_PATTERN.match(code or ''):
+            raise ValueError(f"Código de pluviógrafo inválido: '{code}' (letras, dígitos, '_', '.', '-')")
+        return self.root / f"{code}.npy"
+
+    def exists(self, code: str) -> bool:
+        return self.path(code).exists()
+
+    def length(self, code: str) -> int:
+        """Intervalos guardados (0 si el pluviógrafo no tiene archivo)"""
+        path = self.path(code)
+        return _read_length(path) if path.exists() else 0
+
+    def append(self, code: str, depths_mm) -> int:
+        """
+        Agrega intervalos al final del registro (crea el archivo si no existe).
+
+        Args:
+            code: Código del pluviógrafo
+            depths_mm: Lámina de cada intervalo [mm] (finita, no negativa)
+
+        Returns:
+            Índice del primer intervalo agregado
+        """
+        depths = np.asarray(depths_mm, dtype=GAUGE_STORE_DTYPE)
+        if depths.ndim != 1:
+            raise ValueError(f"depths_mm debe ser 1-D. Forma: {depths.shape}")
+        if not np.all(np.isfinite(depths)) or np.any(depths < 0):
+            raise ValueError("depths_mm debe ser finito y no negativo")
+
+        path = self.path(code)
+        if not path.exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(path, 'xb') as file:
+                file.write(_npy_header(0))
+
+        offset = _read_length(path)
+        with open(path, 'r+b') as file:
+            # Datos primero (descartando restos de un agregado interrumpido);
+            # la cabecera publica la nueva longitud al final
+            file.seek(GAUGE_HEADER_SIZE + offset * depths.itemsize)
+            file.truncate()
+            file.write(depths.tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+            file.seek(0)
+            file.write(_npy_header(offset + len(depths)))
+            file.flush()
+            os.fsync(file.fileno())
+        return offset
+
+    def read(self, code: str, start: int = None, stop: int = None) -> np.ndarray:
+        """
+        Intervalos [start, stop) como vista de solo lectura (numpy.memmap).
+
+        Índices como en un slice; fuera del registro se recorta.
+        """
+        path = self.path(code)
+        if not path.exists() or _read_length(path) == 0:
+            return np.zeros(0, dtype=GAUGE_STORE_DTYPE)
+        return np.load(path, mmap_mode='r')[start:stop]
+
+    def remove(self, code: str) -> None:
+        """Borra el registro de un pluviógrafo (si existe)"""
+        self.path(code).unlink(missing_ok=True)
+
+    def iter_chunks(self, code: str, start: int = None, stop: int = None, **kwargs) -> Iterator[np.ndarray]:
+        """Bloques float64 de [start, stop) para ContinuousSimulation.run()"""
+        return iter_rainfall_chunks(self.read(code, start, stop), **kwargs)
+
+
+def find_rainfall_events(
+    depths_mm,
+    time_step_minutes: float,
+    inter_event_hours: float = INTER_EVENT_DRY_HOURS,
+    min_depth_mm: float = 0.0
+) -> List[Tuple[int, int]]:
+    """
+    Separa un registro en eventos de lluvia.
+
+    Un evento termina tras inter_event_hours sin lluvia (mismo criterio que
+    la curva número en simulación continua). Se recorren solo los
+    intervalos con lluvia.
+
+    Args:
+        depths_mm: Lámina por intervalo [mm] (array o memmap)
+        time_step_minutes: Δt [min]
+        inter_event_hours: Horas secas que separan dos eventos
+        min_depth_mm: Lámina total mínima para incluir un evento
+
+    Returns:
+        Lista de (inicio, fin) en índices de intervalo, fin exclusivo
+    """
+    if time_step_minutes <= 0:
+        raise ValueError(f"time_step_minutes debe ser > 0. Valor: {time_step_minutes}")
+    if inter_event_hours <= 0:
+        raise ValueError(f"inter_event_hours debe ser > 0. Valor: {inter_event_hours}")
+    dry_steps = max(1, math.ceil(inter_event_hours * 60 / time_step_minutes - 1e-9))
+
+    wet = np.flatnonzero(np.asarray(depths_mm) > 0)
+    if wet.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(wet) - 1 >= dry_steps)
+    starts = wet[np.concatenate([[0], breaks + 1])]
+    stops = wet[np.concatenate([breaks, [wet.size - 1]])] + 1
+
+    cumulative = np.concatenate([[0.0], np.cumsum(np.asarray(depths_mm)[wet], dtype=np.float64)])
+    bounds = np.concatenate([[0], breaks + 1, [wet.size]])
+    totals = cumulative[bounds[1:]] - cumulative[bounds[:-1]]
+    keep = totals >= min_depth_mm
+    return list(zip(starts[keep].tolist(), stops[keep].tolist()))
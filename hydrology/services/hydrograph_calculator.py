@@ -5,16 +5,35 @@ Calcula hidrogramas usando diferentes métodos hidrológicos.
 
 Métodos implementados:
 - Rational Method (Hidrograma triangular/trapezoidal)
+- SCS Dimensionless Unit Hydrograph (NEH-630, Cap. 16)
+- Synthetic Unit Hydrographs (Clark, cascada de Nash, Snyder)
 - Convolution method (convolución lluvia efectiva con hidrograma unitario)
 
 Referencias:
 - Chow, V.T., Maidment, D.R., Mays, L.W. (1988). Applied Hydrology. McGraw-Hill.
 - Ven Te Chow (1964). Handbook of Applied Hydrology.
+- USDA-NRCS (2007). National Engineering Handbook, Part 630, Chapter 16.
 """
 
-from typing import Dict, List, Optional
-from .hyetograph import generate_hyetograph
-from .rainfall_excess import calculate_rainfall_excess
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .convolution import ArrayLike, convolve_series
+from .hyetograph import generate_hyetograph_series
+from .pipeline import PipelineStage, run_stage
+from .rainfall_excess import calculate_rainfall_excess_series
+from .result_cache import RESULT_CACHE, hydrograph_cache_key
+from .series import HydrographResult, HydrographSeries, _scalar
+from .unit_hydrograph import (
+    SCS_PEAK_RATE_FACTOR,
+    SYNTHETIC_UNIT_HYDROGRAPHS,
+    scs_dimensionless_unit_hydrograph,
+    scs_time_to_peak_minutes,
+    stack_unit_hydrographs,
+    synthetic_unit_hydrograph,
+    triangular_unit_hydrograph,
+)
 
 
 class HydrographCalculationError(Exception):
@@ -55,20 +74,50 @@ def calculate_hydrograph_rational(
             'method': 'rational'
         }
     """
+    if not isinstance(rainfall_excess_series, np.ndarray) and not rainfall_excess_series:
+        raise ValueError("rainfall_excess_series no puede estar vacía")
+
+    return calculate_hydrograph_rational_series(
+        area_km2=area_km2,
+        tc_minutes=tc_minutes,
+        rainfall_excess_series=rainfall_excess_series,
+        time_step_minutes=time_step_minutes
+    ).to_dict()
+
+
+def calculate_hydrograph_rational_series(
+    area_km2: float,
+    tc_minutes: float,
+    rainfall_excess_series: ArrayLike,
+    time_step_minutes: float = 5
+) -> HydrographSeries:
+    """
+    Igual que calculate_hydrograph_rational() pero retorna HydrographSeries
+    (arrays de NumPy, sin conversión a listas).
+
+    Acepta una matriz de lluvias efectivas (..., n_intervalos) y un área
+    escalar o por escenario: con Tc común todas las filas comparten la forma
+    del hidrograma unitario, que se convoluciona una sola vez por fila y se
+    escala por el caudal unitario de cada escenario. Con Tc por escenario
+    cada fila usa su propia forma (ver stack_unit_hydrographs()).
+    """
     # Validaciones
-    if area_km2 <= 0:
+    area = np.asarray(area_km2, dtype=np.float64)
+    if np.any(area <= 0):
         raise ValueError(f"Área debe ser > 0. Valor: {area_km2}")
-    if tc_minutes <= 0:
+    if np.any(np.asarray(tc_minutes) <= 0):
         raise ValueError(f"Tc debe ser > 0. Valor: {tc_minutes}")
-    if not rainfall_excess_series or len(rainfall_excess_series) == 0:
+
+    rainfall_excess = np.asarray(rainfall_excess_series, dtype=np.float64)
+    if rainfall_excess.size == 0:
         raise ValueError("rainfall_excess_series no puede estar vacía")
 
     # Convertir área a m²
-    area_m2 = area_km2 * 1_000_000
+    area_m2 = area * 1_000_000
 
     # Calcular intensidad promedio de lluvia efectiva (mm/h)
-    total_excess_mm = sum(rainfall_excess_series)
-    duration_hours = len(rainfall_excess_series) * time_step_minutes / 60
+    total_excess_mm = rainfall_excess.sum(axis=-1)
+    duration_hours = rainfall_excess.shape[-1] * time_step_minutes / 60
 
     if duration_hours == 0:
         raise HydrographCalculationError("Duración de tormenta es 0")
@@ -78,105 +127,360 @@ def calculate_hydrograph_rational(
     # Caudal pico usando fórmula racional: Q = (C × i × A) / 360
     # Como ya tenemos lluvia efectiva (C × P), usamos la intensidad efectiva
     # Q (m³/s) = (i_eff [mm/h] × A [ha]) / 360
-    area_ha = area_km2 * 100
+    area_ha = area * 100
     peak_discharge_m3s = (avg_intensity_mmh * area_ha) / 360
 
-    # Parámetros del hidrograma triangular
-    time_to_peak = tc_minutes
-    time_base = 2.67 * tc_minutes  # Aproximación común
+    # Hidrograma unitario triangular (1 mm de lluvia efectiva): la forma
+    # adimensional (cacheada por Tc y Δt) es común a todas las filas, el
+    # caudal unitario no
+    unit_hydrograph = stack_unit_hydrographs(
+        lambda tc: triangular_unit_hydrograph(tc, time_step_minutes), tc_minutes
+    )
+    unit_peak = peak_discharge_m3s / np.where(total_excess_mm > 0, total_excess_mm, 1)
+
+    # Convolución: hidrograma = lluvia efectiva ⊗ hidrograma unitario
+    discharge_series = convolve_rainfall_with_unit_hydrograph(
+        rainfall_excess,
+        unit_hydrograph,
+        time_step_minutes,
+        area_m2
+    ) * np.asarray(unit_peak)[..., np.newaxis]
+
+    return HydrographSeries(
+        discharge_m3s=discharge_series,
+        time_step_minutes=time_step_minutes,
+        method='rational',
+        area_km2=area_km2,
+        tc_minutes=tc_minutes
+    )
+
+
+def calculate_hydrograph_scs(
+    area_km2: float,
+    tc_minutes: float,
+    rainfall_excess_series: List[float],
+    time_step_minutes: float = 5
+) -> Dict:
+    """
+    Calcula hidrograma usando el Hidrograma Unitario Adimensional SCS.
+
+    - Retardo: t_lag = 0.6 × Tc
+    - Tiempo al pico: Tp = Δt/2 + t_lag
+    - Caudal pico por mm de lluvia efectiva: qp = 0.208 × A [km²] / Tp [h]
+    - Forma: tabla t/Tp – q/qp (NEH-630, Tabla 16-1), hasta 5 Tp
+
+    Apropiado para cuencas rurales grandes, donde el hidrograma triangular
+    del método racional no es aceptable.
+
+    Args:
+        area_km2: Área de la cuenca en km²
+        tc_minutes: Tiempo de concentración en minutos
+        rainfall_excess_series: Serie de lluvia efectiva (mm)
+        time_step_minutes: Paso de tiempo en minutos
 
-    # Generar hidrograma triangular usando convolución
-    # Crear hidrograma unitario triangular (1 mm de lluvia efectiva)
-    num_intervals = int((time_base / time_step_minutes) + 2)
-    unit_hydrograph = []
+    Returns:
+        Dict con la misma estructura que calculate_hydrograph_rational(),
+        con method='scs_unit_hydrograph' y además:
+        - lag_minutes: Retardo de la cuenca
+        - uh_time_to_peak_minutes: Tp del hidrograma unitario
+        - uh_peak_m3s_per_mm: qp del hidrograma unitario
+    """
+    if not isinstance(rainfall_excess_series, np.ndarray) and not rainfall_excess_series:
+        raise ValueError("rainfall_excess_series no puede estar vacía")
 
-    for i in range(num_intervals):
-        t = i * time_step_minutes
+    return calculate_hydrograph_scs_series(
+        area_km2=area_km2,
+        tc_minutes=tc_minutes,
+        rainfall_excess_series=rainfall_excess_series,
+        time_step_minutes=time_step_minutes
+    ).to_dict()
 
-        if t <= time_to_peak:
-            # Rama ascendente
-            q_unit = (peak_discharge_m3s / (total_excess_mm if total_excess_mm > 0 else 1)) * (t / time_to_peak)
-        elif t <= time_base:
-            # Rama descendente
-            q_unit = (peak_discharge_m3s / (total_excess_mm if total_excess_mm > 0 else 1)) * \
-                     (time_base - t) / (time_base - time_to_peak)
-        else:
-            q_unit = 0
 
-        unit_hydrograph.append(max(0, q_unit))
+def calculate_hydrograph_scs_series(
+    area_km2: float,
+    tc_minutes: float,
+    rainfall_excess_series: ArrayLike,
+    time_step_minutes: float = 5
+) -> HydrographSeries:
+    """
+    Igual que calculate_hydrograph_scs() pero retorna HydrographSeries.
 
-    # Convolución: hidrograma = lluvia efectiva ⊗ hidrograma unitario
+    Las ordenadas q/qp se toman de la caché (una interpolación por Δt/Tp);
+    cada llamada es una convolución más un escalado por qp. Acepta una matriz
+    de lluvias efectivas (..., n_intervalos) y un área y un Tc escalares o
+    por escenario.
+    """
+    # Validaciones
+    area = np.asarray(area_km2, dtype=np.float64)
+    if np.any(area <= 0):
+        raise ValueError(f"Área debe ser > 0. Valor: {area_km2}")
+    if np.any(np.asarray(tc_minutes) <= 0):
+        raise ValueError(f"Tc debe ser > 0. Valor: {tc_minutes}")
+
+    rainfall_excess = np.asarray(rainfall_excess_series, dtype=np.float64)
+    if rainfall_excess.size == 0:
+        raise ValueError("rainfall_excess_series no puede estar vacía")
+
+    time_to_peak_minutes = scs_time_to_peak_minutes(tc_minutes, time_step_minutes)
+    unit_peak_m3s = SCS_PEAK_RATE_FACTOR * area / (time_to_peak_minutes / 60)
+
+    # Convolución con la forma adimensional y escalado por qp de cada escenario
     discharge_series = convolve_rainfall_with_unit_hydrograph(
-        rainfall_excess_series,
-        unit_hydrograph,
+        rainfall_excess,
+        stack_unit_hydrographs(
+            lambda tc: scs_dimensionless_unit_hydrograph(tc, time_step_minutes), tc_minutes
+        ),
         time_step_minutes,
-        area_m2
+        area * 1_000_000
+    ) * unit_peak_m3s[..., np.newaxis]
+
+    return HydrographSeries(
+        discharge_m3s=discharge_series,
+        time_step_minutes=time_step_minutes,
+        method='scs_unit_hydrograph',
+        area_km2=area_km2,
+        tc_minutes=tc_minutes,
+        extra={
+            'lag_minutes': time_to_peak_minutes - time_step_minutes / 2,
+            'uh_time_to_peak_minutes': time_to_peak_minutes,
+            'uh_peak_m3s_per_mm': unit_peak_m3s
+        }
     )
 
-    # Calcular volúmenes acumulados
-    cumulative_volume = []
-    volume = 0
 
-    for q in discharge_series:
-        volume += q * time_step_minutes * 60  # m³ (Q en m³/s × tiempo en segundos)
-        cumulative_volume.append(volume)
+def calculate_hydrograph_synthetic(
+    area_km2: float,
+    tc_minutes: float,
+    rainfall_excess_series: List[float],
+    time_step_minutes: float = 5,
+    unit_hydrograph: str = 'clark',
+    unit_hydrograph_params: Optional[Dict] = None
+) -> Dict:
+    """
+    Calcula hidrograma con un hidrograma unitario sintético.
+
+    Generadores (ver hydrology.services.unit_hydrograph):
+    - 'clark': traslación tiempo-área + embalse lineal
+      (storage_coefficient_minutes)
+    - 'nash': cascada de n embalses lineales
+      (num_reservoirs, storage_constant_minutes)
+    - 'snyder': retardo y coeficiente de pico de Snyder
+      (lag_minutes, peaking_coefficient)
+
+    Args:
+        area_km2: Área de la cuenca en km²
+        tc_minutes: Tiempo de concentración en minutos
+        rainfall_excess_series: Serie de lluvia efectiva (mm)
+        time_step_minutes: Paso de tiempo en minutos
+        unit_hydrograph: Generador ('clark', 'nash', 'snyder')
+        unit_hydrograph_params: Parámetros de forma del generador (opcional)
+
+    Returns:
+        Dict con la misma estructura que calculate_hydrograph_rational(),
+        con method='synth_unit_hydro' y además:
+        - unit_hydrograph: Generador utilizado
+        - uh_time_to_peak_minutes: Tiempo al pico del hidrograma unitario
+        - uh_peak_m3s_per_mm: Caudal pico del hidrograma unitario
+    """
+    if not isinstance(rainfall_excess_series, np.ndarray) and not rainfall_excess_series:
+        raise ValueError("rainfall_excess_series no puede estar vacía")
+
+    return calculate_hydrograph_synthetic_series(
+        area_km2=area_km2,
+        tc_minutes=tc_minutes,
+        rainfall_excess_series=rainfall_excess_series,
+        time_step_minutes=time_step_minutes,
+        unit_hydrograph=unit_hydrograph,
+        unit_hydrograph_params=unit_hydrograph_params
+    ).to_dict()
+
+
+def calculate_hydrograph_synthetic_series(
+    area_km2: float,
+    tc_minutes: float,
+    rainfall_excess_series: ArrayLike,
+    time_step_minutes: float = 5,
+    unit_hydrograph: str = 'clark',
+    unit_hydrograph_params: Optional[Dict] = None
+) -> HydrographSeries:
+    """
+    Igual que calculate_hydrograph_synthetic() pero retorna HydrographSeries.
+
+    Acepta una matriz de lluvias efectivas (..., n_intervalos) y un área y
+    un Tc escalares o por escenario.
+    """
+    return calculate_synthetic_hydrographs_series(
+        area_km2=area_km2,
+        tc_minutes=tc_minutes,
+        rainfall_excess_series=rainfall_excess_series,
+        time_step_minutes=time_step_minutes,
+        unit_hydrographs=[unit_hydrograph],
+        unit_hydrograph_params={unit_hydrograph: unit_hydrograph_params or {}}
+    )[unit_hydrograph]
+
+
+def calculate_synthetic_hydrographs_series(
+    area_km2: float,
+    tc_minutes: float,
+    rainfall_excess_series: ArrayLike,
+    time_step_minutes: float = 5,
+    unit_hydrographs: Optional[Sequence[str]] = None,
+    unit_hydrograph_params: Optional[Dict[str, Dict]] = None
+) -> Dict[str, HydrographSeries]:
+    """
+    Hidrogramas de una misma lluvia efectiva con varios hidrogramas
+    unitarios sintéticos, en una sola convolución.
+
+    Las ordenadas de pulso (cacheadas) se apilan en una matriz
+    (n_generadores, m) y se convolucionan juntas con la lluvia efectiva;
+    cada resultado se recorta a la longitud de su propio hidrograma unitario.
+
+    Q(t) = Σ [Pe(i) × h(t-i)] × A × 1000 / (Δt × 60)
+
+    Args:
+        area_km2: Área de la cuenca en km² (escalar o por escenario)
+        tc_minutes: Tiempo de concentración en minutos (escalar o por escenario)
+        rainfall_excess_series: Lluvia efectiva [mm], forma (..., n_intervalos)
+        time_step_minutes: Paso de tiempo en minutos
+        unit_hydrographs: Generadores (None = todos los de SYNTHETIC_UNIT_HYDROGRAPHS)
+        unit_hydrograph_params: {generador: parámetros de forma} (opcional)
+
+    Returns:
+        {generador: HydrographSeries} con method='synth_unit_hydro'
+    """
+    # Validaciones
+    area = np.asarray(area_km2, dtype=np.float64)
+    if np.any(area <= 0):
+        raise ValueError(f"Área debe ser > 0. Valor: {area_km2}")
+    if np.any(np.asarray(tc_minutes) <= 0):
+        raise ValueError(f"Tc debe ser > 0. Valor: {tc_minutes}")
+
+    rainfall_excess = np.asarray(rainfall_excess_series, dtype=np.float64)
+    if rainfall_excess.size == 0:
+        raise ValueError("rainfall_excess_series no puede estar vacía")
 
-    # Serie temporal
-    time_steps = [i * time_step_minutes for i in range(len(discharge_series))]
+    if unit_hydrographs is None:
+        unit_hydrographs = list(SYNTHETIC_UNIT_HYDROGRAPHS)
+    unit_hydrograph_params = unit_hydrograph_params or {}
+    ordinates = [
+        stack_unit_hydrographs(
+            lambda tc, name=name: synthetic_unit_hydrograph(
+                name, tc, time_step_minutes, **unit_hydrograph_params.get(name, {})
+            ),
+            tc_minutes
+        )
+        for name in unit_hydrographs
+    ]
 
-    # Encontrar caudal pico real y tiempo al pico
-    actual_peak = max(discharge_series) if discharge_series else 0
-    peak_index = discharge_series.index(actual_peak) if actual_peak > 0 else 0
-    actual_time_to_peak = peak_index * time_step_minutes
+    # Kernels apilados (rellenos con ceros) → una convolución para todos
+    kernels = np.zeros(
+        np.shape(tc_minutes) + (len(ordinates), max(o.shape[-1] for o in ordinates))
+    )
+    for index, ordinate in enumerate(ordinates):
+        kernels[..., index, :ordinate.shape[-1]] = ordinate
+    volume_rate = area * 1000 / (time_step_minutes * 60)
+    discharge = convolve_rainfall_with_unit_hydrograph(
+        rainfall_excess[..., np.newaxis, :],
+        kernels,
+        time_step_minutes,
+        area * 1_000_000
+    ) * volume_rate[..., np.newaxis, np.newaxis]
 
+    num_intervals = rainfall_excess.shape[-1]
     return {
-        'time_steps': time_steps,
-        'discharge_m3s': discharge_series,
-        'cumulative_volume_m3': cumulative_volume,
-        'peak_discharge_m3s': actual_peak,
-        'time_to_peak_minutes': actual_time_to_peak,
-        'time_base_minutes': time_steps[-1] if time_steps else 0,
-        'total_volume_m3': volume,
-        'method': 'rational',
-        'area_km2': area_km2,
-        'tc_minutes': tc_minutes,
-        'time_step_minutes': time_step_minutes
+        name: HydrographSeries(
+            discharge_m3s=discharge[..., index, :num_intervals + ordinate.shape[-1] - 1],
+            time_step_minutes=time_step_minutes,
+            method='synth_unit_hydro',
+            area_km2=area_km2,
+            tc_minutes=tc_minutes,
+            extra={
+                'unit_hydrograph': name,
+                'uh_time_to_peak_minutes': _scalar(np.argmax(ordinate, axis=-1) * float(time_step_minutes)),
+                'uh_peak_m3s_per_mm': ordinate.max(axis=-1) * volume_rate
+            }
+        )
+        for index, (name, ordinate) in enumerate(zip(unit_hydrographs, ordinates))
     }
 
 
+# Métodos de transformación lluvia efectiva → caudal (funciones *_series)
+HYDROGRAPH_METHODS = {
+    'rational': calculate_hydrograph_rational_series,
+    'scs_unit_hydrograph': calculate_hydrograph_scs_series,
+    'synth_unit_hydro': calculate_hydrograph_synthetic_series,
+}
+
+# Parámetros adicionales que acepta cada método de HYDROGRAPH_METHODS
+HYDROGRAPH_METHOD_PARAMETERS = {
+    'synth_unit_hydro': ('unit_hydrograph', 'unit_hydrograph_params'),
+}
+
+
+def transform_rainfall_excess_series(
+    rainfall_excess_series: ArrayLike,
+    area_km2,
+    tc_minutes: float,
+    time_step_minutes: float,
+    method: str = 'rational',
+    **method_params
+) -> HydrographSeries:
+    """
+    Transforma lluvia efectiva en caudal con el método de hidrograma indicado.
+
+    Acepta una matriz de lluvias efectivas (..., n_intervalos) con área y Tc
+    escalares o por escenario (ver las funciones de HYDROGRAPH_METHODS).
+    De method_params solo se pasan al método los que declara en
+    HYDROGRAPH_METHOD_PARAMETERS; los valores None se ignoran.
+
+    Raises:
+        ValueError: Método no implementado o parámetros inválidos
+    """
+    if method not in HYDROGRAPH_METHODS:
+        raise ValueError(
+            f"Método de hidrograma '{method}' no implementado aún. "
+            f"Opciones: {list(HYDROGRAPH_METHODS)}"
+        )
+    accepted = HYDROGRAPH_METHOD_PARAMETERS.get(method, ())
+    return HYDROGRAPH_METHODS[method](
+        area_km2=area_km2,
+        tc_minutes=tc_minutes,
+        rainfall_excess_series=rainfall_excess_series,
+        time_step_minutes=time_step_minutes,
+        **{name: value for name, value in method_params.items() if name in accepted and value is not None}
+    )
+
+
 def convolve_rainfall_with_unit_hydrograph(
-    rainfall_excess_mm: List[float],
-    unit_hydrograph_m3s_per_mm: List[float],
+    rainfall_excess_mm: ArrayLike,
+    unit_hydrograph_m3s_per_mm: ArrayLike,
     time_step_minutes: float,
-    area_m2: float
-) -> List[float]:
+    area_m2: float,
+    backend: str = 'auto'
+) -> np.ndarray:
     """
     Realiza convolución discreta entre lluvia efectiva e hidrograma unitario.
 
     Q(t) = Σ [Pe(i) × U(t-i)]
 
+    Los intervalos con lluvia efectiva <= 0 no aportan caudal. El resultado
+    coincide con la convolución escalar dentro de CONVOLUTION_RTOL × max(Q)
+    (ver hydrology.services.convolution). Para lluvia efectiva que llega por
+    bloques (tiempo real, registros continuos) ver StreamingConvolver.
+
     Args:
-        rainfall_excess_mm: Serie de lluvia efectiva [mm]
+        rainfall_excess_mm: Serie de lluvia efectiva [mm] (lista o array, forma (..., n))
         unit_hydrograph_m3s_per_mm: Hidrograma unitario [m³/s por mm]
         time_step_minutes: Paso de tiempo [min]
         area_m2: Área de la cuenca [m²]
+        backend: Backend de convolución ('auto', 'direct', 'fft')
 
     Returns:
-        Serie de caudales [m³/s]
+        Array de caudales [m³/s] de forma (..., n_rain + n_uh - 1)
     """
-    n_rain = len(rainfall_excess_mm)
-    n_uh = len(unit_hydrograph_m3s_per_mm)
-    n_total = n_rain + n_uh - 1
-
-    discharge = [0.0] * n_total
+    rainfall_excess = np.maximum(np.asarray(rainfall_excess_mm, dtype=np.float64), 0.0)
 
-    # Convolución discreta
-    for i in range(n_rain):
-        for j in range(n_uh):
-            if rainfall_excess_mm[i] > 0:
-                discharge[i + j] += rainfall_excess_mm[i] * unit_hydrograph_m3s_per_mm[j]
-
-    return discharge
+    return convolve_series(rainfall_excess, unit_hydrograph_m3s_per_mm, backend=backend)
 
 
 def calculate_hydrograph(
@@ -193,6 +497,9 @@ def calculate_hydrograph(
     peak_position_ratio: float = 0.5,
     P3_10: float = None,
     Tr: float = None,
+    unit_hydrograph: str = None,
+    unit_hydrograph_params: Dict = None,
+    use_cache: bool = True,
     **kwargs
 ) -> Dict:
     """
@@ -208,7 +515,8 @@ def calculate_hydrograph(
         duration_hours: Duración de tormenta [h]
         area_km2: Área de cuenca [km²]
         tc_minutes: Tiempo de concentración [min]
-        method: Método de hidrograma ('rational', 'scs_unit_hydrograph')
+        method: Método de hidrograma ('rational', 'scs_unit_hydrograph',
+            'synth_unit_hydro')
         hyetograph_method: Método de hietograma ('alternating_block', 'uniform')
         excess_method: Método de lluvia efectiva ('rational', 'scs_curve_number')
         C: Coeficiente de escorrentía (para método racional)
@@ -217,6 +525,11 @@ def calculate_hydrograph(
         peak_position_ratio: Posición del pico en hietograma (0.0-1.0)
         P3_10: Precipitación de referencia IDF [mm]
         Tr: Período de retorno [años]
+        unit_hydrograph: Generador para method='synth_unit_hydro'
+            ('clark', 'nash', 'snyder'; default 'clark')
+        unit_hydrograph_params: Parámetros de forma del generador
+        use_cache: Reutilizar resultados de la caché por contenido
+            (result_cache.RESULT_CACHE) y de las cachés por etapa
         **kwargs: Parámetros adicionales
 
     Returns:
@@ -253,6 +566,150 @@ def calculate_hydrograph(
         >>> result['summary']['peak_discharge_m3s']
         8.45
     """
+    return cached_hydrograph_series(
+        total_rainfall_mm=total_rainfall_mm,
+        duration_hours=duration_hours,
+        area_km2=area_km2,
+        tc_minutes=tc_minutes,
+        method=method,
+        hyetograph_method=hyetograph_method,
+        excess_method=excess_method,
+        C=C,
+        CN=CN,
+        time_step_minutes=time_step_minutes,
+        peak_position_ratio=peak_position_ratio,
+        P3_10=P3_10,
+        Tr=Tr,
+        unit_hydrograph=unit_hydrograph,
+        unit_hydrograph_params=unit_hydrograph_params,
+        use_cache=use_cache,
+        **kwargs
+    ).to_dict()
+
+
+def cached_hydrograph_series(
+    total_rainfall_mm: float,
+    duration_hours: float,
+    area_km2: float,
+    tc_minutes: float,
+    method: str = 'rational',
+    hyetograph_method: str = 'alternating_block',
+    excess_method: str = 'rational',
+    C: float = None,
+    CN: int = None,
+    time_step_minutes: float = None,
+    peak_position_ratio: float = 0.5,
+    P3_10: float = None,
+    Tr: float = None,
+    unit_hydrograph: str = None,
+    unit_hydrograph_params: Dict = None,
+    use_cache: bool = True,
+    **kwargs
+) -> HydrographResult:
+    """
+    calculate_hydrograph_series() memoizado por contenido en result_cache.RESULT_CACHE.
+
+    Mismas entradas y misma entrada de caché que calculate_hydrograph(),
+    pero retorna los arrays (HydrographResult) para quien no necesita
+    listas, p. ej. al empaquetar columnas.
+    """
+    params = dict(
+        total_rainfall_mm=total_rainfall_mm,
+        duration_hours=duration_hours,
+        area_km2=area_km2,
+        tc_minutes=tc_minutes,
+        method=method,
+        hyetograph_method=hyetograph_method,
+        excess_method=excess_method,
+        C=C,
+        CN=CN,
+        time_step_minutes=time_step_minutes,
+        peak_position_ratio=peak_position_ratio,
+        P3_10=P3_10,
+        Tr=Tr,
+        unit_hydrograph=unit_hydrograph,
+        unit_hydrograph_params=unit_hydrograph_params,
+        **kwargs
+    )
+
+    def compute():
+        return calculate_hydrograph_series(**params, use_cache=use_cache)
+
+    if not use_cache:
+        return compute()
+
+    # La clave incluye el Δt automático: None y el Δt equivalente comparten resultado
+    if time_step_minutes is None and isinstance(tc_minutes, (int, float)) and tc_minutes > 0:
+        params['time_step_minutes'] = calculate_default_time_step(tc_minutes)
+    return RESULT_CACHE.get_or_compute(hydrograph_cache_key(params), compute)
+
+
+# Etapas de calculate_hydrograph_series(): entradas propias de cada una
+HYDROGRAPH_STAGES = {
+    'hyetograph': PipelineStage('hyetograph', (
+        'total_rainfall_mm', 'duration_hours', 'hyetograph_method', 'time_step_minutes',
+        'peak_position_ratio', 'P3_10', 'Tr', 'area_km2',
+    )),
+    'excess': PipelineStage('excess', (
+        'excess_method', 'C', 'CN', 'excess_params',
+    ), upstream='hyetograph'),
+    'transform': PipelineStage('transform', (
+        'method', 'tc_minutes', 'area_km2', 'unit_hydrograph', 'unit_hydrograph_params',
+    ), upstream='excess'),
+    'summary': PipelineStage('summary', (
+        'total_rainfall_mm', 'hyetograph_method', 'excess_method',
+    ), upstream='transform'),
+}
+
+
+def calculate_default_time_step(tc_minutes: float) -> float:
+    """
+    Paso de tiempo automático: Δt ≤ Tc/5 (HEC-HMS), redondeado a múltiplo de 5.
+
+    Args:
+        tc_minutes: Tiempo de concentración [min]
+
+    Returns:
+        Paso de tiempo [min]
+    """
+    time_step_minutes = max(1, min(30, tc_minutes / 5))
+    time_step_minutes = round(time_step_minutes / 5) * 5  # Redondear a múltiplo de 5
+    if time_step_minutes == 0:
+        time_step_minutes = 5
+    return time_step_minutes
+
+
+def calculate_hydrograph_series(
+    total_rainfall_mm: float,
+    duration_hours: float,
+    area_km2: float,
+    tc_minutes: float,
+    method: str = 'rational',
+    hyetograph_method: str = 'alternating_block',
+    excess_method: str = 'rational',
+    C: float = None,
+    CN: int = None,
+    time_step_minutes: float = None,
+    peak_position_ratio: float = 0.5,
+    P3_10: float = None,
+    Tr: float = None,
+    unit_hydrograph: str = None,
+    unit_hydrograph_params: Dict = None,
+    use_cache: bool = True,
+    **kwargs
+) -> HydrographResult:
+    """
+    Igual que calculate_hydrograph() pero retorna HydrographResult.
+
+    Las tres etapas intercambian arrays de NumPy; la conversión a listas
+    queda para HydrographResult.to_dict() en el borde de serialización.
+
+    Cada etapa (HYDROGRAPH_STAGES) se cachea por el fingerprint de sus
+    entradas y del de la etapa anterior (ver pipeline.py): editar solo C
+    reutiliza el hietograma y recalcula desde la lluvia efectiva. Los
+    arrays del resultado son de solo lectura; use_cache=False recalcula
+    todas las etapas sin tocar las cachés.
+    """
     # Validar parámetros de entrada
     if total_rainfall_mm <= 0:
         raise ValueError(f"total_rainfall_mm debe ser > 0. Valor: {total_rainfall_mm}")
@@ -271,82 +728,98 @@ def calculate_hydrograph(
 
     # Calcular time_step óptimo si no se especificó
     if time_step_minutes is None:
-        # Regla: Δt ≤ Tc/5 (HEC-HMS)
-        time_step_minutes = max(1, min(30, tc_minutes / 5))
-        time_step_minutes = round(time_step_minutes / 5) * 5  # Redondear a múltiplo de 5
-        if time_step_minutes == 0:
-            time_step_minutes = 5
+        time_step_minutes = calculate_default_time_step(tc_minutes)
+
+    params = dict(
+        total_rainfall_mm=total_rainfall_mm,
+        duration_hours=duration_hours,
+        area_km2=area_km2,
+        tc_minutes=tc_minutes,
+        method=method,
+        hyetograph_method=hyetograph_method,
+        excess_method=excess_method,
+        C=C,
+        CN=CN,
+        time_step_minutes=time_step_minutes,
+        peak_position_ratio=peak_position_ratio,
+        P3_10=P3_10,
+        Tr=Tr,
+        unit_hydrograph=unit_hydrograph,
+        unit_hydrograph_params=unit_hydrograph_params,
+        excess_params=kwargs
+    )
 
     # Paso 1: Generar hietograma
-    try:
-        hyetograph_result = generate_hyetograph(
-            total_rainfall_mm=total_rainfall_mm,
-            duration_hours=duration_hours,
-            method=hyetograph_method,
-            time_step_minutes=time_step_minutes,
-            peak_position_ratio=peak_position_ratio,
-            P3_10=P3_10,
-            Tr=Tr,
-            area_km2=area_km2
-        )
-    except Exception as e:
-        raise HydrographCalculationError(f"Error generando hietograma: {str(e)}")
+    def hyetograph_stage():
+        try:
+            return generate_hyetograph_series(
+                total_rainfall_mm=total_rainfall_mm,
+                duration_hours=duration_hours,
+                method=hyetograph_method,
+                time_step_minutes=time_step_minutes,
+                peak_position_ratio=peak_position_ratio,
+                P3_10=P3_10,
+                Tr=Tr,
+                area_km2=area_km2
+            )
+        except Exception as e:
+            raise HydrographCalculationError(f"Error generando hietograma: {str(e)}")
+
+    hyetograph_key, hyetograph = run_stage(
+        HYDROGRAPH_STAGES['hyetograph'], params, None, hyetograph_stage, use_cache
+    )
 
     # Paso 2: Calcular lluvia efectiva
-    try:
-        rainfall_series = hyetograph_result.get('rainfall_mm', [])
+    def excess_stage():
+        try:
+            return calculate_rainfall_excess_series(
+                rainfall_series=hyetograph.rainfall_mm,
+                method=excess_method,
+                time_step_minutes=time_step_minutes,
+                C=C,
+                CN=CN,
+                **kwargs
+            )
+        except Exception as e:
+            raise HydrographCalculationError(f"Error calculando lluvia efectiva: {str(e)}")
 
-        excess_result = calculate_rainfall_excess(
-            rainfall_series=rainfall_series,
-            method=excess_method,
-            time_step_minutes=time_step_minutes,
-            C=C,
-            CN=CN,
-            **kwargs
-        )
-    except Exception as e:
-        raise HydrographCalculationError(f"Error calculando lluvia efectiva: {str(e)}")
+    excess_key, rainfall_excess = run_stage(
+        HYDROGRAPH_STAGES['excess'], params, hyetograph_key, excess_stage, use_cache
+    )
 
     # Paso 3: Calcular hidrograma
-    try:
-        rainfall_excess_series = excess_result.get('excess_series', [])
-
-        if method == 'rational':
-            hydrograph_result = calculate_hydrograph_rational(
+    def transform_stage():
+        try:
+            return transform_rainfall_excess_series(
+                rainfall_excess_series=rainfall_excess.excess_mm,
                 area_km2=area_km2,
                 tc_minutes=tc_minutes,
-                rainfall_excess_series=rainfall_excess_series,
-                time_step_minutes=time_step_minutes
+                time_step_minutes=time_step_minutes,
+                method=method,
+                unit_hydrograph=unit_hydrograph,
+                unit_hydrograph_params=unit_hydrograph_params
             )
-        else:
-            raise ValueError(f"Método de hidrograma '{method}' no implementado aún")
-    except Exception as e:
-        raise HydrographCalculationError(f"Error calculando hidrograma: {str(e)}")
-
-    # Resumen consolidado
-    summary = {
-        'peak_discharge_m3s': hydrograph_result['peak_discharge_m3s'],
-        'peak_discharge_lps': hydrograph_result['peak_discharge_m3s'] * 1000,
-        'time_to_peak_minutes': hydrograph_result['time_to_peak_minutes'],
-        'time_to_peak_hours': hydrograph_result['time_to_peak_minutes'] / 60,
-        'time_base_minutes': hydrograph_result['time_base_minutes'],
-        'total_volume_m3': hydrograph_result['total_volume_m3'],
-        'total_volume_hm3': hydrograph_result['total_volume_m3'] / 1_000_000,
-        'total_rainfall_mm': total_rainfall_mm,
-        'rainfall_excess_mm': excess_result['total_excess_mm'],
-        'infiltration_mm': excess_result['total_infiltration_mm'],
-        'runoff_coefficient': excess_result['runoff_coefficient'],
-        'area_km2': area_km2,
-        'tc_minutes': tc_minutes,
-        'time_step_minutes': time_step_minutes,
-        'method': method,
-        'hyetograph_method': hyetograph_method,
-        'excess_method': excess_method
-    }
+        except Exception as e:
+            raise HydrographCalculationError(f"Error calculando hidrograma: {str(e)}")
 
-    return {
-        'hyetograph': hyetograph_result,
-        'rainfall_excess': excess_result,
-        'hydrograph': hydrograph_result,
-        'summary': summary
-    }
+    transform_key, hydrograph = run_stage(
+        HYDROGRAPH_STAGES['transform'], params, excess_key, transform_stage, use_cache
+    )
+
+    # Paso 4: Resultado
+    def summary_stage():
+        return HydrographResult(
+            hyetograph=hyetograph,
+            rainfall_excess=rainfall_excess,
+            hydrograph=hydrograph,
+            total_rainfall_mm=total_rainfall_mm,
+            hyetograph_method=hyetograph_method,
+            excess_method=excess_method,
+            fingerprints={
+                'hyetograph': hyetograph_key,
+                'excess': excess_key,
+                'transform': transform_key,
+            }
+        )
+
+    return run_stage(HYDROGRAPH_STAGES['summary'], params, transform_key, summary_stage, use_cache)[1]
@@ -12,8 +12,12 @@ Referencias:
 - SCS (1986). Urban Hydrology for Small Watersheds. TR-55.
 """
 
-from typing import Dict, List
-from calculators.services.idf import calculate_intensity_idf
+from typing import Dict
+
+import numpy as np
+
+from calculators.services.idf_table import get_idf_table
+from .series import HyetographSeries, _scalar
 
 
 class HyetographGenerationError(Exception):
@@ -21,6 +25,83 @@ class HyetographGenerationError(Exception):
     pass
 
 
+def calculate_peak_index(num_intervals: int, peak_position_ratio):
+    """
+    Índice del intervalo pico: int(num_intervals × peak_position_ratio),
+    acotado al último intervalo (peak_position_ratio = 1.0 → final).
+
+    Acepta un ratio escalar o un array de ratios (uno por escenario).
+    """
+    ratio = np.asarray(peak_position_ratio, dtype=np.float64)
+    return np.minimum((num_intervals * ratio).astype(np.int64), num_intervals - 1)
+
+
+def _alternating_block_order(num_intervals: int, peak_index) -> np.ndarray:
+    """
+    Permutación de destino del método de bloques alternados.
+
+    El k-ésimo elemento es la posición que recibe el k-ésimo mayor
+    incremento: pico, izquierda, derecha, izquierda, derecha, ... y, cuando
+    un lado se agota, el resto continúa hacia el otro lado. Equivale a ordenar
+    las posiciones por la clave 2·|j - pico| - (j < pico).
+    """
+    offset = np.arange(num_intervals) - np.asarray(peak_index)[..., np.newaxis]
+    key = 2 * np.abs(offset) - (offset < 0)
+    return np.argsort(key, axis=-1)
+
+
+def arrange_alternating_blocks(increments, peak_index) -> np.ndarray:
+    """
+    Ordena incrementos de precipitación en patrón de bloques alternados.
+
+    Operación vectorizada O(n log n): ordena los incrementos de mayor a menor
+    y los dispersa con indexación avanzada sobre la permutación de destino.
+    Opera sobre el último eje, por lo que acepta una matriz (escenarios ×
+    intervalos) con un índice de pico por escenario.
+
+    Args:
+        increments: Incrementos de precipitación [mm], forma (..., n)
+        peak_index: Índice del pico (escalar o array de forma (...))
+
+    Returns:
+        Array de forma (..., n) con el patrón alternado
+    """
+    increments = np.asarray(increments, dtype=np.float64)
+    sorted_increments = -np.sort(-increments, axis=-1)
+    order = _alternating_block_order(increments.shape[-1], peak_index)
+
+    pattern = np.empty_like(sorted_increments)
+    np.put_along_axis(pattern, order, sorted_increments, axis=-1)
+    return pattern
+
+
+def _column(values) -> np.ndarray:
+    """Parámetro por escenario como columna (..., 1) para broadcasting con el tiempo"""
+    return np.asarray(values, dtype=np.float64)[..., np.newaxis]
+
+
+def _validate_storm(total_rainfall_mm, duration_hours: float, time_step_minutes: float) -> None:
+    """Valida los parámetros comunes de la tormenta (total escalar o array)"""
+    if np.any(np.asarray(total_rainfall_mm) <= 0):
+        raise ValueError(f"Precipitación total debe ser > 0. Valor: {total_rainfall_mm}")
+    if duration_hours <= 0:
+        raise ValueError(f"Duración debe ser > 0. Valor: {duration_hours}")
+    if time_step_minutes <= 0 or time_step_minutes > duration_hours * 60:
+        raise ValueError(f"Time step inválido: {time_step_minutes} min")
+
+
+def _validate_idf_storm(P3_10, Tr, peak_position_ratio) -> None:
+    """Valida los parámetros IDF y la posición del pico (escalares o arrays)"""
+    P3_10_values = np.asarray(P3_10)
+    if np.any((P3_10_values < 50) | (P3_10_values > 100)):
+        raise ValueError(f"P3_10 debe estar entre 50-100mm. Valor: {P3_10}")
+    if np.any(np.asarray(Tr) < 2):
+        raise ValueError(f"Período de retorno debe ser >= 2 años. Valor: {Tr}")
+    ratio = np.asarray(peak_position_ratio)
+    if np.any((ratio < 0.0) | (ratio > 1.0)):
+        raise ValueError(f"peak_position_ratio debe estar entre 0.0-1.0. Valor: {peak_position_ratio}")
+
+
 def generate_hyetograph_uniform(
     total_rainfall_mm: float,
     duration_hours: float,
@@ -59,13 +140,26 @@ def generate_hyetograph_uniform(
         >>> result['intensity_mmh']
         [25.0, 25.0, 25.0, ...]  # Intensidad constante
     """
-    # Validaciones
-    if total_rainfall_mm <= 0:
-        raise ValueError(f"Precipitación total debe ser > 0. Valor: {total_rainfall_mm}")
-    if duration_hours <= 0:
-        raise ValueError(f"Duración debe ser > 0. Valor: {duration_hours}")
-    if time_step_minutes <= 0 or time_step_minutes > duration_hours * 60:
-        raise ValueError(f"Time step inválido: {time_step_minutes} min")
+    return generate_hyetograph_uniform_series(
+        total_rainfall_mm=total_rainfall_mm,
+        duration_hours=duration_hours,
+        time_step_minutes=time_step_minutes
+    ).to_dict()
+
+
+def generate_hyetograph_uniform_series(
+    total_rainfall_mm: float,
+    duration_hours: float,
+    time_step_minutes: float = 5
+) -> HyetographSeries:
+    """
+    Igual que generate_hyetograph_uniform() pero retorna HyetographSeries
+    (arrays de NumPy, sin conversión a listas).
+
+    total_rainfall_mm acepta un array (un total por escenario); el resultado
+    tiene forma total_rainfall_mm.shape + (n_intervalos + 1,).
+    """
+    _validate_storm(total_rainfall_mm, duration_hours, time_step_minutes)
 
     # Convertir duración a minutos
     duration_minutes = duration_hours * 60
@@ -74,33 +168,23 @@ def generate_hyetograph_uniform(
     num_intervals = int(duration_minutes / time_step_minutes)
 
     # Intensidad constante
-    intensity_mmh = total_rainfall_mm / duration_hours
+    intensity_mmh = np.asarray(total_rainfall_mm, dtype=np.float64) / duration_hours
 
     # Lluvia por intervalo
     rainfall_per_interval = (intensity_mmh * time_step_minutes) / 60
 
-    # Generar series temporales
-    time_steps = [i * time_step_minutes for i in range(num_intervals + 1)]
-    rainfall_mm = [rainfall_per_interval if i > 0 else 0 for i in range(num_intervals + 1)]
-    intensity_series = [intensity_mmh if i > 0 else 0 for i in range(num_intervals + 1)]
-    cumulative_mm = []
-
-    cumulative = 0
-    for rain in rainfall_mm:
-        cumulative += rain
-        cumulative_mm.append(cumulative)
-
-    return {
-        'time_steps': time_steps,
-        'rainfall_mm': rainfall_mm,
-        'intensity_mmh': intensity_series,
-        'cumulative_mm': cumulative_mm,
-        'method': 'uniform',
-        'duration_hours': duration_hours,
-        'total_rainfall_mm': total_rainfall_mm,
-        'time_step_minutes': time_step_minutes,
-        'num_intervals': num_intervals
-    }
+    # Lluvia por intervalo (primer valor en 0)
+    rainfall_mm = np.repeat(rainfall_per_interval[..., np.newaxis], num_intervals + 1, axis=-1)
+    rainfall_mm[..., 0] = 0.0
+
+    return HyetographSeries(
+        rainfall_mm=rainfall_mm,
+        time_step_minutes=time_step_minutes,
+        method='uniform',
+        duration_hours=duration_hours,
+        total_rainfall_mm=total_rainfall_mm,
+        num_intervals=num_intervals
+    )
 
 
 def generate_hyetograph_alternating_block(
@@ -152,19 +236,39 @@ def generate_hyetograph_alternating_block(
         ... )
         >>> max_idx = result['intensity_mmh'].index(max(result['intensity_mmh']))
     """
+    return generate_hyetograph_alternating_block_series(
+        total_rainfall_mm=total_rainfall_mm,
+        duration_hours=duration_hours,
+        P3_10=P3_10,
+        Tr=Tr,
+        area_km2=area_km2,
+        time_step_minutes=time_step_minutes,
+        peak_position_ratio=peak_position_ratio
+    ).to_dict()
+
+
+def generate_hyetograph_alternating_block_series(
+    total_rainfall_mm: float,
+    duration_hours: float,
+    P3_10: float,
+    Tr: float,
+    area_km2: float = None,
+    time_step_minutes: float = 5,
+    peak_position_ratio: float = 0.5
+) -> HyetographSeries:
+    """
+    Igual que generate_hyetograph_alternating_block() pero retorna
+    HyetographSeries (arrays de NumPy, sin conversión a listas).
+
+    total_rainfall_mm, P3_10, Tr, area_km2 y peak_position_ratio aceptan
+    arrays (un valor por escenario) combinables por broadcasting; la curva
+    IDF se evalúa una sola vez para la matriz escenarios × intervalos y el
+    resultado tiene forma (..., n_intervalos + 1). duration_hours y
+    time_step_minutes son comunes a todos los escenarios.
+    """
     # Validaciones
-    if total_rainfall_mm <= 0:
-        raise ValueError(f"Precipitación total debe ser > 0. Valor: {total_rainfall_mm}")
-    if duration_hours <= 0:
-        raise ValueError(f"Duración debe ser > 0. Valor: {duration_hours}")
-    if time_step_minutes <= 0 or time_step_minutes > duration_hours * 60:
-        raise ValueError(f"Time step inválido: {time_step_minutes} min")
-    if P3_10 < 50 or P3_10 > 100:
-        raise ValueError(f"P3_10 debe estar entre 50-100mm. Valor: {P3_10}")
-    if Tr < 2:
-        raise ValueError(f"Período de retorno debe ser >= 2 años. Valor: {Tr}")
-    if peak_position_ratio < 0.0 or peak_position_ratio > 1.0:
-        raise ValueError(f"peak_position_ratio debe estar entre 0.0-1.0. Valor: {peak_position_ratio}")
+    _validate_storm(total_rainfall_mm, duration_hours, time_step_minutes)
+    _validate_idf_storm(P3_10, Tr, peak_position_ratio)
 
     try:
         # Convertir duración a minutos
@@ -172,123 +276,107 @@ def generate_hyetograph_alternating_block(
 
         # Número de intervalos
         num_intervals = int(duration_minutes / time_step_minutes)
-        time_step_hours = time_step_minutes / 60
 
-        # Paso 1: Calcular intensidades para duraciones acumuladas usando IDF
-        intensities = []
-        precipitations = []
+        # Paso 1: Calcular precipitación para duraciones acumuladas usando IDF
+        # (una sola consulta a la tabla IDF para todos los escenarios e intervalos)
+        precipitations = get_idf_table().intensity_steps(
+            P3_10=_column(P3_10),
+            Tr=_column(Tr),
+            time_step_minutes=time_step_minutes,
+            num_intervals=num_intervals,
+            Ac=None if area_km2 is None else _column(area_km2)
+        )['P_mm']
 
-        for i in range(1, num_intervals + 1):
-            duration_i = i * time_step_hours
+        return generate_hyetograph_from_depths_series(
+            cumulative_depths_mm=precipitations,
+            total_rainfall_mm=total_rainfall_mm,
+            time_step_minutes=time_step_minutes,
+            peak_position_ratio=peak_position_ratio,
+            duration_hours=duration_hours,
+            idf_params={'P3_10': P3_10, 'Tr': Tr, 'area_km2': area_km2}
+        )
 
-            # Calcular intensidad usando curva IDF
-            idf_result = calculate_intensity_idf(
-                P3_10=P3_10,
-                Tr=Tr,
-                d=duration_i,
-                Ac=area_km2
-            )
+    except Exception as e:
+        raise HyetographGenerationError(f"Error generando hietograma: {str(e)}") from e
+
+
+def generate_hyetograph_from_depths_series(
+    cumulative_depths_mm: np.ndarray,
+    total_rainfall_mm,
+    time_step_minutes: float = 5,
+    peak_position_ratio=0.5,
+    duration_hours: float = None,
+    idf_params: Dict = None
+) -> HyetographSeries:
+    """
+    Pasos 2-4 del método de bloques alternados a partir de las
+    precipitaciones acumuladas P(Δt), P(2Δt), ..., P(nΔt).
+
+    Permite reutilizar una misma evaluación IDF para varias tormentas: una
+    tormenta de k intervalos usa el prefijo cumulative_depths_mm[..., :k].
 
-            intensity = idf_result['I_mmh']
-            precipitation = idf_result['P_mm']
-
-            intensities.append(intensity)
-            precipitations.append(precipitation)
-
-        # Paso 2: Calcular incrementos de precipitación
-        increments = []
-        increments.append(precipitations[0])  # Primer incremento
-
-        for i in range(1, len(precipitations)):
-            increment = precipitations[i] - precipitations[i-1]
-            increments.append(increment)
-
-        # Paso 3: Ordenar incrementos en patrón alternado con pico en peak_position_ratio
-        # Ordenar de mayor a menor
-        sorted_increments = sorted(increments, reverse=True)
-
-        # Calcular índice del pico basado en peak_position_ratio
-        # peak_position_ratio = 0.0 → inicio, 0.5 → centro, 1.0 → final
-        peak_index = int(num_intervals * peak_position_ratio)
-
-        # Crear patrón alternado con pico en la posición especificada
-        alternating_pattern = [0] * num_intervals
-        alternating_pattern[peak_index] = sorted_increments[0]  # Colocar el máximo en la posición del pico
-
-        # Distribuir el resto de incrementos alternando desde el pico
-        left_index = peak_index - 1
-        right_index = peak_index + 1
-        increment_idx = 1
-
-        while increment_idx < len(sorted_increments):
-            # Alternar entre izquierda y derecha
-            if left_index >= 0 and increment_idx < len(sorted_increments):
-                alternating_pattern[left_index] = sorted_increments[increment_idx]
-                left_index -= 1
-                increment_idx += 1
-
-            if right_index < num_intervals and increment_idx < len(sorted_increments):
-                alternating_pattern[right_index] = sorted_increments[increment_idx]
-                right_index += 1
-                increment_idx += 1
-
-        # Paso 4: Generar series temporales
-        time_steps = [i * time_step_minutes for i in range(num_intervals + 1)]
-
-        # Lluvia por intervalo (agregar 0 al inicio)
-        rainfall_mm = [0] + alternating_pattern
-
-        # Calcular intensidades correspondientes
-        intensity_series = []
-        for rain in rainfall_mm:
-            # I (mm/h) = rainfall (mm) / time_step (h)
-            intensity = (rain / time_step_hours) if time_step_hours > 0 else 0
-            intensity_series.append(intensity)
-
-        # Calcular acumulados
-        cumulative_mm = []
-        cumulative = 0
-        for rain in rainfall_mm:
-            cumulative += rain
-            cumulative_mm.append(cumulative)
-
-        # Ajustar si la suma no coincide exactamente con total_rainfall_mm
-        # (por errores de redondeo)
-        actual_total = sum(alternating_pattern)
-        if abs(actual_total - total_rainfall_mm) > 0.1:  # Tolerancia 0.1mm
-            # Aplicar factor de corrección
-            correction_factor = total_rainfall_mm / actual_total
-            rainfall_mm = [r * correction_factor for r in rainfall_mm]
-            intensity_series = [i * correction_factor for i in intensity_series]
-            cumulative_mm = []
-            cumulative = 0
-            for rain in rainfall_mm:
-                cumulative += rain
-                cumulative_mm.append(cumulative)
-
-        return {
-            'time_steps': time_steps,
-            'rainfall_mm': rainfall_mm,
-            'intensity_mmh': intensity_series,
-            'cumulative_mm': cumulative_mm,
-            'method': 'alternating_block',
-            'duration_hours': duration_hours,
-            'total_rainfall_mm': total_rainfall_mm,
-            'time_step_minutes': time_step_minutes,
-            'num_intervals': num_intervals,
-            'idf_params': {
-                'P3_10': P3_10,
-                'Tr': Tr,
-                'area_km2': area_km2
-            },
-            'peak_intensity_mmh': max(intensity_series),
-            'peak_time_minutes': time_steps[intensity_series.index(max(intensity_series))],
+    Args:
+        cumulative_depths_mm: Precipitaciones acumuladas [mm], forma (..., n)
+        total_rainfall_mm: Precipitación total (escalar o array por escenario)
+        time_step_minutes: Intervalo de tiempo (minutos)
+        peak_position_ratio: Posición del pico (escalar o array por escenario)
+        duration_hours: Duración informada (None = n × Δt)
+        idf_params: Parámetros IDF informados en extra['idf_params']
+
+    Returns:
+        HyetographSeries con lluvia de forma (..., n + 1)
+    """
+    num_intervals = cumulative_depths_mm.shape[-1]
+    time_step_hours = time_step_minutes / 60
+    if duration_hours is None:
+        duration_hours = num_intervals * time_step_hours
+
+    total = np.asarray(total_rainfall_mm, dtype=np.float64)
+    batch_shape = np.broadcast_shapes(
+        total.shape, np.shape(peak_position_ratio), cumulative_depths_mm.shape[:-1]
+    )
+    precipitations = np.broadcast_to(cumulative_depths_mm, batch_shape + (num_intervals,))
+
+    # Paso 2: Calcular incrementos de precipitación
+    increments = np.diff(precipitations, axis=-1, prepend=0.0)
+
+    # Paso 3: Ordenar incrementos en patrón alternado con pico en peak_position_ratio
+    # peak_position_ratio = 0.0 → inicio, 0.5 → centro, 1.0 → final
+    peak_index = np.broadcast_to(
+        calculate_peak_index(num_intervals, peak_position_ratio), batch_shape
+    )
+    alternating_pattern = arrange_alternating_blocks(increments, peak_index)
+
+    # Paso 4: Lluvia por intervalo (agregar 0 al inicio)
+    rainfall_mm = np.concatenate(
+        (np.zeros(batch_shape + (1,)), alternating_pattern), axis=-1
+    )
+
+    # Ajustar si la suma no coincide exactamente con total_rainfall_mm
+    # (por errores de redondeo). Tolerancia 0.1mm
+    actual_total = rainfall_mm.sum(axis=-1)
+    correction = np.where(
+        np.abs(actual_total - total) > 0.1, total / actual_total, 1.0
+    )
+    rainfall_mm *= correction[..., np.newaxis]
+
+    max_index = np.argmax(rainfall_mm, axis=-1)
+
+    return HyetographSeries(
+        rainfall_mm=rainfall_mm,
+        time_step_minutes=time_step_minutes,
+        method='alternating_block',
+        duration_hours=duration_hours,
+        total_rainfall_mm=total_rainfall_mm,
+        num_intervals=num_intervals,
+        extra={
+            'idf_params': idf_params or {},
+            'peak_intensity_mmh': _scalar(rainfall_mm.max(axis=-1) / time_step_hours),
+            'peak_time_minutes': _scalar(max_index * time_step_minutes),
             'peak_position_ratio': peak_position_ratio,
-            'peak_index': peak_index
+            'peak_index': _scalar(peak_index.copy())
         }
-
-    except Exception as e:
-        raise HyetographGenerationError(f"Error generando hietograma: {str(e)}") from e
+    )
 
 
 def generate_hyetograph(
@@ -335,13 +423,39 @@ def generate_hyetograph(
         ...     peak_position_ratio=0.3
         ... )
     """
+    return generate_hyetograph_series(
+        total_rainfall_mm=total_rainfall_mm,
+        duration_hours=duration_hours,
+        method=method,
+        time_step_minutes=time_step_minutes,
+        P3_10=P3_10,
+        Tr=Tr,
+        area_km2=area_km2,
+        peak_position_ratio=peak_position_ratio
+    ).to_dict()
+
+
+def generate_hyetograph_series(
+    total_rainfall_mm: float,
+    duration_hours: float,
+    method: str = 'alternating_block',
+    time_step_minutes: float = 5,
+    P3_10: float = None,
+    Tr: float = None,
+    area_km2: float = None,
+    peak_position_ratio: float = 0.5
+) -> HyetographSeries:
+    """
+    Igual que generate_hyetograph() pero retorna HyetographSeries
+    (arrays de NumPy, sin conversión a listas).
+    """
     valid_methods = ['uniform', 'alternating_block']
 
     if method not in valid_methods:
         raise ValueError(f"Método '{method}' no soportado. Opciones: {valid_methods}")
 
     if method == 'uniform':
-        return generate_hyetograph_uniform(
+        return generate_hyetograph_uniform_series(
             total_rainfall_mm=total_rainfall_mm,
             duration_hours=duration_hours,
             time_step_minutes=time_step_minutes
@@ -353,7 +467,7 @@ def generate_hyetograph(
                 "Para method='alternating_block' se requieren P3_10 y Tr"
             )
 
-        return generate_hyetograph_alternating_block(
+        return generate_hyetograph_alternating_block_series(
             total_rainfall_mm=total_rainfall_mm,
             duration_hours=duration_hours,
             P3_10=P3_10,
@@ -0,0 +1,142 @@
+"""
+Parallel Scenario Executor
+
+Reparte listas largas de escenarios (parámetros de calculate_hydrograph())
+entre los procesos de un ProcessPoolExecutor, para usar todos los núcleos en
+barridos de diseño y análisis de sensibilidad.
+
+- Los escenarios se validan y ordenan por clave de agrupación antes de
+  partirlos en bloques, de modo que cada bloque contiene grupos homogéneos
+  que el motor por lotes (hydrology.services.batch) evalúa como matrices.
+- Cada proceso evalúa bloques completos y conserva sus propias cachés
+  (factores IDF, hidrogramas unitarios) entre bloques; el inicializador del
+  proceso las precalienta.
+- Los resultados se devuelven en el orden de entrada, independientemente del
+  número de procesos y del tamaño de bloque.
+
+El número de procesos se toma de max_workers o del setting
+HYDROLOGY_MAX_WORKERS (0 = un proceso por CPU).
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .batch import (
+    EXCESS_GROUP_KEYS,
+    HYETOGRAPH_GROUP_KEYS,
+    TRANSFORM_GROUP_KEYS,
+    calculate_hydrographs_batch,
+    normalize_scenario,
+)
+
+
+# Tamaño máximo de bloque (escenarios por tarea)
+DEFAULT_CHUNK_SIZE = 512
+
+# Bloques por proceso: más de uno reparte mejor la carga entre procesos
+CHUNKS_PER_WORKER = 4
+
+# Escenarios representativos evaluados al iniciar cada proceso
+WARMUP_SCENARIOS = [
+    dict(total_rainfall_mm=50.0, duration_hours=2.0, area_km2=5.0, tc_minutes=45.0,
+         C=0.6, P3_10=70.0, Tr=10),
+    dict(total_rainfall_mm=50.0, duration_hours=2.0, area_km2=5.0, tc_minutes=45.0,
+         excess_method='scs_curve_number', CN=75, P3_10=70.0, Tr=10),
+]
+
+SCENARIO_SORT_KEYS = HYETOGRAPH_GROUP_KEYS + EXCESS_GROUP_KEYS + TRANSFORM_GROUP_KEYS
+
+
+def resolve_worker_count(max_workers: Optional[int] = None) -> int:
+    """
+    Número de procesos a usar.
+
+    Args:
+        max_workers: Procesos pedidos (None = setting HYDROLOGY_MAX_WORKERS,
+            0 = un proceso por CPU)
+
+    Returns:
+        Número de procesos >= 1
+    """
+    if max_workers is None:
+        try:
+            max_workers = settings.HYDROLOGY_MAX_WORKERS
+        except (ImproperlyConfigured, AttributeError):
+            max_workers = 0
+
+    if max_workers < 0:
+        raise ValueError(f"max_workers debe ser >= 0. Valor: {max_workers}")
+    return max_workers or os.cpu_count() or 1
+
+
+def warm_worker_caches() -> None:
+    """Precalienta las cachés del proceso actual (imports, IDF, HU, FFT)"""
+    calculate_hydrographs_batch(WARMUP_SCENARIOS)
+
+
+def _run_chunk(scenarios: List[Dict], include_series: bool) -> List[Dict]:
+    """Tarea de un proceso: evalúa un bloque con el motor por lotes"""
+    return calculate_hydrographs_batch(scenarios, include_series=include_series)
+
+
+def calculate_hydrographs_parallel(
+    scenarios: Iterable[Dict],
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    include_series: bool = False
+) -> List[Dict]:
+    """
+    Calcula hidrogramas para una lista de escenarios en varios procesos.
+
+    Args:
+        scenarios: Dicts con parámetros de calculate_hydrograph()
+        max_workers: Procesos (None = setting HYDROLOGY_MAX_WORKERS, 0 = CPUs)
+        chunk_size: Escenarios por bloque (None = automático, hasta
+            DEFAULT_CHUNK_SIZE y al menos CHUNKS_PER_WORKER bloques por proceso)
+        include_series: Igual que en calculate_hydrographs_batch()
+
+    Returns:
+        Lista en el orden de entrada, igual que calculate_hydrographs_batch()
+
+    Raises:
+        ValueError: Escenario inválido o parámetros de ejecución inválidos
+        HydrographCalculationError: Error en el cálculo de un bloque
+    """
+    normalized = [normalize_scenario(index, scenario) for index, scenario in enumerate(scenarios)]
+    workers = resolve_worker_count(max_workers)
+
+    if chunk_size is None:
+        chunk_size = math.ceil(len(normalized) / (workers * CHUNKS_PER_WORKER))
+        chunk_size = max(1, min(DEFAULT_CHUNK_SIZE, chunk_size))
+    elif chunk_size <= 0:
+        raise ValueError(f"chunk_size debe ser > 0. Valor: {chunk_size}")
+
+    # Orden estable por clave de agrupación: bloques homogéneos y deterministas
+    order = sorted(
+        range(len(normalized)),
+        key=lambda i: tuple(normalized[i][key] for key in SCENARIO_SORT_KEYS)
+    )
+    chunks = [
+        [normalized[i] for i in order[start:start + chunk_size]]
+        for start in range(0, len(order), chunk_size)
+    ]
+
+    if workers == 1 or len(chunks) <= 1:
+        chunk_results = list(map(_run_chunk, chunks, repeat(include_series)))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=warm_worker_caches
+        ) as executor:
+            chunk_results = list(executor.map(_run_chunk, chunks, repeat(include_series)))
+
+    results: List[Dict] = [None] * len(normalized)
+    for position, result in zip(order, chain.from_iterable(chunk_results)):
+        results[position] = result
+    return results
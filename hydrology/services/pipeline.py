@@ -0,0 +1,160 @@
+"""
+Staged Pipeline
+
+Etapas con fingerprint de entradas para el cálculo incremental de
+calculate_hydrograph_series():
+
+    hietograma → lluvia efectiva → transformación → resumen
+
+El fingerprint de cada etapa es un hash (BLAKE2b) de sus entradas
+canónicas y del fingerprint de la etapa aguas arriba, de modo que cambiar
+una entrada invalida esa etapa y todas las siguientes, pero no las
+anteriores: editar C recalcula lluvia efectiva, transformación y resumen y
+reutiliza el hietograma.
+
+Cada etapa tiene una caché LRU (StageCache) por fingerprint compartida por
+el proceso. Las salidas cacheadas se comparten entre llamadas, por lo que
+sus arrays se marcan de solo lectura.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Salidas por etapa conservadas en la caché
+PIPELINE_CACHE_SIZE = 128
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineStage:
+    """Etapa del pipeline: entradas propias y etapa aguas arriba"""
+
+    name: str
+    inputs: Tuple[str, ...]
+    upstream: Optional[str] = None
+
+
+class StageCache:
+    """Caché LRU de las salidas de una etapa por fingerprint"""
+
+    def __init__(self, maxsize: int = PIPELINE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, fingerprint: str, compute: Callable[[], object]):
+        """Salida cacheada o compute() (los errores no se cachean)"""
+        with self._lock:
+            if fingerprint in self._entries:
+                self._entries.move_to_end(fingerprint)
+                self.hits += 1
+                return self._entries[fingerprint]
+
+        output = _read_only(compute())
+        with self._lock:
+            self.misses += 1
+            self._entries[fingerprint] = output
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return output
+
+    def cache_info(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'maxsize': self.maxsize, 'currsize': len(self._entries)}
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# Cachés por etapa: nombre → StageCache
+STAGE_CACHES: Dict[str, StageCache] = {}
+
+
+def _read_only(output):
+    """Marca los arrays de una salida (dataclass) como de solo lectura"""
+    if is_dataclass(output):
+        for item in fields(output):
+            value = getattr(output, item.name)
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+    return output
+
+
+def _canonical(value):
+    """Forma canónica JSON de una entrada (1 y 1.0 tienen el mismo fingerprint)"""
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return [_canonical(item) for item in value.tolist()]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    raise TypeError(f"Entrada no serializable para fingerprint: {type(value).__name__}")
+
+
+def stage_fingerprint(stage: PipelineStage, params: Dict, upstream_fingerprint: Optional[str] = None) -> str:
+    """
+    Fingerprint de una etapa.
+
+    Args:
+        stage: Etapa (se usan solo sus entradas declaradas)
+        params: Valores de las entradas (deben incluir todas las de stage.inputs)
+        upstream_fingerprint: Fingerprint de la etapa aguas arriba
+
+    Returns:
+        Hash hexadecimal de 32 caracteres
+    """
+    payload = json.dumps(
+        [stage.name, upstream_fingerprint, {name: _canonical(params[name]) for name in stage.inputs}],
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def run_stage(
+    stage: PipelineStage,
+    params: Dict,
+    upstream_fingerprint: Optional[str],
+    compute: Callable[[], object],
+    use_cache: bool = True
+) -> Tuple[str, object]:
+    """
+    Ejecuta una etapa reutilizando la salida cacheada de su fingerprint.
+
+    Returns:
+        (fingerprint, salida)
+    """
+    fingerprint = stage_fingerprint(stage, params, upstream_fingerprint)
+    if not use_cache:
+        return fingerprint, compute()
+    cache = STAGE_CACHES.setdefault(stage.name, StageCache())
+    return fingerprint, cache.get_or_compute(fingerprint, compute)
+
+
+def pipeline_cache_info() -> Dict[str, Dict[str, int]]:
+    """
+    Estadísticas de las cachés por etapa.
+
+    Returns:
+        {etapa: {'hits', 'misses', 'maxsize', 'currsize'}}
+    """
+    return {name: cache.cache_info() for name, cache in STAGE_CACHES.items()}
+
+
+def clear_pipeline_caches() -> None:
+    """Vacía las cachés por etapa (y sus estadísticas)"""
+    for cache in STAGE_CACHES.values():
+        cache.cache_clear()
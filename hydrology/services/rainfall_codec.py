@@ -0,0 +1,365 @@
+"""
+Rainfall Codec - Codificación compacta de registros de lluvia
+
+Codifica RainfallData.rainfall_series (lista JSON de {time_min,
+intensity_mm_h, cumulative_mm}) guardando solo:
+
+- inicio del registro [min] y paso Δt [min] (time_min es implícito)
+- la acumulada al inicio del registro [mm]
+- la intensidad de cada intervalo cuantizada a `quantum` mm/h, como
+  diferencias entre intervalos consecutivos
+
+cumulative_mm es redundante: se reconstruye sumando las láminas
+(intensidad × Δt), de modo que acumula el error de cuantizar las
+intensidades (a lo sumo quantum / 2 × Δt por intervalo). Un registro cuya
+acumulada no coincide con sus intensidades (salvo el redondeo de la
+propia acumulada) no se codifica y se conserva en JSON.
+
+Los intervalos se agrupan en bloques de `block_size` con compresión
+independiente (zlib sobre enteros zigzag del menor ancho que alcance) y un
+índice con el desplazamiento de cada bloque y la suma de intensidades
+cuantizadas anteriores, de modo que una ventana [start, stop) decodifica
+solo los bloques que toca.
+
+Estructura (little-endian):
+
+    cabecera  '<4sBdddqII': magic, versión, inicio, Δt, acumulada inicial,
+              quantum [10⁻⁶ mm/h], intervalos, block_size
+    índice    '<Iq' por bloque: desplazamiento del bloque en los datos,
+              suma de intensidades cuantizadas anteriores al bloque
+    bloques   '<B' bytes por entero + zlib(deltas zigzag)
+"""
+
+import math
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .series import _to_python
+
+
+RAINFALL_CODEC_MAGIC = b'HRNF'
+RAINFALL_CODEC_VERSION = 2
+
+_HEADER = struct.Struct('<4sBdddqII')
+_BLOCK_INDEX = struct.Struct('<Iq')
+_BLOCK_WIDTH = struct.Struct('<B')
+
+# Resolución de la intensidad [mm/h] (se guarda en 10⁻⁶ mm/h en la cabecera)
+RAINFALL_QUANTUM_MM_H = 0.001
+_QUANTUM_SCALE = 1_000_000
+
+# Intervalos por bloque comprimido
+RAINFALL_BLOCK_SIZE = 4096
+
+RAINFALL_COMPRESSION_LEVEL = 6
+
+# Tolerancia relativa a Δt para considerar regular un registro
+REGULAR_TIME_TOLERANCE = 1e-6
+
+# Diferencia mínima admitida [mm] entre cumulative_mm y la suma de las
+# intensidades; se amplía a la resolución decimal de cumulative_mm si es mayor
+RAINFALL_CONSISTENCY_TOLERANCE_MM = 0.001
+
+_UNSIGNED_BY_WIDTH = {1: '<u1', 2: '<u2', 4: '<u4', 8: '<u8'}
+
+
+@dataclass(slots=True)
+class RainfallRecord:
+    """Registro de lluvia a paso constante: lámina [mm] por intervalo (start + kΔt, start + (k+1)Δt]"""
+
+    depths_mm: np.ndarray
+    start_min: float
+    time_step_minutes: float
+    initial_cumulative_mm: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.depths_mm)
+
+    @property
+    def time_min(self) -> np.ndarray:
+        """Tiempo al final de cada intervalo [min]"""
+        return self.start_min + np.arange(1, len(self) + 1) * self.time_step_minutes
+
+    @property
+    def intensity_mm_h(self) -> np.ndarray:
+        """Intensidad media de cada intervalo [mm/h]"""
+        return np.asarray(self.depths_mm, dtype=np.float64) * 60 / self.time_step_minutes
+
+    @property
+    def cumulative_mm(self) -> np.ndarray:
+        """Lluvia acumulada al final de cada intervalo [mm]"""
+        return self.initial_cumulative_mm + np.cumsum(self.depths_mm, dtype=np.float64)
+
+    def to_records(self) -> List[Dict]:
+        """Lista de puntos {time_min, intensity_mm_h, cumulative_mm} (formato JSON anterior)"""
+        return [
+            {'time_min': t, 'intensity_mm_h': i, 'cumulative_mm': c}
+            for t, i, c in zip(
+                _to_python(self.time_min),
+                _to_python(np.round(self.intensity_mm_h, 6)),
+                _to_python(np.round(self.cumulative_mm, 6))
+            )
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class RainfallHeader:
+    """Metadatos de un registro codificado (sin decodificar los datos)"""
+
+    start_min: float
+    time_step_minutes: float
+    initial_cumulative_mm: float
+    quantum_mm_h: float
+    length: int
+    block_size: int
+
+    @property
+    def end_min(self) -> float:
+        return self.start_min + self.length * self.time_step_minutes
+
+    @property
+    def num_blocks(self) -> int:
+        return math.ceil(self.length / self.block_size)
+
+
+def quantize_intensity(intensity_mm_h, quantum_mm_h: float = RAINFALL_QUANTUM_MM_H) -> np.ndarray:
+    """Intensidades [mm/h] redondeadas a la resolución de la codificación"""
+    return np.rint(np.asarray(intensity_mm_h, dtype=np.float64) / quantum_mm_h) * quantum_mm_h
+
+
+def encode_rainfall(
+    intensity_mm_h: Sequence[float],
+    start_min: float,
+    time_step_minutes: float,
+    initial_cumulative_mm: float = 0.0,
+    quantum_mm_h: float = RAINFALL_QUANTUM_MM_H,
+    block_size: int = RAINFALL_BLOCK_SIZE
+) -> bytes:
+    """
+    Codifica intensidades por intervalo a paso constante.
+
+    Args:
+        intensity_mm_h: Intensidad media de cada intervalo [mm/h] (>= 0)
+        start_min: Inicio del primer intervalo [min]
+        time_step_minutes: Paso de tiempo Δt [min]
+        initial_cumulative_mm: Acumulada al inicio del registro [mm]
+        quantum_mm_h: Resolución de la intensidad [mm/h]
+        block_size: Intervalos por bloque
+
+    Returns:
+        Bytes codificados
+    """
+    intensity = np.asarray(intensity_mm_h, dtype=np.float64)
+    if intensity.ndim != 1 or len(intensity) == 0:
+        raise ValueError("intensity_mm_h debe ser un array 1-D no vacío")
+    if np.any(intensity < 0) or not np.all(np.isfinite(intensity)):
+        raise ValueError("intensity_mm_h debe ser finito y no negativo")
+    if time_step_minutes <= 0:
+        raise ValueError(f"time_step_minutes debe ser > 0. Valor: {time_step_minutes}")
+    quantum_scaled = int(round(quantum_mm_h * _QUANTUM_SCALE))
+    if quantum_scaled <= 0:
+        raise ValueError(f"quantum_mm_h debe ser >= 1e-6. Valor: {quantum_mm_h}")
+    if block_size <= 0:
+        raise ValueError(f"block_size debe ser > 0. Valor: {block_size}")
+
+    quantized = np.rint(intensity / (quantum_scaled / _QUANTUM_SCALE)).astype(np.int64)
+    preceding = np.concatenate([[0], np.cumsum(quantized)])
+
+    index = []
+    blocks = []
+    offset = 0
+    for first in range(0, len(quantized), block_size):
+        block = quantized[first:first + block_size]
+        deltas = np.diff(block, prepend=0)
+        zigzag = ((deltas << 1) ^ (deltas >> 63)).astype(np.uint64)
+        width = next(width for width in (1, 2, 4, 8) if zigzag.max() < 1 << (8 * width))
+        data = _BLOCK_WIDTH.pack(width) + zlib.compress(
+            zigzag.astype(_UNSIGNED_BY_WIDTH[width]).tobytes(), RAINFALL_COMPRESSION_LEVEL
+        )
+        index.append(_BLOCK_INDEX.pack(offset, preceding[first]))
+        blocks.append(data)
+        offset += len(data)
+
+    return b''.join([
+        _HEADER.pack(
+            RAINFALL_CODEC_MAGIC, RAINFALL_CODEC_VERSION, float(start_min), float(time_step_minutes),
+            float(initial_cumulative_mm), quantum_scaled, len(intensity), block_size
+        ),
+        *index,
+        *blocks,
+    ])
+
+
+def rainfall_header(data) -> RainfallHeader:
+    """
+    Lee solo la cabecera de un registro codificado.
+
+    Raises:
+        ValueError: Si los bytes no son un registro codificado válido
+    """
+    buffer = memoryview(data)
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Registro de lluvia codificado truncado")
+    magic, version, start, time_step, initial, quantum_scaled, length, block_size = _HEADER.unpack_from(buffer)
+    if magic != RAINFALL_CODEC_MAGIC:
+        raise ValueError("Los datos no son un registro de lluvia codificado (magic inválido)")
+    if version != RAINFALL_CODEC_VERSION:
+        raise ValueError(f"Versión de codificación de lluvia no soportada: {version}")
+    return RainfallHeader(start, time_step, initial, quantum_scaled / _QUANTUM_SCALE, length, block_size)
+
+
+def decode_rainfall(data, start: Optional[int] = None, stop: Optional[int] = None) -> RainfallRecord:
+    """
+    Decodifica un registro (o los intervalos [start, stop)) a arrays de NumPy.
+
+    Solo se descomprimen los bloques que se solapan con la ventana.
+
+    Args:
+        data: Bytes de encode_rainfall() (bytes, memoryview o bytearray)
+        start, stop: Índices de intervalo (como en un slice; None = extremos)
+
+    Returns:
+        RainfallRecord de la ventana (start_min e initial_cumulative_mm
+        corresponden al primer intervalo de la ventana)
+    """
+    buffer = memoryview(data)
+    header = rainfall_header(buffer)
+    start, stop, _ = slice(start, stop).indices(header.length)
+    stop = max(start, stop)
+    # Lámina [mm] de una unidad de intensidad cuantizada
+    depth_per_unit = header.quantum_mm_h * header.time_step_minutes / 60
+
+    blocks_offset = _HEADER.size + header.num_blocks * _BLOCK_INDEX.size
+    if len(buffer) < blocks_offset:
+        raise ValueError("Registro de lluvia codificado truncado")
+
+    first_block = start // header.block_size
+    last_block = max(first_block, math.ceil(stop / header.block_size))
+    depths = []
+    anchor = None
+    for block in range(first_block, min(last_block, header.num_blocks)):
+        offset, preceding = _BLOCK_INDEX.unpack_from(buffer, _HEADER.size + block * _BLOCK_INDEX.size)
+        end = (
+            _BLOCK_INDEX.unpack_from(buffer, _HEADER.size + (block + 1) * _BLOCK_INDEX.size)[0]
+            if block + 1 < header.num_blocks else len(buffer) - blocks_offset
+        )
+        chunk = buffer[blocks_offset + offset:blocks_offset + end]
+        (width,) = _BLOCK_WIDTH.unpack_from(chunk)
+        zigzag = np.frombuffer(zlib.decompress(chunk[_BLOCK_WIDTH.size:]), dtype=_UNSIGNED_BY_WIDTH[width])
+        zigzag = zigzag.astype(np.int64)
+        deltas = (zigzag >> 1) ^ -(zigzag & 1)
+        block_intensity = np.cumsum(deltas)
+
+        block_start = block * header.block_size
+        lower = max(start - block_start, 0)
+        upper = min(stop - block_start, len(block_intensity))
+        if anchor is None:
+            anchor = preceding + int(block_intensity[:lower].sum())
+        depths.append(block_intensity[lower:upper])
+
+    quantized = np.concatenate(depths) if depths else np.zeros(0, dtype=np.int64)
+    return RainfallRecord(
+        depths_mm=quantized * depth_per_unit,
+        start_min=header.start_min + start * header.time_step_minutes,
+        time_step_minutes=header.time_step_minutes,
+        initial_cumulative_mm=header.initial_cumulative_mm + (anchor or 0) * depth_per_unit
+    )
+
+
+def decode_rainfall_window(data, start_min: float = None, end_min: float = None) -> RainfallRecord:
+    """
+    Intervalos que se solapan con [start_min, end_min) [min].
+
+    Args:
+        data: Bytes de encode_rainfall()
+        start_min, end_min: Ventana de tiempo (None = extremos del registro)
+    """
+    header = rainfall_header(data)
+    step = header.time_step_minutes
+    start = None if start_min is None else max(0, math.floor((start_min - header.start_min) / step + 1e-9))
+    stop = None if end_min is None else max(0, math.ceil((end_min - header.start_min) / step - 1e-9))
+    return decode_rainfall(data, start, stop)
+
+
+def _decimal_resolution(values: np.ndarray) -> float:
+    """Resolución decimal de los valores (10⁻ᵈ, d <= 6), 0 si tienen más decimales"""
+    for decimals in range(7):
+        scaled = values * 10 ** decimals
+        if np.allclose(scaled, np.rint(scaled), rtol=0, atol=1e-6):
+            return 10.0 ** -decimals
+    return 0.0
+
+
+def encode_rainfall_records(
+    records: Sequence[Dict],
+    quantum_mm_h: float = RAINFALL_QUANTUM_MM_H,
+    block_size: int = RAINFALL_BLOCK_SIZE
+) -> Optional[bytes]:
+    """
+    Codifica una lista {time_min, intensity_mm_h, cumulative_mm}.
+
+    time_min es el final de cada intervalo. Se guarda intensity_mm_h;
+    cumulative_mm solo fija la acumulada inicial y se verifica contra las
+    intensidades (sin intensity_mm_h, se toman las diferencias de
+    cumulative_mm).
+
+    Returns:
+        Bytes codificados, o None si el registro no se puede reconstruir
+        tal cual (paso no constante, intensidades negativas o acumulada
+        que no coincide con las intensidades); en ese caso se conserva en JSON
+
+    Raises:
+        ValueError: Registro vacío o sin las claves necesarias
+    """
+    if not records:
+        raise ValueError("rainfall_series no puede estar vacía")
+    if any('time_min' not in point for point in records):
+        raise ValueError("Los puntos deben incluir 'time_min'")
+
+    times = np.array([point['time_min'] for point in records], dtype=np.float64)
+    if len(times) < 2:
+        return None
+    time_step = times[1] - times[0]
+    regular = time_step > 0 and np.allclose(
+        times, times[0] + np.arange(len(times)) * time_step, rtol=0, atol=REGULAR_TIME_TOLERANCE * time_step
+    )
+    if not regular:
+        return None
+
+    intensity = (
+        np.array([point['intensity_mm_h'] for point in records], dtype=np.float64)
+        if all('intensity_mm_h' in point for point in records) else None
+    )
+    cumulative = (
+        np.array([point['cumulative_mm'] for point in records], dtype=np.float64)
+        if all('cumulative_mm' in point for point in records) else None
+    )
+    if intensity is None and cumulative is None:
+        raise ValueError("Los puntos deben incluir 'cumulative_mm' o 'intensity_mm_h'")
+    if intensity is None:
+        intensity = np.diff(cumulative, prepend=0.0) * 60 / time_step
+    if np.any(intensity < 0) or not np.all(np.isfinite(intensity)):
+        return None
+
+    initial = 0.0
+    if cumulative is not None:
+        # Las intensidades recibidas (sin cuantizar) deben sumar la acumulada,
+        # salvo el redondeo de cumulative_mm (hasta una unidad de su resolución)
+        depths = intensity * time_step / 60
+        initial = cumulative[0] - depths[0]
+        tolerance = max(RAINFALL_CONSISTENCY_TOLERANCE_MM, _decimal_resolution(cumulative))
+        if not np.allclose(cumulative, initial + np.cumsum(depths), rtol=1e-9, atol=tolerance):
+            return None
+
+    return encode_rainfall(
+        intensity,
+        start_min=times[0] - time_step,
+        time_step_minutes=time_step,
+        initial_cumulative_mm=initial,
+        quantum_mm_h=quantum_mm_h,
+        block_size=block_size
+    )
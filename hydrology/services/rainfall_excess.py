@@ -3,9 +3,22 @@ Rainfall Excess Calculation Service
 
 Calcula lluvia efectiva (escorrentía) considerando pérdidas por infiltración.
 Métodos: Racional (C × P) y SCS Curve Number
+
+Las variantes *_series están vectorizadas: aceptan una matriz de lluvias
+(tormentas × intervalos) y arrays de C o CN, que se combinan por
+broadcasting con las dimensiones previas al eje temporal. Un barrido de
+sensibilidad sobre cientos de CN es una sola pasada de NumPy:
+
+    calculate_rainfall_excess_scs_series(rainfall, CN=np.arange(60, 96))
+    # excess_mm.shape == (36, n_intervalos)
 """
 
-from typing import Dict, List
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from .convolution import ArrayLike
+from .series import RainfallExcessSeries
 
 
 class RainfallExcessError(Exception):
@@ -21,45 +34,58 @@ def calculate_rainfall_excess_rational(
     """Calcula lluvia efectiva usando Método Racional: Pe = C × P"""
     if not isinstance(rainfall_series, list) or len(rainfall_series) == 0:
         raise ValueError("rainfall_series debe ser lista no vacía")
-    if C < 0 or C > 1:
+
+    return calculate_rainfall_excess_rational_series(
+        rainfall_series, C, time_step_minutes
+    ).to_dict()
+
+
+def _broadcast_parameter(
+    rainfall: np.ndarray,
+    parameter: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Alinea un parámetro por serie (C, CN) con una matriz de lluvias.
+
+    El parámetro se combina por broadcasting con rainfall.shape[:-1]; la
+    lluvia se expande (sin copia) a la forma resultante.
+    """
+    shape = np.broadcast_shapes(parameter.shape, rainfall.shape[:-1]) + rainfall.shape[-1:]
+    return np.broadcast_to(rainfall, shape), parameter[..., np.newaxis]
+
+
+def calculate_rainfall_excess_rational_series(
+    rainfall_series: ArrayLike,
+    C: Union[float, ArrayLike],
+    time_step_minutes: float = 5
+) -> RainfallExcessSeries:
+    """
+    Igual que calculate_rainfall_excess_rational() pero retorna RainfallExcessSeries.
+
+    Acepta una matriz de lluvias (..., n_intervalos) y un C escalar o un array
+    de C combinable por broadcasting con las dimensiones previas.
+    """
+    rainfall = np.asarray(rainfall_series, dtype=np.float64)
+    C_values = np.asarray(C, dtype=np.float64)
+
+    if rainfall.size == 0:
+        raise ValueError("rainfall_series debe ser lista no vacía")
+    if np.any((C_values < 0) | (C_values > 1)):
         raise ValueError(f"C debe estar entre 0-1. Valor: {C}")
 
-    excess_series = []
-    infiltration_series = []
-    cumulative_excess = []
-    cumulative_infiltration = []
-    sum_excess = 0
-    sum_infiltration = 0
-
-    for rainfall in rainfall_series:
-        if rainfall < 0:
-            raise ValueError(f"Rainfall negativo: {rainfall}")
-
-        excess = C * rainfall
-        infiltration = rainfall - excess
-
-        excess_series.append(excess)
-        infiltration_series.append(infiltration)
-        sum_excess += excess
-        sum_infiltration += infiltration
-        cumulative_excess.append(sum_excess)
-        cumulative_infiltration.append(sum_infiltration)
-
-    total_rainfall = sum(rainfall_series)
-
-    return {
-        'excess_series': excess_series,
-        'infiltration_series': infiltration_series,
-        'cumulative_excess_mm': cumulative_excess,
-        'cumulative_infiltration_mm': cumulative_infiltration,
-        'total_rainfall_mm': total_rainfall,
-        'total_excess_mm': sum_excess,
-        'total_infiltration_mm': sum_infiltration,
-        'runoff_coefficient': C,
-        'method': 'rational',
-        'time_step_minutes': time_step_minutes,
-        'num_intervals': len(rainfall_series)
-    }
+    negative = rainfall < 0
+    if negative.any():
+        raise ValueError(f"Rainfall negativo: {rainfall[negative][0]}")
+
+    rainfall, C_column = _broadcast_parameter(rainfall, C_values)
+
+    return RainfallExcessSeries(
+        rainfall_mm=rainfall,
+        excess_mm=C_column * rainfall,
+        method='rational',
+        time_step_minutes=time_step_minutes,
+        extra={'C': C}
+    )
 
 
 def calculate_rainfall_excess_scs(
@@ -69,64 +95,86 @@ def calculate_rainfall_excess_scs(
     antecedent_condition: str = 'AMC-II'
 ) -> Dict:
     """Calcula lluvia efectiva usando SCS Curve Number"""
-    if CN < 30 or CN > 100:
-        raise ValueError(f"CN debe estar entre 30-100. Valor: {CN}")
+    return calculate_rainfall_excess_scs_series(
+        rainfall_series, CN, time_step_minutes, antecedent_condition
+    ).to_dict()
+
 
-    # Ajustar CN por AMC
-    CN_adjusted = CN
+def adjust_curve_number(
+    CN: Union[float, ArrayLike],
+    antecedent_condition: str = 'AMC-II'
+) -> Union[float, np.ndarray]:
+    """
+    Ajusta CN por condición de humedad antecedente (AMC), redondeado a 0.1.
+
+    Args:
+        CN: Curve Number para AMC-II (escalar o array)
+        antecedent_condition: 'AMC-I' | 'AMC-II' | 'AMC-III'
+
+    Returns:
+        CN ajustado (mismo tipo/forma que la entrada)
+    """
+    CN_adjusted = np.asarray(CN, dtype=np.float64)
     if antecedent_condition == 'AMC-I':
-        CN_adjusted = CN / (2.281 - 0.01281 * CN)
+        CN_adjusted = CN_adjusted / (2.281 - 0.01281 * CN_adjusted)
     elif antecedent_condition == 'AMC-III':
-        CN_adjusted = CN / (0.427 + 0.00573 * CN)
+        CN_adjusted = CN_adjusted / (0.427 + 0.00573 * CN_adjusted)
+
+    CN_adjusted = np.round(CN_adjusted, 1)
+    return float(CN_adjusted) if CN_adjusted.ndim == 0 else CN_adjusted
+
+
+def calculate_rainfall_excess_scs_series(
+    rainfall_series: ArrayLike,
+    CN: Union[int, ArrayLike],
+    time_step_minutes: float = 5,
+    antecedent_condition: str = 'AMC-II'
+) -> RainfallExcessSeries:
+    """
+    Igual que calculate_rainfall_excess_scs() pero retorna RainfallExcessSeries.
+
+    Formulación vectorizada sobre lluvia acumulada:
+        P(t) = cumsum(lluvia)
+        Pe(t) = (P - Ia)² / (P - Ia + S)   si P > Ia, 0 en otro caso
+        Pe_incremental = diff(Pe)
+
+    Acepta una matriz de lluvias (..., n_intervalos) y un CN escalar o un
+    array de CN combinable por broadcasting con las dimensiones previas.
+    """
+    CN_values = np.asarray(CN, dtype=np.float64)
+    if np.any((CN_values < 30) | (CN_values > 100)):
+        raise ValueError(f"CN debe estar entre 30-100. Valor: {CN}")
 
-    CN_adjusted = round(CN_adjusted, 1)
+    CN_adjusted = adjust_curve_number(CN_values, antecedent_condition)
     S_mm = (25400 / CN_adjusted) - 254
     Ia_mm = 0.2 * S_mm
 
-    excess_series = []
-    infiltration_series = []
-    cumulative_rainfall = []
-    cumulative_excess = []
-    P_accumulated = 0
-    Pe_accumulated = 0
-
-    for rainfall in rainfall_series:
-        P_accumulated += rainfall
-        cumulative_rainfall.append(P_accumulated)
-
-        if P_accumulated <= Ia_mm:
-            Pe_accumulated_new = 0
-        else:
-            numerator = (P_accumulated - Ia_mm) ** 2
-            denominator = P_accumulated - Ia_mm + S_mm
-            Pe_accumulated_new = numerator / denominator if denominator > 0 else 0
-
-        Pe_increment = Pe_accumulated_new - Pe_accumulated
-        Pe_accumulated = Pe_accumulated_new
-        infiltration_increment = rainfall - Pe_increment
-
-        excess_series.append(Pe_increment)
-        infiltration_series.append(infiltration_increment)
-        cumulative_excess.append(Pe_accumulated)
-
-    total_rainfall = sum(rainfall_series)
-    total_excess = cumulative_excess[-1] if cumulative_excess else 0
-
-    return {
-        'excess_series': excess_series,
-        'infiltration_series': infiltration_series,
-        'cumulative_excess_mm': cumulative_excess,
-        'total_rainfall_mm': total_rainfall,
-        'total_excess_mm': total_excess,
-        'total_infiltration_mm': total_rainfall - total_excess,
-        'runoff_coefficient': total_excess / total_rainfall if total_rainfall > 0 else 0,
-        'method': 'scs_curve_number',
-        'CN_original': CN,
-        'CN_adjusted': CN_adjusted,
-        'S_mm': S_mm,
-        'Ia_mm': Ia_mm,
-        'time_step_minutes': time_step_minutes
-    }
+    rainfall = np.asarray(rainfall_series, dtype=np.float64)
+    rainfall, S_column = _broadcast_parameter(rainfall, np.asarray(S_mm))
+    Ia_column = 0.2 * S_column
+
+    P_accumulated = np.cumsum(rainfall, axis=-1)
+    effective = P_accumulated - Ia_column
+    denominator = effective + S_column
+    Pe_accumulated = np.divide(
+        effective ** 2, denominator,
+        out=np.zeros_like(P_accumulated),
+        where=(effective > 0) & (denominator > 0)
+    )
+    excess = np.diff(Pe_accumulated, axis=-1, prepend=0.0)
+
+    return RainfallExcessSeries(
+        rainfall_mm=rainfall,
+        excess_mm=excess,
+        method='scs_curve_number',
+        time_step_minutes=time_step_minutes,
+        extra={
+            'CN_original': CN,
+            'CN_adjusted': CN_adjusted,
+            'S_mm': S_mm,
+            'Ia_mm': Ia_mm
+        }
+    )
 
 
 def calculate_rainfall_excess(
@@ -138,13 +186,27 @@ def calculate_rainfall_excess(
     antecedent_condition: str = 'AMC-II'
 ) -> Dict:
     """Función principal para calcular lluvia efectiva"""
+    return calculate_rainfall_excess_series(
+        rainfall_series, method, time_step_minutes, C, CN, antecedent_condition
+    ).to_dict()
+
+
+def calculate_rainfall_excess_series(
+    rainfall_series: ArrayLike,
+    method: str = 'rational',
+    time_step_minutes: float = 5,
+    C: float = None,
+    CN: int = None,
+    antecedent_condition: str = 'AMC-II'
+) -> RainfallExcessSeries:
+    """Igual que calculate_rainfall_excess() pero retorna RainfallExcessSeries"""
     if method == 'rational':
         if C is None:
             raise ValueError("method='rational' requiere C")
-        return calculate_rainfall_excess_rational(rainfall_series, C, time_step_minutes)
+        return calculate_rainfall_excess_rational_series(rainfall_series, C, time_step_minutes)
     elif method == 'scs_curve_number':
         if CN is None:
             raise ValueError("method='scs_curve_number' requiere CN")
-        return calculate_rainfall_excess_scs(rainfall_series, CN, time_step_minutes, antecedent_condition)
+        return calculate_rainfall_excess_scs_series(rainfall_series, CN, time_step_minutes, antecedent_condition)
     else:
         raise ValueError(f"Método '{method}' no soportado")
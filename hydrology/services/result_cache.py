@@ -0,0 +1,202 @@
+"""
+Result Cache
+
+Memoización por contenido de calculate_hydrograph() y
+cached_hydrograph_series() (se guarda el HydrographResult): la clave es un hash
+(BLAKE2b) de la forma canónica de todas las entradas, con el paso de tiempo
+automático ya resuelto, de modo que time_step_minutes=None y el Δt explícito
+equivalente comparten resultado.
+
+Dos niveles:
+- En proceso: LRU acotada por número de entradas y por bytes (los
+  resultados se guardan serializados con pickle; cada lectura devuelve una
+  copia independiente).
+- Backend compartido (opcional): cualquier objeto con la API de caché de
+  Django (get/set), p. ej. caches['default'] con LocMemCache,
+  FileBasedCache o RedisCache. Lo configura HydrologyConfig.ready() según
+  settings.HYDROGRAPH_RESULT_CACHE. Los errores del backend no interrumpen
+  el cálculo.
+
+Las claves llevan el prefijo versionado RESULT_CACHE_PREFIX:v<versión>:;
+incrementar RESULT_CACHE_VERSION al cambiar los algoritmos invalida todos
+los resultados guardados.
+"""
+
+import hashlib
+import json
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from .pipeline import _canonical
+
+
+# Versión de los algoritmos de cálculo (incrementar al cambiar resultados)
+RESULT_CACHE_VERSION = 3
+
+RESULT_CACHE_PREFIX = 'hydrocal:hydrograph'
+
+# Límites del nivel en proceso
+RESULT_CACHE_MAX_ENTRIES = 256
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def hydrograph_cache_key(params: Dict, version: int = None) -> str:
+    """
+    Clave de caché de un conjunto de entradas.
+
+    Args:
+        params: Entradas de calculate_hydrograph() (con Δt resuelto)
+        version: Versión de algoritmos (default RESULT_CACHE_VERSION)
+
+    Returns:
+        '<prefijo>:v<versión>:<hash hexadecimal de 32 caracteres>'
+    """
+    if version is None:
+        version = RESULT_CACHE_VERSION
+    payload = json.dumps(_canonical(params), sort_keys=True, separators=(',', ':'))
+    digest = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    return f"{RESULT_CACHE_PREFIX}:v{version}:{digest}"
+
+
+class ResultCache:
+    """Caché de resultados en dos niveles: LRU en proceso y backend compartido"""
+
+    def __init__(
+        self,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+        backend=None,
+        timeout: Optional[float] = None
+    ):
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError(f"Límites inválidos: max_entries={max_entries}, max_bytes={max_bytes}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.timeout = timeout
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(('hits', 'backend_hits', 'misses', 'evictions', 'backend_errors'), 0)
+
+    def get(self, key: str):
+        """Resultado guardado (copia) o None"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return pickle.loads(data)
+
+        if self.backend is not None:
+            try:
+                value = self.backend.get(key)
+            except Exception:
+                self._count('backend_errors')
+                value = None
+            if value is not None:
+                self._count('backend_hits')
+                self._store(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+                return value
+
+        self._count('misses')
+        return None
+
+    def set(self, key: str, value) -> None:
+        """Guarda un resultado en ambos niveles"""
+        self._store(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value, self.timeout)
+            except Exception:
+                self._count('backend_errors')
+
+    def get_or_compute(self, key: str, compute: Callable[[], object]):
+        """Resultado guardado o compute() (los errores no se cachean)"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def _count(self, name: str) -> None:
+        """Incrementa un contador (los hilos de la API comparten la caché)"""
+        with self._lock:
+            self._stats[name] += 1
+
+    def _store(self, key: str, data: bytes) -> None:
+        """Inserta en el nivel en proceso desalojando por antigüedad (LRU)"""
+        if len(data) > self.max_bytes or self.max_entries == 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._stats['evictions'] += 1
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                'maxsize': self.max_entries,
+                'currsize': len(self._entries),
+                'max_bytes': self.max_bytes,
+                'currbytes': self._size,
+            }
+
+    def cache_clear(self) -> None:
+        """Vacía el nivel en proceso (el backend se invalida con la versión)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+# Caché compartida por el proceso (ver configure_result_cache)
+RESULT_CACHE = ResultCache()
+
+
+def configure_result_cache(
+    backend=None,
+    max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+    max_bytes: int = RESULT_CACHE_MAX_BYTES,
+    timeout: Optional[float] = None
+) -> ResultCache:
+    """
+    Reconfigura la caché del proceso (vacía el nivel en proceso).
+
+    Args:
+        backend: Caché con API de Django (None = solo nivel en proceso)
+        max_entries: Máximo de resultados en proceso (0 = desactivado)
+        max_bytes: Máximo de bytes en proceso (tamaño serializado)
+        timeout: Expiración en el backend [s] (None = sin expiración)
+
+    Returns:
+        RESULT_CACHE
+    """
+    if max_entries < 0 or max_bytes < 0:
+        raise ValueError(f"Límites inválidos: max_entries={max_entries}, max_bytes={max_bytes}")
+    RESULT_CACHE.cache_clear()
+    RESULT_CACHE.backend = backend
+    RESULT_CACHE.max_entries = max_entries
+    RESULT_CACHE.max_bytes = max_bytes
+    RESULT_CACHE.timeout = timeout
+    return RESULT_CACHE
+
+
+def result_cache_info() -> Dict[str, int]:
+    """Estadísticas de la caché de resultados del proceso"""
+    return RESULT_CACHE.cache_info()
+
+
+def clear_result_cache() -> None:
+    """Vacía el nivel en proceso de la caché de resultados"""
+    RESULT_CACHE.cache_clear()
@@ -0,0 +1,695 @@
+"""
+Channel Routing Service
+
+Tránsito de hidrogramas por tramos de cauce (métodos hidrológicos lineales)
+y por embalses de nivel horizontal:
+
+- Muskingum: parámetros K (tiempo de viaje) y X (ponderación)
+- Muskingum-Cunge: K y X a partir de la geometría e hidráulica del cauce
+  (celeridad y difusión de la onda cinemática, Ponce 1978)
+- Puls modificado: embalse / laguna de detención con curva
+  cota–volumen–caudal (ver StorageIndicationTable)
+
+Ambos usan la recurrencia de Muskingum
+
+    O(t+1) = C0 × I(t+1) + C1 × I(t) + C2 × O(t)
+
+que es un filtro IIR de primer orden (b = [C0, C1], a = [1, -C2]) y se
+aplica con scipy.signal.lfilter sobre toda la serie, sin bucles en Python.
+El caudal inicial se toma en régimen permanente (O(0) = I(0)).
+
+Subdivisión automática: si Δt no cumple 2KX <= Δt <= 2K(1-X) (coeficientes
+no negativos), el paso se divide en sub-pasos (entrada interpolada
+linealmente) y/o el tramo en sub-tramos iguales en serie.
+
+Las series aceptan varias filas (..., n): todas se transitan por el mismo
+tramo en una sola llamada.
+
+Puls modificado: la curva de indicación de almacenamiento 2S/Δt + O se
+precalcula una vez por laguna y Δt (caché LRU); cada paso es una búsqueda
+binaria (searchsorted) en esa curva, vectorizada sobre todas las filas. Las
+tablas pueden apilar varias lagunas (p, k) para evaluar alternativas de
+diseño en una sola pasada.
+
+Referencias:
+- Chow, V.T., Maidment, D.R., Mays, L.W. (1988). Applied Hydrology, Cap. 8-9.
+- Ponce, V.M. (1989). Engineering Hydrology: Principles and Practices, Cap. 9.
+- USACE (2000). HEC-HMS Technical Reference Manual, Cap. 8.
+- Puls, L.G. (1928). Flood regulation of the Tennessee River. 70th Congress.
+"""
+
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.signal import lfilter, lfilter_zi
+
+from .convolution import ArrayLike
+from .series import RoutedHydrographSeries, _scalar
+
+
+# Caudal remanente (relativo al pico) bajo el cual se corta la recesión de salida
+ROUTING_TAIL_TOLERANCE = 1e-4
+
+# Límite de sub-pasos y sub-tramos de la subdivisión automática
+MAX_SUBDIVISIONS = 1000
+
+# Muskingum-Cunge: caudal de referencia = Q_base + REFERENCE_DISCHARGE_RATIO × (Q_pico - Q_base)
+REFERENCE_DISCHARGE_RATIO = 0.5
+
+# Celeridad de la onda cinemática en cauce ancho con Manning: c = 5/3 × V
+KINEMATIC_CELERITY_RATIO = 5 / 3
+
+# Tablas de indicación de almacenamiento en caché (por laguna y Δt)
+STORAGE_INDICATION_CACHE_SIZE = 128
+
+# Vaciado máximo tras la entrada, como múltiplo de su duración
+MAX_DRAIN_RATIO = 10
+
+
+def muskingum_coefficients(
+    K_minutes: float,
+    X: float,
+    time_step_minutes: float
+) -> Tuple[float, float, float]:
+    """
+    Coeficientes de Muskingum (C0 + C1 + C2 = 1).
+
+    Args:
+        K_minutes: Tiempo de viaje del tramo [min]
+        X: Factor de ponderación (0 <= X <= 0.5)
+        time_step_minutes: Paso de tiempo [min]
+
+    Returns:
+        (C0, C1, C2)
+    """
+    denominator = 2 * K_minutes * (1 - X) + time_step_minutes
+    return (
+        (time_step_minutes - 2 * K_minutes * X) / denominator,
+        (time_step_minutes + 2 * K_minutes * X) / denominator,
+        (2 * K_minutes * (1 - X) - time_step_minutes) / denominator,
+    )
+
+
+def select_subdivision(K_minutes: float, X: float, time_step_minutes: float) -> Tuple[int, int]:
+    """
+    Sub-pasos n y sub-tramos m mínimos (n × m) con coeficientes no negativos.
+
+    Cada sub-tramo tiene K/m y se transita con Δt/n; se busca
+    2X <= (Δt/n) / (K/m) <= 2(1-X).
+
+    Returns:
+        (num_substeps, num_subreaches)
+
+    Raises:
+        ValueError: Si no hay subdivisión válida dentro de MAX_SUBDIVISIONS
+    """
+    ratio = time_step_minutes / K_minutes
+    best = None
+    for num_substeps in range(1, MAX_SUBDIVISIONS + 1):
+        # El costo n × m es al menos n: no hay mejores candidatos
+        if best is not None and num_substeps >= best[0] * best[1]:
+            break
+        num_subreaches = max(1, math.ceil(2 * X * num_substeps / ratio - 1e-9))
+        if ratio * num_subreaches / num_substeps > 2 * (1 - X) + 1e-9:
+            continue
+        if best is None or num_substeps * num_subreaches < best[0] * best[1]:
+            best = (num_substeps, num_subreaches)
+
+    if best is None or best[1] > MAX_SUBDIVISIONS:
+        raise ValueError(
+            f"No hay subdivisión válida para K = {K_minutes} min, X = {X}, "
+            f"Δt = {time_step_minutes} min"
+        )
+    return best
+
+
+def _route_reach(
+    inflow: np.ndarray,
+    coefficients: Tuple[float, float, float],
+    num_substeps: int,
+    num_subreaches: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Transita filas de caudal por num_subreaches sub-tramos iguales con
+    num_substeps sub-pasos por intervalo. Retorna (entrada, salida) en el
+    paso original, extendidas hasta que la recesión cae bajo la tolerancia.
+    """
+    c0, c1, c2 = coefficients
+
+    # Extensión para la recesión: cada sub-tramo decae como C2 por sub-paso
+    if 0 < c2 < 1:
+        num_tail = math.ceil(num_subreaches * math.log(ROUTING_TAIL_TOLERANCE) / math.log(c2))
+    else:
+        num_tail = 2 * num_subreaches + 1
+    num_tail = math.ceil(num_tail / num_substeps) + 1
+    inflow = np.concatenate([inflow, np.repeat(inflow[..., -1:], num_tail, axis=-1)], axis=-1)
+
+    # Entrada interpolada linealmente en los sub-pasos
+    signal = inflow
+    if num_substeps > 1:
+        lower, offset = np.divmod(np.arange((inflow.shape[-1] - 1) * num_substeps + 1), num_substeps)
+        upper = np.minimum(lower + 1, inflow.shape[-1] - 1)
+        weight = offset / num_substeps
+        signal = inflow[..., lower] * (1 - weight) + inflow[..., upper] * weight
+
+    # Recurrencia de Muskingum como filtro IIR, en régimen permanente inicial
+    b, a = [c0, c1], [1.0, -c2]
+    zi = lfilter_zi(b, a)
+    for _ in range(num_subreaches):
+        signal, _ = lfilter(b, a, signal, axis=-1, zi=signal[..., :1] * zi)
+    outflow = signal[..., ::num_substeps]
+
+    # Corte de la recesión (outflow vuelve al caudal final de entrada)
+    residual = np.abs(outflow - inflow[..., -1:]).reshape(-1, outflow.shape[-1]).max(axis=0)
+    threshold = ROUTING_TAIL_TOLERANCE * max(float(np.abs(outflow).max()), 1e-12)
+    length = int(np.flatnonzero(residual >= threshold)[-1]) + 1 if np.any(residual >= threshold) else 1
+    length = max(length, inflow.shape[-1] - num_tail)
+    return inflow[..., :length], outflow[..., :length]
+
+
+def _validate_inflow(inflow_m3s: ArrayLike, time_step_minutes: float) -> np.ndarray:
+    """Valida y convierte el hidrograma de entrada"""
+    inflow = np.asarray(inflow_m3s, dtype=np.float64)
+    if inflow.ndim == 0 or inflow.shape[-1] == 0:
+        raise ValueError("inflow_m3s no puede estar vacía")
+    if np.any(inflow < 0):
+        raise ValueError("inflow_m3s no puede tener caudales negativos")
+    if time_step_minutes <= 0:
+        raise ValueError(f"time_step_minutes debe ser > 0. Valor: {time_step_minutes}")
+    return inflow
+
+
+def _muskingum_reach(
+    K_minutes: float,
+    X: float,
+    time_step_minutes: float,
+    num_subreaches: Optional[int] = None
+) -> Tuple[Tuple[float, float, float], int, int]:
+    """
+    Valida un tramo de Muskingum y elige su subdivisión.
+
+    Returns:
+        (coeficientes del sub-tramo, num_substeps, num_subreaches)
+    """
+    if K_minutes <= 0:
+        raise ValueError(f"K_minutes debe ser > 0. Valor: {K_minutes}")
+    if not 0 <= X <= 0.5:
+        raise ValueError(f"X debe estar en [0, 0.5]. Valor: {X}")
+
+    if num_subreaches is None:
+        num_substeps, num_subreaches = select_subdivision(K_minutes, X, time_step_minutes)
+    else:
+        if num_subreaches < 1:
+            raise ValueError(f"num_subreaches debe ser >= 1. Valor: {num_subreaches}")
+        num_substeps = max(1, math.ceil(
+            time_step_minutes / (2 * (K_minutes / num_subreaches) * (1 - X)) - 1e-9
+        ))
+
+    sub_K = K_minutes / num_subreaches
+    sub_step = time_step_minutes / num_substeps
+    coefficients = muskingum_coefficients(sub_K, X, sub_step)
+    return coefficients, num_substeps, num_subreaches
+
+
+def route_muskingum(
+    inflow_m3s: ArrayLike,
+    time_step_minutes: float,
+    K_minutes: float,
+    X: float = 0.2,
+    num_subreaches: Optional[int] = None
+) -> RoutedHydrographSeries:
+    """
+    Tránsito de Muskingum.
+
+    Args:
+        inflow_m3s: Hidrograma de entrada [m³/s], forma (..., n)
+        time_step_minutes: Paso de tiempo [min]
+        K_minutes: Tiempo de viaje del tramo [min]
+        X: Factor de ponderación (0 <= X <= 0.5)
+        num_subreaches: Sub-tramos (None = subdivisión automática; si se
+            indica, solo se eligen sub-pasos)
+
+    Returns:
+        RoutedHydrographSeries con method='muskingum'
+
+    Raises:
+        ValueError: Parámetros inválidos
+    """
+    inflow = _validate_inflow(inflow_m3s, time_step_minutes)
+    coefficients, num_substeps, num_subreaches = _muskingum_reach(
+        K_minutes, X, time_step_minutes, num_subreaches
+    )
+    inflow, outflow = _route_reach(inflow, coefficients, num_substeps, num_subreaches)
+
+    return RoutedHydrographSeries(
+        inflow_m3s=inflow,
+        outflow_m3s=outflow,
+        time_step_minutes=time_step_minutes,
+        method='muskingum',
+        num_substeps=num_substeps,
+        num_subreaches=num_subreaches,
+        extra={
+            'K_minutes': K_minutes,
+            'X': X,
+            'coefficients': list(coefficients)
+        }
+    )
+
+
+def muskingum_cunge_parameters(
+    reference_discharge_m3s: float,
+    length_m: float,
+    slope: float,
+    manning_n: float,
+    width_m: float
+) -> Dict[str, float]:
+    """
+    Celeridad y difusión de la onda cinemática en un cauce rectangular ancho.
+
+    - Caudal unitario: q = Q / B
+    - Tirante normal (Manning): y = (q n / √S₀)^(3/5)
+    - Celeridad: c = 5/3 × q / y
+    - Longitud de difusión: q / (S₀ c)
+
+    Returns:
+        {'celerity_ms', 'diffusion_length_m', 'depth_m', 'velocity_ms'}
+    """
+    unit_discharge = reference_discharge_m3s / width_m
+    depth = (unit_discharge * manning_n / math.sqrt(slope)) ** 0.6
+    velocity = unit_discharge / depth
+    celerity = KINEMATIC_CELERITY_RATIO * velocity
+    return {
+        'celerity_ms': celerity,
+        'diffusion_length_m': unit_discharge / (slope * celerity),
+        'depth_m': depth,
+        'velocity_ms': velocity,
+    }
+
+
+def _muskingum_cunge_reach(
+    time_step_minutes: float,
+    length_m: float,
+    slope: float,
+    manning_n: float,
+    width_m: float,
+    reference_discharge_m3s: float
+) -> Tuple[Tuple[float, float, float], int, int, Dict]:
+    """
+    Valida un tramo de Muskingum-Cunge y elige su subdivisión.
+
+    Returns:
+        (coeficientes del sub-tramo, num_substeps, num_subreaches, extra)
+    """
+    for name, value in (('length_m', length_m), ('slope', slope), ('manning_n', manning_n), ('width_m', width_m)):
+        if value <= 0:
+            raise ValueError(f"{name} debe ser > 0. Valor: {value}")
+    if reference_discharge_m3s <= 0:
+        raise ValueError(f"reference_discharge_m3s debe ser > 0. Valor: {reference_discharge_m3s}")
+
+    hydraulics = muskingum_cunge_parameters(reference_discharge_m3s, length_m, slope, manning_n, width_m)
+    celerity = hydraulics['celerity_ms']
+    diffusion_length = hydraulics['diffusion_length_m']
+
+    for num_substeps in range(1, MAX_SUBDIVISIONS + 1):
+        sub_step_seconds = time_step_minutes * 60 / num_substeps
+        target_dx = 0.5 * (celerity * sub_step_seconds + diffusion_length)
+        num_subreaches = max(1, math.ceil(length_m / target_dx - 1e-9))
+        dx = length_m / num_subreaches
+        courant = celerity * sub_step_seconds / dx
+        # C2 >= 0 ⇔ Courant <= 1 + D (D = q / (S₀ c Δx))
+        if courant <= 1 + diffusion_length / dx + 1e-9:
+            break
+    else:
+        raise ValueError(
+            f"No hay subdivisión válida para Muskingum-Cunge con Δt = {time_step_minutes} min"
+        )
+    if num_subreaches > MAX_SUBDIVISIONS:
+        raise ValueError(f"Tramo requiere {num_subreaches} sub-tramos (> {MAX_SUBDIVISIONS})")
+
+    sub_K_minutes = dx / celerity / 60
+    X = 0.5 * (1 - diffusion_length / dx)
+    coefficients = muskingum_coefficients(sub_K_minutes, X, sub_step_seconds / 60)
+    return coefficients, num_substeps, num_subreaches, {
+        'K_minutes': sub_K_minutes * num_subreaches,
+        'X': X,
+        'coefficients': list(coefficients),
+        'reference_discharge_m3s': reference_discharge_m3s,
+        'courant_number': courant,
+        **hydraulics
+    }
+
+
+def route_muskingum_cunge(
+    inflow_m3s: ArrayLike,
+    time_step_minutes: float,
+    length_m: float,
+    slope: float,
+    manning_n: float,
+    width_m: float,
+    reference_discharge_m3s: Optional[float] = None
+) -> RoutedHydrographSeries:
+    """
+    Tránsito de Muskingum-Cunge de parámetros constantes.
+
+    Sub-tramos de longitud Δx ≈ (c Δt + q / (S₀ c)) / 2 (Ponce), con
+    K = Δx / c y X = (1 - q / (S₀ c Δx)) / 2; si el número de Courant
+    supera 1 + D, Δt se divide en sub-pasos. En tramos cortos muy difusivos
+    X puede ser negativo (propio del método).
+
+    Args:
+        inflow_m3s: Hidrograma de entrada [m³/s], forma (..., n)
+        time_step_minutes: Paso de tiempo [min]
+        length_m: Longitud del tramo [m]
+        slope: Pendiente del fondo [m/m]
+        manning_n: Coeficiente de Manning
+        width_m: Ancho del cauce [m]
+        reference_discharge_m3s: Caudal de referencia (None = Q_base + 0.5
+            × (Q_pico - Q_base) de la entrada, común a todas las filas)
+
+    Returns:
+        RoutedHydrographSeries con method='muskingum_cunge'
+
+    Raises:
+        ValueError: Parámetros inválidos
+    """
+    inflow = _validate_inflow(inflow_m3s, time_step_minutes)
+
+    if reference_discharge_m3s is None:
+        base, peak = float(inflow.min()), float(inflow.max())
+        reference_discharge_m3s = base + REFERENCE_DISCHARGE_RATIO * (peak - base)
+
+    coefficients, num_substeps, num_subreaches, extra = _muskingum_cunge_reach(
+        time_step_minutes, length_m, slope, manning_n, width_m, reference_discharge_m3s
+    )
+    inflow, outflow = _route_reach(inflow, coefficients, num_substeps, num_subreaches)
+
+    return RoutedHydrographSeries(
+        inflow_m3s=inflow,
+        outflow_m3s=outflow,
+        time_step_minutes=time_step_minutes,
+        method='muskingum_cunge',
+        num_substeps=num_substeps,
+        num_subreaches=num_subreaches,
+        extra=extra
+    )
+
+
+class _RowInterpolator:
+    """
+    Interpolación lineal por filas de una tabla (p, k) con xp no decreciente
+    en cada fila: una sola búsqueda binaria sobre las filas concatenadas
+    (desplazadas para que el conjunto sea monótono). Por debajo del rango se
+    toma el primer valor; por encima se extrapola con el último tramo.
+    """
+
+    __slots__ = ('xp', 'fp', 'keys', 'offsets', 'slopes', 'num_points')
+
+    def __init__(self, xp: np.ndarray, fp: np.ndarray):
+        self.xp = xp
+        self.fp = fp
+        self.num_points = xp.shape[-1]
+        span = float(xp.max() - xp.min()) + 1.0
+        self.offsets = np.arange(xp.shape[0]) * span - xp[:, 0]
+        self.keys = (xp + self.offsets[:, np.newaxis]).ravel()
+        dx = np.diff(xp, axis=-1)
+        self.slopes = np.divide(np.diff(fp, axis=-1), dx, out=np.zeros_like(dx), where=dx > 0).ravel()
+
+    def __call__(self, x: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        x = np.maximum(x, self.xp[rows, 0]) + self.offsets[rows]
+        first = rows * self.num_points
+        index = np.clip(np.searchsorted(self.keys, x, side='right') - 1, first, first + self.num_points - 2)
+        segment = index - rows
+        return self.fp.ravel()[index] + self.slopes[segment] * (x - self.keys[index])
+
+
+@dataclass(slots=True)
+class StorageIndicationTable:
+    """
+    Curva de indicación de almacenamiento de una o varias lagunas (filas).
+
+    indication = 2S/Δt + O [m³/s], estrictamente creciente por fila.
+    """
+
+    storage_m3: np.ndarray
+    discharge_m3s: np.ndarray
+    stage_m: Optional[np.ndarray]
+    time_step_minutes: float
+    indication_m3s: np.ndarray = field(init=False)
+    _outflow: _RowInterpolator = field(init=False, repr=False)
+    _discharge: _RowInterpolator = field(init=False, repr=False)
+    _initial_storage: _RowInterpolator = field(init=False, repr=False)
+    _stage: Optional[_RowInterpolator] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.indication_m3s = 2 * self.storage_m3 / (self.time_step_minutes * 60) + self.discharge_m3s
+        self._outflow = _RowInterpolator(self.indication_m3s, self.discharge_m3s)
+        self._discharge = _RowInterpolator(self.storage_m3, self.discharge_m3s)
+        self._initial_storage = _RowInterpolator(self.discharge_m3s, self.storage_m3)
+        self._stage = None if self.stage_m is None else _RowInterpolator(self.storage_m3, self.stage_m)
+
+    @property
+    def num_ponds(self) -> int:
+        return self.storage_m3.shape[0]
+
+    def outflow(self, indication_m3s: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Caudal de salida para 2S/Δt + O dado (búsqueda binaria por fila)"""
+        return self._outflow(indication_m3s, rows)
+
+    def discharge(self, storage_m3: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Caudal de salida para el volumen dado"""
+        return self._discharge(storage_m3, rows)
+
+    def steady_storage(self, discharge_m3s: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Volumen con el que la laguna descarga el caudal dado (máximo si hay tramos planos)"""
+        return self._initial_storage(discharge_m3s, rows)
+
+    def stage(self, storage_m3: np.ndarray, rows: np.ndarray) -> Optional[np.ndarray]:
+        """Cota para el volumen dado (None si la tabla no tiene cotas)"""
+        return None if self._stage is None else self._stage(storage_m3, rows)
+
+
+@lru_cache(maxsize=STORAGE_INDICATION_CACHE_SIZE)
+def _cached_storage_indication_table(
+    shape: Tuple[int, int],
+    storage: bytes,
+    discharge: bytes,
+    stage: Optional[bytes],
+    time_step_minutes: float
+) -> StorageIndicationTable:
+    """Construye (una vez por laguna y Δt) la curva de indicación"""
+    def _array(buffer):
+        return np.frombuffer(buffer, dtype=np.float64).reshape(shape)
+
+    return StorageIndicationTable(
+        storage_m3=_array(storage),
+        discharge_m3s=_array(discharge),
+        stage_m=None if stage is None else _array(stage),
+        time_step_minutes=time_step_minutes
+    )
+
+
+def storage_indication_table(
+    storage_m3: ArrayLike,
+    discharge_m3s: ArrayLike,
+    time_step_minutes: float,
+    stage_m: Optional[ArrayLike] = None
+) -> StorageIndicationTable:
+    """
+    Curva de indicación de almacenamiento (2S/Δt + O) de una o varias lagunas.
+
+    Las tablas se cachean por (curva cota–volumen–caudal, Δt): las corridas
+    repetidas de una misma laguna reutilizan la curva precalculada.
+
+    Args:
+        storage_m3: Volumen almacenado [m³], forma (k,) o (p, k) para p lagunas,
+            estrictamente creciente
+        discharge_m3s: Caudal de salida [m³/s] para cada volumen, no decreciente
+        time_step_minutes: Paso de tiempo del tránsito [min]
+        stage_m: Cotas [m] para cada volumen (opcional)
+
+    Returns:
+        StorageIndicationTable con tablas de forma (p, k)
+
+    Raises:
+        ValueError: Tabla inválida
+    """
+    storage = np.atleast_2d(np.asarray(storage_m3, dtype=np.float64))
+    discharge = np.atleast_2d(np.asarray(discharge_m3s, dtype=np.float64))
+    stage = None if stage_m is None else np.atleast_2d(np.asarray(stage_m, dtype=np.float64))
+
+    if storage.ndim != 2 or storage.shape != discharge.shape or (stage is not None and stage.shape != storage.shape):
+        raise ValueError("storage_m3, discharge_m3s y stage_m deben tener la misma forma (k,) o (p, k)")
+    if storage.shape[-1] < 2:
+        raise ValueError("La tabla cota–volumen–caudal requiere al menos 2 puntos")
+    if time_step_minutes <= 0:
+        raise ValueError(f"time_step_minutes debe ser > 0. Valor: {time_step_minutes}")
+    if np.any(storage < 0) or np.any(np.diff(storage, axis=-1) <= 0):
+        raise ValueError("storage_m3 debe ser no negativo y estrictamente creciente")
+    if np.any(discharge < 0) or np.any(np.diff(discharge, axis=-1) < 0):
+        raise ValueError("discharge_m3s debe ser no negativo y no decreciente")
+    if stage is not None and np.any(np.diff(stage, axis=-1) < 0):
+        raise ValueError("stage_m debe ser no decreciente")
+
+    return _cached_storage_indication_table(
+        storage.shape,
+        storage.tobytes(),
+        discharge.tobytes(),
+        None if stage is None else stage.tobytes(),
+        float(time_step_minutes)
+    )
+
+
+def route_modified_puls(
+    inflow_m3s: ArrayLike,
+    time_step_minutes: float,
+    storage_m3: Optional[ArrayLike] = None,
+    discharge_m3s: Optional[ArrayLike] = None,
+    stage_m: Optional[ArrayLike] = None,
+    table: Optional[StorageIndicationTable] = None,
+    initial_storage_m3: Optional[Union[float, Sequence[float]]] = None
+) -> RoutedHydrographSeries:
+    """
+    Tránsito de Puls modificado (embalse de nivel horizontal).
+
+        2S₂/Δt + O₂ = I₁ + I₂ + (2S₁/Δt + O₁) - 2 O₁
+
+    O₂ se obtiene de la curva de indicación precalculada por búsqueda
+    binaria. Las filas de la entrada y las lagunas de la tabla se combinan
+    por broadcasting (p.ej. una tormenta por varias lagunas, o varias
+    tormentas por una laguna) y se transitan juntas, paso a paso.
+
+    Tras la entrada se continúa con su último caudal hasta que la salida se
+    estabiliza (a lo sumo MAX_DRAIN_RATIO veces la duración de la entrada).
+
+    Args:
+        inflow_m3s: Hidrograma de entrada [m³/s], forma (..., n)
+        time_step_minutes: Paso de tiempo [min]
+        storage_m3, discharge_m3s, stage_m: Tabla cota–volumen–caudal
+            (ver storage_indication_table()); se ignoran si se pasa table
+        table: Curva de indicación ya construida (mismo Δt)
+        initial_storage_m3: Volumen inicial (None = régimen permanente con
+            la entrada inicial)
+
+    Returns:
+        RoutedHydrographSeries con method='modified_puls' y en extra:
+        storage_m3, stage_m (si hay cotas), peak_storage_m3, peak_stage_m,
+        exceeds_table (la laguna superó el volumen máximo de la tabla)
+
+    Raises:
+        ValueError: Parámetros inválidos
+    """
+    inflow = _validate_inflow(inflow_m3s, time_step_minutes)
+    if table is None:
+        if storage_m3 is None or discharge_m3s is None:
+            raise ValueError("Puls modificado requiere table o storage_m3 y discharge_m3s")
+        table = storage_indication_table(storage_m3, discharge_m3s, time_step_minutes, stage_m)
+    elif table.time_step_minutes != time_step_minutes:
+        raise ValueError(
+            f"La tabla se construyó con Δt = {table.time_step_minutes} min, "
+            f"no {time_step_minutes} min"
+        )
+
+    # Filas: broadcasting entre entradas (...) y lagunas (p,)
+    pond_shape = (table.num_ponds,) if table.num_ponds > 1 else ()
+    try:
+        leading = np.broadcast_shapes(inflow.shape[:-1], pond_shape)
+    except ValueError:
+        raise ValueError(
+            f"Formas incompatibles: entrada {inflow.shape} y {table.num_ponds} lagunas"
+        )
+    num_intervals = inflow.shape[-1]
+    inflow = np.broadcast_to(inflow, leading + (num_intervals,)).reshape(-1, num_intervals)
+    rows = np.broadcast_to(np.arange(table.num_ponds).reshape(pond_shape), leading).ravel()
+
+    dt_seconds = time_step_minutes * 60
+    if initial_storage_m3 is None:
+        storage = table.steady_storage(inflow[:, 0], rows)
+    else:
+        storage = np.broadcast_to(np.asarray(initial_storage_m3, dtype=np.float64), leading).ravel()
+    outflow_now = table.discharge(storage, rows)
+    indication = 2 * storage / dt_seconds + outflow_now
+
+    max_steps = num_intervals * (1 + MAX_DRAIN_RATIO)
+    outflow = np.empty((inflow.shape[0], max_steps))
+    indications = np.empty_like(outflow)
+    outflow[:, 0], indications[:, 0] = outflow_now, indication
+    final_inflow = inflow[:, -1]
+    peak_outflow = float(outflow_now.max())
+    length = max_steps
+    for step in range(1, max_steps):
+        previous = inflow[:, min(step - 1, num_intervals - 1)]
+        current = inflow[:, min(step, num_intervals - 1)]
+        indication = previous + current + indication - 2 * outflow_now
+        outflow_now = table.outflow(indication, rows)
+        outflow[:, step], indications[:, step] = outflow_now, indication
+        peak_outflow = max(peak_outflow, float(outflow_now.max()))
+        # Tras la entrada: se corta cuando la salida vuelve al caudal final
+        if step >= num_intervals and np.all(
+            np.abs(outflow_now - final_inflow) <= ROUTING_TAIL_TOLERANCE * max(peak_outflow, 1e-12)
+        ):
+            length = step + 1
+            break
+
+    outflow = outflow[:, :length]
+    storage = np.maximum((indications[:, :length] - outflow) * dt_seconds / 2, 0.0)
+    inflow = np.concatenate(
+        [inflow, np.repeat(final_inflow[:, np.newaxis], length - num_intervals, axis=-1)], axis=-1
+    )[:, :length]
+    stage = table.stage(storage, rows[:, np.newaxis])
+
+    shape = leading + (length,)
+    extra = {
+        'storage_m3': storage.reshape(shape),
+        'peak_storage_m3': _scalar(storage.max(axis=-1).reshape(leading)),
+        'exceeds_table': _scalar((storage.max(axis=-1) > table.storage_m3[rows, -1]).reshape(leading)),
+    }
+    if stage is not None:
+        extra['stage_m'] = stage.reshape(shape)
+        extra['peak_stage_m'] = _scalar(stage.max(axis=-1).reshape(leading))
+
+    return RoutedHydrographSeries(
+        inflow_m3s=inflow.reshape(shape),
+        outflow_m3s=outflow.reshape(shape),
+        time_step_minutes=time_step_minutes,
+        method='modified_puls',
+        extra=extra
+    )
+
+
+# Métodos de tránsito (parámetros del tramo como argumentos con nombre)
+ROUTING_METHODS = {
+    'muskingum': route_muskingum,
+    'muskingum_cunge': route_muskingum_cunge,
+    'modified_puls': route_modified_puls,
+}
+
+
+def route_hydrograph(
+    inflow_m3s: ArrayLike,
+    time_step_minutes: float,
+    method: str = 'muskingum',
+    **reach_params
+) -> RoutedHydrographSeries:
+    """
+    Transita un hidrograma por un tramo con el método indicado.
+
+    Args:
+        inflow_m3s: Hidrograma de entrada [m³/s], forma (..., n)
+        time_step_minutes: Paso de tiempo [min]
+        method: 'muskingum' | 'muskingum_cunge' | 'modified_puls'
+        **reach_params: Parámetros del tramo del método (ver ROUTING_METHODS)
+
+    Raises:
+        ValueError: Método desconocido o parámetros inválidos
+    """
+    if method not in ROUTING_METHODS:
+        raise ValueError(
+            f"Método de tránsito '{method}' no soportado. Opciones: {list(ROUTING_METHODS)}"
+        )
+    try:
+        return ROUTING_METHODS[method](inflow_m3s, time_step_minutes, **reach_params)
+    except TypeError as e:
+        raise ValueError(f"Parámetros de tramo inválidos para '{method}': {str(e)}")
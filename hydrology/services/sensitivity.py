@@ -0,0 +1,427 @@
+"""
+Global Sensitivity Analysis
+
+Ordena los parámetros de un escenario de calculate_hydrograph() según su
+influencia sobre el caudal pico, el volumen y el tiempo al pico:
+
+- Morris (efectos elementales): r trayectorias de k + 1 puntos en una
+  grilla de p niveles; μ* (media del valor absoluto del efecto) mide la
+  importancia y σ la no linealidad o interacción. Cuesta r × (k + 1)
+  evaluaciones.
+- Sobol (varianza): matrices A, B y AB_i de Saltelli con una secuencia de
+  Sobol aleatorizada; índices de primer orden S1 (Saltelli 2010) y totales
+  ST (Jansen), con intervalos de confianza por bootstrap. Cuesta N × (k + 2)
+  evaluaciones.
+
+Los parámetros varían uniformemente en [low, high]. time_step_minutes se
+discretiza a múltiplos de TIME_STEP_RESOLUTION_MINUTES: las filas se agrupan
+por Δt y cada grupo se evalúa con evaluate_scenario_samples() como una
+matriz. Los bloques de filas se reparten entre procesos
+(ProcessPoolExecutor, igual que calculate_hydrographs_parallel()).
+
+Example:
+    >>> result = sobol_indices(
+    ...     dict(duration_hours=3, area_km2=5.2, tc_minutes=45, C=0.6,
+    ...          P3_10=70, Tr=25, total_rainfall_mm=None),
+    ...     bounds={'C': (0.5, 0.7), 'tc_minutes': (35, 60), 'P3_10': (60, 80)},
+    ...     num_samples=1024, seed=1)
+    >>> result.ranking('peak_discharge_m3s')
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.stats import qmc
+
+from .parallel import CHUNKS_PER_WORKER, resolve_worker_count, warm_worker_caches
+from .uncertainty import (
+    MONTE_CARLO_BLOCK_SIZE,
+    MONTE_CARLO_METRICS,
+    PARAMETER_BOUNDS,
+    _prepare_scenario,
+    evaluate_scenario_samples,
+)
+
+
+# Parámetros analizables
+SENSITIVITY_PARAMETERS = ('C', 'CN', 'tc_minutes', 'peak_position_ratio', 'time_step_minutes', 'P3_10', 'Tr')
+
+# Métricas sobre las que se calculan los índices
+SENSITIVITY_METRICS = ('peak_discharge_m3s', 'total_volume_m3', 'time_to_peak_minutes')
+
+# Rango válido de cada parámetro
+SENSITIVITY_BOUNDS = {**PARAMETER_BOUNDS, 'time_step_minutes': (1.0, 60.0)}
+
+# Discretización de Δt (las filas con igual Δt se evalúan juntas)
+TIME_STEP_RESOLUTION_MINUTES = 1.0
+
+# Rango por defecto: nominal ± DEFAULT_RELATIVE_RANGE × nominal
+DEFAULT_RELATIVE_RANGE = 0.2
+
+DEFAULT_MORRIS_TRAJECTORIES = 20
+DEFAULT_MORRIS_LEVELS = 4
+DEFAULT_SOBOL_SAMPLES = 256
+DEFAULT_BOOTSTRAP = 100
+
+# Índice usado para ordenar los parámetros de cada método
+RANKING_INDEX = {'morris': 'mu_star', 'sobol': 'ST'}
+
+
+@dataclass(slots=True)
+class SensitivityResult:
+    """Índices de sensibilidad por métrica y parámetro"""
+
+    method: str
+    parameters: List[str]
+    bounds: Dict[str, Tuple[float, float]]
+    # métrica → parámetro → índice (mu, mu_star, sigma o S1, S1_conf, ST, ST_conf)
+    indices: Dict[str, Dict[str, Dict[str, float]]]
+    num_evaluations: int
+    seed: Optional[int] = None
+    settings: Dict = field(default_factory=dict)
+
+    def ranking(self, metric: str = 'peak_discharge_m3s') -> List[str]:
+        """Parámetros de mayor a menor influencia (μ* en Morris, ST en Sobol)"""
+        index = RANKING_INDEX[self.method]
+        values = self.indices[metric]
+        return sorted(self.parameters, key=lambda name: values[name][index], reverse=True)
+
+    def to_dict(self) -> Dict:
+        return {
+            'method': self.method,
+            'parameters': self.parameters,
+            'bounds': {name: list(bound) for name, bound in self.bounds.items()},
+            'num_evaluations': self.num_evaluations,
+            'seed': self.seed,
+            'settings': self.settings,
+            'indices': self.indices,
+            'ranking': {metric: self.ranking(metric) for metric in self.indices},
+        }
+
+
+def default_sensitivity_bounds(
+    scenario: Dict,
+    parameters: Optional[Sequence[str]] = None,
+    relative_range: float = DEFAULT_RELATIVE_RANGE
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Rangos nominal × (1 ± relative_range), recortados a SENSITIVITY_BOUNDS.
+
+    Args:
+        scenario: Parámetros de calculate_hydrograph()
+        parameters: Parámetros a analizar (None = los de SENSITIVITY_PARAMETERS
+            que el escenario usa: C o CN según excess_method, P3_10 y Tr con
+            hietograma de bloques alternos)
+        relative_range: Semiancho relativo del rango
+
+    Returns:
+        {parámetro: (low, high)}
+
+    Raises:
+        ValueError: Parámetro sin valor nominal o rango inválido
+    """
+    if not 0 < relative_range < 1:
+        raise ValueError(f"relative_range debe estar entre 0 y 1. Valor: {relative_range}")
+    params = _prepare_scenario(scenario)
+    if parameters is None:
+        unused = set()
+        if params['excess_method'] == 'rational':
+            unused.add('CN')
+        elif params['excess_method'] == 'scs_curve_number':
+            unused.add('C')
+        if params['hyetograph_method'] != 'alternating_block':
+            unused.update(('P3_10', 'Tr', 'peak_position_ratio'))
+        parameters = [name for name in SENSITIVITY_PARAMETERS if name not in unused]
+
+    bounds = {}
+    for name in parameters:
+        if name not in SENSITIVITY_PARAMETERS:
+            raise ValueError(f"Parámetro '{name}' no soportado. Opciones: {list(SENSITIVITY_PARAMETERS)}")
+        if params[name] is None:
+            raise ValueError(f"Parámetro '{name}' sin valor nominal en el escenario")
+        nominal = float(params[name])
+        low, high = SENSITIVITY_BOUNDS[name]
+        bounds[name] = (
+            max(low, nominal * (1 - relative_range)),
+            min(high, nominal * (1 + relative_range))
+        )
+    return _validate_bounds(bounds)
+
+
+def _validate_bounds(bounds: Dict) -> Dict[str, Tuple[float, float]]:
+    """Valida {parámetro: (low, high)} contra SENSITIVITY_BOUNDS"""
+    if not bounds:
+        raise ValueError("Se requiere al menos un parámetro")
+    validated = {}
+    for name, bound in bounds.items():
+        if name not in SENSITIVITY_PARAMETERS:
+            raise ValueError(f"Parámetro '{name}' no soportado. Opciones: {list(SENSITIVITY_PARAMETERS)}")
+        low, high = (float(value) for value in bound)
+        valid_low, valid_high = SENSITIVITY_BOUNDS[name]
+        if not valid_low <= low < high <= valid_high:
+            raise ValueError(
+                f"Parámetro '{name}': rango inválido ({low}, {high}); "
+                f"debe cumplir {valid_low} <= low < high <= {valid_high}"
+            )
+        validated[name] = (low, high)
+    return validated
+
+
+def _evaluate_chunk(scenario: Dict, samples: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Tarea de un proceso: evalúa un bloque de filas agrupadas por Δt"""
+    samples = dict(samples)
+    time_steps = samples.pop('time_step_minutes', None)
+    if time_steps is None:
+        return evaluate_scenario_samples(scenario, samples)
+
+    metrics = {name: np.empty(time_steps.size) for name in MONTE_CARLO_METRICS}
+    for time_step in np.unique(time_steps):
+        rows = time_steps == time_step
+        group = evaluate_scenario_samples(
+            dict(scenario, time_step_minutes=float(time_step)),
+            {name: values[rows] for name, values in samples.items()}
+        )
+        for name, values in group.items():
+            metrics[name][rows] = values
+    return metrics
+
+
+def evaluate_parameter_samples(
+    scenario: Dict,
+    samples: Dict[str, np.ndarray],
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Evalúa N combinaciones de parámetros repartiendo bloques entre procesos.
+
+    A diferencia de evaluate_scenario_samples(), time_step_minutes puede
+    variar por fila (se redondea a TIME_STEP_RESOLUTION_MINUTES).
+
+    Args:
+        scenario: Parámetros nominales de calculate_hydrograph()
+        samples: {parámetro: array (N,)}
+        max_workers: Procesos (None = setting HYDROLOGY_MAX_WORKERS, 0 = CPUs,
+            1 = en el proceso actual)
+        chunk_size: Filas por bloque (None = automático, hasta
+            MONTE_CARLO_BLOCK_SIZE y al menos CHUNKS_PER_WORKER bloques por proceso)
+
+    Returns:
+        {métrica de MONTE_CARLO_METRICS: array (N,)} en el orden de entrada
+
+    Raises:
+        ValueError: Parámetros inválidos
+    """
+    _prepare_scenario(scenario)
+    samples = {name: np.asarray(values, dtype=np.float64) for name, values in samples.items()}
+    num_rows = len(next(iter(samples.values())))
+    workers = resolve_worker_count(max_workers)
+
+    if chunk_size is None:
+        chunk_size = math.ceil(num_rows / (workers * CHUNKS_PER_WORKER))
+        chunk_size = max(1, min(MONTE_CARLO_BLOCK_SIZE, chunk_size))
+    elif chunk_size <= 0:
+        raise ValueError(f"chunk_size debe ser > 0. Valor: {chunk_size}")
+
+    # Filas ordenadas por Δt: bloques con pocos grupos de Δt
+    if 'time_step_minutes' in samples:
+        time_steps = np.round(samples['time_step_minutes'] / TIME_STEP_RESOLUTION_MINUTES)
+        samples['time_step_minutes'] = np.maximum(time_steps, 1) * TIME_STEP_RESOLUTION_MINUTES
+        order = np.argsort(samples['time_step_minutes'], kind='stable')
+    else:
+        order = np.arange(num_rows)
+    positions = [order[start:start + chunk_size] for start in range(0, num_rows, chunk_size)]
+    chunks = [{name: values[rows] for name, values in samples.items()} for rows in positions]
+
+    if workers == 1 or len(chunks) <= 1:
+        chunk_results = list(map(_evaluate_chunk, repeat(scenario), chunks))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=warm_worker_caches
+        ) as executor:
+            chunk_results = list(executor.map(_evaluate_chunk, repeat(scenario), chunks))
+
+    metrics = {name: np.empty(num_rows) for name in MONTE_CARLO_METRICS}
+    for rows, result in zip(positions, chunk_results):
+        for name, values in result.items():
+            metrics[name][rows] = values
+    return metrics
+
+
+def _scale(unit: np.ndarray, bounds: Dict[str, Tuple[float, float]]) -> Dict[str, np.ndarray]:
+    """Columnas del hipercubo unitario → valores de cada parámetro"""
+    return {
+        name: low + unit[:, column] * (high - low)
+        for column, (name, (low, high)) in enumerate(bounds.items())
+    }
+
+
+def morris_screening(
+    scenario: Dict,
+    bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+    num_trajectories: int = DEFAULT_MORRIS_TRAJECTORIES,
+    num_levels: int = DEFAULT_MORRIS_LEVELS,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None
+) -> SensitivityResult:
+    """
+    Cribado de Morris por efectos elementales.
+
+    Los efectos se expresan en unidades de la métrica por rango completo del
+    parámetro (comparables entre parámetros).
+
+    Args:
+        scenario: Parámetros nominales de calculate_hydrograph()
+        bounds: {parámetro: (low, high)} (None = default_sensitivity_bounds())
+        num_trajectories: Trayectorias r
+        num_levels: Niveles p de la grilla (par); salto Δ = p / (2 (p - 1))
+        seed: Semilla del generador
+        max_workers: Procesos (ver evaluate_parameter_samples())
+
+    Returns:
+        SensitivityResult con mu, mu_star y sigma
+
+    Raises:
+        ValueError: Parámetros inválidos
+    """
+    bounds = default_sensitivity_bounds(scenario) if bounds is None else _validate_bounds(bounds)
+    if num_trajectories < 2:
+        raise ValueError(f"num_trajectories debe ser >= 2. Valor: {num_trajectories}")
+    if num_levels < 2 or num_levels % 2:
+        raise ValueError(f"num_levels debe ser par y >= 2. Valor: {num_levels}")
+    names = list(bounds)
+    k = len(names)
+    rng = np.random.default_rng(seed)
+
+    # Trayectorias: punto base en la grilla y un salto ±Δ por parámetro en orden aleatorio
+    delta = num_levels / (2 * (num_levels - 1))
+    lower = rng.integers(0, num_levels // 2, size=(num_trajectories, k)) / (num_levels - 1)
+    directions = rng.choice([-1.0, 1.0], size=(num_trajectories, k))
+    order = rng.permuted(np.tile(np.arange(k), (num_trajectories, 1)), axis=1)
+    trajectory = np.arange(num_trajectories)[:, np.newaxis]
+
+    steps = np.zeros((num_trajectories, k, k))
+    steps[trajectory, np.arange(k), order] = directions[trajectory, order] * delta
+    points = np.empty((num_trajectories, k + 1, k))
+    points[:, 0] = lower + delta * (directions < 0)
+    points[:, 1:] = points[:, :1] + np.cumsum(steps, axis=1)
+
+    metrics = evaluate_parameter_samples(scenario, _scale(points.reshape(-1, k), bounds), max_workers)
+
+    indices = {}
+    for metric in SENSITIVITY_METRICS:
+        outputs = metrics[metric].reshape(num_trajectories, k + 1)
+        effects = np.empty((num_trajectories, k))
+        effects[trajectory, order] = np.diff(outputs, axis=1) / (directions[trajectory, order] * delta)
+        mu = effects.mean(axis=0)
+        mu_star = np.abs(effects).mean(axis=0)
+        sigma = effects.std(axis=0, ddof=1)
+        indices[metric] = {
+            name: {'mu': float(mu[i]), 'mu_star': float(mu_star[i]), 'sigma': float(sigma[i])}
+            for i, name in enumerate(names)
+        }
+
+    return SensitivityResult(
+        method='morris',
+        parameters=names,
+        bounds=bounds,
+        indices=indices,
+        num_evaluations=num_trajectories * (k + 1),
+        seed=seed,
+        settings={'num_trajectories': num_trajectories, 'num_levels': num_levels}
+    )
+
+
+def _sobol_estimates(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Estimadores de S1 (Saltelli 2010) y ST (Jansen).
+
+    f_a, f_b: (..., N); f_ab: (k, ..., N). Varianza nula → índices 0.
+    """
+    variance = np.var(np.concatenate([f_a, f_b], axis=-1), axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        first = np.mean(f_b * (f_ab - f_a), axis=-1) / variance
+        total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=-1) / variance
+    return np.where(variance > 0, first, 0.0), np.where(variance > 0, total, 0.0)
+
+
+def sobol_indices(
+    scenario: Dict,
+    bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+    num_samples: int = DEFAULT_SOBOL_SAMPLES,
+    seed: Optional[int] = None,
+    num_bootstrap: int = DEFAULT_BOOTSTRAP,
+    max_workers: Optional[int] = None
+) -> SensitivityResult:
+    """
+    Índices de Sobol de primer orden y totales.
+
+    Args:
+        scenario: Parámetros nominales de calculate_hydrograph()
+        bounds: {parámetro: (low, high)} (None = default_sensitivity_bounds())
+        num_samples: Tamaño N de las matrices base (se redondea a la potencia
+            de 2 siguiente, requisito de la secuencia de Sobol)
+        seed: Semilla de la aleatorización y del bootstrap
+        num_bootstrap: Remuestreos para los intervalos de confianza del 95 %
+            (0 = sin intervalos)
+        max_workers: Procesos (ver evaluate_parameter_samples())
+
+    Returns:
+        SensitivityResult con S1, S1_conf, ST y ST_conf
+
+    Raises:
+        ValueError: Parámetros inválidos
+    """
+    bounds = default_sensitivity_bounds(scenario) if bounds is None else _validate_bounds(bounds)
+    if num_samples < 2:
+        raise ValueError(f"num_samples debe ser >= 2. Valor: {num_samples}")
+    if num_bootstrap < 0:
+        raise ValueError(f"num_bootstrap debe ser >= 0. Valor: {num_bootstrap}")
+    names = list(bounds)
+    k = len(names)
+    rng = np.random.default_rng(seed)
+
+    # Matrices de Saltelli: AB_i = A con la columna i de B
+    num_samples = 1 << (num_samples - 1).bit_length()
+    base = qmc.Sobol(d=2 * k, scramble=True, seed=rng).random(num_samples)
+    a, b = base[:, :k], base[:, k:]
+    ab = np.repeat(a[np.newaxis], k, axis=0)
+    ab[np.arange(k), :, np.arange(k)] = b.T
+    unit = np.concatenate([a, b, ab.reshape(-1, k)])
+
+    metrics = evaluate_parameter_samples(scenario, _scale(unit, bounds), max_workers)
+    resamples = rng.integers(0, num_samples, size=(num_bootstrap, num_samples))
+
+    indices = {}
+    for metric in SENSITIVITY_METRICS:
+        outputs = metrics[metric]
+        f_a, f_b = outputs[:num_samples], outputs[num_samples:2 * num_samples]
+        f_ab = outputs[2 * num_samples:].reshape(k, num_samples)
+        first, total = _sobol_estimates(f_a, f_b, f_ab)
+        if num_bootstrap:
+            first_boot, total_boot = _sobol_estimates(f_a[resamples], f_b[resamples], f_ab[:, resamples])
+            first_conf, total_conf = 1.96 * first_boot.std(axis=-1), 1.96 * total_boot.std(axis=-1)
+        else:
+            first_conf = total_conf = np.zeros(k)
+        indices[metric] = {
+            name: {
+                'S1': float(first[i]), 'S1_conf': float(first_conf[i]),
+                'ST': float(total[i]), 'ST_conf': float(total_conf[i]),
+            }
+            for i, name in enumerate(names)
+        }
+
+    return SensitivityResult(
+        method='sobol',
+        parameters=names,
+        bounds=bounds,
+        indices=indices,
+        num_evaluations=num_samples * (k + 2),
+        seed=seed,
+        settings={'num_samples': num_samples, 'num_bootstrap': num_bootstrap}
+    )
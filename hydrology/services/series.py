@@ -0,0 +1,344 @@
+"""
+Series - Tipos de resultado basados en arrays
+
+Contenedores internos (dataclasses con __slots__) que transportan las series
+temporales como arrays float64 de NumPy entre las etapas del cálculo:
+
+    hietograma → lluvia efectiva → hidrograma
+
+Las series derivadas (tiempos, intensidades, acumulados) se calculan bajo
+demanda. La conversión a listas/dicts ocurre solamente en to_dict(), en el
+borde de serialización (API, persistencia).
+
+La última dimensión de cada array es el tiempo; las dimensiones previas (si
+existen) indexan escenarios o tormentas.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Union
+
+import numpy as np
+
+
+def _to_python(value):
+    """Convierte escalares/arrays de NumPy a tipos nativos para serializar"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _scalar(value):
+    """Escalares de NumPy → tipo nativo; arrays (casos por lotes) sin cambios"""
+    if isinstance(value, np.ndarray) and value.ndim == 0:
+        return value.item()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _safe_ratio(numerator, denominator) -> Union[float, np.ndarray]:
+    """numerator / denominator, 0 donde denominator <= 0"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    ratio = np.divide(
+        numerator, denominator,
+        out=np.zeros(np.broadcast(numerator, denominator).shape),
+        where=denominator > 0
+    )
+    return float(ratio) if ratio.ndim == 0 else ratio
+
+
+@dataclass(slots=True)
+class HyetographSeries:
+    """Hietograma: lluvia por intervalo [mm], con el primer valor en 0"""
+
+    rainfall_mm: np.ndarray
+    time_step_minutes: float
+    method: str
+    duration_hours: float
+    total_rainfall_mm: float
+    num_intervals: int
+    extra: Dict = field(default_factory=dict)
+
+    @property
+    def time_steps(self) -> np.ndarray:
+        """Tiempos [min] al final de cada intervalo"""
+        return np.arange(self.rainfall_mm.shape[-1]) * self.time_step_minutes
+
+    @property
+    def intensity_mmh(self) -> np.ndarray:
+        """Intensidad por intervalo [mm/h]"""
+        return self.rainfall_mm / (self.time_step_minutes / 60)
+
+    @property
+    def cumulative_mm(self) -> np.ndarray:
+        """Lluvia acumulada [mm]"""
+        return np.cumsum(self.rainfall_mm, axis=-1)
+
+    def to_dict(self) -> Dict:
+        """Serializa al formato de generate_hyetograph()"""
+        result = {
+            'time_steps': self.time_steps.tolist(),
+            'rainfall_mm': self.rainfall_mm.tolist(),
+            'intensity_mmh': self.intensity_mmh.tolist(),
+            'cumulative_mm': self.cumulative_mm.tolist(),
+            'method': self.method,
+            'duration_hours': self.duration_hours,
+            'total_rainfall_mm': self.total_rainfall_mm,
+            'time_step_minutes': self.time_step_minutes,
+            'num_intervals': self.num_intervals,
+        }
+        result.update({key: _to_python(value) for key, value in self.extra.items()})
+        return result
+
+
+@dataclass(slots=True)
+class RainfallExcessSeries:
+    """Lluvia efectiva por intervalo [mm] y la lluvia que la originó"""
+
+    rainfall_mm: np.ndarray
+    excess_mm: np.ndarray
+    method: str
+    time_step_minutes: float
+    extra: Dict = field(default_factory=dict)
+
+    @property
+    def infiltration_mm(self) -> np.ndarray:
+        """Infiltración (pérdidas) por intervalo [mm]"""
+        return self.rainfall_mm - self.excess_mm
+
+    @property
+    def cumulative_excess_mm(self) -> np.ndarray:
+        """Lluvia efectiva acumulada [mm]"""
+        return np.cumsum(self.excess_mm, axis=-1)
+
+    @property
+    def cumulative_infiltration_mm(self) -> np.ndarray:
+        """Infiltración acumulada [mm]"""
+        return np.cumsum(self.infiltration_mm, axis=-1)
+
+    @property
+    def total_rainfall_mm(self) -> Union[float, np.ndarray]:
+        return _scalar(self.rainfall_mm.sum(axis=-1))
+
+    @property
+    def total_excess_mm(self) -> Union[float, np.ndarray]:
+        return _scalar(self.excess_mm.sum(axis=-1))
+
+    @property
+    def total_infiltration_mm(self) -> Union[float, np.ndarray]:
+        return _scalar(self.infiltration_mm.sum(axis=-1))
+
+    @property
+    def runoff_coefficient(self) -> Union[float, np.ndarray]:
+        """C del método racional, o Pe/P para métodos de pérdidas"""
+        if 'C' in self.extra:
+            return self.extra['C']
+        return _safe_ratio(self.excess_mm.sum(axis=-1), self.rainfall_mm.sum(axis=-1))
+
+    def to_dict(self) -> Dict:
+        """Serializa al formato de calculate_rainfall_excess()"""
+        result = {
+            'excess_series': self.excess_mm.tolist(),
+            'infiltration_series': self.infiltration_mm.tolist(),
+            'cumulative_excess_mm': self.cumulative_excess_mm.tolist(),
+            'cumulative_infiltration_mm': self.cumulative_infiltration_mm.tolist(),
+            'total_rainfall_mm': _to_python(self.total_rainfall_mm),
+            'total_excess_mm': _to_python(self.total_excess_mm),
+            'total_infiltration_mm': _to_python(self.total_infiltration_mm),
+            'runoff_coefficient': _to_python(self.runoff_coefficient),
+            'method': self.method,
+            'time_step_minutes': self.time_step_minutes,
+            'num_intervals': self.excess_mm.shape[-1],
+        }
+        result.update({
+            key: _to_python(value) for key, value in self.extra.items() if key != 'C'
+        })
+        return result
+
+
+@dataclass(slots=True)
+class HydrographSeries:
+    """Hidrograma de caudales [m³/s] a paso constante"""
+
+    discharge_m3s: np.ndarray
+    time_step_minutes: float
+    method: str
+    area_km2: float
+    tc_minutes: float
+    extra: Dict = field(default_factory=dict)
+
+    @property
+    def time_steps(self) -> np.ndarray:
+        """Tiempos [min]"""
+        return np.arange(self.discharge_m3s.shape[-1]) * self.time_step_minutes
+
+    @property
+    def cumulative_volume_m3(self) -> np.ndarray:
+        """Volumen acumulado [m³] (Q en m³/s × tiempo en segundos)"""
+        return np.cumsum(self.discharge_m3s * (self.time_step_minutes * 60), axis=-1)
+
+    @property
+    def total_volume_m3(self) -> Union[float, np.ndarray]:
+        return _scalar(self.cumulative_volume_m3[..., -1])
+
+    @property
+    def peak_index(self) -> Union[int, np.ndarray]:
+        """Índice del primer máximo (0 si no hay caudal)"""
+        index = np.argmax(self.discharge_m3s, axis=-1)
+        peak = np.take_along_axis(self.discharge_m3s, index[..., np.newaxis], axis=-1)[..., 0]
+        return _scalar(np.where(peak > 0, index, 0))
+
+    @property
+    def peak_discharge_m3s(self) -> Union[float, np.ndarray]:
+        return _scalar(self.discharge_m3s.max(axis=-1))
+
+    @property
+    def time_to_peak_minutes(self) -> Union[float, np.ndarray]:
+        return _scalar(np.asarray(self.peak_index) * self.time_step_minutes)
+
+    @property
+    def time_base_minutes(self) -> float:
+        return _scalar((self.discharge_m3s.shape[-1] - 1) * self.time_step_minutes)
+
+    def to_records(self) -> List[Dict]:
+        """Serie como lista de puntos {time_min, discharge_m3s, cumulative_volume_m3}"""
+        return [
+            {'time_min': t, 'discharge_m3s': q, 'cumulative_volume_m3': v}
+            for t, q, v in zip(
+                self.time_steps.tolist(),
+                self.discharge_m3s.tolist(),
+                self.cumulative_volume_m3.tolist()
+            )
+        ]
+
+    def to_dict(self) -> Dict:
+        """Serializa al formato de calculate_hydrograph_rational()"""
+        cumulative_volume = self.cumulative_volume_m3
+        result = {
+            'time_steps': self.time_steps.tolist(),
+            'discharge_m3s': self.discharge_m3s.tolist(),
+            'cumulative_volume_m3': cumulative_volume.tolist(),
+            'peak_discharge_m3s': self.peak_discharge_m3s,
+            'time_to_peak_minutes': self.time_to_peak_minutes,
+            'time_base_minutes': self.time_base_minutes,
+            'total_volume_m3': _to_python(cumulative_volume[..., -1]),
+            'method': self.method,
+            'area_km2': self.area_km2,
+            'tc_minutes': self.tc_minutes,
+            'time_step_minutes': self.time_step_minutes,
+        }
+        result.update({key: _to_python(value) for key, value in self.extra.items()})
+        return result
+
+
+@dataclass(slots=True)
+class HydrographResult:
+    """Resultado completo del pipeline hietograma → excess → hidrograma"""
+
+    hyetograph: HyetographSeries
+    rainfall_excess: RainfallExcessSeries
+    hydrograph: HydrographSeries
+    total_rainfall_mm: float
+    hyetograph_method: str
+    excess_method: str
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+
+    def summary(self) -> Dict:
+        """Resumen consolidado del cálculo"""
+        hydrograph = self.hydrograph
+        excess = self.rainfall_excess
+        peak_discharge = hydrograph.peak_discharge_m3s
+        time_to_peak = hydrograph.time_to_peak_minutes
+        total_volume = hydrograph.total_volume_m3
+
+        return {
+            'peak_discharge_m3s': peak_discharge,
+            'peak_discharge_lps': peak_discharge * 1000,
+            'time_to_peak_minutes': time_to_peak,
+            'time_to_peak_hours': time_to_peak / 60,
+            'time_base_minutes': hydrograph.time_base_minutes,
+            'total_volume_m3': total_volume,
+            'total_volume_hm3': total_volume / 1_000_000,
+            'total_rainfall_mm': self.total_rainfall_mm,
+            'rainfall_excess_mm': excess.total_excess_mm,
+            'infiltration_mm': excess.total_infiltration_mm,
+            'runoff_coefficient': _to_python(excess.runoff_coefficient),
+            'area_km2': hydrograph.area_km2,
+            'tc_minutes': hydrograph.tc_minutes,
+            'time_step_minutes': hydrograph.time_step_minutes,
+            'method': hydrograph.method,
+            'hyetograph_method': self.hyetograph_method,
+            'excess_method': self.excess_method
+        }
+
+    def to_dict(self) -> Dict:
+        """Serializa al formato de calculate_hydrograph()"""
+        return {
+            'hyetograph': self.hyetograph.to_dict(),
+            'rainfall_excess': self.rainfall_excess.to_dict(),
+            'hydrograph': self.hydrograph.to_dict(),
+            'summary': self.summary()
+        }
+
+
+@dataclass(slots=True)
+class RoutedHydrographSeries:
+    """Tránsito de un hidrograma por un tramo: entrada y salida [m³/s] a paso constante"""
+
+    inflow_m3s: np.ndarray
+    outflow_m3s: np.ndarray
+    time_step_minutes: float
+    method: str
+    num_substeps: int = 1
+    num_subreaches: int = 1
+    extra: Dict = field(default_factory=dict)
+
+    @property
+    def time_steps(self) -> np.ndarray:
+        """Tiempos [min]"""
+        return np.arange(self.outflow_m3s.shape[-1]) * self.time_step_minutes
+
+    @property
+    def peak_inflow_m3s(self) -> Union[float, np.ndarray]:
+        return _scalar(self.inflow_m3s.max(axis=-1))
+
+    @property
+    def peak_outflow_m3s(self) -> Union[float, np.ndarray]:
+        return _scalar(self.outflow_m3s.max(axis=-1))
+
+    @property
+    def peak_attenuation(self) -> Union[float, np.ndarray]:
+        """Atenuación del pico: 1 - Q_salida / Q_entrada"""
+        return _scalar(1 - _safe_ratio(self.peak_outflow_m3s, self.peak_inflow_m3s))
+
+    @property
+    def peak_lag_minutes(self) -> Union[float, np.ndarray]:
+        """Desfase entre el pico de entrada y el de salida [min]"""
+        lag = np.argmax(self.outflow_m3s, axis=-1) - np.argmax(self.inflow_m3s, axis=-1)
+        return _scalar(lag * self.time_step_minutes)
+
+    @property
+    def outflow_volume_m3(self) -> Union[float, np.ndarray]:
+        return _scalar(self.outflow_m3s.sum(axis=-1) * (self.time_step_minutes * 60))
+
+    def to_dict(self) -> Dict:
+        """Serializa series y resumen del tránsito"""
+        result = {
+            'time_steps': self.time_steps.tolist(),
+            'inflow_m3s': self.inflow_m3s.tolist(),
+            'outflow_m3s': self.outflow_m3s.tolist(),
+            'peak_inflow_m3s': self.peak_inflow_m3s,
+            'peak_outflow_m3s': self.peak_outflow_m3s,
+            'peak_attenuation': self.peak_attenuation,
+            'peak_lag_minutes': self.peak_lag_minutes,
+            'outflow_volume_m3': self.outflow_volume_m3,
+            'method': self.method,
+            'time_step_minutes': self.time_step_minutes,
+            'num_substeps': self.num_substeps,
+            'num_subreaches': self.num_subreaches,
+        }
+        result.update({key: _to_python(value) for key, value in self.extra.items()})
+        return result
@@ -0,0 +1,367 @@
+"""
+Monte Carlo Uncertainty Engine
+
+Bandas de confianza del caudal pico, el volumen y el tiempo al pico de un
+escenario de calculate_hydrograph() cuando C, CN, Tc, P₃,₁₀ (u otros
+parámetros numéricos) son inciertos.
+
+1. Muestreo por hipercubo latino (scipy.stats.qmc.LatinHypercube): cada
+   parámetro se estratifica en N intervalos equiprobables y las muestras
+   uniformes se transforman con la inversa de la distribución (ppf).
+2. Evaluación vectorizada (evaluate_scenario_samples): las N realizaciones
+   son filas de una misma matriz; Δt y duración son comunes, y C, CN, Tc,
+   P₃,₁₀, Tr, área y posición del pico varían por fila (el hidrograma
+   unitario de cada Tc se construye una vez y se apila).
+3. Cuantiles, media y desvío de cada métrica.
+
+Si total_rainfall_mm es None la precipitación total de cada realización es
+P(D) de la curva IDF, de modo que la incertidumbre de P₃,₁₀ y Tr se
+propaga al volumen de lluvia y no solo a la forma del hietograma.
+
+Distribuciones (dict con 'distribution' y sus parámetros, o una distribución
+congelada de scipy.stats):
+- uniform: low, high
+- triangular: low, mode, high
+- normal: mean, std (truncada a low/high o a PARAMETER_BOUNDS)
+- lognormal: median, sigma (desvío de ln X)
+
+Example:
+    >>> result = run_monte_carlo(
+    ...     dict(duration_hours=6, area_km2=5.2, tc_minutes=45, C=0.6,
+    ...          P3_10=70, Tr=25, total_rainfall_mm=None),
+    ...     distributions={
+    ...         'C': dict(distribution='uniform', low=0.5, high=0.7),
+    ...         'tc_minutes': dict(distribution='triangular', low=35, mode=45, high=60),
+    ...         'P3_10': dict(distribution='normal', mean=70, std=5),
+    ...     },
+    ...     num_realizations=10_000, seed=42)
+    >>> result.quantiles('peak_discharge_m3s')
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from scipy import stats
+from scipy.stats import qmc
+
+from calculators.services.idf_table import get_idf_table
+from .batch import SCENARIO_DEFAULTS, SCENARIO_REQUIRED
+from .hydrograph_calculator import calculate_default_time_step, transform_rainfall_excess_series
+from .hyetograph import (
+    _validate_idf_storm,
+    _validate_storm,
+    generate_hyetograph_from_depths_series,
+    generate_hyetograph_series,
+)
+from .rainfall_excess import calculate_rainfall_excess_series
+
+
+# Parámetros de un escenario que pueden variar por realización
+UNCERTAIN_PARAMETERS = (
+    'total_rainfall_mm', 'area_km2', 'tc_minutes', 'C', 'CN', 'P3_10', 'Tr', 'peak_position_ratio',
+)
+
+# Rango válido de cada parámetro (truncamiento por defecto de la normal)
+PARAMETER_BOUNDS = {
+    'total_rainfall_mm': (0.0, np.inf),
+    'area_km2': (0.0, np.inf),
+    'tc_minutes': (0.0, np.inf),
+    'C': (0.0, 1.0),
+    'CN': (30.0, 100.0),
+    'P3_10': (50.0, 100.0),
+    'Tr': (2.0, np.inf),
+    'peak_position_ratio': (0.0, 1.0),
+}
+
+# Métricas por realización
+MONTE_CARLO_METRICS = (
+    'peak_discharge_m3s', 'total_volume_m3', 'time_to_peak_minutes', 'total_rainfall_mm', 'total_excess_mm',
+)
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Realizaciones evaluadas por bloque (acota la memoria de las matrices)
+MONTE_CARLO_BLOCK_SIZE = 4096
+
+
+def _uniform(low: float, high: float, bounds):
+    return stats.uniform(loc=low, scale=high - low)
+
+
+def _triangular(low: float, mode: float, high: float, bounds):
+    return stats.triang(c=(mode - low) / (high - low), loc=low, scale=high - low)
+
+
+def _normal(mean: float, std: float, bounds, low: Optional[float] = None, high: Optional[float] = None):
+    low = bounds[0] if low is None else low
+    high = bounds[1] if high is None else high
+    return stats.truncnorm(a=(low - mean) / std, b=(high - mean) / std, loc=mean, scale=std)
+
+
+def _lognormal(median: float, sigma: float, bounds):
+    return stats.lognorm(s=sigma, scale=median)
+
+
+# Distribuciones: nombre → constructor de la distribución congelada de scipy.stats
+DISTRIBUTIONS = {
+    'uniform': _uniform,
+    'triangular': _triangular,
+    'normal': _normal,
+    'lognormal': _lognormal,
+}
+
+
+def parameter_distribution(name: str, spec):
+    """
+    Distribución congelada de scipy.stats para un parámetro.
+
+    Args:
+        name: Parámetro (ver UNCERTAIN_PARAMETERS)
+        spec: {'distribution': ..., **parámetros} o distribución con ppf()
+
+    Raises:
+        ValueError: Parámetro o distribución desconocidos, o parámetros inválidos
+    """
+    if name not in UNCERTAIN_PARAMETERS:
+        raise ValueError(f"Parámetro incierto '{name}' no soportado. Opciones: {list(UNCERTAIN_PARAMETERS)}")
+    if hasattr(spec, 'ppf'):
+        return spec
+    params = dict(spec)
+    kind = params.pop('distribution', None)
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(
+            f"Parámetro '{name}': distribución '{kind}' no soportada. Opciones: {list(DISTRIBUTIONS)}"
+        )
+    try:
+        distribution = DISTRIBUTIONS[kind](bounds=PARAMETER_BOUNDS[name], **params)
+    except TypeError as e:
+        raise ValueError(f"Parámetro '{name}': parámetros inválidos para '{kind}': {str(e)}")
+    if not np.all(np.isfinite(distribution.ppf([0.25, 0.5, 0.75]))):
+        raise ValueError(f"Parámetro '{name}': distribución '{kind}' inválida ({params})")
+    return distribution
+
+
+def latin_hypercube_samples(
+    distributions: Dict[str, object],
+    num_realizations: int,
+    seed=None
+) -> Dict[str, np.ndarray]:
+    """
+    Muestras por hipercubo latino de distribuciones independientes.
+
+    Args:
+        distributions: {parámetro: distribución con ppf()}
+        num_realizations: Número de realizaciones N
+        seed: Semilla o numpy.random.Generator (reproducibilidad)
+
+    Returns:
+        {parámetro: array (N,)}
+    """
+    names = list(distributions)
+    uniform = qmc.LatinHypercube(d=len(names), seed=np.random.default_rng(seed)).random(num_realizations)
+    return {name: distributions[name].ppf(uniform[:, column]) for column, name in enumerate(names)}
+
+
+def _prepare_scenario(scenario: Dict) -> Dict:
+    """Completa valores por defecto (Δt automático con el Tc nominal)"""
+    unknown = set(scenario) - set(SCENARIO_DEFAULTS) - set(SCENARIO_REQUIRED)
+    if unknown:
+        raise ValueError(f"Parámetros desconocidos {sorted(unknown)}")
+    missing = [name for name in ('duration_hours', 'area_km2', 'tc_minutes') if scenario.get(name) is None]
+    if missing:
+        raise ValueError(f"Faltan parámetros {missing}")
+    params = {'total_rainfall_mm': None, **SCENARIO_DEFAULTS, **scenario}
+    if params['total_rainfall_mm'] is None and params['hyetograph_method'] != 'alternating_block':
+        raise ValueError("total_rainfall_mm=None requiere hyetograph_method='alternating_block'")
+    if params['time_step_minutes'] is None:
+        params['time_step_minutes'] = calculate_default_time_step(params['tc_minutes'])
+    return params
+
+
+def evaluate_scenario_samples(scenario: Dict, samples: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Evalúa N realizaciones de un escenario en una pasada vectorizada.
+
+    Args:
+        scenario: Parámetros de calculate_hydrograph(); total_rainfall_mm
+            puede ser None (P(D) de la curva IDF de cada realización)
+        samples: {parámetro de UNCERTAIN_PARAMETERS: array (N,)}; los demás
+            parámetros toman el valor del escenario
+
+    Returns:
+        {métrica de MONTE_CARLO_METRICS: array (N,)}
+
+    Raises:
+        ValueError: Parámetros faltantes o fuera de rango
+    """
+    params = _prepare_scenario(scenario)
+    unknown = set(samples) - set(UNCERTAIN_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Parámetros inciertos no soportados: {sorted(unknown)}")
+    num_realizations = len(next(iter(samples.values()))) if samples else 1
+
+    metrics = {name: np.empty(num_realizations) for name in MONTE_CARLO_METRICS}
+    for start in range(0, num_realizations, MONTE_CARLO_BLOCK_SIZE):
+        rows = slice(start, min(start + MONTE_CARLO_BLOCK_SIZE, num_realizations))
+        columns = {
+            name: np.asarray(samples[name], dtype=np.float64)[rows] if name in samples else params[name]
+            for name in UNCERTAIN_PARAMETERS
+        }
+        for name, values in _evaluate_block(params, columns).items():
+            metrics[name][rows] = values
+    return metrics
+
+
+def _evaluate_block(params: Dict, columns: Dict) -> Dict[str, np.ndarray]:
+    """Hietograma → lluvia efectiva → hidrograma de un bloque de realizaciones"""
+    time_step_minutes = params['time_step_minutes']
+    duration_hours = params['duration_hours']
+
+    if params['hyetograph_method'] == 'alternating_block':
+        if columns['P3_10'] is None or columns['Tr'] is None:
+            raise ValueError("method='alternating_block' requiere P3_10 y Tr")
+        _validate_idf_storm(columns['P3_10'], columns['Tr'], columns['peak_position_ratio'])
+        num_intervals = int(duration_hours * 60 / time_step_minutes)
+        depths = get_idf_table().intensity_steps(
+            P3_10=np.asarray(columns['P3_10'], dtype=np.float64)[..., np.newaxis],
+            Tr=np.asarray(columns['Tr'], dtype=np.float64)[..., np.newaxis],
+            time_step_minutes=time_step_minutes,
+            num_intervals=num_intervals,
+            Ac=np.asarray(columns['area_km2'], dtype=np.float64)[..., np.newaxis]
+        )['P_mm']
+        total = depths[..., -1] if columns['total_rainfall_mm'] is None else columns['total_rainfall_mm']
+        _validate_storm(total, duration_hours, time_step_minutes)
+        hyetograph = generate_hyetograph_from_depths_series(
+            cumulative_depths_mm=depths,
+            total_rainfall_mm=total,
+            time_step_minutes=time_step_minutes,
+            peak_position_ratio=columns['peak_position_ratio'],
+            duration_hours=duration_hours
+        )
+    else:
+        hyetograph = generate_hyetograph_series(
+            total_rainfall_mm=columns['total_rainfall_mm'],
+            duration_hours=duration_hours,
+            method=params['hyetograph_method'],
+            time_step_minutes=time_step_minutes
+        )
+
+    rainfall_excess = calculate_rainfall_excess_series(
+        rainfall_series=hyetograph.rainfall_mm,
+        method=params['excess_method'],
+        time_step_minutes=time_step_minutes,
+        C=columns['C'],
+        CN=columns['CN'],
+        antecedent_condition=params['antecedent_condition']
+    )
+    hydrograph = transform_rainfall_excess_series(
+        rainfall_excess_series=rainfall_excess.excess_mm,
+        area_km2=columns['area_km2'],
+        tc_minutes=columns['tc_minutes'],
+        time_step_minutes=time_step_minutes,
+        method=params['method'],
+        unit_hydrograph=params['unit_hydrograph'],
+        unit_hydrograph_params=params['unit_hydrograph_params']
+    )
+    return {
+        'peak_discharge_m3s': hydrograph.peak_discharge_m3s,
+        'total_volume_m3': hydrograph.total_volume_m3,
+        'time_to_peak_minutes': hydrograph.time_to_peak_minutes,
+        'total_rainfall_mm': rainfall_excess.total_rainfall_mm,
+        'total_excess_mm': rainfall_excess.total_excess_mm,
+    }
+
+
+@dataclass(slots=True)
+class MonteCarloResult:
+    """Realizaciones de Monte Carlo y sus estadísticos"""
+
+    samples: Dict[str, np.ndarray]
+    metrics: Dict[str, np.ndarray]
+    num_realizations: int
+    seed: Optional[int]
+    time_step_minutes: float
+    quantile_levels: Sequence[float] = DEFAULT_QUANTILES
+    nominal: Dict[str, float] = field(default_factory=dict)
+
+    def quantiles(self, metric: str, levels: Optional[Sequence[float]] = None) -> Dict[float, float]:
+        """Cuantiles de una métrica: {nivel: valor}"""
+        levels = self.quantile_levels if levels is None else levels
+        values = np.quantile(self.metrics[metric], levels)
+        return dict(zip([float(level) for level in levels], values.tolist()))
+
+    def exceedance_probability(self, metric: str, threshold: float) -> float:
+        """Fracción de realizaciones con la métrica por encima del umbral"""
+        return float(np.mean(self.metrics[metric] > threshold))
+
+    def statistics(self, metric: str) -> Dict:
+        values = self.metrics[metric]
+        return {
+            'mean': float(values.mean()),
+            'std': float(values.std(ddof=1)) if values.size > 1 else 0.0,
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'quantiles': {f"{level:g}": value for level, value in self.quantiles(metric).items()},
+        }
+
+    def to_dict(self, include_samples: bool = False) -> Dict:
+        result = {
+            'num_realizations': self.num_realizations,
+            'seed': self.seed,
+            'time_step_minutes': self.time_step_minutes,
+            'uncertain_parameters': list(self.samples),
+            'nominal': self.nominal,
+            'metrics': {metric: self.statistics(metric) for metric in self.metrics},
+        }
+        if include_samples:
+            result['samples'] = {name: values.tolist() for name, values in self.samples.items()}
+            result['realizations'] = {name: values.tolist() for name, values in self.metrics.items()}
+        return result
+
+
+def run_monte_carlo(
+    scenario: Dict,
+    distributions: Dict[str, object],
+    num_realizations: int = 1000,
+    seed: Optional[int] = None,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES
+) -> MonteCarloResult:
+    """
+    Análisis de incertidumbre de Monte Carlo con hipercubo latino.
+
+    Args:
+        scenario: Parámetros nominales de calculate_hydrograph()
+            (total_rainfall_mm=None: P(D) de la IDF de cada realización)
+        distributions: {parámetro: distribución} (ver parameter_distribution())
+        num_realizations: Número de realizaciones
+        seed: Semilla del generador (mismo seed → mismas realizaciones)
+        quantiles: Niveles de los cuantiles informados
+
+    Returns:
+        MonteCarloResult
+
+    Raises:
+        ValueError: Parámetros o distribuciones inválidos
+    """
+    if num_realizations < 2:
+        raise ValueError(f"num_realizations debe ser >= 2. Valor: {num_realizations}")
+    if not distributions:
+        raise ValueError("Se requiere al menos un parámetro incierto")
+    if any(not 0 <= level <= 1 for level in quantiles):
+        raise ValueError(f"Los cuantiles deben estar entre 0 y 1. Valores: {quantiles}")
+    frozen = {name: parameter_distribution(name, spec) for name, spec in distributions.items()}
+
+    samples = latin_hypercube_samples(frozen, num_realizations, seed)
+    metrics = evaluate_scenario_samples(scenario, samples)
+    nominal = evaluate_scenario_samples(scenario, {})
+
+    return MonteCarloResult(
+        samples=samples,
+        metrics=metrics,
+        num_realizations=num_realizations,
+        seed=seed,
+        time_step_minutes=_prepare_scenario(scenario)['time_step_minutes'],
+        quantile_levels=tuple(quantiles),
+        nominal={name: float(values[0]) for name, values in nominal.items()}
+    )
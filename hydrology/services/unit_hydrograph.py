@@ -0,0 +1,410 @@
+"""
+Unit Hydrograph Service
+
+Ordenadas adimensionales (pico = 1) de hidrogramas unitarios sintéticos,
+memoizadas en una caché LRU acotada por (Tc, Δt, parámetros de forma):
+
+- Triangular (método racional): tiempo al pico Tc, tiempo base 2.67 Tc
+- SCS adimensional: tabla t/Tp – q/qp interpolada una vez por Δt/Tp
+- Sintéticos (SYNTHETIC_UNIT_HYDROGRAPHS): Clark, cascada de Nash y Snyder,
+  como ordenadas de pulso normalizadas (fracción del volumen de lluvia
+  efectiva que sale en cada intervalo, suma = 1)
+
+Las ordenadas solo dependen de la geometría del hidrograma unitario; el
+escalado por área y lluvia efectiva lo aplica cada método de transformación.
+Las tormentas repetidas sobre una misma cuenca (dashboard, barridos por
+lotes) reutilizan así el hidrograma unitario sin reconstruirlo.
+
+Los arrays retornados son compartidos entre llamadas y de solo lectura.
+stack_unit_hydrographs() apila las ordenadas de un Tc por escenario (p.ej.
+realizaciones de Monte Carlo) en una matriz rellena con ceros.
+
+Referencias:
+- USDA-NRCS (2007). National Engineering Handbook, Part 630, Chapter 16:
+  Hydrographs. Tabla 16-1.
+- Clark, C.O. (1945). Storage and the unit hydrograph. Trans. ASCE 110.
+- Nash, J.E. (1957). The form of the instantaneous unit hydrograph.
+  IASH Publ. 45.
+- Snyder, F.F. (1938). Synthetic unit-graphs. Trans. AGU 19.
+- USACE (2000). HEC-HMS Technical Reference Manual, Cap. 6.
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+import numpy as np
+from scipy.optimize import brentq
+from scipy.signal import lfilter
+from scipy.special import gammainc, gammaln
+
+
+# Entradas máximas por caché de forma
+UNIT_HYDROGRAPH_CACHE_SIZE = 256
+
+# Tiempo base del hidrograma triangular como múltiplo de Tc (aproximación común)
+TRIANGULAR_TIME_BASE_RATIO = 2.67
+
+# Hidrograma unitario adimensional SCS (NEH-630, Tabla 16-1)
+SCS_DIMENSIONLESS_TIME = np.array([
+    0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9,
+    1.0, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9,
+    2.0, 2.2, 2.4, 2.6, 2.8, 3.0, 3.2, 3.4, 3.6, 3.8,
+    4.0, 4.5, 5.0
+])
+SCS_DIMENSIONLESS_DISCHARGE = np.array([
+    0.000, 0.030, 0.100, 0.190, 0.310, 0.470, 0.660, 0.820, 0.930, 0.990,
+    1.000, 0.990, 0.930, 0.860, 0.780, 0.680, 0.560, 0.460, 0.390, 0.330,
+    0.280, 0.207, 0.147, 0.107, 0.077, 0.055, 0.040, 0.029, 0.021, 0.015,
+    0.011, 0.005, 0.000
+])
+
+# Retardo SCS: t_lag = 0.6 × Tc
+SCS_LAG_RATIO = 0.6
+
+# Caudal pico SCS por mm de lluvia efectiva: qp [m³/s] = 0.208 × A [km²] / Tp [h]
+SCS_PEAK_RATE_FACTOR = 0.208
+
+# Volumen que las ordenadas sintéticas pueden dejar fuera al truncar la cola
+SYNTHETIC_TAIL_TOLERANCE = 1e-4
+
+# Clark: coeficiente de almacenamiento por defecto R = 1.0 × Tc (R / (Tc + R) = 0.5)
+CLARK_STORAGE_RATIO = 1.0
+
+# Nash: número de embalses por defecto; retardo n × K = 0.6 × Tc (como SCS)
+NASH_DEFAULT_RESERVOIRS = 3
+
+# Snyder (SI): qp [m³/s por mm] = 0.275 × Cp × A [km²] / tp [h]
+SNYDER_PEAK_RATE_FACTOR = 0.275
+SNYDER_DEFAULT_PEAKING_COEFFICIENT = 0.6
+SNYDER_STANDARD_DURATION_RATIO = 5.5
+
+# 1 m³/s por mm sobre 1 km² equivale a 3.6 veces el volumen unitario por hora
+_UNIT_VOLUME_PER_HOUR = 3600 / 1000
+
+
+def _read_only(ordinates: np.ndarray) -> np.ndarray:
+    """Marca un array como de solo lectura (se comparte desde la caché)"""
+    ordinates.setflags(write=False)
+    return ordinates
+
+
+@lru_cache(maxsize=UNIT_HYDROGRAPH_CACHE_SIZE)
+def _triangular_ordinates(
+    tc_minutes: float,
+    time_step_minutes: float,
+    time_base_ratio: float
+) -> np.ndarray:
+    """Construye (una vez por clave) las ordenadas del hidrograma triangular"""
+    time_to_peak = tc_minutes
+    time_base = time_base_ratio * tc_minutes
+
+    num_intervals = int((time_base / time_step_minutes) + 2)
+    t = np.arange(num_intervals) * time_step_minutes
+
+    # Rama ascendente hasta Tc, rama descendente hasta el tiempo base
+    ordinates = np.where(
+        t <= time_to_peak,
+        t / time_to_peak,
+        (time_base - t) / (time_base - time_to_peak)
+    )
+    return _read_only(np.maximum(ordinates, 0.0))
+
+
+def triangular_unit_hydrograph(
+    tc_minutes: float,
+    time_step_minutes: float,
+    time_base_ratio: float = TRIANGULAR_TIME_BASE_RATIO
+) -> np.ndarray:
+    """
+    Forma adimensional (pico = 1) del hidrograma unitario triangular.
+
+    - Tiempo al pico = Tc
+    - Tiempo base = time_base_ratio × Tc
+
+    Args:
+        tc_minutes: Tiempo de concentración [min]
+        time_step_minutes: Paso de tiempo [min]
+        time_base_ratio: Tiempo base / Tc
+
+    Returns:
+        Ordenadas en t = 0, Δt, 2Δt, ... hasta el tiempo base (solo lectura)
+    """
+    return _triangular_ordinates(float(tc_minutes), float(time_step_minutes), float(time_base_ratio))
+
+
+def scs_time_to_peak_minutes(tc_minutes, time_step_minutes: float):
+    """
+    Tiempo al pico del hidrograma unitario SCS: Tp = Δt/2 + 0.6 Tc.
+
+    Args:
+        tc_minutes: Tiempo de concentración [min] (escalar o array)
+        time_step_minutes: Duración de la lluvia unitaria (= Δt) [min]
+
+    Returns:
+        Tp [min]
+    """
+    return time_step_minutes / 2 + SCS_LAG_RATIO * tc_minutes
+
+
+@lru_cache(maxsize=UNIT_HYDROGRAPH_CACHE_SIZE)
+def _scs_ordinates(step_ratio: float) -> np.ndarray:
+    """Interpola (una vez por Δt/Tp) la tabla adimensional SCS en t = kΔt"""
+    num_intervals = int(SCS_DIMENSIONLESS_TIME[-1] / step_ratio) + 2
+    dimensionless_time = np.arange(num_intervals) * step_ratio
+    return _read_only(np.interp(
+        dimensionless_time, SCS_DIMENSIONLESS_TIME, SCS_DIMENSIONLESS_DISCHARGE, right=0.0
+    ))
+
+
+def scs_dimensionless_unit_hydrograph(
+    tc_minutes: float,
+    time_step_minutes: float
+) -> np.ndarray:
+    """
+    Ordenadas q/qp del hidrograma unitario adimensional SCS.
+
+    La forma solo depende de Δt/Tp, con Tp = Δt/2 + 0.6 Tc; la tabla t/Tp –
+    q/qp se interpola una vez por relación y se reutiliza desde la caché.
+
+    Args:
+        tc_minutes: Tiempo de concentración [min]
+        time_step_minutes: Paso de tiempo [min]
+
+    Returns:
+        Ordenadas en t = 0, Δt, 2Δt, ... hasta 5 Tp (solo lectura)
+    """
+    step_ratio = time_step_minutes / scs_time_to_peak_minutes(tc_minutes, time_step_minutes)
+    return _scs_ordinates(float(step_ratio))
+
+
+def _truncate_tail(ordinates: np.ndarray) -> np.ndarray:
+    """Corta la cola cuando el volumen restante es < SYNTHETIC_TAIL_TOLERANCE y renormaliza"""
+    remaining = np.cumsum(ordinates[::-1])[::-1]
+    length = int(np.count_nonzero(remaining >= SYNTHETIC_TAIL_TOLERANCE * remaining[0]))
+    ordinates = ordinates[:max(length, 2)]
+    return _read_only(ordinates / ordinates.sum())
+
+
+@lru_cache(maxsize=UNIT_HYDROGRAPH_CACHE_SIZE)
+def _clark_ordinates(tc_steps: float, storage_steps: float) -> np.ndarray:
+    """Curva tiempo-área trasladada y embalse lineal, en unidades de Δt"""
+    # Curva tiempo-área sintética de HEC-HMS: A/At = 1.414 (t/Tc)^1.5 hasta Tc/2
+    num_inflow = int(np.ceil(tc_steps - 1e-9))
+    t = np.minimum(np.arange(num_inflow + 1) / tc_steps, 1.0)
+    cumulative_area = np.where(t <= 0.5, 1.414 * t ** 1.5, 1 - 1.414 * (1 - t) ** 1.5)
+    inflow = np.diff(cumulative_area, prepend=0.0)
+
+    # Embalse lineal dS/dt = I - S/R con entrada constante en el intervalo (solución
+    # exacta, estable para cualquier Δt/R) como filtro recursivo de primer orden
+    decay = np.exp(-1.0 / storage_steps)
+    num_tail = int(np.ceil(np.log(SYNTHETIC_TAIL_TOLERANCE) / np.log(decay))) if decay > 0 else 1
+    inflow = np.concatenate([inflow, np.zeros(num_tail)])
+    return _truncate_tail(lfilter([1.0 - decay], [1.0, -decay], inflow))
+
+
+def clark_unit_hydrograph(
+    tc_minutes: float,
+    time_step_minutes: float,
+    storage_coefficient_minutes: Optional[float] = None
+) -> np.ndarray:
+    """
+    Hidrograma unitario de Clark (traslación tiempo-área + embalse lineal).
+
+    Args:
+        tc_minutes: Tiempo de concentración (tiempo de traslación) [min]
+        time_step_minutes: Paso de tiempo [min]
+        storage_coefficient_minutes: Coeficiente de almacenamiento R [min]
+            (None = CLARK_STORAGE_RATIO × Tc)
+
+    Returns:
+        Ordenadas de pulso normalizadas en t = 0, Δt, 2Δt, ... (solo lectura)
+    """
+    if storage_coefficient_minutes is None:
+        storage_coefficient_minutes = CLARK_STORAGE_RATIO * tc_minutes
+    if storage_coefficient_minutes <= 0:
+        raise ValueError(f"storage_coefficient_minutes debe ser > 0. Valor: {storage_coefficient_minutes}")
+    return _clark_ordinates(
+        float(tc_minutes / time_step_minutes), float(storage_coefficient_minutes / time_step_minutes)
+    )
+
+
+@lru_cache(maxsize=UNIT_HYDROGRAPH_CACHE_SIZE)
+def _gamma_ordinates(shape: float, scale_steps: float) -> np.ndarray:
+    """
+    Ordenadas de pulso de un HUI gamma (forma, escala en unidades de Δt):
+    diferencias de la curva S, F(kΔt) - F((k-1)Δt), en forma cerrada.
+    """
+    # Media + 4 desviaciones + 10 escalas: la cola omitida es << SYNTHETIC_TAIL_TOLERANCE
+    num_intervals = int(np.ceil(scale_steps * (shape + 4 * np.sqrt(shape) + 10))) + 2
+    s_curve = gammainc(shape, np.arange(num_intervals) / scale_steps)
+    return _truncate_tail(np.diff(s_curve, prepend=0.0))
+
+
+def nash_unit_hydrograph(
+    tc_minutes: float,
+    time_step_minutes: float,
+    num_reservoirs: float = NASH_DEFAULT_RESERVOIRS,
+    storage_constant_minutes: Optional[float] = None
+) -> np.ndarray:
+    """
+    Hidrograma unitario de Nash (cascada de n embalses lineales iguales).
+
+    El HUI es la densidad gamma de forma n y escala K; las ordenadas de pulso
+    salen de la curva S (función gamma incompleta), sin iterar embalses.
+
+    Args:
+        tc_minutes: Tiempo de concentración [min]
+        time_step_minutes: Paso de tiempo [min]
+        num_reservoirs: Número de embalses n (admite valores no enteros)
+        storage_constant_minutes: Constante K de cada embalse [min]
+            (None = 0.6 × Tc / n, retardo igual al de SCS)
+
+    Returns:
+        Ordenadas de pulso normalizadas en t = 0, Δt, 2Δt, ... (solo lectura)
+    """
+    if num_reservoirs <= 0:
+        raise ValueError(f"num_reservoirs debe ser > 0. Valor: {num_reservoirs}")
+    if storage_constant_minutes is None:
+        storage_constant_minutes = SCS_LAG_RATIO * tc_minutes / num_reservoirs
+    if storage_constant_minutes <= 0:
+        raise ValueError(f"storage_constant_minutes debe ser > 0. Valor: {storage_constant_minutes}")
+    return _gamma_ordinates(float(num_reservoirs), float(storage_constant_minutes / time_step_minutes))
+
+
+def _gamma_peak_factor(mode_shape: float) -> float:
+    """Pico × tiempo al pico de una densidad gamma con moda en 1: m^(m+1) e^-m / Γ(m+1)"""
+    return float(np.exp((mode_shape + 1) * np.log(mode_shape) - mode_shape - gammaln(mode_shape + 1)))
+
+
+def snyder_unit_hydrograph(
+    tc_minutes: float,
+    time_step_minutes: float,
+    lag_minutes: Optional[float] = None,
+    peaking_coefficient: float = SNYDER_DEFAULT_PEAKING_COEFFICIENT
+) -> np.ndarray:
+    """
+    Hidrograma unitario de Snyder ajustado por una densidad gamma.
+
+    - Retardo estándar tp (None = 0.6 × Tc) para lluvia de duración tr = tp/5.5
+    - Retardo ajustado a la duración Δt: tpR = tp + (Δt - tr) / 4
+    - Pico: qp = 0.275 × Cp × A / tpR [m³/s por mm], en Tp = Δt/2 + tpR
+
+    La forma gamma con moda en Tp y pico qp conserva el volumen unitario.
+
+    Args:
+        tc_minutes: Tiempo de concentración [min]
+        time_step_minutes: Paso de tiempo [min]
+        lag_minutes: Retardo estándar tp [min]
+        peaking_coefficient: Coeficiente de pico Cp (0 < Cp <= 1)
+
+    Returns:
+        Ordenadas de pulso normalizadas en t = 0, Δt, 2Δt, ... (solo lectura)
+    """
+    if lag_minutes is None:
+        lag_minutes = SCS_LAG_RATIO * tc_minutes
+    if lag_minutes <= 0:
+        raise ValueError(f"lag_minutes debe ser > 0. Valor: {lag_minutes}")
+    if not 0 < peaking_coefficient <= 1:
+        raise ValueError(f"peaking_coefficient debe estar en (0, 1]. Valor: {peaking_coefficient}")
+
+    adjusted_lag = lag_minutes + (time_step_minutes - lag_minutes / SNYDER_STANDARD_DURATION_RATIO) / 4
+    time_to_peak = time_step_minutes / 2 + adjusted_lag
+
+    # Pico adimensional qp × Tp / volumen; se resuelve la forma gamma con esa relación
+    target = SNYDER_PEAK_RATE_FACTOR * peaking_coefficient * _UNIT_VOLUME_PER_HOUR * time_to_peak / adjusted_lag
+    mode_shape = brentq(lambda m: _gamma_peak_factor(m) - target, 1e-6, 1e4)
+    return _gamma_ordinates(float(mode_shape + 1), float(time_to_peak / mode_shape / time_step_minutes))
+
+
+# Generadores de hidrogramas unitarios sintéticos (ordenadas de pulso normalizadas)
+SYNTHETIC_UNIT_HYDROGRAPHS: Dict[str, Callable[..., np.ndarray]] = {
+    'clark': clark_unit_hydrograph,
+    'nash': nash_unit_hydrograph,
+    'snyder': snyder_unit_hydrograph,
+}
+
+
+def synthetic_unit_hydrograph(
+    generator: str,
+    tc_minutes: float,
+    time_step_minutes: float,
+    **params
+) -> np.ndarray:
+    """
+    Ordenadas de pulso normalizadas del hidrograma unitario sintético indicado.
+
+    Args:
+        generator: Nombre en SYNTHETIC_UNIT_HYDROGRAPHS
+        tc_minutes: Tiempo de concentración [min]
+        time_step_minutes: Paso de tiempo [min]
+        **params: Parámetros de forma del generador
+
+    Raises:
+        ValueError: Generador desconocido o parámetros inválidos
+    """
+    if generator not in SYNTHETIC_UNIT_HYDROGRAPHS:
+        raise ValueError(
+            f"Hidrograma unitario sintético '{generator}' no soportado. "
+            f"Opciones: {list(SYNTHETIC_UNIT_HYDROGRAPHS)}"
+        )
+    try:
+        return SYNTHETIC_UNIT_HYDROGRAPHS[generator](tc_minutes, time_step_minutes, **params)
+    except TypeError as e:
+        raise ValueError(f"Parámetros inválidos para '{generator}': {str(e)}")
+
+
+# Cachés por forma de hidrograma unitario
+UNIT_HYDROGRAPH_CACHES = {
+    'triangular': _triangular_ordinates,
+    'scs': _scs_ordinates,
+    'clark': _clark_ordinates,
+    'gamma': _gamma_ordinates,
+}
+
+
+def stack_unit_hydrographs(
+    builder: Callable[[float], np.ndarray],
+    tc_minutes
+) -> np.ndarray:
+    """
+    Ordenadas para un Tc escalar o por escenario.
+
+    Con un array de Tc se construye una vez cada valor distinto y las
+    ordenadas se apilan en una matriz tc.shape + (m_max,), rellena con
+    ceros al final de las filas más cortas.
+
+    Args:
+        builder: Ordenadas para un Tc (p.ej. lambda tc: triangular_unit_hydrograph(tc, Δt))
+        tc_minutes: Tiempo de concentración [min] (escalar o array)
+
+    Returns:
+        Ordenadas de forma (m,) o tc.shape + (m_max,)
+    """
+    tc = np.asarray(tc_minutes, dtype=np.float64)
+    if tc.ndim == 0:
+        return builder(float(tc))
+    values, inverse = np.unique(tc, return_inverse=True)
+    ordinates = [builder(float(value)) for value in values]
+    stacked = np.zeros((len(ordinates), max(len(ordinate) for ordinate in ordinates)))
+    for row, ordinate in zip(stacked, ordinates):
+        row[:len(ordinate)] = ordinate
+    return stacked[inverse.reshape(tc.shape)]
+
+
+def unit_hydrograph_cache_info() -> Dict[str, Dict[str, int]]:
+    """
+    Estadísticas de las cachés de hidrogramas unitarios.
+
+    Returns:
+        {forma: {'hits', 'misses', 'maxsize', 'currsize'}}
+    """
+    return {
+        shape: cached.cache_info()._asdict()
+        for shape, cached in UNIT_HYDROGRAPH_CACHES.items()
+    }
+
+
+def clear_unit_hydrograph_cache() -> None:
+    """Vacía las cachés de hidrogramas unitarios (y sus estadísticas)"""
+    for cached in UNIT_HYDROGRAPH_CACHES.values():
+        cached.cache_clear()
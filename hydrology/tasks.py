@@ -0,0 +1,140 @@
+"""
+Tareas de Celery de la app hydrology
+
+- calibrate_watershed_task: calibración de C/CN y Tc de una cuenca contra
+  los eventos observados de RainfallData, con progreso en el estado de la
+  tarea (state='PROGRESS', meta={watershed_id, iteration, max_iterations, ...}).
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+
+from celery import shared_task
+
+from watersheds.models import Watershed
+from hydrology.services.calibration import calibrate_parameters
+
+
+# Intervalo mínimo entre actualizaciones de progreso (escrituras al backend)
+CALIBRATION_PROGRESS_INTERVAL_SECONDS = 1.0
+
+
+class CalibrationTaskError(Exception):
+    """
+    Fallo de calibrate_watershed_task. Guarda la cuenca en args para que
+    sobreviva a la serialización del backend de resultados y el endpoint
+    de estado pueda comprobar a qué cuenca pertenece la tarea.
+    """
+
+    def __init__(self, watershed_id: int, message: str):
+        super().__init__(watershed_id, message)
+        self.watershed_id = watershed_id
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def calibrate_watershed(
+    watershed: Watershed,
+    event_ids: Optional[List[int]] = None,
+    apply: bool = False,
+    progress_callback: Optional[Callable[[Dict], None]] = None,
+    **options
+) -> Dict:
+    """
+    Calibra una cuenca con sus eventos que tienen caudal observado.
+
+    Args:
+        watershed: Cuenca (área, Tc, c_racional y nc_scs iniciales)
+        event_ids: Ids de RainfallData a usar (None = todos los que tienen
+            observed_discharge)
+        apply: Guardar c_racional/nc_scs y tc_horas ajustados en la cuenca
+        progress_callback: Ver calibrate_parameters()
+        **options: Parámetros de calibrate_parameters() (objective,
+            optimizer, method, excess_method, max_iterations, ...)
+
+    Returns:
+        CalibrationResult.to_dict() con watershed_id, event_ids y applied
+
+    Raises:
+        ValueError: Cuenca sin área/Tc, sin eventos observados o parámetros inválidos
+    """
+    if not watershed.area_hectareas or watershed.area_hectareas <= 0:
+        raise ValueError("La cuenca debe tener área definida (area_hectareas > 0)")
+    if not watershed.tc_horas or watershed.tc_horas <= 0:
+        raise ValueError("La cuenca debe tener tiempo de concentración (tc_horas > 0)")
+
+    rainfall_data = watershed.rainfall_data.filter(observed_discharge__isnull=False).order_by('event_date', 'id')
+    if event_ids is not None:
+        rainfall_data = rainfall_data.filter(id__in=event_ids)
+    rainfall_data = list(rainfall_data)
+    if not rainfall_data:
+        raise ValueError("La cuenca no tiene eventos con caudal observado (observed_discharge)")
+
+    result = calibrate_parameters(
+        events=[(rain.records, rain.observed_discharge) for rain in rainfall_data],
+        area_km2=float(watershed.area_hectareas) / 100,  # Convertir ha a km²
+        initial=dict(
+            C=watershed.c_racional,
+            CN=watershed.nc_scs,
+            tc_minutes=float(watershed.tc_horas) * 60  # Convertir horas a minutos
+        ),
+        progress_callback=progress_callback,
+        **options
+    )
+
+    if apply:
+        fitted = result.parameters
+        if 'C' in fitted:
+            watershed.c_racional = round(fitted['C'], 3)
+        if 'CN' in fitted:
+            watershed.nc_scs = int(round(fitted['CN']))
+        if 'tc_minutes' in fitted:
+            watershed.tc_horas = fitted['tc_minutes'] / 60
+        watershed.save(update_fields=['c_racional', 'nc_scs', 'tc_horas', 'updated_at'])
+
+    return {
+        'watershed_id': watershed.id,
+        'event_ids': [rain.id for rain in rainfall_data],
+        'applied': apply,
+        **result.to_dict(),
+    }
+
+
+@shared_task(bind=True)
+def calibrate_watershed_task(self, watershed_id: int, options: Dict) -> Dict:
+    """
+    Calibración en segundo plano (ver calibrate_watershed()).
+
+    El progreso se publica como state='PROGRESS' con meta = último
+    reporte de calibrate_parameters() más watershed_id, a lo sumo una vez
+    por CALIBRATION_PROGRESS_INTERVAL_SECONDS. Los errores se relanzan
+    como CalibrationTaskError.
+    """
+    last_update = 0.0
+
+    def report(progress: Dict) -> None:
+        nonlocal last_update
+        now = time.monotonic()
+        if now - last_update >= CALIBRATION_PROGRESS_INTERVAL_SECONDS:
+            last_update = now
+            self.update_state(state='PROGRESS', meta={'watershed_id': watershed_id, **progress})
+
+    try:
+        watershed = Watershed.objects.get(pk=watershed_id)
+        return calibrate_watershed(watershed, progress_callback=report, **options)
+    except Exception as e:
+        raise CalibrationTaskError(watershed_id, str(e)) from e
+
+
+def calibration_task_watershed(task) -> Optional[int]:
+    """
+    Cuenca de una calibración a partir de su AsyncResult: watershed_id del
+    meta (PROGRESS), del resultado (SUCCESS) o de CalibrationTaskError
+    (FAILURE). None si el estado no la incluye.
+    """
+    info = task.info
+    if isinstance(info, dict):
+        return info.get('watershed_id')
+    return getattr(info, 'watershed_id', None)
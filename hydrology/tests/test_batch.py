@@ -0,0 +1,112 @@
+"""
+Tests para el motor de hidrogramas por lotes
+
+Verifica que calculate_hydrographs_batch() reproduce calculate_hydrograph()
+escenario a escenario, conservando el orden de entrada.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from hydrology.services import (
+    calculate_hydrograph,
+    calculate_hydrographs_batch,
+    HydrographResult,
+)
+
+
+def _design_scenarios():
+    """Barrido Tr × duración × posición del pico × Tc × método de excess"""
+    scenarios = []
+    for Tr, duration, ratio, tc, excess_method in itertools.product(
+        [2, 10, 100], [1.0, 6.0], [0.3, 0.5], [20.0, 90.0], ['rational', 'scs_curve_number']
+    ):
+        scenarios.append(dict(
+            total_rainfall_mm=40.0 + Tr,
+            duration_hours=duration,
+            area_km2=2.0 + tc / 10,
+            tc_minutes=tc,
+            excess_method=excess_method,
+            C=0.55,
+            CN=70 + Tr / 10,
+            P3_10=70.0,
+            Tr=Tr,
+            peak_position_ratio=ratio
+        ))
+    scenarios.append(dict(
+        total_rainfall_mm=30.0, duration_hours=1.0, area_km2=10.0,
+        tc_minutes=20.0, hyetograph_method='uniform', C=0.5
+    ))
+    return scenarios
+
+
+class TestCalculateHydrographsBatch:
+    """Tests para calculate_hydrographs_batch"""
+
+    def test_matches_scalar_path(self):
+        """Cada resumen coincide con calculate_hydrograph() del mismo escenario"""
+        scenarios = _design_scenarios()
+
+        results = calculate_hydrographs_batch(scenarios)
+
+        assert len(results) == len(scenarios)
+        for scenario, result in zip(scenarios, results):
+            expected = calculate_hydrograph(**scenario)['summary']
+            assert set(result) == {'summary'}
+            for key, value in expected.items():
+                if isinstance(value, str):
+                    assert result['summary'][key] == value
+                else:
+                    assert result['summary'][key] == pytest.approx(value, rel=1e-9)
+
+    def test_include_series(self):
+        """include_series agrega el HydrographResult de cada escenario"""
+        scenarios = _design_scenarios()[:4]
+
+        results = calculate_hydrographs_batch(scenarios, include_series=True)
+
+        for scenario, result in zip(scenarios, results):
+            series = result['series']
+            expected = calculate_hydrograph(**scenario)
+            assert isinstance(series, HydrographResult)
+            assert series.hydrograph.discharge_m3s.ndim == 1
+            np.testing.assert_allclose(
+                series.to_dict()['hydrograph']['discharge_m3s'],
+                expected['hydrograph']['discharge_m3s'],
+                rtol=1e-9, atol=1e-12
+            )
+            assert series.to_dict()['hyetograph']['peak_index'] == expected['hyetograph']['peak_index']
+
+    def test_auto_time_step(self):
+        """Sin time_step_minutes se usa el Δt automático de cada Tc"""
+        results = calculate_hydrographs_batch([
+            dict(total_rainfall_mm=50.0, duration_hours=2.0, area_km2=5.0,
+                 tc_minutes=tc, C=0.6, P3_10=70.0, Tr=10)
+            for tc in (30.0, 60.0, 150.0)
+        ])
+
+        assert [r['summary']['time_step_minutes'] for r in results] == [5, 10, 30]
+
+    def test_empty(self):
+        """Una lista vacía produce una lista vacía"""
+        assert calculate_hydrographs_batch([]) == []
+
+    def test_invalid_scenario_reports_index(self):
+        """Los errores de validación indican el escenario"""
+        scenarios = _design_scenarios()[:2] + [dict(
+            total_rainfall_mm=50.0, duration_hours=2.0, area_km2=5.0, tc_minutes=30.0,
+            P3_10=70.0, Tr=10
+        )]
+
+        with pytest.raises(ValueError, match='Escenario 2'):
+            calculate_hydrographs_batch(scenarios)
+
+    def test_unknown_parameter(self):
+        """Parámetros desconocidos se rechazan"""
+        with pytest.raises(ValueError, match='desconocidos'):
+            calculate_hydrographs_batch([dict(
+                total_rainfall_mm=50.0, duration_hours=2.0, area_km2=5.0,
+                tc_minutes=30.0, C=0.6, P3_10=70.0, Tr=10, tr=25
+            )])
@@ -0,0 +1,149 @@
+"""
+Tests para la calibración de C/CN y Tc contra hidrogramas observados
+"""
+
+import numpy as np
+import pytest
+
+from hydrology.services import (
+    calibrate_parameters,
+    calibration_event,
+    goodness_of_fit,
+)
+from hydrology.services.hydrograph_calculator import transform_rainfall_excess_series
+from hydrology.services.rainfall_excess import calculate_rainfall_excess_series
+
+
+STORMS = ([2, 5, 12, 20, 8, 3, 1, 0, 0, 4, 9, 3], [1, 1, 3, 30, 12, 2])
+
+
+def _observed_event(depths, time_step, method='scs_unit_hydrograph', excess_method='scs_curve_number', **params):
+    """Registros de RainfallData y caudal 'observado' simulado con parámetros conocidos"""
+    depths = np.asarray(depths, dtype=np.float64)
+    excess = calculate_rainfall_excess_series(
+        depths, method=excess_method, time_step_minutes=time_step, C=params.get('C'), CN=params.get('CN')
+    ).excess_mm
+    discharge = transform_rainfall_excess_series(
+        excess, 5.2, params['tc_minutes'], time_step, method=method
+    ).discharge_m3s
+    rainfall_series = [
+        {'time_min': (k + 1) * time_step, 'intensity_mm_h': depth * 60 / time_step, 'cumulative_mm': total}
+        for k, (depth, total) in enumerate(zip(depths, np.cumsum(depths)))
+    ]
+    observed = [{'time_min': k * time_step, 'discharge_m3s': q} for k, q in enumerate(discharge)]
+    return rainfall_series, observed
+
+
+class TestGoodnessOfFit:
+
+    def test_perfect_fit(self):
+        observed = np.array([0.0, 2.0, 5.0, 3.0, 1.0])
+        metrics = goodness_of_fit(observed, observed)
+
+        assert metrics == {'nse': pytest.approx(1.0), 'kge': pytest.approx(1.0), 'rmse': pytest.approx(0.0)}
+
+    def test_known_values(self):
+        observed = np.array([1.0, 2.0, 3.0, 4.0])
+        metrics = goodness_of_fit(observed + 1.0, observed)
+
+        # NSE = 1 - 4 / 5; KGE: r = 1, α = 1, β = 3.5 / 2.5
+        assert metrics['nse'] == pytest.approx(0.2)
+        assert metrics['kge'] == pytest.approx(1 - 0.4)
+        assert metrics['rmse'] == pytest.approx(1.0)
+
+    def test_mask_per_row(self):
+        observed = np.array([[1.0, 2.0, 3.0, 4.0], [1.0, 2.0, 3.0, 0.0]])
+        simulated = np.array([[2.0, 3.0, 4.0, 5.0], [1.0, 2.0, 3.0, 99.0]])
+        mask = np.array([[True] * 4, [True, True, True, False]])
+        metrics = goodness_of_fit(simulated, observed, mask)
+
+        assert metrics['nse'] == pytest.approx([0.2, 1.0])
+
+
+class TestCalibrationEvent:
+
+    def test_resamples_to_time_step(self):
+        event = calibration_event(
+            [{'time_min': 10, 'cumulative_mm': 4.0}, {'time_min': 20, 'cumulative_mm': 10.0}],
+            [{'time_min': 0, 'discharge_m3s': 0.0}, {'time_min': 20, 'discharge_m3s': 4.0}],
+            time_step_minutes=5.0
+        )
+
+        np.testing.assert_allclose(event.rainfall_mm, [2.0, 2.0, 3.0, 3.0])
+        np.testing.assert_allclose(event.observed_m3s, [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_invalid_observed(self):
+        rainfall = [{'time_min': 10, 'cumulative_mm': 4.0}]
+        with pytest.raises(ValueError, match="vacía"):
+            calibration_event(rainfall, [], 5.0)
+        with pytest.raises(ValueError, match="no negativo"):
+            calibration_event(rainfall, [{'time_min': 0, 'discharge_m3s': -1.0}], 5.0)
+
+
+class TestCalibrateParameters:
+
+    @pytest.mark.parametrize('objective', ['nse', 'kge', 'rmse'])
+    @pytest.mark.parametrize('optimizer', ['nelder-mead', 'powell'])
+    def test_recovers_curve_number_and_tc(self, objective, optimizer):
+        events = [_observed_event(storm, 10.0, CN=78, tc_minutes=50.0) for storm in STORMS]
+        progress = []
+
+        result = calibrate_parameters(
+            events, 5.2, initial=dict(CN=65, tc_minutes=35), objective=objective,
+            optimizer=optimizer, time_step_minutes=10.0, progress_callback=progress.append
+        )
+
+        assert result.parameters['CN'] == pytest.approx(78, abs=0.5)
+        assert result.parameters['tc_minutes'] == pytest.approx(50, abs=0.5)
+        assert result.metrics['nse'] > 0.999
+        assert len(result.event_metrics) == 2
+        assert len(progress) == result.num_iterations
+        assert progress[-1]['num_evaluations'] <= result.num_evaluations
+
+    def test_rational_calibrates_c(self):
+        events = [_observed_event(STORMS[0], 10.0, method='rational', excess_method='rational',
+                                  C=0.45, tc_minutes=40.0)]
+
+        progress = []
+
+        result = calibrate_parameters(
+            events, 5.2, initial=dict(C=0.7, tc_minutes=60), method='rational', excess_method='rational',
+            optimizer='differential_evolution', max_iterations=30, time_step_minutes=10.0, seed=1,
+            progress_callback=progress.append
+        )
+
+        assert list(result.parameters) == ['C', 'tc_minutes']
+        assert result.parameters['C'] == pytest.approx(0.45, abs=0.01)
+        assert result.to_dict()['objective_value'] == result.metrics['nse']
+        values = [step['objective_value'] for step in progress]
+        assert len(progress) == result.num_iterations and values == sorted(values, reverse=True)
+        assert progress[-1]['parameters'] == pytest.approx(result.parameters)
+
+    def test_excess_reused_when_only_tc_changes(self):
+        """Con C fijo la lluvia efectiva se calcula una sola vez"""
+        events = [_observed_event(STORMS[1], 10.0, CN=78, tc_minutes=50.0)]
+
+        result = calibrate_parameters(
+            events, 5.2, initial=dict(CN=78, tc_minutes=35), parameters=['tc_minutes'], time_step_minutes=10.0
+        )
+
+        assert result.parameters['tc_minutes'] == pytest.approx(50, abs=0.5)
+        assert result.cache['excess_misses'] == 1
+        assert result.cache['excess_hits'] == result.num_evaluations - 1
+
+    def test_invalid_arguments(self):
+        events = [_observed_event(STORMS[1], 10.0, CN=78, tc_minutes=50.0)]
+        initial = dict(CN=70, tc_minutes=40)
+
+        with pytest.raises(ValueError, match="Objetivo"):
+            calibrate_parameters(events, 5.2, initial, objective='mae')
+        with pytest.raises(ValueError, match="Optimizador"):
+            calibrate_parameters(events, 5.2, initial, optimizer='bfgs')
+        with pytest.raises(ValueError, match="al menos un evento"):
+            calibrate_parameters([], 5.2, initial)
+        with pytest.raises(ValueError, match="tc_minutes"):
+            calibrate_parameters(events, 5.2, dict(CN=70))
+        with pytest.raises(ValueError, match="no soportados"):
+            calibrate_parameters(events, 5.2, initial, parameters=['area_km2'])
+        with pytest.raises(ValueError, match="rango inválido"):
+            calibrate_parameters(events, 5.2, initial, bounds={'CN': (90, 60)})
@@ -0,0 +1,91 @@
+"""
+Tests para el almacenamiento columnar de series temporales
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from hydrology.models import Hydrograph
+from hydrology.services import (
+    calculate_hydrograph_series,
+    pack_columns,
+    pack_records,
+    unpack_columns,
+)
+
+
+@pytest.fixture(scope='module')
+def long_hydrograph():
+    """Hidrograma de 3 días a paso de 1 minuto"""
+    return calculate_hydrograph_series(
+        total_rainfall_mm=150, duration_hours=72, area_km2=50, tc_minutes=120,
+        excess_method='scs_curve_number', CN=75, P3_10=80, Tr=25, time_step_minutes=1
+    ).hydrograph
+
+
+class TestPackColumns:
+
+    def test_regular_round_trip_is_zero_copy(self):
+        discharge = np.array([0.0, 1.5, 4.25, 2.0])
+        series = unpack_columns(pack_columns({'discharge_m3s': discharge}, start=5.0, time_step=2.5,
+                                             dtype='float64', compression='none'))
+
+        np.testing.assert_array_equal(series.columns['discharge_m3s'], discharge)
+        np.testing.assert_array_equal(series.time, [5.0, 7.5, 10.0, 12.5])
+        assert series.time_step == 2.5 and len(series) == 4
+        assert not series.columns['discharge_m3s'].flags.writeable
+        assert series.columns['discharge_m3s'].base is not None
+
+    def test_irregular_records(self):
+        records = [
+            {'time_min': 0.0, 'discharge_m3s': 0.1},
+            {'time_min': 10.0, 'discharge_m3s': 0.7},
+            {'time_min': 25.0, 'discharge_m3s': 0.3},
+        ]
+        series = unpack_columns(pack_records(records))
+
+        assert series.time_step == 0.0
+        assert series.to_records() == records  # float32 con representación más corta
+
+    def test_invalid_data(self):
+        with pytest.raises(ValueError, match="magic"):
+            unpack_columns(b'X' * 64)
+        with pytest.raises(ValueError, match="truncados"):
+            unpack_columns(pack_columns({'q': [1.0, 2.0]}, time_step=1.0, compression='none')[:-4])
+        with pytest.raises(ValueError, match="igual longitud"):
+            pack_columns({'q': [1.0, 2.0], 'v': [1.0]}, time_step=1.0)
+        with pytest.raises(ValueError, match="time_step"):
+            pack_columns({'q': [1.0]})
+        with pytest.raises(ValueError, match="vacía"):
+            pack_records([])
+
+
+class TestHydrographStorage:
+
+    def test_long_hydrograph_size(self, long_hydrograph):
+        records = long_hydrograph.to_records()
+        data = pack_records(records)
+        series = unpack_columns(data)
+
+        assert len(json.dumps(records)) > 300_000
+        assert len(data) < 40_000
+        assert series.time_step == 1.0
+        np.testing.assert_allclose(series.columns['discharge_m3s'], long_hydrograph.discharge_m3s, rtol=1e-6)
+        np.testing.assert_allclose(series.time, long_hydrograph.time_steps)
+
+    def test_model_accessors(self, long_hydrograph):
+        records = long_hydrograph.to_records()[:50]
+        hydrograph = Hydrograph(hydrograph_data=records)
+
+        # Registro sin convertir: se lee desde el JSON anterior
+        assert hydrograph.series.time_step == 1.0
+        assert hydrograph.records[10]['time_min'] == 10.0
+
+        hydrograph.records = records
+        assert hydrograph.hydrograph_data is None
+        assert len(hydrograph.series) == 50
+        stored = hydrograph.records
+        assert [point['time_min'] for point in stored] == [point['time_min'] for point in records]
+        assert stored[30]['discharge_m3s'] == pytest.approx(records[30]['discharge_m3s'], rel=1e-6)
@@ -0,0 +1,228 @@
+"""
+Tests para la simulación continua por bloques
+"""
+
+import numpy as np
+import pytest
+
+from hydrology.services import (
+    ContinuousSimulation,
+    continuous_unit_hydrograph,
+    iter_rainfall_chunks,
+    rainfall_event_chunks,
+    rainfall_records_to_depths,
+    route_hydrograph,
+    simulate_continuous,
+)
+from hydrology.services.hydrograph_calculator import transform_rainfall_excess_series
+from hydrology.services.rainfall_excess import calculate_rainfall_excess_scs_series
+
+
+DECK_STORAGE = dict(storage_m3=[0.0, 5e4, 2e5, 6e5], discharge_m3s=[0.0, 2.0, 10.0, 40.0])
+
+
+def _record(num_intervals=6000, seed=3):
+    """Registro sintético intermitente de lluvia por intervalo [mm]"""
+    rng = np.random.default_rng(seed)
+    return np.where(rng.random(num_intervals) < 0.06, rng.gamma(0.6, 2.0, num_intervals), 0.0)
+
+
+def _run(rainfall, chunk_size, **params):
+    """Concatena las salidas de una simulación por bloques"""
+    simulation = ContinuousSimulation(area_km2=8.0, tc_minutes=60.0, time_step_minutes=5.0, **params)
+    chunks = list(simulation.run(iter_rainfall_chunks(rainfall, chunk_size)))
+    return simulation, {
+        name: np.concatenate([getattr(chunk, name) for chunk in chunks])
+        for name in ('excess_mm', 'discharge_m3s', 'output_m3s')
+    }
+
+
+class TestChunkInvariance:
+    """El resultado no depende del tamaño de bloque"""
+
+    @pytest.mark.parametrize('loss_method, loss_params', [
+        ('rational', dict(C=0.5)),
+        ('scs_curve_number', dict(CN=80, inter_event_hours=3)),
+        ('deficit_constant', dict(initial_deficit_mm=10, max_deficit_mm=25, constant_rate_mm_h=1.5)),
+    ])
+    @pytest.mark.parametrize('routing', [
+        None,
+        dict(method='muskingum', K_minutes=40.0, X=0.2),
+        dict(method='modified_puls', **DECK_STORAGE),
+    ])
+    def test_chunked_equals_single_block(self, loss_method, loss_params, routing):
+        rainfall = _record()
+        params = dict(loss_method=loss_method, loss_params=loss_params, routing=routing)
+        _, whole = _run(rainfall, rainfall.size, **params)
+        _, chunked = _run(rainfall, 487, **params)
+
+        for name in whole:
+            np.testing.assert_allclose(chunked[name], whole[name], rtol=1e-9, atol=1e-9)
+
+    def test_summary_accumulates_chunks(self):
+        rainfall = _record()
+        simulation, outputs = _run(rainfall, 1000, loss_method='rational', loss_params=dict(C=0.5))
+        summary = simulation.summary
+
+        assert summary.num_intervals == rainfall.size
+        assert summary.total_rainfall_mm == pytest.approx(rainfall.sum())
+        assert summary.runoff_coefficient == pytest.approx(0.5)
+        assert summary.peak_discharge_m3s == pytest.approx(outputs['output_m3s'].max())
+        assert summary.time_to_peak_minutes == np.argmax(outputs['output_m3s']) * 5.0
+
+        simulation.finish()
+        assert simulate_continuous(
+            iter_rainfall_chunks(rainfall, 700), 8.0, 60.0, 5.0,
+            loss_method='rational', loss_params=dict(C=0.5)
+        ).to_dict() == pytest.approx(summary.to_dict())
+
+    @pytest.mark.parametrize('routing', [None, dict(method='muskingum', K_minutes=40.0, X=0.2)])
+    def test_finish_adds_recession(self, routing):
+        """Lluvia al final del registro: la recesión completa entra en el volumen"""
+        rainfall = np.zeros(2000)
+        rainfall[-10:] = 5.0
+        params = dict(loss_method='rational', loss_params=dict(C=0.5), routing=routing)
+        simulation, outputs = _run(rainfall, 512, **params)
+
+        tail = simulation.finish()
+        summary = simulate_continuous(iter_rainfall_chunks(rainfall, 512), 8.0, 60.0, 5.0, **params)
+
+        assert tail.start_index == 2000 and tail.time_steps[0] == 2000 * 5.0
+        assert summary.num_intervals == 2000 and summary.total_excess_mm == pytest.approx(25.0)
+        assert summary.total_volume_m3 == pytest.approx(simulation.summary.total_volume_m3)
+        assert summary.peak_discharge_m3s == max(outputs['output_m3s'].max(), tail.output_m3s.max())
+        if routing is None:
+            assert summary.total_volume_m3 == pytest.approx(25.0 * 8.0 * 1000, rel=1e-3)
+        with pytest.raises(ValueError, match="terminó"):
+            simulation.process(rainfall)
+
+
+class TestWholeRecordEquivalence:
+    """Transformación y tránsito coinciden con los servicios de un evento"""
+
+    @pytest.mark.parametrize('method, method_params', [
+        ('scs_unit_hydrograph', {}),
+        ('synth_unit_hydro', dict(unit_hydrograph='clark')),
+    ])
+    def test_transform_matches_convolution(self, method, method_params):
+        rainfall = _record()
+        _, outputs = _run(rainfall, 512, loss_method='rational', loss_params=dict(C=0.5),
+                          method=method, **method_params)
+        reference = transform_rainfall_excess_series(
+            0.5 * rainfall, 8.0, 60.0, 5.0, method=method, **method_params
+        ).discharge_m3s[:rainfall.size]
+
+        np.testing.assert_allclose(outputs['discharge_m3s'], reference, atol=1e-9 * reference.max())
+
+    def test_rational_unit_hydrograph_has_unit_volume(self):
+        """Triangular normalizado: 1 mm sobre 8 km² = 8000 m³"""
+        kernel = continuous_unit_hydrograph('rational', 8.0, 60.0, 5.0)
+        assert kernel.sum() * 5.0 * 60 == pytest.approx(8000.0)
+
+    @pytest.mark.parametrize('routing', [
+        dict(method='muskingum', K_minutes=60.0, X=0.2),
+        dict(method='muskingum', K_minutes=2.0, X=0.3),
+        dict(method='muskingum_cunge', length_m=6000.0, slope=0.002, manning_n=0.035,
+             width_m=12.0, reference_discharge_m3s=5.0),
+        dict(method='modified_puls', **DECK_STORAGE),
+    ])
+    def test_routing_matches_route_hydrograph(self, routing):
+        rainfall = _record()
+        _, outputs = _run(rainfall, 600, loss_method='rational', loss_params=dict(C=0.5), routing=routing)
+        reference = route_hydrograph(outputs['discharge_m3s'], 5.0, **routing).outflow_m3s
+
+        np.testing.assert_allclose(outputs['output_m3s'], reference[:rainfall.size], rtol=1e-9, atol=1e-12)
+
+
+class TestLossState:
+    """Humedad del suelo transportada entre bloques"""
+
+    def test_curve_number_single_event_matches_scs(self):
+        """Dentro de un evento coincide con el número de curva por tormenta"""
+        rainfall = np.array([0.0, 2.0, 5.0, 0.0, 8.0, 12.0, 4.0, 1.0])
+        _, outputs = _run(rainfall, 3, loss_method='scs_curve_number', loss_params=dict(CN=85))
+        reference = calculate_rainfall_excess_scs_series(rainfall, 85).excess_mm
+
+        np.testing.assert_allclose(outputs['excess_mm'], reference, atol=1e-12)
+
+    def test_curve_number_resets_after_dry_period(self):
+        """Tras inter_event_hours sin lluvia el segundo evento recomienza con Ia completo"""
+        storm = np.array([10.0, 20.0, 15.0])
+        dry = np.zeros(12 * 7)  # 7 h a 5 min
+        rainfall = np.concatenate([storm, dry, storm])
+        simulation, outputs = _run(rainfall, 40, loss_method='scs_curve_number', loss_params=dict(CN=80))
+        excess = outputs['excess_mm']
+
+        np.testing.assert_allclose(excess[-3:], excess[:3], atol=1e-12)
+        assert simulation.state['loss'] == {'event_rainfall_mm': 45.0, 'dry_steps': 0}
+
+    def test_curve_number_continues_event_within_dry_gap(self):
+        """Pausas más cortas que inter_event_hours no reinician el evento"""
+        storm = np.array([10.0, 20.0, 15.0])
+        rainfall = np.concatenate([storm, np.zeros(12), storm])
+        _, outputs = _run(rainfall, 5, loss_method='scs_curve_number', loss_params=dict(CN=80))
+
+        assert outputs['excess_mm'][-3:].sum() > outputs['excess_mm'][:3].sum()
+
+    def test_deficit_fills_then_constant_rate(self):
+        rainfall = np.array([4.0, 4.0, 4.0, 4.0])
+        simulation, outputs = _run(rainfall, 1, loss_method='deficit_constant', loss_params=dict(
+            initial_deficit_mm=6.0, max_deficit_mm=10.0, constant_rate_mm_h=12.0
+        ))
+
+        # Déficit 6 mm: 4 + 2 (excedente 2 - 1 de tasa constante); luego 4 - 1
+        np.testing.assert_allclose(outputs['excess_mm'], [0.0, 1.0, 3.0, 3.0])
+        assert simulation.state['loss'] == {'deficit_mm': 0.0}
+
+    def test_deficit_recovers_in_dry_periods(self):
+        rainfall = np.concatenate([[10.0], np.zeros(100)])
+        simulation, _ = _run(rainfall, 30, loss_method='deficit_constant', loss_params=dict(
+            initial_deficit_mm=5.0, max_deficit_mm=8.0, constant_rate_mm_h=1.2, recovery_rate_mm_h=0.6
+        ))
+
+        # 100 intervalos secos × 0.05 mm = 5 mm (por debajo de max_deficit_mm)
+        assert simulation.state['loss']['deficit_mm'] == pytest.approx(5.0)
+
+    def test_invalid_loss_parameters(self):
+        with pytest.raises(ValueError, match="no soportado"):
+            ContinuousSimulation(8.0, 60.0, 5.0, loss_method='horton')
+        with pytest.raises(ValueError, match="Parámetros inválidos"):
+            ContinuousSimulation(8.0, 60.0, 5.0, loss_method='scs_curve_number', loss_params=dict(C=0.5))
+        with pytest.raises(ValueError, match="max_deficit_mm"):
+            ContinuousSimulation(8.0, 60.0, 5.0, loss_method='deficit_constant', loss_params=dict(
+                initial_deficit_mm=20, max_deficit_mm=10, constant_rate_mm_h=1
+            ))
+
+    def test_cunge_requires_reference_discharge(self):
+        with pytest.raises(ValueError, match="reference_discharge_m3s"):
+            ContinuousSimulation(8.0, 60.0, 5.0, loss_params=dict(CN=80), routing=dict(
+                method='muskingum_cunge', length_m=6000.0, slope=0.002, manning_n=0.035, width_m=12.0
+            ))
+
+
+class TestRainfallSources:
+    """Conversión de registros observados a bloques de lluvia"""
+
+    def test_records_to_depths_resamples_cumulative(self):
+        records = [
+            {'time_min': 10, 'intensity_mm_h': 30.0, 'cumulative_mm': 5.0},
+            {'time_min': 20, 'intensity_mm_h': 60.0, 'cumulative_mm': 15.0},
+        ]
+        np.testing.assert_allclose(rainfall_records_to_depths(records, 5.0), [2.5, 2.5, 5.0, 5.0])
+
+    def test_records_without_cumulative_use_intensity(self):
+        records = [{'time_min': 10, 'intensity_mm_h': 30.0}, {'time_min': 20, 'intensity_mm_h': 60.0}]
+        np.testing.assert_allclose(rainfall_records_to_depths(records, 10.0), [5.0, 10.0])
+
+    def test_event_chunks_fill_gaps_with_zeros(self):
+        event = [{'time_min': 10, 'cumulative_mm': 4.0}]
+        chunks = list(rainfall_event_chunks([(0, event), (60, event)], 5.0, chunk_size=4))
+        series = np.concatenate(chunks)
+
+        assert [chunk.size for chunk in chunks] == [4, 4, 4, 2]
+        np.testing.assert_allclose(series, [2, 2] + [0] * 10 + [2, 2])
+
+    def test_chunks_reject_negative_rainfall(self):
+        simulation = ContinuousSimulation(8.0, 60.0, 5.0, loss_params=dict(CN=80))
+        with pytest.raises(ValueError, match="no negativos"):
+            simulation.process([1.0, -1.0])
@@ -0,0 +1,173 @@
+"""
+Tests para el motor de convolución
+
+Verifica que los backends 'direct' y 'fft' reproducen la convolución
+escalar original dentro de CONVOLUTION_RTOL.
+"""
+
+import numpy as np
+import pytest
+
+from hydrology.services.convolution import (
+    CONVOLUTION_RTOL,
+    StreamingConvolver,
+    convolve_series,
+    select_convolution_backend,
+)
+from hydrology.services.hydrograph_calculator import convolve_rainfall_with_unit_hydrograph
+
+
+def _scalar_convolution(rainfall, unit_hydrograph):
+    """Convolución escalar de referencia (implementación original)"""
+    discharge = [0.0] * (len(rainfall) + len(unit_hydrograph) - 1)
+    for i in range(len(rainfall)):
+        for j in range(len(unit_hydrograph)):
+            if rainfall[i] > 0:
+                discharge[i + j] += rainfall[i] * unit_hydrograph[j]
+    return discharge
+
+
+class TestConvolveSeries:
+    """Tests para convolve_series"""
+
+    @pytest.mark.parametrize('backend', ['direct', 'fft', 'auto'])
+    def test_matches_scalar_reference(self, backend):
+        """Todos los backends coinciden con la convolución escalar"""
+        rng = np.random.default_rng(42)
+        rainfall = rng.uniform(0, 5, 300).tolist()
+        unit_hydrograph = rng.uniform(0, 2, 120).tolist()
+
+        expected = np.array(_scalar_convolution(rainfall, unit_hydrograph))
+        result = convolve_series(rainfall, unit_hydrograph, backend=backend)
+
+        assert result.shape == expected.shape
+        np.testing.assert_allclose(result, expected, rtol=0, atol=CONVOLUTION_RTOL * expected.max())
+
+    def test_backend_selection_by_size(self):
+        """Series cortas usan 'direct', series largas usan 'fft'"""
+        assert select_convolution_backend(24, 20) == 'direct'
+        assert select_convolution_backend(4320, 500) == 'fft'
+
+    @pytest.mark.parametrize('backend', ['direct', 'fft'])
+    def test_matrix_rows_share_kernel(self, backend):
+        """Cada fila de una matriz se convoluciona con el mismo kernel"""
+        rng = np.random.default_rng(7)
+        signals = rng.uniform(0, 5, (3, 2, 40))
+        kernel = rng.uniform(0, 1, 15)
+
+        result = convolve_series(signals, kernel, backend=backend)
+
+        assert result.shape == (3, 2, 54)
+        for signal, row in zip(signals.reshape(-1, 40), result.reshape(-1, 54)):
+            np.testing.assert_allclose(row, np.convolve(signal, kernel), rtol=CONVOLUTION_RTOL, atol=1e-12)
+
+    @pytest.mark.parametrize('backend', ['direct', 'fft'])
+    def test_stacked_kernels(self, backend):
+        """Una matriz de kernels se combina por broadcasting con las filas de signal"""
+        rng = np.random.default_rng(11)
+        signals = rng.uniform(0, 5, (2, 1, 40))
+        kernels = rng.uniform(0, 1, (3, 15))
+
+        result = convolve_series(signals, kernels, backend=backend)
+
+        assert result.shape == (2, 3, 54)
+        for i in range(2):
+            for j in range(3):
+                np.testing.assert_allclose(
+                    result[i, j], np.convolve(signals[i, 0], kernels[j]), rtol=CONVOLUTION_RTOL, atol=1e-12
+                )
+
+    def test_incompatible_shapes(self):
+        """Formas no combinables lanzan ValueError"""
+        with pytest.raises(ValueError, match="incompatibles"):
+            convolve_series(np.ones((2, 10)), np.ones((3, 4)))
+
+    def test_invalid_backend(self):
+        """Backend desconocido lanza ValueError"""
+        with pytest.raises(ValueError, match="no soportado"):
+            convolve_series([1.0, 2.0], [1.0], backend='gpu')
+
+    def test_empty_series(self):
+        """Series vacías lanzan ValueError"""
+        with pytest.raises(ValueError, match="no pueden estar vacías"):
+            convolve_series([], [1.0])
+
+
+class TestConvolveRainfallWithUnitHydrograph:
+    """Tests para convolve_rainfall_with_unit_hydrograph"""
+
+    def test_negative_excess_ignored(self):
+        """Intervalos con lluvia efectiva <= 0 no aportan caudal"""
+        rainfall = [0.0, -1.0, 2.0, 0.0]
+        unit_hydrograph = [0.0, 1.0, 0.5]
+
+        result = convolve_rainfall_with_unit_hydrograph(rainfall, unit_hydrograph, 5, 1e6)
+
+        np.testing.assert_allclose(result, _scalar_convolution(rainfall, unit_hydrograph))
+
+    def test_accepts_arrays(self):
+        """Acepta arrays de NumPy directamente"""
+        rainfall = np.linspace(0, 3, 50)
+        unit_hydrograph = np.linspace(1, 0, 10)
+
+        result = convolve_rainfall_with_unit_hydrograph(rainfall, unit_hydrograph, 5, 1e6)
+
+        assert len(result) == 59
+        np.testing.assert_allclose(result, _scalar_convolution(rainfall.tolist(), unit_hydrograph.tolist()))
+
+
+class TestStreamingConvolver:
+    """Tests para StreamingConvolver (overlap-add por bloques)"""
+
+    @pytest.mark.parametrize('backend', ['direct', 'fft', 'auto'])
+    @pytest.mark.parametrize('block_size', [1, 7, 50, 400])
+    def test_blocks_match_full_convolution(self, backend, block_size):
+        """La concatenación de push() y flush() es la convolución completa"""
+        rng = np.random.default_rng(7)
+        signal = rng.uniform(0, 5, 1000)
+        kernel = rng.uniform(0, 2, 150)
+
+        convolver = StreamingConvolver(kernel, backend=backend)
+        blocks = [convolver.push(signal[i:i + block_size]) for i in range(0, signal.size, block_size)]
+        assert all(block.size == min(block_size, signal.size - i)
+                   for block, i in zip(blocks, range(0, signal.size, block_size)))
+        result = np.concatenate(blocks + [convolver.flush()])
+
+        expected = convolve_series(signal, kernel, backend='direct')
+        np.testing.assert_allclose(result, expected, atol=CONVOLUTION_RTOL * expected.max())
+
+    def test_tail_is_bounded_by_kernel_length(self):
+        convolver = StreamingConvolver(np.ones(30))
+        for _ in range(5):
+            convolver.push(np.ones(100))
+        assert convolver.tail.shape == (29,)
+        assert convolver.num_samples == 500
+
+    def test_rows_and_stacked_kernels(self):
+        """Bloques (k, b) contra kernels (k, m) o un kernel común"""
+        rng = np.random.default_rng(3)
+        signal = rng.uniform(0, 5, (3, 200))
+        kernels = rng.uniform(0, 1, (3, 80))
+
+        convolver = StreamingConvolver(kernels, backend='fft')
+        result = np.concatenate([convolver.push(signal[:, :120]), convolver.push(signal[:, 120:]),
+                                 convolver.flush()], axis=-1)
+        np.testing.assert_allclose(result, convolve_series(signal, kernels), atol=1e-9)
+
+    def test_block_shape_must_not_change(self):
+        convolver = StreamingConvolver(np.ones(5))
+        convolver.push(np.ones((2, 10)))
+        with pytest.raises(ValueError, match="no coincide"):
+            convolver.push(np.ones(10))
+
+    def test_flush_resets_state(self):
+        convolver = StreamingConvolver([1.0, 1.0])
+        convolver.push([1.0, 2.0])
+        np.testing.assert_allclose(convolver.flush(), [2.0])
+        np.testing.assert_allclose(convolver.push([1.0]), [1.0])
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="vacío"):
+            StreamingConvolver([])
+        with pytest.raises(ValueError, match="no soportado"):
+            StreamingConvolver([1.0], backend='gpu')
@@ -0,0 +1,103 @@
+"""
+Tests para la búsqueda de duración crítica
+
+Verifica que la grilla gruesa + sección áurea encuentra el máximo de una
+búsqueda exhaustiva y que el hidrograma crítico coincide con
+calculate_hydrograph() para la misma tormenta.
+"""
+
+import pytest
+
+from hydrology.services import (
+    calculate_hydrograph,
+    find_critical_duration,
+    HydrographCalculationError,
+)
+
+
+SCS_WATERSHED = dict(
+    area_km2=50.0,
+    tc_minutes=180.0,
+    P3_10=80.0,
+    Tr=25,
+    excess_method='scs_curve_number',
+    CN=75,
+    time_step_minutes=5.0
+)
+
+
+class TestFindCriticalDuration:
+    """Tests para find_critical_duration"""
+
+    @pytest.mark.parametrize('search_peak_position', [False, True])
+    def test_matches_exhaustive_search(self, search_peak_position):
+        """El óptimo coincide con evaluar todas las duraciones"""
+        result = find_critical_duration(**SCS_WATERSHED, search_peak_position=search_peak_position)
+        num_candidates = int(24 * 60 / result.time_step_minutes)
+        exhaustive = find_critical_duration(
+            **SCS_WATERSHED, search_peak_position=search_peak_position, grid_size=20 * num_candidates
+        )
+
+        assert len(exhaustive.evaluations) == num_candidates
+        assert result.num_intervals == exhaustive.num_intervals
+        assert result.peak_discharge_m3s == pytest.approx(exhaustive.peak_discharge_m3s)
+        assert len(result.evaluations) < num_candidates / 4
+
+    @pytest.mark.parametrize('method', ['rational', 'scs_unit_hydrograph'])
+    def test_padded_grid_matches_single_storm(self, method):
+        """Las duraciones evaluadas juntas (matriz con ceros) dan el pico de cada tormenta sola"""
+        result = find_critical_duration(
+            **dict(SCS_WATERSHED, max_duration_hours=6), method=method, search_peak_position=True, grid_size=1000
+        )
+
+        assert len(result.evaluations) == 6 * 60 / 5
+        assert result.peak_discharge_m3s == pytest.approx(result.calculation.hydrograph.peak_discharge_m3s)
+
+    def test_critical_hydrograph_matches_pipeline(self):
+        """El hidrograma crítico es el de calculate_hydrograph() con P = IDF(D)"""
+        result = find_critical_duration(**SCS_WATERSHED, search_peak_position=True)
+        summary = result.calculation.summary()
+
+        expected = calculate_hydrograph(
+            total_rainfall_mm=summary['total_rainfall_mm'],
+            duration_hours=result.critical_duration_hours,
+            area_km2=SCS_WATERSHED['area_km2'],
+            tc_minutes=SCS_WATERSHED['tc_minutes'],
+            excess_method='scs_curve_number',
+            CN=SCS_WATERSHED['CN'],
+            time_step_minutes=result.time_step_minutes,
+            peak_position_ratio=result.peak_position_ratio,
+            P3_10=SCS_WATERSHED['P3_10'],
+            Tr=SCS_WATERSHED['Tr']
+        )['summary']
+
+        assert summary['peak_discharge_m3s'] == pytest.approx(expected['peak_discharge_m3s'])
+        assert result.peak_discharge_m3s == pytest.approx(expected['peak_discharge_m3s'])
+
+    def test_duration_range(self):
+        """La duración crítica respeta el rango pedido"""
+        result = find_critical_duration(
+            **SCS_WATERSHED, min_duration_hours=6.0, max_duration_hours=12.0
+        )
+
+        assert 6.0 <= result.critical_duration_hours <= 12.0
+        assert all(6.0 <= item['duration_hours'] <= 12.0
+                   for item in result.to_dict()['evaluated_durations'])
+
+    def test_to_dict(self):
+        """to_dict() no incluye series (solo resumen y evaluaciones)"""
+        data = find_critical_duration(**SCS_WATERSHED).to_dict()
+
+        assert data['num_evaluations'] == len(data['evaluated_durations'])
+        assert 'hydrograph' not in data
+        assert data['summary']['peak_discharge_m3s'] == pytest.approx(data['peak_discharge_m3s'])
+
+    def test_invalid_range(self):
+        """Rango de duraciones vacío lanza ValueError"""
+        with pytest.raises(ValueError, match='Rango de duraciones'):
+            find_critical_duration(**SCS_WATERSHED, min_duration_hours=10, max_duration_hours=5)
+
+    def test_invalid_idf_parameters(self):
+        """Parámetros IDF fuera de rango lanzan HydrographCalculationError"""
+        with pytest.raises(HydrographCalculationError):
+            find_critical_duration(**{**SCS_WATERSHED, 'P3_10': 30.0})
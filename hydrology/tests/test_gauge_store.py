@@ -0,0 +1,152 @@
+"""
+Tests para el archivo de lluvia por pluviógrafo (memory-mapped, solo agregados)
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from django.contrib.admin.sites import site
+
+from hydrology.models import RainfallGauge
+from hydrology.services import GaugeStore, find_rainfall_events
+from hydrology.services.continuous import simulate_continuous
+
+
+@pytest.fixture
+def store(tmp_path):
+    return GaugeStore(tmp_path)
+
+
+@pytest.fixture
+def gauge(tmp_path, settings):
+    settings.RAINFALL_STORE_ROOT = str(tmp_path)
+    return RainfallGauge(
+        code='PLUVIO-01', watershed_id=1, time_step_minutes=5.0,
+        start_time=datetime(1995, 1, 1, tzinfo=timezone.utc)
+    )
+
+
+class TestGaugeStore:
+
+    def test_append_does_not_rewrite_data(self, store):
+        first = np.arange(1000, dtype=np.float32) / 10
+        assert store.append('G1', first) == 0
+        before = store.path('G1').read_bytes()
+
+        assert store.append('G1', [0.5, 0.0, 1.5]) == 1000
+        after = store.path('G1').read_bytes()
+
+        assert after[128:len(before)] == before[128:]
+        assert len(after) == len(before) + 3 * 4
+        np.testing.assert_array_equal(np.load(store.path('G1')), np.concatenate([first, [0.5, 0.0, 1.5]]))
+
+    def test_read_is_memmap_slice(self, store):
+        store.append('G1', np.linspace(0, 1, 50_000))
+        window = store.read('G1', 10_000, 10_010)
+
+        assert isinstance(window, np.memmap) and not window.flags.writeable
+        assert store.length('G1') == 50_000 and len(window) == 10
+        assert window[0] == pytest.approx(10_000 / 49_999, rel=1e-6)
+        assert len(store.read('G1', 60_000)) == 0
+        assert len(store.read('G2')) == 0
+
+    def test_interrupted_append_is_discarded(self, store):
+        store.append('G1', [1.0, 2.0])
+        with open(store.path('G1'), 'ab') as file:
+            file.write(b'\x00' * 6)  # datos sin cabecera actualizada
+
+        assert store.append('G1', [3.0]) == 2
+        np.testing.assert_array_equal(store.read('G1'), [1.0, 2.0, 3.0])
+
+    def test_remove(self, store):
+        store.append('G1', [1.0])
+        store.remove('G1')
+        store.remove('G1')
+
+        assert not store.exists('G1') and store.length('G1') == 0
+
+    def test_invalid_input(self, store):
+        with pytest.raises(ValueError, match="Código"):
+            store.path('../fuera')
+        with pytest.raises(ValueError, match="no negativo"):
+            store.append('G1', [1.0, -1.0])
+        store.path('G2').write_bytes(b'no es npy')
+        with pytest.raises(ValueError, match="válido"):
+            store.length('G2')
+
+
+class TestRainfallEvents:
+
+    def test_split_by_dry_period(self):
+        depths = np.zeros(500)
+        depths[[10, 12, 30]] = 1.0      # 30 - 12 - 1 = 17 intervalos secos < 72 (6 h)
+        depths[[200, 201]] = [0.2, 0.1]
+        depths[400] = 5.0
+
+        assert find_rainfall_events(depths, 5.0) == [(10, 31), (200, 202), (400, 401)]
+        assert find_rainfall_events(depths, 5.0, min_depth_mm=1.0) == [(10, 31), (400, 401)]
+        assert find_rainfall_events(depths, 5.0, inter_event_hours=1) == [(10, 13), (30, 31), (200, 202), (400, 401)]
+        assert find_rainfall_events(np.zeros(10), 5.0) == []
+
+
+class TestRainfallGauge:
+
+    def test_window_and_events(self, gauge):
+        depths = np.zeros(2 * 288)
+        depths[100:112] = 2.0
+        depths[400:403] = 0.5
+        gauge.append(depths)
+
+        window = gauge.window(datetime(1995, 1, 1, 8, 20, tzinfo=timezone.utc),
+                              datetime(1995, 1, 1, 9, 20, tzinfo=timezone.utc))
+        assert window.start_min == 500.0 and len(window) == 12
+        assert window.cumulative_mm[-1] == pytest.approx(24.0)
+
+        events = gauge.extract_events()
+        assert [(event.gauge_offset, event.gauge_length) for event in events] == [(100, 12), (400, 3)]
+        assert events[1].event_date.isoformat() == '1995-01-02'
+        assert events[0].total_rainfall_mm == 24.0 and events[0].duration_hours == 1.0
+
+    def test_event_accessors(self, gauge):
+        gauge.append(np.tile([0.0, 1.2, 0.6, 0.0], 100))
+        event = gauge.extract_event(40, 48)
+
+        assert event.rainfall_series is None and event.rainfall_encoded is None
+        assert event.records[:2] == [
+            {'time_min': 5.0, 'intensity_mm_h': 0.0, 'cumulative_mm': 0.0},
+            {'time_min': 10.0, 'intensity_mm_h': 14.4, 'cumulative_mm': 1.2},
+        ]
+        window = event.rainfall_window(10.0, 20.0)
+        np.testing.assert_allclose(window.time_min, [15.0, 20.0])
+        assert window.cumulative_mm[-1] == pytest.approx(1.8)
+
+        event.records = event.records
+        assert event.gauge is None and event.rainfall_encoded is not None
+
+    def test_continuous_simulation_from_memmap(self, gauge):
+        record = np.where(np.arange(20_000) % 500 < 6, 3.0, 0.0)
+        gauge.append(record)
+        params = dict(
+            area_km2=4.0, tc_minutes=60, time_step_minutes=5.0, loss_method='rational', loss_params={'C': 0.5}
+        )
+
+        from_store = simulate_continuous(gauge.store.iter_chunks(gauge.code, chunk_size=4096), **params)
+        in_memory = simulate_continuous([record], **params)
+
+        assert from_store.num_intervals == 20_000
+        assert from_store.peak_discharge_m3s == pytest.approx(in_memory.peak_discharge_m3s)
+        assert from_store.total_volume_m3 == pytest.approx(in_memory.total_volume_m3)
+
+    def test_record_fields_locked_with_data(self, gauge):
+        admin = site._registry[RainfallGauge]
+        assert 'code' not in admin.get_readonly_fields(None, gauge)
+
+        gauge.append([1.0, 2.0])
+
+        assert {'code', 'start_time', 'time_step_minutes'} <= set(admin.get_readonly_fields(None, gauge))
+        # Un pluviógrafo nuevo no hereda el archivo de otro con el mismo código
+        duplicate = RainfallGauge(code=gauge.code, watershed_id=1, time_step_minutes=5.0, start_time=gauge.start_time)
+        with pytest.raises(ValueError, match="Ya existe un registro"):
+            duplicate.save()
@@ -1,15 +1,24 @@
 """
 Tests para hydrograph_calculator service
 
-Prueba el cálculo completo de hidrogramas usando el método racional.
+Prueba el cálculo completo de hidrogramas usando el método racional, el
+hidrograma unitario adimensional SCS y los hidrogramas unitarios sintéticos.
 """
 
+import numpy as np
 import pytest
 from hydrology.services import (
     calculate_hydrograph,
     calculate_hydrograph_rational,
+    calculate_hydrograph_scs,
+    calculate_hydrograph_synthetic,
+    calculate_synthetic_hydrographs_series,
+    calculate_hydrographs_batch,
+    clear_unit_hydrograph_cache,
+    unit_hydrograph_cache_info,
     HydrographCalculationError
 )
+from hydrology.services.hydrograph_calculator import transform_rainfall_excess_series
 
 
 class TestCalculateHydrographRational:
@@ -333,3 +342,180 @@ class TestHydrographValidation:
         # Verificar que es monótona creciente
         for i in range(1, len(cumulative)):
             assert cumulative[i] >= cumulative[i-1]
+
+
+class TestCalculateHydrographSCS:
+    """Tests para el hidrograma unitario adimensional SCS"""
+
+    def test_unit_response(self):
+        """1 mm en un intervalo: pico qp en Tp y volumen de 1 mm sobre la cuenca"""
+        # Tc = 100 min, Δt = 10 min → Tp = 5 + 60 = 65 min
+        # qp = 0.208 × 20 km² / (65/60 h) = 3.84 m³/s por mm
+        result = calculate_hydrograph_scs(
+            area_km2=20.0,
+            tc_minutes=100.0,
+            rainfall_excess_series=[1.0],
+            time_step_minutes=10.0
+        )
+
+        assert result['method'] == 'scs_unit_hydrograph'
+        assert result['uh_time_to_peak_minutes'] == pytest.approx(65.0)
+        assert result['uh_peak_m3s_per_mm'] == pytest.approx(0.208 * 20.0 / (65.0 / 60))
+        assert result['time_to_peak_minutes'] in (60.0, 70.0)
+        assert result['peak_discharge_m3s'] <= result['uh_peak_m3s_per_mm']
+        assert result['total_volume_m3'] == pytest.approx(20.0 * 1000, rel=0.01)
+
+    def test_complete_flow_rural_watershed(self):
+        """Flujo completo: el volumen del hidrograma es la lluvia efectiva × área"""
+        result = calculate_hydrograph(
+            total_rainfall_mm=120.0,
+            duration_hours=24.0,
+            area_km2=50.0,
+            tc_minutes=240.0,
+            method='scs_unit_hydrograph',
+            excess_method='scs_curve_number',
+            CN=70,
+            P3_10=80.0,
+            Tr=25
+        )
+
+        summary = result['summary']
+        assert summary['method'] == 'scs_unit_hydrograph'
+        assert summary['peak_discharge_m3s'] > 0
+        assert summary['total_volume_m3'] == pytest.approx(
+            summary['rainfall_excess_mm'] * 50.0 * 1000, rel=0.01
+        )
+
+    def test_ordinates_cached_per_step_ratio(self):
+        """La tabla se interpola una sola vez por Δt/Tp"""
+        clear_unit_hydrograph_cache()
+        for excess in ([1.0, 2.0], [3.0, 0.5, 1.0], [0.2]):
+            calculate_hydrograph_scs(50.0, 240.0, excess, time_step_minutes=15.0)
+
+        info = unit_hydrograph_cache_info()['scs']
+        assert info['misses'] == 1
+        assert info['hits'] == 2
+
+    def test_batch_matches_pipeline(self):
+        """El motor por lotes soporta el método SCS con los mismos resultados"""
+        scenarios = [
+            dict(total_rainfall_mm=P, duration_hours=6.0, area_km2=area, tc_minutes=180.0,
+                 method='scs_unit_hydrograph', excess_method='scs_curve_number',
+                 CN=75, P3_10=75.0, Tr=Tr)
+            for P, Tr, area in [(80.0, 10, 30.0), (110.0, 50, 30.0), (95.0, 25, 80.0)]
+        ]
+
+        results = calculate_hydrographs_batch(scenarios)
+
+        for scenario, result in zip(scenarios, results):
+            expected = calculate_hydrograph(**scenario)['summary']
+            assert result['summary']['peak_discharge_m3s'] == pytest.approx(expected['peak_discharge_m3s'])
+            assert result['summary']['total_volume_m3'] == pytest.approx(expected['total_volume_m3'])
+
+    def test_unknown_method(self):
+        """Métodos no implementados lanzan HydrographCalculationError"""
+        with pytest.raises(HydrographCalculationError, match='no implementado'):
+            calculate_hydrograph(
+                total_rainfall_mm=50.0, duration_hours=2.0, area_km2=5.0,
+                tc_minutes=45.0, method='kinematic_wave', C=0.6, P3_10=70.0, Tr=10
+            )
+
+
+class TestCalculateHydrographSynthetic:
+    """Tests para los hidrogramas unitarios sintéticos (method='synth_unit_hydro')"""
+
+    @pytest.mark.parametrize('unit_hydrograph', ['clark', 'nash', 'snyder'])
+    def test_volume_conservation(self, unit_hydrograph):
+        """El volumen del hidrograma es la lluvia efectiva × área"""
+        result = calculate_hydrograph_synthetic(
+            area_km2=20.0,
+            tc_minutes=100.0,
+            rainfall_excess_series=[2.0, 5.0, 3.0],
+            time_step_minutes=10.0,
+            unit_hydrograph=unit_hydrograph
+        )
+
+        assert result['method'] == 'synth_unit_hydro'
+        assert result['unit_hydrograph'] == unit_hydrograph
+        assert result['total_volume_m3'] == pytest.approx(10.0 * 20.0 * 1000)
+
+    def test_side_by_side_matches_individual(self):
+        """La convolución conjunta coincide con cada generador por separado"""
+        excess = np.array([[0.0, 4.0, 9.0, 2.0], [1.0, 1.0, 1.0, 0.0]])
+        params = {'nash': {'num_reservoirs': 4}}
+
+        results = calculate_synthetic_hydrographs_series(
+            area_km2=np.array([12.0, 30.0]),
+            tc_minutes=80.0,
+            rainfall_excess_series=excess,
+            time_step_minutes=5.0,
+            unit_hydrograph_params=params
+        )
+
+        assert list(results) == ['clark', 'nash', 'snyder']
+        for name, series in results.items():
+            for row, area in enumerate([12.0, 30.0]):
+                expected = calculate_hydrograph_synthetic(
+                    area, 80.0, excess[row], 5.0, unit_hydrograph=name,
+                    unit_hydrograph_params=params.get(name)
+                )
+                np.testing.assert_allclose(series.discharge_m3s[row], expected['discharge_m3s'], atol=1e-9)
+
+    def test_complete_flow(self):
+        """Flujo completo con generador y parámetros de forma"""
+        result = calculate_hydrograph(
+            total_rainfall_mm=100.0,
+            duration_hours=6.0,
+            area_km2=40.0,
+            tc_minutes=180.0,
+            method='synth_unit_hydro',
+            excess_method='scs_curve_number',
+            CN=72,
+            P3_10=75.0,
+            Tr=25,
+            unit_hydrograph='snyder',
+            unit_hydrograph_params={'peaking_coefficient': 0.7}
+        )
+
+        assert result['hydrograph']['unit_hydrograph'] == 'snyder'
+        assert result['summary']['total_volume_m3'] == pytest.approx(
+            result['summary']['rainfall_excess_mm'] * 40.0 * 1000, rel=1e-6
+        )
+
+    def test_batch_groups_by_generator(self):
+        """El motor por lotes agrupa por generador y coincide con el pipeline"""
+        scenarios = [
+            dict(total_rainfall_mm=80.0, duration_hours=4.0, area_km2=25.0, tc_minutes=120.0,
+                 method='synth_unit_hydro', C=0.5, P3_10=70.0, Tr=10,
+                 unit_hydrograph=name, unit_hydrograph_params=params)
+            for name, params in [('clark', None), ('nash', {'num_reservoirs': 2}), ('clark', {'storage_coefficient_minutes': 60})]
+        ]
+
+        results = calculate_hydrographs_batch(scenarios)
+
+        for scenario, result in zip(scenarios, results):
+            expected = calculate_hydrograph(**scenario)['summary']
+            assert result['summary']['peak_discharge_m3s'] == pytest.approx(expected['peak_discharge_m3s'])
+
+    @pytest.mark.parametrize('method', ['rational', 'scs_unit_hydrograph', 'synth_unit_hydro'])
+    def test_tc_per_scenario(self, method):
+        """Tc por escenario coincide con la transformación de cada fila por separado"""
+        excess = np.array([[0.0, 4.0, 9.0, 2.0], [1.0, 1.0, 1.0, 0.0], [3.0, 0.0, 0.0, 5.0]])
+        tc = np.array([40.0, 95.0, 40.0])
+
+        stacked = transform_rainfall_excess_series(excess, 12.0, tc, 5.0, method=method)
+
+        for row in range(3):
+            expected = transform_rainfall_excess_series(excess[row], 12.0, tc[row], 5.0, method=method)
+            length = expected.discharge_m3s.size
+            np.testing.assert_allclose(stacked.discharge_m3s[row, :length], expected.discharge_m3s, atol=1e-12)
+            np.testing.assert_allclose(stacked.discharge_m3s[row, length:], 0.0, atol=1e-12)
+            assert stacked.peak_discharge_m3s[row] == pytest.approx(expected.peak_discharge_m3s)
+
+    def test_invalid_generator(self):
+        """Generador desconocido lanza HydrographCalculationError"""
+        with pytest.raises(HydrographCalculationError, match='no soportado'):
+            calculate_hydrograph(
+                total_rainfall_mm=50.0, duration_hours=2.0, area_km2=5.0, tc_minutes=45.0,
+                method='synth_unit_hydro', C=0.6, P3_10=70.0, Tr=10, unit_hydrograph='espey'
+            )
@@ -0,0 +1,96 @@
+"""
+Tests para el servicio de generación de hietogramas
+
+Verifica el arreglo vectorizado de bloques alternados contra el algoritmo
+escalar original (alternancia izquierda/derecha elemento a elemento).
+"""
+
+import numpy as np
+import pytest
+
+from hydrology.services.hyetograph import (
+    arrange_alternating_blocks,
+    calculate_peak_index,
+    generate_hyetograph_alternating_block,
+)
+
+
+def _scalar_alternating_blocks(increments, peak_index):
+    """Arreglo de bloques alternados escalar (implementación original)"""
+    sorted_increments = sorted(increments, reverse=True)
+    pattern = [0] * len(increments)
+    pattern[peak_index] = sorted_increments[0]
+    left_index, right_index, increment_idx = peak_index - 1, peak_index + 1, 1
+
+    while increment_idx < len(sorted_increments):
+        if left_index >= 0 and increment_idx < len(sorted_increments):
+            pattern[left_index] = sorted_increments[increment_idx]
+            left_index -= 1
+            increment_idx += 1
+        if right_index < len(increments) and increment_idx < len(sorted_increments):
+            pattern[right_index] = sorted_increments[increment_idx]
+            right_index += 1
+            increment_idx += 1
+
+    return pattern
+
+
+class TestArrangeAlternatingBlocks:
+    """Tests para arrange_alternating_blocks"""
+
+    @pytest.mark.parametrize('num_intervals', [1, 2, 7, 24, 145])
+    @pytest.mark.parametrize('ratio', [0.0, 0.3, 0.5, 0.7, 0.99])
+    def test_matches_scalar_reference(self, num_intervals, ratio):
+        """El arreglo vectorizado reproduce el algoritmo escalar"""
+        rng = np.random.default_rng(num_intervals)
+        increments = rng.uniform(0, 10, num_intervals)
+        peak_index = int(calculate_peak_index(num_intervals, ratio))
+
+        result = arrange_alternating_blocks(increments, peak_index)
+
+        assert result.tolist() == _scalar_alternating_blocks(increments.tolist(), peak_index)
+
+    def test_rows_with_different_peaks(self):
+        """Cada fila de una matriz usa su propio índice de pico"""
+        increments = np.tile(np.arange(1.0, 11.0), (3, 1))
+        peak_index = calculate_peak_index(10, np.array([0.0, 0.5, 0.9]))
+
+        result = arrange_alternating_blocks(increments, peak_index)
+
+        assert np.argmax(result, axis=1).tolist() == [0, 5, 9]
+        for row, peak in zip(result, peak_index):
+            assert row.tolist() == _scalar_alternating_blocks(list(range(1, 11)), int(peak))
+
+
+class TestGenerateHyetographAlternatingBlock:
+    """Tests para generate_hyetograph_alternating_block"""
+
+    def test_peak_at_end(self):
+        """peak_position_ratio = 1.0 coloca el pico en el último intervalo"""
+        result = generate_hyetograph_alternating_block(
+            total_rainfall_mm=50.0,
+            duration_hours=2.0,
+            P3_10=70,
+            Tr=10,
+            time_step_minutes=10,
+            peak_position_ratio=1.0
+        )
+
+        assert result['peak_index'] == 11
+        assert result['peak_time_minutes'] == 120
+
+    def test_total_and_cumulative(self):
+        """El total se ajusta a total_rainfall_mm y el acumulado es creciente"""
+        result = generate_hyetograph_alternating_block(
+            total_rainfall_mm=80.0,
+            duration_hours=24.0,
+            P3_10=75,
+            Tr=25,
+            area_km2=12.0,
+            time_step_minutes=1,
+            peak_position_ratio=0.4
+        )
+
+        assert len(result['rainfall_mm']) == 1441
+        assert result['cumulative_mm'][-1] == pytest.approx(80.0)
+        assert np.all(np.diff(result['cumulative_mm']) >= 0)
@@ -0,0 +1,126 @@
+"""
+Tests para el modelo de red de drenaje (subcuencas, tramos, confluencias)
+"""
+
+import numpy as np
+import pytest
+
+from hydrology.services import (
+    DrainageNetwork,
+    calculate_hydrograph_series,
+    route_muskingum,
+)
+
+
+def _subbasin(name, downstream, area_km2=3.0, tc_minutes=40.0, C=0.6):
+    """Subcuenca con tormenta de diseño IDF"""
+    return dict(name=name, kind='subbasin', downstream=downstream, params=dict(
+        total_rainfall_mm=60.0, duration_hours=2.0, area_km2=area_km2,
+        tc_minutes=tc_minutes, C=C, P3_10=70.0, Tr=10
+    ))
+
+
+def _network():
+    """SC-1 + SC-2 → J-1 → T-1 → OUT ← SC-3"""
+    return DrainageNetwork([
+        _subbasin('SC-1', 'J-1'),
+        _subbasin('SC-2', 'J-1', area_km2=5.0, tc_minutes=60.0),
+        dict(name='J-1', kind='junction', downstream='T-1'),
+        dict(name='T-1', kind='reach', downstream='OUT',
+             params=dict(method='muskingum', K_minutes=30.0, X=0.2)),
+        _subbasin('SC-3', 'OUT', area_km2=2.0, tc_minutes=25.0),
+        dict(name='OUT', kind='junction'),
+    ])
+
+
+class TestDrainageNetwork:
+    """Tests para DrainageNetwork"""
+
+    def test_topological_order(self):
+        """Cada elemento se evalúa después de sus aportes"""
+        network = _network()
+        position = {name: i for i, name in enumerate(network.order)}
+
+        assert network.outlets == ['OUT']
+        for name, upstream in network.upstream.items():
+            assert all(position[u] < position[name] for u in upstream)
+
+    def test_subbasins_match_pipeline(self):
+        """Las subcuencas coinciden con calculate_hydrograph() con el Δt común"""
+        result = _network().compute(time_step_minutes=5.0, max_workers=1)
+
+        expected = calculate_hydrograph_series(
+            total_rainfall_mm=60.0, duration_hours=2.0, area_km2=5.0, tc_minutes=60.0,
+            C=0.6, P3_10=70.0, Tr=10, time_step_minutes=5.0
+        ).hydrograph.discharge_m3s
+        np.testing.assert_allclose(result.hydrograph('SC-2')[:expected.size], expected, atol=1e-9)
+
+    def test_subbasin_unit_hydrograph_params(self):
+        """Subcuenca con hidrograma unitario sintético y parámetros de forma"""
+        params = dict(
+            total_rainfall_mm=60.0, duration_hours=2.0, area_km2=3.0, tc_minutes=40.0, C=0.6, P3_10=70.0, Tr=10,
+            method='synth_unit_hydro', unit_hydrograph='nash', unit_hydrograph_params={'num_reservoirs': 3}
+        )
+        network = DrainageNetwork([
+            dict(name='SC-1', kind='subbasin', downstream='OUT', params=params),
+            dict(name='OUT', kind='junction'),
+        ])
+
+        result = network.compute(time_step_minutes=5.0, max_workers=1)
+
+        expected = calculate_hydrograph_series(**params, time_step_minutes=5.0).hydrograph.discharge_m3s
+        np.testing.assert_allclose(result.hydrograph('SC-1')[:expected.size], expected, atol=1e-9)
+
+    def test_junctions_and_reaches(self):
+        """Las confluencias suman sus aportes y los tramos transitan su único aporte"""
+        result = _network().compute(time_step_minutes=5.0, max_workers=1)
+
+        np.testing.assert_allclose(result.hydrograph('J-1'), result.hydrograph('SC-1') + result.hydrograph('SC-2'))
+        routed = route_muskingum(result.hydrograph('J-1'), 5.0, K_minutes=30.0, X=0.2).outflow_m3s
+        np.testing.assert_allclose(result.hydrograph('T-1'), routed[:result.discharge_m3s.shape[-1]])
+        np.testing.assert_allclose(result.hydrograph('OUT'), result.hydrograph('T-1') + result.hydrograph('SC-3'))
+
+    def test_concurrent_matches_sequential(self):
+        """La evaluación en paralelo de ramas independientes da el mismo resultado"""
+        sequential = _network().compute(max_workers=1)
+        concurrent = _network().compute(max_workers=4)
+
+        np.testing.assert_array_equal(sequential.discharge_m3s, concurrent.discharge_m3s)
+
+    def test_large_network_conserves_volume(self):
+        """Red de 120 subcuencas: el volumen en la salida es la suma de los aportes"""
+        rng = np.random.default_rng(3)
+        elements = [dict(name='OUT', kind='junction')]
+        junctions = ['OUT']
+        for i in range(40):
+            junction = f'J-{i}'
+            elements.append(dict(name=f'T-{i}', kind='reach', downstream=junctions[rng.integers(len(junctions))],
+                                 params=dict(method='muskingum', K_minutes=float(rng.uniform(10, 40)), X=0.2)))
+            elements.append(dict(name=junction, kind='junction', downstream=f'T-{i}'))
+            junctions.append(junction)
+        for i in range(120):
+            elements.append(_subbasin(f'SC-{i}', junctions[1 + i % 40],
+                                      area_km2=float(rng.uniform(0.5, 5)), tc_minutes=float(rng.uniform(15, 90))))
+
+        result = DrainageNetwork(elements).compute(time_step_minutes=5.0, horizon_hours=48.0, max_workers=4)
+
+        volumes = result.total_volume_m3
+        inflow_volume = sum(volumes[f'SC-{i}'] for i in range(120))
+        assert result.discharge_m3s.shape == (len(elements), 577)
+        assert volumes['OUT'] == pytest.approx(inflow_volume, rel=1e-3)
+        assert result.to_dict()['elements'][0]['name'] == 'OUT'
+
+    @pytest.mark.parametrize('elements, match', [
+        ([_subbasin('A', 'B'), _subbasin('A', None)], 'repetido'),
+        ([_subbasin('A', 'X')], 'inexistente'),
+        ([_subbasin('A', 'B'), _subbasin('B', None)], 'no puede recibir aportes'),
+        ([_subbasin('A', 'T'), _subbasin('B', 'T'), dict(name='T', kind='reach')], 'exactamente un aporte'),
+        ([dict(name='J', kind='junction')], 'sin aportes'),
+        ([_subbasin('A', 'J1'), dict(name='J1', kind='junction', downstream='J2'),
+          dict(name='J2', kind='junction', downstream='J1')], 'ciclo'),
+        ([dict(name='P', kind='pump')], 'no soportado'),
+    ])
+    def test_invalid_topology(self, elements, match):
+        """Topologías inválidas lanzan ValueError"""
+        with pytest.raises(ValueError, match=match):
+            DrainageNetwork(elements)
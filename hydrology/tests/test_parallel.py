@@ -0,0 +1,111 @@
+"""
+Tests para el ejecutor paralelo de escenarios
+
+Verifica que el reparto en bloques entre procesos conserva el orden de
+entrada y reproduce el motor por lotes.
+"""
+
+import pytest
+
+from hydrology.services import (
+    calculate_hydrographs_batch,
+    calculate_hydrographs_parallel,
+)
+from hydrology.services.parallel import resolve_worker_count
+
+
+def _scenarios():
+    """Escenarios intercalados (grupos distintos alternados en la entrada)"""
+    return [
+        dict(
+            total_rainfall_mm=40.0 + Tr,
+            duration_hours=duration,
+            area_km2=5.0,
+            tc_minutes=tc,
+            excess_method=excess_method,
+            C=0.6,
+            CN=75,
+            P3_10=70.0,
+            Tr=Tr
+        )
+        for Tr in (5, 25, 100)
+        for tc in (30.0, 60.0)
+        for duration in (2.0, 1.0)
+        for excess_method in ('scs_curve_number', 'rational')
+    ]
+
+
+class TestCalculateHydrographsParallel:
+    """Tests para calculate_hydrographs_parallel"""
+
+    @pytest.mark.parametrize('max_workers, chunk_size', [(1, None), (1, 5), (2, 4)])
+    def test_matches_batch_in_input_order(self, max_workers, chunk_size):
+        """El resultado no depende de procesos ni de tamaño de bloque"""
+        scenarios = _scenarios()
+
+        results = calculate_hydrographs_parallel(
+            scenarios, max_workers=max_workers, chunk_size=chunk_size
+        )
+
+        assert results == calculate_hydrographs_batch(scenarios)
+
+    def test_include_series(self):
+        """Las series de cada escenario vuelven de los procesos"""
+        scenarios = _scenarios()[:6]
+
+        results = calculate_hydrographs_parallel(
+            scenarios, max_workers=2, chunk_size=2, include_series=True
+        )
+
+        for result in results:
+            assert result['series'].summary()['peak_discharge_m3s'] == pytest.approx(
+                result['summary']['peak_discharge_m3s']
+            )
+
+    def test_unit_hydrograph_params(self):
+        """Los escenarios ya normalizados conservan los parámetros de forma"""
+        scenarios = [
+            dict(scenario, method='synth_unit_hydro', unit_hydrograph='nash',
+                 unit_hydrograph_params={'num_reservoirs': num_reservoirs})
+            for scenario in _scenarios()[:4]
+            for num_reservoirs in (2, 3)
+        ]
+
+        results = calculate_hydrographs_parallel(scenarios, max_workers=2, chunk_size=3)
+
+        assert results == calculate_hydrographs_batch(scenarios)
+        assert results[0] != results[1]
+
+    def test_invalid_scenario_rejected_before_dispatch(self):
+        """Los escenarios se validan en el proceso principal"""
+        scenarios = _scenarios() + [dict(total_rainfall_mm=50.0, duration_hours=2.0)]
+
+        with pytest.raises(ValueError, match='Escenario 24'):
+            calculate_hydrographs_parallel(scenarios, max_workers=2)
+
+    def test_invalid_chunk_size(self):
+        """chunk_size <= 0 lanza ValueError"""
+        with pytest.raises(ValueError, match='chunk_size'):
+            calculate_hydrographs_parallel(_scenarios(), chunk_size=0)
+
+
+class TestResolveWorkerCount:
+    """Tests para resolve_worker_count"""
+
+    def test_explicit(self):
+        """max_workers explícito tiene prioridad"""
+        assert resolve_worker_count(3) == 3
+
+    def test_setting(self, settings):
+        """Sin max_workers se usa HYDROLOGY_MAX_WORKERS"""
+        settings.HYDROLOGY_MAX_WORKERS = 6
+        assert resolve_worker_count() == 6
+
+    def test_zero_uses_cpus(self):
+        """0 = un proceso por CPU"""
+        assert resolve_worker_count(0) >= 1
+
+    def test_negative(self):
+        """Valores negativos lanzan ValueError"""
+        with pytest.raises(ValueError):
+            resolve_worker_count(-1)
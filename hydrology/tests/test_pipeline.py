@@ -0,0 +1,96 @@
+"""
+Tests para el pipeline por etapas con caché por fingerprint
+"""
+
+import numpy as np
+import pytest
+
+from hydrology.services import (
+    calculate_hydrograph_series,
+    clear_pipeline_caches,
+    pipeline_cache_info,
+    stage_fingerprint,
+    HydrographCalculationError,
+    PipelineStage,
+)
+
+
+SCENARIO = dict(
+    total_rainfall_mm=60, duration_hours=2, area_km2=5.2, tc_minutes=45,
+    method='scs_unit_hydrograph', excess_method='scs_curve_number', CN=75, P3_10=70, Tr=25
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    clear_pipeline_caches()
+    yield
+    clear_pipeline_caches()
+
+
+def _misses():
+    return {name: info['misses'] for name, info in pipeline_cache_info().items()}
+
+
+class TestStageFingerprint:
+
+    def test_canonical_numbers(self):
+        stage = PipelineStage('excess', ('C', 'CN'))
+
+        assert stage_fingerprint(stage, {'C': 1, 'CN': 75}) == stage_fingerprint(stage, {'C': 1.0, 'CN': np.int64(75)})
+        assert stage_fingerprint(stage, {'C': 1, 'CN': 75}) != stage_fingerprint(stage, {'C': 1, 'CN': 76})
+
+    def test_ignores_undeclared_inputs_and_chains_upstream(self):
+        stage = PipelineStage('excess', ('C',), upstream='hyetograph')
+        fingerprint = stage_fingerprint(stage, {'C': 0.5, 'tc_minutes': 30}, 'abc')
+
+        assert fingerprint == stage_fingerprint(stage, {'C': 0.5, 'tc_minutes': 60}, 'abc')
+        assert fingerprint != stage_fingerprint(stage, {'C': 0.5}, 'abd')
+
+
+class TestIncrementalRecompute:
+
+    def test_edit_curve_number_reuses_hyetograph(self):
+        first = calculate_hydrograph_series(**SCENARIO)
+        second = calculate_hydrograph_series(**dict(SCENARIO, CN=80))
+
+        assert _misses() == {'hyetograph': 1, 'excess': 2, 'transform': 2, 'summary': 2}
+        assert second.hyetograph is first.hyetograph
+        assert second.fingerprints['hyetograph'] == first.fingerprints['hyetograph']
+        assert second.fingerprints['excess'] != first.fingerprints['excess']
+
+    def test_edit_tc_with_fixed_time_step_reuses_excess(self):
+        first = calculate_hydrograph_series(**SCENARIO, time_step_minutes=5)
+        second = calculate_hydrograph_series(**dict(SCENARIO, tc_minutes=60), time_step_minutes=5)
+
+        assert _misses() == {'hyetograph': 1, 'excess': 1, 'transform': 2, 'summary': 2}
+        assert second.rainfall_excess is first.rainfall_excess
+        assert second.hydrograph.peak_discharge_m3s != first.hydrograph.peak_discharge_m3s
+
+    def test_repeated_call_hits_every_stage(self):
+        first = calculate_hydrograph_series(**SCENARIO)
+        second = calculate_hydrograph_series(**SCENARIO)
+
+        assert second is first
+        assert all(info['hits'] == 1 for info in pipeline_cache_info().values())
+
+
+class TestCachedResults:
+
+    def test_matches_uncached_and_read_only(self):
+        cached = calculate_hydrograph_series(**SCENARIO)
+        uncached = calculate_hydrograph_series(**SCENARIO, use_cache=False)
+
+        assert cached.to_dict() == uncached.to_dict()
+        assert cached.fingerprints == uncached.fingerprints
+        with pytest.raises(ValueError, match="read-only"):
+            cached.hydrograph.discharge_m3s[0] = 1.0
+
+    def test_errors_are_not_cached(self):
+        scenario = dict(SCENARIO, excess_method='rational', C=1.5)
+
+        for _ in range(2):
+            with pytest.raises(HydrographCalculationError, match="lluvia efectiva"):
+                calculate_hydrograph_series(**scenario)
+
+        assert pipeline_cache_info()['excess']['currsize'] == 0
@@ -0,0 +1,173 @@
+"""
+Tests para la codificación compacta de registros de lluvia
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from hydrology.models import RainfallData
+from hydrology.services import (
+    decode_rainfall,
+    decode_rainfall_window,
+    encode_rainfall,
+    encode_rainfall_records,
+    rainfall_header,
+)
+
+
+@pytest.fixture(scope='module')
+def gauge_depths():
+    """Un año de lluvia a paso de 5 minutos (intermitente, lámina en mm)"""
+    rng = np.random.default_rng(7)
+    wet = rng.random(105_120) < 0.08
+    return np.where(wet, np.round(rng.gamma(0.6, 1.5, wet.size), 1), 0.0)
+
+
+@pytest.fixture(scope='module')
+def gauge_intensity(gauge_depths):
+    """Intensidad [mm/h] del registro de 5 minutos"""
+    return gauge_depths * 12
+
+
+class TestEncodeRainfall:
+
+    def test_round_trip_without_drift(self, gauge_depths, gauge_intensity):
+        data = encode_rainfall(gauge_intensity, start_min=0.0, time_step_minutes=5.0, initial_cumulative_mm=2.5)
+        record = decode_rainfall(data)
+
+        assert len(record) == len(gauge_depths)
+        assert record.time_step_minutes == 5.0 and record.time_min[0] == 5.0
+        np.testing.assert_allclose(record.intensity_mm_h, gauge_intensity, atol=1e-9)
+        np.testing.assert_allclose(record.cumulative_mm, 2.5 + np.cumsum(gauge_depths), atol=1e-6)
+
+    def test_intensity_quantum(self):
+        record = decode_rainfall(encode_rainfall([12.3456, 0.0004, 7.0], 0.0, 10.0))
+
+        np.testing.assert_allclose(record.intensity_mm_h, [12.346, 0.0, 7.0])
+        np.testing.assert_allclose(record.depths_mm, np.array([12.346, 0.0, 7.0]) / 6)
+
+    def test_size_against_json(self, gauge_intensity):
+        records = decode_rainfall(encode_rainfall(gauge_intensity, 0.0, 5.0)).to_records()
+        data = encode_rainfall_records(records)
+
+        assert len(json.dumps(records)) > 7_000_000
+        assert len(data) < 40_000
+
+    def test_slice_matches_full_decode(self, gauge_intensity):
+        data = encode_rainfall(gauge_intensity, start_min=60.0, time_step_minutes=5.0, block_size=1000)
+        full = decode_rainfall(data)
+        window = decode_rainfall(data, 2_500, 7_300)
+
+        assert window.start_min == 60.0 + 2_500 * 5.0
+        np.testing.assert_array_equal(window.depths_mm, full.depths_mm[2_500:7_300])
+        np.testing.assert_allclose(window.cumulative_mm, full.cumulative_mm[2_500:7_300])
+        assert len(decode_rainfall(data, 200_000)) == 0
+
+    def test_time_window(self, gauge_intensity):
+        data = encode_rainfall(gauge_intensity[:1000], start_min=0.0, time_step_minutes=5.0)
+        window = decode_rainfall_window(data, 102.0, 130.0)
+
+        np.testing.assert_array_equal(window.time_min, [105.0, 110.0, 115.0, 120.0, 125.0, 130.0])
+        assert rainfall_header(data).end_min == 5000.0
+
+    def test_invalid_data(self):
+        with pytest.raises(ValueError, match="magic"):
+            decode_rainfall(b'X' * 64)
+        with pytest.raises(ValueError, match="no negativo"):
+            encode_rainfall([1.0, -0.5], 0.0, 5.0)
+        with pytest.raises(ValueError, match="time_step_minutes"):
+            encode_rainfall([1.0], 0.0, 0.0)
+
+
+class TestRainfallRecords:
+
+    def test_records_round_trip(self):
+        records = [
+            {'time_min': 10.0 * (k + 1), 'intensity_mm_h': 6.0 * (k % 4), 'cumulative_mm': sum(j % 4 for j in range(k + 1))}
+            for k in range(30)
+        ]
+
+        assert decode_rainfall(encode_rainfall_records(records)).to_records() == records
+
+    def test_intensity_is_stored(self):
+        records = [
+            {'time_min': 5.0, 'intensity_mm_h': 0.0},
+            {'time_min': 10.0, 'intensity_mm_h': 10.0},
+            {'time_min': 15.0, 'intensity_mm_h': 20.5},
+        ]
+
+        assert decode_rainfall(encode_rainfall_records(records)).to_records() == [
+            {'time_min': 5.0, 'intensity_mm_h': 0.0, 'cumulative_mm': 0.0},
+            {'time_min': 10.0, 'intensity_mm_h': 10.0, 'cumulative_mm': 0.833333},
+            {'time_min': 15.0, 'intensity_mm_h': 20.5, 'cumulative_mm': 2.541667},
+        ]
+
+    def test_long_full_precision_record(self):
+        """30 días a 5 min con floats sin redondear: se codifica (la deriva de cuantizar se acepta)"""
+        rng = np.random.default_rng(11)
+        intensity = np.where(rng.random(8640) < 0.1, rng.gamma(0.6, 15.0, 8640), 0.0)
+        cumulative = 3.7 + np.cumsum(intensity * 5 / 60)
+        records = [
+            {'time_min': 5.0 * (k + 1), 'intensity_mm_h': float(i), 'cumulative_mm': float(c)}
+            for k, (i, c) in enumerate(zip(intensity, cumulative))
+        ]
+
+        record = decode_rainfall(encode_rainfall_records(records))
+
+        np.testing.assert_allclose(record.intensity_mm_h, intensity, rtol=0, atol=0.0005 + 1e-9)
+        np.testing.assert_allclose(record.cumulative_mm, cumulative, rtol=0, atol=8640 * 0.0005 * 5 / 60)
+
+    @pytest.mark.parametrize('decimals', [2, 1])
+    def test_rounded_cumulative(self, decimals):
+        """cumulative_mm redondeada a 0.01 o 0.1 mm se codifica"""
+        intensity = np.array([0.0, 3.7, 11.3, 25.9, 8.1, 4.4, 0.0, 1.3, 6.2, 0.0, 2.5, 0.9])
+        cumulative = np.round(np.cumsum(intensity * 5 / 60), decimals)
+        records = [
+            {'time_min': 5.0 * (k + 1), 'intensity_mm_h': float(i), 'cumulative_mm': float(c)}
+            for k, (i, c) in enumerate(zip(intensity, cumulative))
+        ]
+
+        record = decode_rainfall(encode_rainfall_records(records))
+
+        np.testing.assert_allclose(record.intensity_mm_h, intensity, atol=1e-9)
+        np.testing.assert_allclose(record.cumulative_mm, cumulative, atol=10.0 ** -decimals)
+
+    def test_inconsistent_series_stay_json(self):
+        records = [
+            {'time_min': 5.0, 'intensity_mm_h': 0.0, 'cumulative_mm': 0.0},
+            {'time_min': 10.0, 'intensity_mm_h': 10.0, 'cumulative_mm': 0.5},
+            {'time_min': 15.0, 'intensity_mm_h': 20.0, 'cumulative_mm': 1.8},
+        ]
+        rain = RainfallData(rainfall_series=records)
+        rain.records = records
+
+        assert encode_rainfall_records(records) is None
+        assert rain.rainfall_encoded is None and rain.records == records
+
+    def test_irregular_series_stay_json(self):
+        records = [
+            {'time_min': 0.0, 'intensity_mm_h': 0.0, 'cumulative_mm': 0.0},
+            {'time_min': 10.0, 'intensity_mm_h': 6.0, 'cumulative_mm': 1.0},
+            {'time_min': 25.0, 'intensity_mm_h': 4.0, 'cumulative_mm': 2.0},
+        ]
+        rain = RainfallData(rainfall_series=records)
+        rain.records = records
+
+        assert encode_rainfall_records(records) is None
+        assert rain.rainfall_encoded is None and rain.records == records
+        assert rain.rainfall is None
+
+    def test_model_accessors(self, gauge_intensity):
+        records = decode_rainfall(encode_rainfall(gauge_intensity[:500], 0.0, 5.0)).to_records()
+        rain = RainfallData(rainfall_series=records)
+
+        # Registro sin convertir: se lee desde el JSON anterior
+        assert len(rain.rainfall) == 500
+
+        rain.records = records
+        assert rain.rainfall_series is None
+        assert rain.records == records
+        window = rain.rainfall_window(1000.0, 1100.0)
+        np.testing.assert_allclose(window.cumulative_mm, [point['cumulative_mm'] for point in records[200:220]])
@@ -2,10 +2,13 @@
 Tests para el servicio de cálculo de lluvia efectiva
 """
 
+import numpy as np
 import pytest
 from hydrology.services.rainfall_excess import (
     calculate_rainfall_excess_rational,
+    calculate_rainfall_excess_rational_series,
     calculate_rainfall_excess_scs,
+    calculate_rainfall_excess_scs_series,
     calculate_rainfall_excess,
     RainfallExcessError
 )
@@ -138,6 +141,58 @@ class TestRainfallExcessSCS:
         assert all(cumulative[i] <= cumulative[i+1] for i in range(len(cumulative)-1))
 
 
+class TestRainfallExcessVectorized:
+    """Tests para las variantes vectorizadas (matrices de tormentas, barridos de CN/C)"""
+
+    def test_scs_matrix_of_storms(self):
+        """Cada fila de una matriz de lluvias coincide con el cálculo individual"""
+        storms = np.array([
+            [0.0, 5.0, 10.0, 8.0, 4.0],
+            [0.0, 1.0, 1.0, 1.0, 1.0],
+            [0.0, 20.0, 30.0, 5.0, 0.0],
+        ])
+        result = calculate_rainfall_excess_scs_series(storms, CN=80)
+
+        assert result.excess_mm.shape == (3, 5)
+        for row, storm in zip(result.excess_mm, storms):
+            expected = calculate_rainfall_excess_scs(storm.tolist(), CN=80)
+            np.testing.assert_allclose(row, expected['excess_series'], atol=1e-12)
+
+    def test_scs_curve_number_sweep(self):
+        """Un barrido de CN se evalúa en una sola pasada"""
+        rainfall = np.array([0.0, 5.0, 10.0, 8.0, 4.0, 12.0])
+        curve_numbers = np.arange(60, 100)
+        result = calculate_rainfall_excess_scs_series(rainfall, CN=curve_numbers)
+
+        totals = result.total_excess_mm
+        assert totals.shape == (40,)
+        assert np.all(np.diff(totals) > 0)  # Más escorrentía con mayor CN
+        assert totals[15] == pytest.approx(
+            calculate_rainfall_excess_scs(rainfall.tolist(), CN=75)['total_excess_mm']
+        )
+
+    def test_scs_storms_by_curve_numbers(self):
+        """CN (m, 1) × tormentas (s, n) produce (m, s, n)"""
+        storms = np.full((4, 10), 3.0)
+        result = calculate_rainfall_excess_scs_series(storms, CN=np.array([[70], [80], [90]]))
+
+        assert result.excess_mm.shape == (3, 4, 10)
+        assert result.cumulative_excess_mm[..., -1] == pytest.approx(result.excess_mm.sum(axis=-1))
+
+    def test_rational_c_sweep(self):
+        """Un barrido de C escala la lluvia de cada escenario"""
+        rainfall = np.array([2.0, 3.0, 2.0])
+        result = calculate_rainfall_excess_rational_series(rainfall, C=np.array([0.2, 0.5, 0.9]))
+
+        np.testing.assert_allclose(result.total_excess_mm, [1.4, 3.5, 6.3])
+        np.testing.assert_allclose(result.runoff_coefficient, [0.2, 0.5, 0.9])
+
+    def test_invalid_cn_in_sweep(self):
+        """Un solo CN fuera de rango invalida el barrido"""
+        with pytest.raises(ValueError, match="CN debe estar entre 30-100"):
+            calculate_rainfall_excess_scs_series([5.0, 5.0], CN=[80, 110])
+
+
 class TestRainfallExcessWrapper:
     """Tests para la función wrapper calculate_rainfall_excess"""
 
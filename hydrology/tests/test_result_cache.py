@@ -0,0 +1,141 @@
+"""
+Tests para la caché de resultados por contenido de calculate_hydrograph()
+"""
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from hydrology.services import (
+    cached_hydrograph_series,
+    calculate_hydrograph,
+    configure_result_cache,
+    hydrograph_cache_key,
+    result_cache_info,
+    ResultCache,
+)
+from hydrology.services import result_cache
+
+
+SCENARIO = dict(total_rainfall_mm=60, duration_hours=2, area_km2=5.2, tc_minutes=45, C=0.6, P3_10=70, Tr=25)
+
+
+@pytest.fixture
+def shared_backend():
+    backend = LocMemCache('hydrograph-results', {})
+    previous = result_cache.RESULT_CACHE.backend
+    configure_result_cache(backend=backend)
+    yield backend
+    configure_result_cache(backend=previous)
+
+
+class BrokenBackend:
+
+    def get(self, key):
+        raise ConnectionError("backend caído")
+
+    def set(self, key, value, timeout=None):
+        raise ConnectionError("backend caído")
+
+
+class TestCacheKey:
+
+    def test_canonical_and_versioned(self):
+        key = hydrograph_cache_key(dict(SCENARIO, time_step_minutes=10))
+
+        assert key.startswith(f'hydrocal:hydrograph:v{result_cache.RESULT_CACHE_VERSION}:')
+        assert key == hydrograph_cache_key(dict(SCENARIO, time_step_minutes=10.0, area_km2=5.2))
+        assert key != hydrograph_cache_key(dict(SCENARIO, time_step_minutes=5))
+        assert key != hydrograph_cache_key(dict(SCENARIO, time_step_minutes=10), version=0)
+
+
+class TestResultCache:
+
+    def test_size_based_eviction(self):
+        value = {'discharge_m3s': list(range(100))}
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        cache = ResultCache(max_entries=10, max_bytes=2 * size)
+
+        for key in 'abc':
+            cache.set(key, value)
+        cache.get('b')
+        cache.set('d', value)
+
+        info = cache.cache_info()
+        assert info['currsize'] == 2 and info['currbytes'] == 2 * size
+        assert info['evictions'] == 2
+        assert cache.get('a') is None and cache.get('b') == value
+
+    def test_entry_limit_and_copies(self):
+        cache = ResultCache(max_entries=1)
+        cache.set('a', {'peak': [1.0]})
+        cache.get('a')['peak'].append(2.0)
+        cache.set('b', {'peak': [3.0]})
+
+        assert cache.get('a') is None
+        assert cache.get('b') == {'peak': [3.0]}
+
+    def test_backend_errors_do_not_break(self):
+        cache = ResultCache(backend=BrokenBackend())
+
+        assert cache.get_or_compute('a', lambda: {'q': 1}) == {'q': 1}
+        assert cache.get('a') == {'q': 1}
+        assert cache.cache_info()['backend_errors'] == 2
+
+    def test_counters_under_concurrency(self):
+        cache = ResultCache(backend=BrokenBackend())
+        cache.set('a', {'q': 1})
+
+        def lookups(_):
+            for _ in range(500):
+                cache.get('a')
+                cache.get('b')
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lookups, range(8)))
+
+        info = cache.cache_info()
+        assert info['hits'] == info['misses'] == 4000
+        assert info['backend_errors'] == 4001
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError, match="Límites"):
+            ResultCache(max_entries=-1)
+
+
+class TestCalculateHydrographCache:
+
+    def test_auto_time_step_shares_entry(self, shared_backend):
+        first = calculate_hydrograph(**SCENARIO)
+        first['summary']['peak_discharge_m3s'] = -1.0
+        second = calculate_hydrograph(**SCENARIO, time_step_minutes=10)
+
+        assert result_cache_info()['hits'] == 1
+        assert second == calculate_hydrograph(**SCENARIO, use_cache=False)
+
+    def test_series_entry_point_shares_entry(self, shared_backend):
+        expected = calculate_hydrograph(**SCENARIO)
+        result = cached_hydrograph_series(**SCENARIO)
+
+        assert result_cache_info()['hits'] == 1
+        assert result.to_dict() == expected
+        assert not result.hydrograph.discharge_m3s.flags.writeable
+
+    def test_backend_tier_shared_between_processes(self, shared_backend):
+        expected = calculate_hydrograph(**SCENARIO)
+        configure_result_cache(backend=shared_backend)  # proceso "nuevo": nivel en proceso vacío
+
+        assert calculate_hydrograph(**SCENARIO) == expected
+        assert result_cache_info()['backend_hits'] == 1
+        assert result_cache_info()['misses'] == 0
+
+    def test_version_bump_invalidates(self, shared_backend, monkeypatch):
+        calculate_hydrograph(**SCENARIO)
+        configure_result_cache(backend=shared_backend)
+        monkeypatch.setattr(result_cache, 'RESULT_CACHE_VERSION', result_cache.RESULT_CACHE_VERSION + 1)
+
+        calculate_hydrograph(**SCENARIO)
+
+        assert result_cache_info()['misses'] == 1
@@ -0,0 +1,249 @@
+"""
+Tests para el tránsito de hidrogramas en cauces (Muskingum, Muskingum-Cunge)
+y en embalses (Puls modificado)
+"""
+
+import numpy as np
+import pytest
+
+from hydrology.services import (
+    muskingum_coefficients,
+    route_hydrograph,
+    route_muskingum,
+    route_modified_puls,
+    route_muskingum_cunge,
+    storage_indication_table,
+)
+
+
+def _inflow(num_intervals=200, time_step_minutes=10.0, base=10.0, peak=100.0):
+    """Hidrograma de entrada gaussiano sobre un caudal base"""
+    t = np.arange(num_intervals) * time_step_minutes
+    return base + (peak - base) * np.exp(-((t - 300) / 120) ** 2)
+
+
+def _muskingum_loop(inflow, K, X, dt, num_subreaches=1):
+    """Recurrencia de Muskingum paso a paso (implementación de referencia)"""
+    c0, c1, c2 = muskingum_coefficients(K / num_subreaches, X, dt)
+    for _ in range(num_subreaches):
+        outflow = [inflow[0]]
+        for k in range(1, len(inflow)):
+            outflow.append(c0 * inflow[k] + c1 * inflow[k - 1] + c2 * outflow[-1])
+        inflow = outflow
+    return np.array(outflow)
+
+
+class TestMuskingum:
+    """Tests para route_muskingum"""
+
+    def test_coefficients_sum_to_one(self):
+        """C0 + C1 + C2 = 1"""
+        assert sum(muskingum_coefficients(60.0, 0.2, 10.0)) == pytest.approx(1.0)
+
+    def test_matches_reference_loop(self):
+        """El filtro lineal reproduce la recurrencia paso a paso"""
+        inflow = _inflow()
+        result = route_muskingum(inflow, 10.0, K_minutes=20.0, X=0.2)
+        assert (result.num_substeps, result.num_subreaches) == (1, 1)
+
+        padded = np.concatenate([inflow, np.full(result.outflow_m3s.size - inflow.size, inflow[-1])])
+        np.testing.assert_allclose(result.outflow_m3s, _muskingum_loop(padded, 20.0, 0.2, 10.0), rtol=1e-10)
+
+    def test_subreaches_when_time_step_too_short(self):
+        """Con Δt < 2KX el tramo se divide en sub-tramos con coeficientes no negativos"""
+        inflow = _inflow()
+        result = route_muskingum(inflow, 10.0, K_minutes=60.0, X=0.2)
+
+        assert result.num_subreaches == 3
+        assert min(result.extra['coefficients']) >= 0
+        padded = np.concatenate([inflow, np.full(result.outflow_m3s.size - inflow.size, inflow[-1])])
+        np.testing.assert_allclose(
+            result.outflow_m3s, _muskingum_loop(padded, 60.0, 0.2, 10.0, num_subreaches=3), rtol=1e-10
+        )
+
+    def test_substeps_when_time_step_too_long(self):
+        """Con Δt > 2K(1-X) se usan sub-pasos sobre la entrada interpolada"""
+        fine_inflow = _inflow(num_intervals=401, time_step_minutes=5.0)
+        coarse_inflow = fine_inflow[::2]
+
+        coarse = route_muskingum(coarse_inflow, 10.0, K_minutes=5.0, X=0.2)
+        fine = route_muskingum(np.interp(np.arange(401) / 2, np.arange(201), coarse_inflow), 5.0, K_minutes=5.0, X=0.2)
+
+        assert coarse.num_substeps == 2
+        np.testing.assert_allclose(coarse.outflow_m3s[:200], fine.outflow_m3s[:400:2], rtol=1e-10)
+
+    def test_pure_translation(self):
+        """X = 0.5 y K = Δt trasladan el hidrograma un intervalo"""
+        inflow = _inflow()
+        result = route_muskingum(inflow, 10.0, K_minutes=10.0, X=0.5)
+
+        np.testing.assert_allclose(result.outflow_m3s[1:inflow.size], inflow[:-1], atol=1e-9)
+
+    def test_attenuation_and_volume(self):
+        """El pico se atenúa y retrasa, conservando el volumen"""
+        inflow = _inflow()
+        result = route_muskingum(inflow, 10.0, K_minutes=120.0, X=0.1)
+
+        assert 0 < result.peak_attenuation < 1
+        assert result.peak_lag_minutes > 0
+        assert result.outflow_m3s.sum() == pytest.approx(result.inflow_m3s.sum(), rel=1e-3)
+        assert result.outflow_m3s[0] == pytest.approx(inflow[0])
+
+    def test_rows_routed_together(self):
+        """Varias filas se transitan en una sola llamada"""
+        inflow = np.vstack([_inflow(), _inflow(peak=250.0)])
+        result = route_muskingum(inflow, 10.0, K_minutes=45.0, X=0.25)
+
+        assert result.outflow_m3s.shape[0] == 2
+        for row in range(2):
+            single = route_muskingum(inflow[row], 10.0, K_minutes=45.0, X=0.25)
+            length = min(single.outflow_m3s.size, result.outflow_m3s.shape[-1])
+            np.testing.assert_allclose(result.outflow_m3s[row, :length], single.outflow_m3s[:length])
+
+    def test_invalid_parameters(self):
+        """Parámetros inválidos lanzan ValueError"""
+        with pytest.raises(ValueError, match="X debe estar"):
+            route_muskingum(_inflow(), 10.0, K_minutes=30.0, X=0.7)
+        with pytest.raises(ValueError, match="K_minutes"):
+            route_muskingum(_inflow(), 10.0, K_minutes=0.0)
+        with pytest.raises(ValueError, match="negativos"):
+            route_muskingum([1.0, -2.0], 10.0, K_minutes=30.0)
+
+
+class TestMuskingumCunge:
+    """Tests para route_muskingum_cunge"""
+
+    REACH = dict(slope=0.001, manning_n=0.035, width_m=30.0)
+
+    def test_volume_and_travel_time(self):
+        """El pico se retrasa aproximadamente L / c y el volumen se conserva"""
+        result = route_muskingum_cunge(_inflow(), 10.0, length_m=20000.0, **self.REACH)
+
+        travel_minutes = 20000.0 / result.extra['celerity_ms'] / 60
+        assert result.extra['K_minutes'] == pytest.approx(travel_minutes)
+        assert abs(result.peak_lag_minutes - travel_minutes) <= 20.0
+        assert result.extra['X'] <= 0.5
+        assert min(result.extra['coefficients']) >= 0
+        assert result.outflow_m3s.sum() == pytest.approx(result.inflow_m3s.sum(), rel=1e-3)
+
+    def test_longer_reach_attenuates_more(self):
+        """Tramos más largos atenúan más el pico"""
+        short = route_muskingum_cunge(_inflow(), 10.0, length_m=5000.0, **self.REACH)
+        long = route_muskingum_cunge(_inflow(), 10.0, length_m=50000.0, **self.REACH)
+
+        assert long.peak_outflow_m3s < short.peak_outflow_m3s < 100.0
+
+    def test_long_time_step_uses_substeps(self):
+        """Un Δt largo respecto al tiempo de viaje se divide en sub-pasos"""
+        result = route_muskingum_cunge(_inflow(num_intervals=20, time_step_minutes=60.0), 60.0,
+                                       length_m=2000.0, slope=0.01, manning_n=0.03, width_m=10.0)
+
+        assert result.num_substeps > 1
+        assert min(result.extra['coefficients']) >= 0
+        assert result.outflow_m3s.sum() == pytest.approx(result.inflow_m3s.sum(), rel=1e-3)
+
+
+def _pond(area_m2=5000.0, max_stage_m=8.0):
+    """Laguna prismática con vertedero: S = A h, O = 2 h^1.5"""
+    stage = np.linspace(0.0, max_stage_m, 81)
+    return dict(storage_m3=area_m2 * stage, discharge_m3s=2.0 * stage ** 1.5, stage_m=stage)
+
+
+class TestModifiedPuls:
+    """Tests para route_modified_puls"""
+
+    def _inflow(self):
+        t = np.arange(300) * 5.0
+        return 1.0 + 20.0 * np.exp(-((t - 200) / 60) ** 2)
+
+    def test_matches_reference_loop(self):
+        """La búsqueda en la curva precalculada reproduce el método paso a paso"""
+        inflow = self._inflow()
+        pond = _pond()
+        result = route_modified_puls(inflow, 5.0, **pond)
+
+        storage, discharge = pond['storage_m3'], pond['discharge_m3s']
+        indication_curve = 2 * storage / 300 + discharge
+        padded = np.concatenate([inflow, np.full(result.outflow_m3s.size - inflow.size, inflow[-1])])
+        outflow = np.interp(np.interp(inflow[0], discharge, storage), storage, discharge)
+        indication = 2 * np.interp(inflow[0], discharge, storage) / 300 + outflow
+        expected = [outflow]
+        for k in range(1, padded.size):
+            indication = padded[k - 1] + padded[k] + indication - 2 * outflow
+            outflow = np.interp(indication, indication_curve, discharge)
+            expected.append(outflow)
+
+        np.testing.assert_allclose(result.outflow_m3s, expected, rtol=1e-10)
+        assert not result.extra['exceeds_table']
+
+    def test_mass_balance(self):
+        """ΔS = Δt × (Ī - Ō) en cada intervalo (regla del trapecio)"""
+        result = route_modified_puls(self._inflow(), 5.0, **_pond())
+
+        inflow, outflow, storage = result.inflow_m3s, result.outflow_m3s, result.extra['storage_m3']
+        np.testing.assert_allclose(
+            np.diff(storage),
+            300 * ((inflow[1:] + inflow[:-1]) / 2 - (outflow[1:] + outflow[:-1]) / 2),
+            atol=1e-6
+        )
+        assert result.peak_outflow_m3s < result.peak_inflow_m3s
+        assert result.extra['peak_stage_m'] == pytest.approx(result.extra['peak_storage_m3'] / 5000.0)
+
+    def test_stacked_ponds(self):
+        """Varias lagunas en una tabla (p, k) coinciden con tránsitos individuales"""
+        areas = np.array([2000.0, 5000.0, 20000.0])
+        stage = np.linspace(0.0, 8.0, 81)
+        table = storage_indication_table(areas[:, np.newaxis] * stage, np.tile(2.0 * stage ** 1.5, (3, 1)), 5.0)
+
+        result = route_modified_puls(self._inflow(), 5.0, table=table)
+
+        assert result.outflow_m3s.shape[0] == 3
+        assert np.all(np.diff(result.peak_outflow_m3s) < 0)
+        for row, area in enumerate(areas):
+            single = route_modified_puls(self._inflow(), 5.0, **_pond(area))
+            length = min(single.outflow_m3s.size, result.outflow_m3s.shape[-1])
+            np.testing.assert_allclose(result.outflow_m3s[row, :length], single.outflow_m3s[:length], rtol=1e-9)
+
+    def test_table_cached_per_pond_and_time_step(self):
+        """La curva de indicación se construye una vez por laguna y Δt"""
+        pond = _pond()
+        first = storage_indication_table(pond['storage_m3'], pond['discharge_m3s'], 5.0)
+
+        assert storage_indication_table(pond['storage_m3'].copy(), pond['discharge_m3s'], 5.0) is first
+        assert storage_indication_table(pond['storage_m3'], pond['discharge_m3s'], 10.0) is not first
+
+    def test_exceeds_table(self):
+        """Una laguna insuficiente se señala y se extrapola con el último tramo"""
+        result = route_modified_puls(self._inflow(), 5.0, **_pond(max_stage_m=2.0))
+
+        assert result.extra['exceeds_table']
+        assert result.extra['peak_stage_m'] > 2.0
+
+    def test_invalid_table(self):
+        """Tablas inválidas o con otro Δt lanzan ValueError"""
+        with pytest.raises(ValueError, match="estrictamente creciente"):
+            storage_indication_table([0.0, 10.0, 5.0], [0.0, 1.0, 2.0], 5.0)
+        with pytest.raises(ValueError, match="no decreciente"):
+            storage_indication_table([0.0, 10.0, 20.0], [0.0, 2.0, 1.0], 5.0)
+        table = storage_indication_table([0.0, 10.0, 20.0], [0.0, 1.0, 2.0], 5.0)
+        with pytest.raises(ValueError, match="Δt"):
+            route_modified_puls(self._inflow(), 10.0, table=table)
+
+
+class TestRouteHydrograph:
+    """Tests para route_hydrograph"""
+
+    def test_dispatch(self):
+        """Despacha al método indicado con los parámetros del tramo"""
+        result = route_hydrograph(_inflow(), 10.0, method='muskingum_cunge', length_m=10000.0,
+                                  slope=0.002, manning_n=0.04, width_m=20.0)
+
+        assert result.method == 'muskingum_cunge'
+        assert result.to_dict()['peak_outflow_m3s'] == result.peak_outflow_m3s
+
+    def test_unknown_method(self):
+        """Método o parámetros desconocidos lanzan ValueError"""
+        with pytest.raises(ValueError, match="no soportado"):
+            route_hydrograph(_inflow(), 10.0, method='kinematic_wave')
+        with pytest.raises(ValueError, match="inválidos"):
+            route_hydrograph(_inflow(), 10.0, method='muskingum', length_m=100.0)
@@ -0,0 +1,133 @@
+"""
+Tests para el análisis de sensibilidad global (Morris y Sobol)
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from hydrology.services import (
+    default_sensitivity_bounds,
+    evaluate_parameter_samples,
+    evaluate_scenario_samples,
+    morris_screening,
+    sobol_indices,
+)
+
+
+SCENARIO = dict(
+    total_rainfall_mm=None, duration_hours=3, area_km2=5.2, tc_minutes=45,
+    C=0.6, CN=75, P3_10=70, Tr=25
+)
+
+# Parámetros que no afectan el tiempo al pico (solo escalan la lluvia efectiva)
+SCALE_PARAMETERS = ('C', 'P3_10', 'Tr')
+
+
+class TestBounds:
+
+    def test_default_bounds_skip_unused_parameters(self):
+        bounds = default_sensitivity_bounds(SCENARIO)
+
+        assert list(bounds) == ['C', 'tc_minutes', 'peak_position_ratio', 'time_step_minutes', 'P3_10', 'Tr']
+        assert bounds['C'] == pytest.approx((0.48, 0.72))
+        assert bounds['time_step_minutes'] == pytest.approx((8.0, 12.0))  # Δt automático = 10 min
+
+        scs = default_sensitivity_bounds(dict(SCENARIO, excess_method='scs_curve_number'))
+        assert 'CN' in scs and 'C' not in scs
+
+    def test_default_bounds_clipped(self):
+        bounds = default_sensitivity_bounds(dict(SCENARIO, C=0.95), parameters=['C'], relative_range=0.5)
+        assert bounds == {'C': (0.475, 1.0)}
+
+    def test_invalid_bounds(self):
+        with pytest.raises(ValueError, match="no soportado"):
+            morris_screening(SCENARIO, {'area_km2': (4, 6)})
+        with pytest.raises(ValueError, match="rango inválido"):
+            morris_screening(SCENARIO, {'C': (0.7, 0.5)})
+        with pytest.raises(ValueError, match="rango inválido"):
+            sobol_indices(SCENARIO, {'P3_10': (40, 80)})
+        with pytest.raises(ValueError, match="sin valor nominal"):
+            default_sensitivity_bounds(dict(SCENARIO, CN=None), parameters=['CN'])
+
+
+class TestEvaluateParameterSamples:
+
+    def test_time_step_groups_match_single_evaluation(self):
+        samples = {
+            'C': np.array([0.5, 0.6, 0.7, 0.55, 0.65]),
+            'time_step_minutes': np.array([10.2, 5.0, 9.8, 5.0, 15.0]),
+        }
+        metrics = evaluate_parameter_samples(SCENARIO, samples, max_workers=1, chunk_size=2)
+
+        for row, time_step in enumerate([10.0, 5.0, 10.0, 5.0, 15.0]):
+            expected = evaluate_scenario_samples(
+                dict(SCENARIO, time_step_minutes=time_step), {'C': samples['C'][row:row + 1]}
+            )
+            for name, values in expected.items():
+                assert metrics[name][row] == pytest.approx(values[0], rel=1e-12)
+
+    def test_worker_processes_match_sequential(self):
+        rng = np.random.default_rng(5)
+        samples = {'tc_minutes': rng.uniform(30, 60, 40), 'time_step_minutes': rng.uniform(5, 12, 40)}
+
+        sequential = evaluate_parameter_samples(SCENARIO, samples, max_workers=1)
+        parallel = evaluate_parameter_samples(SCENARIO, samples, max_workers=2, chunk_size=8)
+
+        for name in sequential:
+            np.testing.assert_allclose(parallel[name], sequential[name], rtol=1e-12)
+
+
+class TestMorris:
+
+    def test_evaluations_and_ranking(self):
+        result = morris_screening(SCENARIO, num_trajectories=10, seed=1, max_workers=1)
+        timing = result.indices['time_to_peak_minutes']
+
+        assert result.num_evaluations == 10 * (len(result.parameters) + 1)
+        assert set(result.ranking('peak_discharge_m3s')[:2]) == {'C', 'P3_10'}
+        for name in SCALE_PARAMETERS:
+            assert timing[name]['mu_star'] == 0.0
+        assert timing['peak_position_ratio']['mu_star'] > 0
+
+    def test_linear_effect_is_exact(self):
+        """El volumen racional es lineal en C: efecto constante y σ = 0"""
+        result = morris_screening(SCENARIO, {'C': (0.4, 0.8)}, num_trajectories=6, seed=2, max_workers=1)
+        volume = result.indices['total_volume_m3']['C']
+        nominal = evaluate_scenario_samples(SCENARIO, {})['total_volume_m3'][0]
+
+        assert volume['mu'] == pytest.approx(nominal / 0.6 * 0.4)
+        assert volume['sigma'] == pytest.approx(0.0, abs=1e-6 * volume['mu'])
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="num_levels"):
+            morris_screening(SCENARIO, num_levels=3)
+        with pytest.raises(ValueError, match="num_trajectories"):
+            morris_screening(SCENARIO, num_trajectories=1)
+
+
+class TestSobol:
+
+    def test_indices(self):
+        result = sobol_indices(SCENARIO, num_samples=500, seed=3, max_workers=1)
+        peak = result.indices['peak_discharge_m3s']
+        timing = result.indices['time_to_peak_minutes']
+
+        assert result.settings['num_samples'] == 512
+        assert result.num_evaluations == 512 * (len(result.parameters) + 2)
+        assert set(result.ranking('peak_discharge_m3s')[:2]) == {'C', 'P3_10'}
+        assert sum(values['S1'] for values in peak.values()) == pytest.approx(1.0, abs=0.1)
+        for name in SCALE_PARAMETERS:
+            assert timing[name] == {'S1': 0.0, 'S1_conf': 0.0, 'ST': 0.0, 'ST_conf': 0.0}
+        assert peak['C']['ST_conf'] > 0
+
+    def test_seed_reproducible_and_serializable(self):
+        bounds = {'C': (0.5, 0.7), 'tc_minutes': (35, 60)}
+        first = sobol_indices(SCENARIO, bounds, num_samples=64, seed=4, max_workers=1)
+        second = sobol_indices(SCENARIO, bounds, num_samples=64, seed=4, max_workers=1)
+
+        assert first.indices == second.indices
+        data = json.loads(json.dumps(first.to_dict()))
+        assert data['bounds'] == {'C': [0.5, 0.7], 'tc_minutes': [35.0, 60.0]}
+        assert data['ranking']['total_volume_m3'][0] in bounds
@@ -0,0 +1,78 @@
+"""
+Tests para los tipos de resultado basados en arrays (series)
+
+Verifica que el pipeline array-nativo produce los mismos resultados que la
+API basada en dicts y que la conversión a listas ocurre solo en to_dict().
+"""
+
+import numpy as np
+import pytest
+
+from hydrology.services import (
+    calculate_hydrograph,
+    calculate_hydrograph_series,
+    HydrographResult,
+)
+
+
+PIPELINE_KWARGS = dict(
+    total_rainfall_mm=50.0,
+    duration_hours=2.0,
+    area_km2=5.2,
+    tc_minutes=45.0,
+    C=0.6,
+    time_step_minutes=10.0,
+    P3_10=70.0,
+    Tr=10.0
+)
+
+
+class TestHydrographResult:
+    """Tests para calculate_hydrograph_series / HydrographResult"""
+
+    def test_stages_hold_arrays(self):
+        """Las tres etapas transportan arrays float64"""
+        result = calculate_hydrograph_series(**PIPELINE_KWARGS)
+
+        assert isinstance(result, HydrographResult)
+        assert isinstance(result.hyetograph.rainfall_mm, np.ndarray)
+        assert isinstance(result.rainfall_excess.excess_mm, np.ndarray)
+        assert isinstance(result.hydrograph.discharge_m3s, np.ndarray)
+        assert result.hydrograph.discharge_m3s.dtype == np.float64
+
+    def test_slots_dataclasses(self):
+        """Los contenedores usan __slots__ (sin __dict__ por instancia)"""
+        result = calculate_hydrograph_series(**PIPELINE_KWARGS)
+
+        assert not hasattr(result.hydrograph, '__dict__')
+        with pytest.raises(AttributeError):
+            result.hydrograph.unexpected_attribute = 1
+
+    def test_to_dict_matches_dict_api(self):
+        """to_dict() reproduce exactamente calculate_hydrograph()"""
+        series_result = calculate_hydrograph_series(**PIPELINE_KWARGS).to_dict()
+        dict_result = calculate_hydrograph(**PIPELINE_KWARGS)
+
+        assert series_result['summary'] == dict_result['summary']
+        assert series_result['hydrograph']['discharge_m3s'] == dict_result['hydrograph']['discharge_m3s']
+        assert isinstance(series_result['hyetograph']['rainfall_mm'], list)
+
+    def test_summary_consistency(self):
+        """El resumen es consistente con las series"""
+        result = calculate_hydrograph_series(**PIPELINE_KWARGS)
+        summary = result.summary()
+        discharge = result.hydrograph.discharge_m3s
+
+        assert summary['peak_discharge_m3s'] == pytest.approx(discharge.max())
+        assert summary['time_to_peak_minutes'] == np.argmax(discharge) * 10.0
+        assert summary['total_volume_m3'] == pytest.approx(discharge.sum() * 600)
+        assert summary['runoff_coefficient'] == 0.6
+
+    def test_to_records(self):
+        """to_records() produce los puntos que se guardan en hydrograph_data"""
+        result = calculate_hydrograph_series(**PIPELINE_KWARGS)
+        records = result.hydrograph.to_records()
+
+        assert len(records) == result.hydrograph.discharge_m3s.size
+        assert set(records[0]) == {'time_min', 'discharge_m3s', 'cumulative_volume_m3'}
+        assert records[-1]['cumulative_volume_m3'] == pytest.approx(result.hydrograph.total_volume_m3)
@@ -0,0 +1,133 @@
+"""
+Tests para el análisis de incertidumbre de Monte Carlo
+"""
+
+import numpy as np
+import pytest
+
+from hydrology.services import (
+    calculate_hydrograph,
+    evaluate_scenario_samples,
+    latin_hypercube_samples,
+    parameter_distribution,
+    run_monte_carlo,
+)
+
+
+SCENARIO = dict(
+    total_rainfall_mm=None, duration_hours=3, area_km2=5.2, tc_minutes=45,
+    C=0.6, CN=75, P3_10=70, Tr=25
+)
+
+DISTRIBUTIONS = {
+    'C': dict(distribution='uniform', low=0.5, high=0.7),
+    'tc_minutes': dict(distribution='triangular', low=35, mode=45, high=60),
+    'P3_10': dict(distribution='normal', mean=70, std=5),
+}
+
+
+class TestSampling:
+    """Hipercubo latino y distribuciones"""
+
+    def test_one_sample_per_stratum(self):
+        frozen = {'C': parameter_distribution('C', dict(distribution='uniform', low=0.0, high=1.0))}
+        samples = latin_hypercube_samples(frozen, 50, seed=7)['C']
+        strata = np.floor(samples * 50).astype(int)
+
+        assert sorted(strata.tolist()) == list(range(50))
+
+    def test_normal_truncated_to_parameter_bounds(self):
+        distribution = parameter_distribution('C', dict(distribution='normal', mean=0.95, std=0.2))
+        samples = distribution.ppf(np.linspace(0.001, 0.999, 200))
+
+        assert samples.min() >= 0 and samples.max() <= 1
+
+    def test_lognormal_median(self):
+        distribution = parameter_distribution('tc_minutes', dict(distribution='lognormal', median=45, sigma=0.2))
+        assert distribution.ppf(0.5) == pytest.approx(45.0)
+
+    def test_invalid_distributions(self):
+        with pytest.raises(ValueError, match="no soportado"):
+            parameter_distribution('duration_hours', dict(distribution='uniform', low=1, high=2))
+        with pytest.raises(ValueError, match="no soportada"):
+            parameter_distribution('C', dict(distribution='beta', a=2, b=2))
+        with pytest.raises(ValueError):
+            parameter_distribution('C', dict(distribution='uniform', low=0.7, high=0.5))
+
+
+class TestEvaluation:
+    """Las realizaciones coinciden con calculate_hydrograph()"""
+
+    @pytest.mark.parametrize('method, excess_method', [
+        ('rational', 'rational'),
+        ('scs_unit_hydrograph', 'scs_curve_number'),
+        ('synth_unit_hydro', 'scs_curve_number'),
+    ])
+    def test_realizations_match_single_scenario(self, method, excess_method):
+        scenario = dict(SCENARIO, method=method, excess_method=excess_method)
+        samples = {
+            'C': np.array([0.5, 0.65, 0.7]),
+            'CN': np.array([70.0, 80.0, 85.0]),
+            'tc_minutes': np.array([35.0, 45.0, 58.0]),
+            'P3_10': np.array([62.0, 70.0, 81.0]),
+        }
+        metrics = evaluate_scenario_samples(scenario, samples)
+
+        for row in range(3):
+            params = dict(scenario, time_step_minutes=10.0, **{name: values[row] for name, values in samples.items()})
+            params['total_rainfall_mm'] = metrics['total_rainfall_mm'][row]
+            summary = calculate_hydrograph(**params)['summary']
+            assert metrics['peak_discharge_m3s'][row] == pytest.approx(summary['peak_discharge_m3s'], rel=1e-9)
+            assert metrics['total_volume_m3'][row] == pytest.approx(summary['total_volume_m3'], rel=1e-9)
+            assert metrics['time_to_peak_minutes'][row] == summary['time_to_peak_minutes']
+
+    def test_idf_total_follows_p3_10(self):
+        metrics = evaluate_scenario_samples(SCENARIO, {'P3_10': np.array([60.0, 70.0, 80.0])})
+        assert np.all(np.diff(metrics['total_rainfall_mm']) > 0)
+
+        fixed = evaluate_scenario_samples(dict(SCENARIO, total_rainfall_mm=60), {'P3_10': np.array([60.0, 80.0])})
+        np.testing.assert_allclose(fixed['total_rainfall_mm'], 60.0)
+
+    def test_invalid_scenarios(self):
+        with pytest.raises(ValueError, match="no soportados"):
+            evaluate_scenario_samples(SCENARIO, {'duration_hours': np.array([1.0, 2.0])})
+        with pytest.raises(ValueError, match="alternating_block"):
+            evaluate_scenario_samples(dict(SCENARIO, hyetograph_method='uniform'), {})
+        with pytest.raises(ValueError, match="Faltan"):
+            evaluate_scenario_samples({k: v for k, v in SCENARIO.items() if k != 'area_km2'}, {})
+
+
+class TestRunMonteCarlo:
+
+    def test_seed_reproducible(self):
+        first = run_monte_carlo(SCENARIO, DISTRIBUTIONS, 200, seed=11)
+        second = run_monte_carlo(SCENARIO, DISTRIBUTIONS, 200, seed=11)
+        other = run_monte_carlo(SCENARIO, DISTRIBUTIONS, 200, seed=12)
+
+        np.testing.assert_array_equal(first.metrics['peak_discharge_m3s'], second.metrics['peak_discharge_m3s'])
+        assert not np.array_equal(first.metrics['peak_discharge_m3s'], other.metrics['peak_discharge_m3s'])
+
+    def test_quantiles_bracket_nominal(self):
+        result = run_monte_carlo(SCENARIO, DISTRIBUTIONS, 500, seed=3)
+        quantiles = list(result.quantiles('peak_discharge_m3s').values())
+
+        assert quantiles == sorted(quantiles)
+        assert quantiles[0] < result.nominal['peak_discharge_m3s'] < quantiles[-1]
+        assert 0 < result.exceedance_probability('peak_discharge_m3s', result.nominal['peak_discharge_m3s']) < 1
+
+    def test_to_dict(self):
+        result = run_monte_carlo(SCENARIO, DISTRIBUTIONS, 20, seed=0, quantiles=(0.1, 0.9))
+        data = result.to_dict(include_samples=True)
+
+        assert data['num_realizations'] == 20
+        assert data['uncertain_parameters'] == ['C', 'tc_minutes', 'P3_10']
+        assert list(data['metrics']['peak_discharge_m3s']['quantiles']) == ['0.1', '0.9']
+        assert len(data['realizations']['total_volume_m3']) == 20
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="num_realizations"):
+            run_monte_carlo(SCENARIO, DISTRIBUTIONS, 1)
+        with pytest.raises(ValueError, match="al menos un"):
+            run_monte_carlo(SCENARIO, {}, 10)
+        with pytest.raises(ValueError, match="cuantiles"):
+            run_monte_carlo(SCENARIO, DISTRIBUTIONS, 10, quantiles=(0.5, 1.5))
@@ -0,0 +1,159 @@
+"""
+Tests para la caché de hidrogramas unitarios adimensionales y los
+generadores sintéticos (Clark, Nash, Snyder)
+"""
+
+import numpy as np
+import pytest
+
+from scipy.stats import gamma
+
+from hydrology.services import (
+    calculate_hydrograph,
+    clark_unit_hydrograph,
+    clear_unit_hydrograph_cache,
+    nash_unit_hydrograph,
+    snyder_unit_hydrograph,
+    synthetic_unit_hydrograph,
+    triangular_unit_hydrograph,
+    unit_hydrograph_cache_info,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Cada test parte de una caché vacía"""
+    clear_unit_hydrograph_cache()
+    yield
+    clear_unit_hydrograph_cache()
+
+
+class TestTriangularUnitHydrograph:
+    """Tests para triangular_unit_hydrograph"""
+
+    def test_shape(self):
+        """Pico 1 en Tc y cero a partir del tiempo base (2.67 Tc)"""
+        ordinates = triangular_unit_hydrograph(tc_minutes=30.0, time_step_minutes=5.0)
+        t = np.arange(ordinates.size) * 5.0
+
+        assert ordinates[6] == 1.0
+        assert ordinates.max() == 1.0
+        assert np.all(ordinates[t >= 2.67 * 30.0] == 0.0)
+        np.testing.assert_allclose(ordinates[:7], t[:7] / 30.0)
+
+    def test_read_only(self):
+        """Las ordenadas compartidas no se pueden modificar"""
+        ordinates = triangular_unit_hydrograph(45.0, 10.0)
+
+        with pytest.raises(ValueError):
+            ordinates[0] = 1.0
+
+    def test_repeated_calls_hit_cache(self):
+        """La misma clave (Tc, Δt, forma) reutiliza las ordenadas"""
+        first = triangular_unit_hydrograph(45, 10)
+        second = triangular_unit_hydrograph(45.0, 10.0)
+        triangular_unit_hydrograph(45.0, 5.0)
+
+        info = unit_hydrograph_cache_info()['triangular']
+        assert second is first
+        assert info['hits'] == 1
+        assert info['misses'] == 2
+        assert info['currsize'] == 2
+
+    def test_repeated_storms_skip_construction(self):
+        """Tormentas repetidas sobre la misma cuenca no reconstruyen el HU"""
+        for total_rainfall_mm in (40.0, 60.0, 80.0):
+            calculate_hydrograph(
+                total_rainfall_mm=total_rainfall_mm, duration_hours=2.0, area_km2=5.2,
+                tc_minutes=45.0, C=0.6, P3_10=70.0, Tr=10, time_step_minutes=10.0
+            )
+
+        info = unit_hydrograph_cache_info()['triangular']
+        assert info['misses'] == 1
+        assert info['hits'] == 2
+
+    def test_clear(self):
+        """clear_unit_hydrograph_cache() vacía la caché y sus estadísticas"""
+        triangular_unit_hydrograph(45.0, 10.0)
+        clear_unit_hydrograph_cache()
+
+        info = unit_hydrograph_cache_info()['triangular']
+        assert info['currsize'] == 0
+        assert info['misses'] == 0
+
+
+class TestSyntheticUnitHydrographs:
+    """Tests para los generadores de hidrogramas unitarios sintéticos"""
+
+    @pytest.mark.parametrize('generator', ['clark', 'nash', 'snyder'])
+    def test_unit_volume(self, generator):
+        """Las ordenadas de pulso son no negativas y suman 1"""
+        ordinates = synthetic_unit_hydrograph(generator, tc_minutes=100.0, time_step_minutes=10.0)
+
+        assert ordinates[0] == 0.0
+        assert np.all(ordinates >= 0)
+        assert ordinates.sum() == pytest.approx(1.0)
+
+    def test_clark_matches_reservoir_loop(self):
+        """El filtro recursivo reproduce el embalse lineal paso a paso"""
+        tc, dt, storage = 60.0, 10.0, 45.0
+        ordinates = clark_unit_hydrograph(tc, dt, storage_coefficient_minutes=storage)
+
+        # Tiempo-área de HEC-HMS con 6 incrementos y embalse exacto en cada intervalo
+        t = np.arange(7) / 6
+        area = np.where(t <= 0.5, 1.414 * t ** 1.5, 1 - 1.414 * (1 - t) ** 1.5)
+        inflow = np.diff(area, prepend=0.0)
+        decay = np.exp(-dt / storage)
+        outflow, expected = 0.0, []
+        for k in range(ordinates.size):
+            outflow = decay * outflow + (1 - decay) * (inflow[k] if k < inflow.size else 0.0)
+            expected.append(outflow)
+
+        # Las ordenadas se renormalizan tras cortar la cola
+        np.testing.assert_allclose(ordinates, np.array(expected) / sum(expected), rtol=1e-9)
+
+    def test_nash_single_reservoir(self):
+        """Con n = 1 la cascada de Nash es un embalse lineal (exponencial)"""
+        ordinates = nash_unit_hydrograph(60.0, 10.0, num_reservoirs=1, storage_constant_minutes=20.0)
+
+        np.testing.assert_allclose(ordinates[2] / ordinates[1], np.exp(-0.5))
+
+    def test_nash_matches_gamma_distribution(self):
+        """Las ordenadas son incrementos de la distribución gamma(n, K)"""
+        ordinates = nash_unit_hydrograph(100.0, 10.0, num_reservoirs=2.5)
+        scale = 0.6 * 100.0 / 2.5
+
+        t = np.arange(ordinates.size) * 10.0
+        expected = np.diff(gamma.cdf(t, 2.5, scale=scale), prepend=0.0)
+        np.testing.assert_allclose(ordinates, expected / expected.sum())
+
+    def test_snyder_peak(self):
+        """El pico está en Tp = Δt/2 + tpR con caudal qp = 0.275 Cp A / tpR"""
+        dt, lag, cp = 10.0, 60.0, 0.6
+        ordinates = snyder_unit_hydrograph(100.0, dt, lag_minutes=lag, peaking_coefficient=cp)
+
+        adjusted_lag = lag + (dt - lag / 5.5) / 4
+        time_to_peak = dt / 2 + adjusted_lag
+        # Caudal pico por mm sobre 1 km² → fracción del volumen por intervalo
+        peak_fraction = 0.275 * cp / (adjusted_lag / 60) * (dt * 60) / 1000
+        assert abs(np.argmax(ordinates) * dt - time_to_peak) <= dt
+        assert ordinates.max() == pytest.approx(peak_fraction, rel=0.01)
+
+    def test_shared_cache(self):
+        """Nash y Snyder comparten la caché de ordenadas gamma"""
+        nash_unit_hydrograph(100.0, 10.0)
+        nash_unit_hydrograph(100.0, 10.0)
+        snyder_unit_hydrograph(100.0, 10.0)
+
+        info = unit_hydrograph_cache_info()['gamma']
+        assert info['hits'] == 1
+        assert info['misses'] == 2
+
+    def test_invalid_generator(self):
+        """Generadores desconocidos o parámetros inválidos lanzan ValueError"""
+        with pytest.raises(ValueError, match="no soportado"):
+            synthetic_unit_hydrograph('espey', 60.0, 10.0)
+        with pytest.raises(ValueError, match="Parámetros inválidos"):
+            synthetic_unit_hydrograph('clark', 60.0, 10.0, num_reservoirs=3)
+        with pytest.raises(ValueError, match="peaking_coefficient"):
+            snyder_unit_hydrograph(60.0, 10.0, peaking_coefficient=1.5)
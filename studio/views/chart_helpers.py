@@ -3,8 +3,6 @@ Chart Helper Functions - HidroStudio Professional
 Funciones auxiliares para generar datos de gráficos (hietogramas e hidrogramas)
 """
 
-import json
-
 
 def calculate_optimal_timestep(storm, custom_timestep=None):
     """
@@ -139,13 +137,13 @@ def generate_hydrograph_data(hydrograph):
     Returns:
         dict: {'time_steps': [...], 'discharge': [...], 'name': '...'}
     """
-    # If hydrograph_data exists, use it
-    if hydrograph.hydrograph_data:
-        data = json.loads(hydrograph.hydrograph_data) if isinstance(hydrograph.hydrograph_data, str) else hydrograph.hydrograph_data
+    # If a stored series exists, use it (columnar arrays, no per-point dicts)
+    series = hydrograph.series
+    if series is not None:
         return {
             'name': hydrograph.get_method_display(),
-            'time_steps': data.get('time_steps', []),
-            'discharge': data.get('discharge', [])
+            'time_steps': series.time.tolist(),
+            'discharge': series.columns['discharge_m3s'].tolist()
         }
 
     # Otherwise, generate sample triangular hydrograph
@@ -4,11 +4,13 @@ Tests unitarios para el servicio de Curvas IDF Uruguay.
 
 import pytest
 import math
+import numpy as np
 from calculators.services.idf import (
     calculate_CT,
     calculate_CD,
     calculate_CA,
     calculate_intensity_idf,
+    calculate_intensity_idf_array,
     get_P3_10_reference_values,
     validate_inputs_and_warn
 )
@@ -277,6 +279,41 @@ class TestCalculateIntensityIDF:
         assert result_5['I_mmh'] < result_10['I_mmh'] < result_25['I_mmh']
 
 
+class TestCalculateIntensityIDFArray:
+    """Tests para la versión vectorizada del cálculo IDF."""
+
+    def test_matches_scalar_functions(self):
+        """Test que coincide con CT, CD y CA escalares en ambas ramas de d."""
+        durations = np.array([0.25, 1.0, 2.99, 3.0, 6.0, 24.0])
+        result = calculate_intensity_idf_array(P3_10=74, Tr=5, d=durations, Ac=30)
+
+        for i, d in enumerate(durations):
+            expected_P = 74 * calculate_CT(5) * calculate_CD(d) * calculate_CA(30, d)
+            assert result['P_mm'][i] == pytest.approx(expected_P, rel=1e-12)
+            assert result['I_mmh'][i] == pytest.approx(expected_P / d, rel=1e-12)
+
+    def test_broadcasting_tr_and_duration(self):
+        """Test que Tr y d se combinan por broadcasting en una tabla IDF."""
+        Tr = np.array([2, 5, 10, 25])[:, np.newaxis]
+        d = np.array([0.5, 1, 3, 6, 24])
+        result = calculate_intensity_idf_array(P3_10=75, Tr=Tr, d=d)
+
+        assert result['I_mmh'].shape == (4, 5)
+        assert np.all(result['CA'] == 1.0)
+        # Intensidad crece con Tr y decrece con la duración
+        assert np.all(np.diff(result['I_mmh'], axis=0) > 0)
+        assert np.all(np.diff(result['I_mmh'], axis=1) < 0)
+
+    def test_invalid_values(self):
+        """Test que cualquier valor fuera de rango lanza ValueError."""
+        with pytest.raises(ValueError, match="debe ser mayor a 0"):
+            calculate_intensity_idf_array(P3_10=75, Tr=5, d=[1, 0, 2])
+        with pytest.raises(ValueError, match="debe ser >= 2 años"):
+            calculate_intensity_idf_array(P3_10=75, Tr=[5, 1], d=1)
+        with pytest.raises(ValueError, match="no puede ser negativa"):
+            calculate_intensity_idf_array(P3_10=75, Tr=5, d=1, Ac=-1)
+
+
 class TestGetP310ReferenceValues:
     """Tests para valores de referencia de P3_10."""
 
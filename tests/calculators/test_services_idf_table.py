@@ -0,0 +1,108 @@
+"""
+Tests unitarios para las tablas IDF precalculadas.
+"""
+
+import pytest
+import numpy as np
+from calculators.services.idf import (
+    calculate_CT,
+    calculate_CD,
+    calculate_CA,
+    calculate_intensity_idf_array
+)
+from calculators.services.idf_table import (
+    IDFTable,
+    get_idf_table,
+    IDF_TABLE_MAX_RELATIVE_ERROR
+)
+
+
+@pytest.fixture(scope='module')
+def table():
+    return get_idf_table()
+
+
+class TestNodes:
+    """Tests para las consultas exactas en los nodos."""
+
+    def test_common_return_periods(self, table):
+        """Tr enteros devuelven el valor de la fórmula."""
+        for Tr in (2, 5, 10, 25, 50, 100):
+            assert table.CT(Tr) == calculate_CT(Tr)
+
+    def test_duration_multiples_of_time_step(self, table):
+        """k·Δt con Δt entero son nodos aunque k·Δt/60 no sea exacto."""
+        d = np.arange(1, 145) * (10 / 60)
+        np.testing.assert_allclose(table.CD(d), [calculate_CD(x) for x in d], rtol=1e-14)
+        np.testing.assert_allclose(table.CA(5.2, d), [calculate_CA(5.2, x) for x in d], rtol=1e-14)
+
+    def test_intensity_steps_matches_exact(self, table):
+        """intensity_steps() coincide con la evaluación exacta."""
+        Tr = np.array([[2.0], [25.0], [100.0]])
+        result = table.intensity_steps(70, Tr, 10, 144, Ac=5.2)
+        expected = calculate_intensity_idf_array(70, Tr, np.arange(1, 145) * 10 / 60, Ac=5.2)
+
+        for key in ('P_mm', 'I_mmh', 'CT', 'CD', 'CA'):
+            np.testing.assert_allclose(result[key], expected[key], rtol=1e-14)
+        assert result['P_mm'].shape == (3, 144)
+
+
+class TestInterpolation:
+    """Tests para la interpolación fuera de los nodos."""
+
+    def test_error_bound(self, table):
+        """Error relativo acotado en todo el rango tabulado."""
+        rng = np.random.default_rng(0)
+        Tr = rng.uniform(2, 1000, 20000)
+        d = np.geomspace(1 / 60, 48, 20000)
+        Ac = rng.uniform(0, 1000, 20000)
+
+        for approx, exact in (
+            (table.CT(Tr), table.CT(Tr, exact=True)),
+            (table.CD(d), table.CD(d, exact=True)),
+            (table.CA(Ac, d), table.CA(Ac, d, exact=True)),
+        ):
+            assert np.max(np.abs(approx / exact - 1)) < IDF_TABLE_MAX_RELATIVE_ERROR
+
+    def test_cd_branches_not_mixed(self, table):
+        """Justo antes de 3 h se usa la rama de duraciones cortas."""
+        d = np.array([2.999, 3.0, 3.001])
+        np.testing.assert_allclose(table.CD(d), [calculate_CD(x) for x in d], rtol=IDF_TABLE_MAX_RELATIVE_ERROR)
+
+    def test_out_of_range_is_exact(self, table):
+        """Fuera de las grillas se evalúan las fórmulas."""
+        assert table.CT(5000.5) == pytest.approx(calculate_CT(5000.5), rel=1e-14)
+        assert table.CD(72.5) == pytest.approx(calculate_CD(72.5), rel=1e-14)
+        assert table.CD(0.5 / 60) == pytest.approx(calculate_CD(0.5 / 60), rel=1e-14)
+        assert table.CA(2500.3, 1) == pytest.approx(calculate_CA(2500.3, 1), rel=1e-14)
+
+    def test_exact_option(self):
+        """exact=True evalúa siempre las fórmulas."""
+        table = IDFTable(max_return_period=10, max_duration_minutes=240, max_area_km2=10, exact=True)
+        d = np.array([0.7, 1.3])
+        expected = calculate_intensity_idf_array(74, 7.5, d, Ac=3.3)
+
+        np.testing.assert_array_equal(table.intensity(74, 7.5, d, Ac=3.3)['P_mm'], expected['P_mm'])
+        np.testing.assert_array_equal(table.intensity_steps(74, 7.5, 2.5, 4, Ac=3.3)['P_mm'],
+                                      calculate_intensity_idf_array(74, 7.5, np.arange(1, 5) * 2.5 / 60, 3.3)['P_mm'])
+
+
+class TestValidation:
+    """Tests para validaciones."""
+
+    def test_same_errors_as_exact(self, table):
+        with pytest.raises(ValueError, match='período de retorno'):
+            table.intensity(70, 1.5, 1)
+        with pytest.raises(ValueError, match='duración'):
+            table.intensity(70, 10, 0)
+        with pytest.raises(ValueError, match='negativa'):
+            table.intensity_steps(70, 10, 5, 12, Ac=-1)
+
+    def test_invalid_grids(self):
+        with pytest.raises(ValueError):
+            IDFTable(max_duration_minutes=120)
+        with pytest.raises(ValueError):
+            IDFTable(area_step_km2=0)
+
+    def test_shared_table(self):
+        assert get_idf_table() is get_idf_table()